@@ -1,19 +1,127 @@
 """
-Punto de Entrada Principal de la Aplicación Simplex Solver.
+Punto de Entrada Principal de la Aplicación Simplex Solver (consola).
+
+Resuelve en lote problemas exportados por la aplicación y escribe un
+registro JSON por línea (JSONL) con el resultado de cada uno:
+
+    python app.py problemas/                      # .json y .jsonl de la carpeta
+    python app.py 'exportados/*.json' --workers 4 --salida resultados.jsonl
+    cat problemas.jsonl | python app.py --tiempo-limite 5 --ordenado
+    python app.py --interactivo [--perfil [N]]    # ingreso guiado de un problema
+
+Sale con 1 si algún problema no se pudo leer o resolver (un problema
+infactible o no acotado es un resultado, no un error).
 """
-# 1. IMPORTAMOS EL NUEVO SOLVER JUNTO A LOS OTROS
-from app.controllers import ObjectiveFunctionController, ConstraintsController, SolverController
+import argparse
+import sys
+import time
+from collections import Counter
+
+from app import config
+from app.utils.logging_setup import configure_logging
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("Debe ser un entero mayor que 0.")
+    return number
+
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError("Debe ser un número mayor que 0.")
+    return number
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    from app.services import SolverBackendRegistry
+
+    parser = argparse.ArgumentParser(prog="python app.py", description="Solver Simplex por consola (en lote).")
+    parser.add_argument("entradas", nargs="*", metavar="ENTRADA",
+                        help="Archivos .json/.jsonl, carpetas o patrones glob; '-' (o nada) lee JSONL "
+                             "de la entrada estándar.")
+    parser.add_argument("--workers", type=_positive_int, default=config.BATCH_MAX_WORKERS,
+                        help=f"Problemas que se resuelven a la vez (por defecto {config.BATCH_MAX_WORKERS}).")
+    parser.add_argument("--backend", choices=[SolverBackendRegistry.AUTO] + SolverBackendRegistry.names(),
+                        default=None, help="Backend para todos los problemas (por defecto, el de cada "
+                                           "problema o el de app.config).")
+    parser.add_argument("--tiempo-limite", type=_positive_float, default=None, metavar="SEGUNDOS",
+                        help="Tiempo máximo por problema, visualización incluida "
+                             f"(por defecto el del problema o {config.SOLVE_TIME_LIMIT:g} s).")
+    parser.add_argument("--visualizacion", action="store_true",
+                        help="Incluir el HTML de gilp en cada registro.")
+    parser.add_argument("--tablas", action="store_true", help="Incluir las tablas intermedias en cada registro.")
+    parser.add_argument("--guardar", action="store_true",
+                        help="Guardar cada reporte como solucion_N.json (el registro trae 'solucion_id').")
+    parser.add_argument("--ordenado", action="store_true",
+                        help="Escribir los registros en el orden de entrada (por defecto, a medida que terminan).")
+    parser.add_argument("--salida", default=None, metavar="RUTA",
+                        help="Archivo JSONL de resultados (por defecto, la salida estándar).")
+    parser.add_argument("--interactivo", action="store_true", help="Ingresar un problema paso a paso.")
+    parser.add_argument("--perfil", nargs="?", type=int, const=20, default=None, metavar="N",
+                        help="Con --interactivo: perfila la resolución (cProfile) y muestra las N "
+                             "funciones más costosas.")
+    args = parser.parse_args(argv)
+    if args.perfil is not None and not args.interactivo:
+        parser.error("--perfil solo se usa con --interactivo.")
+    if not args.interactivo and not args.entradas and sys.stdin.isatty():
+        parser.error("Indicá archivos, carpetas o patrones, o enviá JSONL por la entrada estándar "
+                     "(o usá --interactivo).")
+    return args
+
+
+def print_profile(profile_info: dict):
+    """Resumen del perfil en consola."""
+    print(f"\nPerfil guardado en {profile_info['archivo']} (resumen: {profile_info['resumen']})")
+    print(f"{'Tiempo propio':>14} {'Acumulado':>10} {'Llamadas':>9}  Función")
+    for row in profile_info["top"]:
+        print(f"{row['tiempo_propio']:>14.4f} {row['tiempo_acumulado']:>10.4f} {row['llamadas']:>9}  {row['funcion']}")
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Resuelve las entradas y escribe un registro JSONL por problema. Retorna el código de salida."""
+    from app.controllers import BatchController
+    from app.controllers.batch_controller import ESTADO_INVALIDO
+
+    BatchController.configure()
+    settings = BatchController.settings(backend=args.backend, time_limit=args.tiempo_limite,
+                                        visualization=args.visualizacion, tableaus=args.tablas,
+                                        persist=args.guardar)
+    entries = BatchController.read(args.entradas or ["-"], stdin=sys.stdin)
+    states = Counter()
+    start = time.perf_counter()
+    output = open(args.salida, "w", encoding="utf-8") if args.salida else sys.stdout
+    try:
+        for record in BatchController.run(entries, settings, workers=args.workers, ordered=args.ordenado):
+            output.write(BatchController.to_jsonl(record) + "\n")
+            output.flush()
+            states[record["estado"]] += 1
+    finally:
+        if args.salida:
+            output.close()
+
+    summary = ", ".join(f"{count} {state}" for state, count in states.most_common())
+    print(f"{sum(states.values())} problema(s) en {time.perf_counter() - start:.2f} s: {summary or 'ninguno'}",
+          file=sys.stderr)
+    failed = states["Error"] + states[ESTADO_INVALIDO]
+    return 1 if failed else 0
+
+
+def run_interactive(args: argparse.Namespace):
+    """Ingreso guiado de la función objetivo y las restricciones, y su resolución."""
+    from app.controllers import ObjectiveFunctionController, ConstraintsController, SolverController
+    from app.services import StorageService
 
-def main():
-    """Ejecuta el flujo principal de la aplicación."""
     print("===================================")
     print("   BIENVENIDO AL SOLVER SIMPLEX    ")
     print("===================================\n")
-    
+
     # --- Flujo 1: Función Objetivo ---
     obj_controller = ObjectiveFunctionController()
     coefficients = obj_controller.run()
-    
+
     if not coefficients:
         print("No se pudo definir la función objetivo. Saliendo.")
         return
@@ -24,11 +132,19 @@ def main():
     # --- Flujo 2: Restricciones ---
     const_controller = ConstraintsController()
     const_controller.run(expected_vars=expected_vars)
-    
+
     # --- Flujo 3: Calcular Solución (NUEVO - ISSUE #7) ---
     try:
-        solver = SolverController()
+        problem = {"problema_definicion": {
+            "funcion_objetivo": StorageService.load_objective_function(),
+            "restricciones": StorageService.load_constraints(),
+        }}
+        if args.perfil is not None:
+            config.PROFILING_TOP_N = args.perfil
+        solver = SolverController(problem, profile=args.perfil is not None)
         solver.run()
+        if solver.profile_info:
+            print_profile(solver.profile_info)
     except ImportError:
         print("\n================= ERROR =================")
         print("No se pudo encontrar la librería 'scipy'.")
@@ -46,5 +162,15 @@ def main():
     print("===================================\n")
 
 
+def main(argv=None) -> int:
+    """Ejecuta la aplicación de consola (en lote o, con --interactivo, guiada)."""
+    args = parse_args(argv)
+    configure_logging()
+    if args.interactivo:
+        run_interactive(args)
+        return 0
+    return run_batch(args)
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
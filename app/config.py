@@ -21,4 +21,135 @@ PREFIX_FUNCION_OBJETIVO = "funcion_objetivo"
 PREFIX_RESTRICCIONES = "restricciones"
 PREFIX_SOLUCION = "solucion_"
 PREFIX_PROBLEMA = "problema_"
-PREFIX_PDF = "reporte_solucion_"
\ No newline at end of file
+PREFIX_PDF = "reporte_solucion_"
+
+# --- Presolve ---
+# Reduce el modelo (filas vacías, singleton, duplicadas, variables fijas)
+# antes de enviarlo al solver y a la visualización.
+PRESOLVE_ENABLED = True
+
+# --- Escalado (equilibrado de filas y columnas) ---
+# "auto": solo si max|a_ij| / min|a_ij| supera SCALING_RANGE_THRESHOLD.
+# "on": siempre. "off": nunca.
+SCALING_MODE = "auto"
+SCALING_RANGE_THRESHOLD = 1e4
+
+# --- Backends de resolución ---
+# "auto" elige según tamaño/densidad; también: "highs-ds", "highs-ipm", "highs", "tableau".
+SOLVER_DEFAULT_BACKEND = "auto"
+# Opciones por defecto; cada backend toma solo las que soporta.
+SOLVER_DEFAULT_OPTIONS = {"presolve": True}
+# Política automática: a partir de cuántos no-ceros un modelo es "grande"
+# y con qué densidad máxima se lo considera "ralo".
+SOLVER_AUTO_LARGE_NONZEROS = 50_000
+SOLVER_AUTO_SPARSE_DENSITY = 0.05
+
+# --- Presupuesto de cada resolución ---
+# Tiempo total (segundos) para el solver y la visualización (la opción 'time_limit'
+# del problema lo reemplaza) y máximo de pivoteos de cada algoritmo ('maxiter').
+SOLVE_TIME_LIMIT = float(os.environ.get("SIMPLEX_SOLVE_TIME_LIMIT", "10"))
+SOLVE_ITERATION_LIMIT = 10_000
+# Con el pool de procesos, si una resolución no termina en el tiempo límite más
+# este margen, se termina el proceso que la resuelve (ver SolveExecutor.call).
+SOLVE_CANCEL_GRACE = 5.0
+
+# --- Visualización según el tamaño del modelo ---
+# gilp dibuja solo modelos de 2 o 3 variables, y hasta VISUALIZATION_GILP_MAX_ROWS
+# restricciones (enumerar los vértices crece rápido con las filas).
+VISUALIZATION_GILP_VARIABLES = (2, 3)
+VISUALIZATION_GILP_MAX_ROWS = 20
+# Tamaño máximo de la tabla de simple_simplex (filas = restricciones + 1,
+# columnas = variables + restricciones + 2) para generar la historia de tablas.
+# Más grande, el reporte trae solo un resumen (ver VisualizationPolicy).
+VISUALIZATION_TABLEAU_MAX_ROWS = 40
+VISUALIZATION_TABLEAU_MAX_COLUMNS = 50
+
+# --- Reportes PDF ---
+# Cantidad máxima de flowables pendientes en memoria mientras se maqueta el PDF
+# y tamaño de los bloques con los que se envía la respuesta.
+PDF_STORY_CHUNK_SIZE = 50
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+# Caché de PDFs por solución + hash del contenido (se regeneran solo si el reporte cambia).
+PDF_CACHE_ENABLED = True
+PDF_CACHE_DIR = os.path.join(OUTPUT_DIR, "pdf_cache")
+
+# --- Exportación de PDFs en lote ---
+# Cada lote se maqueta en un pool de procesos y se entrega como un único .zip.
+PDF_BATCH_DIR = os.path.join(OUTPUT_DIR, "pdf_lotes")
+PDF_BATCH_MAX_WORKERS = max(1, min(4, os.cpu_count() or 1))
+PDF_BATCH_MAX_IDS = 200
+# Memoria adicional (MB) que puede reservar un lote entero; se reparte entre sus procesos.
+PDF_BATCH_MEMORY_LIMIT_MB = 2048
+# Lotes que se procesan a la vez en cada proceso web (el resto espera en cola).
+PDF_BATCH_MAX_CONCURRENT_JOBS = 2
+# Segundos que un lote espera a que se escriban los reportes encolados (write-behind);
+# los que no llegan a escribirse fallan como inexistentes.
+PDF_BATCH_FLUSH_TIMEOUT = 30.0
+# Segundos que se conservan el estado y el .zip de un lote (se borran al crear otro lote).
+PDF_BATCH_TTL = 24 * 3600
+
+# --- Resolución en lote (python app.py) ---
+# Procesos que resuelven a la vez (--workers lo reemplaza).
+BATCH_MAX_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# --- Historial de tablas en solution.html ---
+# Tablas por página que devuelve /solucion/<id>/tablas (y máximo que se puede pedir).
+TABLEAU_PAGE_SIZE = 1
+TABLEAU_PAGE_SIZE_MAX = 20
+# Tablas ya convertidas a HTML que se guardan en memoria (por hash de la tabla y el pivote).
+TABLEAU_HTML_CACHE_SIZE = 512
+
+# --- Persistencia de las soluciones (solucion_N.json) ---
+# "sync": se escribe antes de responder (comportamiento original).
+# "write-behind": se encola y un hilo de fondo lo escribe en lotes (fsync por lote).
+# "off": no se guarda (el historial, /exportar-pdf y los lotes de PDF no la verán).
+PERSISTENCE_MODE = "sync"
+# Reportes encolados como máximo; con la cola llena se escribe en el momento.
+PERSISTENCE_QUEUE_SIZE = 256
+# Reportes por lote y cuánto espera el hilo (segundos) a completar un lote.
+PERSISTENCE_BATCH_SIZE = 32
+PERSISTENCE_BATCH_WAIT = 0.05
+
+# --- Logs ---
+# Nivel del logger "app" (DEBUG muestra el detalle de cada resolución) y
+# formato de salida: "text" o "json" (una línea por registro, con los campos extra).
+LOG_LEVEL = os.environ.get("SIMPLEX_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("SIMPLEX_LOG_FORMAT", "text").lower()
+# Niveles por módulo, ej: {"app.core.presolve": "DEBUG", "app.services.storage_service": "WARNING"}.
+LOG_LEVELS = {}
+
+# --- Métricas (/metrics, formato de texto de Prometheus) ---
+# Cada proceso vuelca sus métricas a METRICS_DIR (como mucho una vez por
+# METRICS_FLUSH_INTERVAL segundos) y /metrics suma las de todos los workers.
+METRICS_ENABLED = True
+METRICS_DIR = os.environ.get("SIMPLEX_METRICS_DIR", os.path.join(OUTPUT_DIR, "metricas"))
+METRICS_FLUSH_INTERVAL = 1.0
+
+# --- Perfilado de una resolución (cProfile) ---
+# Token de administrador para pedir un perfil desde la web, solo en la cabecera
+# X-Simplex-Perfil. Sin token, solo desde app.py --interactivo --perfil.
+PROFILING_TOKEN = os.environ.get("SIMPLEX_PROFILING_TOKEN", "")
+# Dónde va el perfil si la solución no se guardó (si se guardó, va junto al reporte).
+PROFILING_DIR = os.path.join(OUTPUT_DIR, "perfiles")
+# Funciones del resumen (las de más tiempo propio).
+PROFILING_TOP_N = 20
+
+# --- Ejecución de las resoluciones ---
+# "inline": en el hilo que atiende el pedido. "process": en un pool de procesos
+# por worker web, para que los hilos de un worker gthread sigan atendiendo
+# mientras se resuelve (gunicorn.conf.py usa "process" por defecto).
+SOLVE_EXECUTOR = os.environ.get("SIMPLEX_SOLVE_EXECUTOR", "inline").lower()
+# Procesos del pool de cada worker web.
+SOLVE_EXECUTOR_MAX_WORKERS = max(1, min(2, os.cpu_count() or 1))
+# Módulos que cada proceso del pool importa al iniciar (solver, gilp, simple_simplex).
+SOLVE_EXECUTOR_PRELOAD = ("app.controllers.solver_controller", "scipy.optimize", "simple_simplex", "gilp")
+# Cómo se crean los procesos del pool: "spawn" (intérprete nuevo) o "fork" (copia
+# del worker; gunicorn.conf.py lo usa con --preload, cuando el worker ya viene
+# precalentado del master). Si el worker ya tiene hilos, se usa "spawn".
+SOLVE_EXECUTOR_START_METHOD = "spawn"
+
+# --- Importación diferida ---
+# scipy, gilp, simple_simplex y ReportLab se importan recién al usarlos (ver
+# app/utils/lazy_imports.py). Con gunicorn --preload (o SIMPLEX_PRELOAD=1),
+# el master importa estos módulos antes de crear los workers.
+PRELOAD_MODULES = ("scipy.optimize", "simple_simplex", "gilp", "app.services.pdf_report_service")
@@ -2,5 +2,6 @@
 from .objective_function_controller import ObjectiveFunctionController
 from .constraints_controller import ConstraintsController
 from .solver_controller import SolverController
+from .batch_controller import BatchController
 
-__all__ = ['ObjectiveFunctionController', 'ConstraintsController','SolverController']
\ No newline at end of file
+__all__ = ['ObjectiveFunctionController', 'ConstraintsController','SolverController', 'BatchController']
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Controlador de la API JSON (v1).
+Rutas para clientes automáticos: sin plantillas, sin sesión y sin
+escritura obligatoria en disco.
+"""
+
+from flask import Blueprint, Response, jsonify, request
+
+from app import config
+from app.controllers.solver_controller import SolverController
+from app.controllers.ui_controller import validate_problem_structure, profiling_requested
+from app.services import SolverBackendRegistry, SolutionWriter, Metrics
+
+
+api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
+# /metrics va en la raíz, donde lo busca Prometheus por defecto
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@api_bp.route('/solve', methods=['POST'])
+def solve():
+    """
+    Resuelve un problema enviado como JSON:
+
+        {
+            "problema_definicion": {...},   # mismo formato que la carga de archivos
+            "backend": "auto",              # opcional
+            "opciones": {"time_limit": 5},  # opcional
+            "incluir_tablas": false,        # opcional: agrega 'tablas_intermedias'
+            "guardar": false                # opcional: guarda solucion_N.json
+        }
+
+    Responde 'solucion_encontrada' y 'diagnostico' (más 'tablas_intermedias'
+    y 'solucion_id' si se pidieron, y 'perfil' si la request trae el token
+    de perfilado: ver profiling_requested).
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Se espera un objeto JSON."}), 400
+
+    problem = payload.get("problema_definicion")
+    is_valid, message = validate_problem_structure(problem)
+    if not is_valid:
+        return jsonify({"error": message}), 400
+
+    backend = payload.get("backend") or None
+    solver_options = payload.get("opciones") or {}
+    include_tableaus = payload.get("incluir_tablas", False)
+    persist = payload.get("guardar", False)
+    if not isinstance(solver_options, dict):
+        return jsonify({"error": "'opciones' debe ser un objeto."}), 400
+    if not isinstance(include_tableaus, bool) or not isinstance(persist, bool):
+        return jsonify({"error": "'incluir_tablas' y 'guardar' deben ser true o false."}), 400
+    if backend and backend != SolverBackendRegistry.AUTO:
+        try:
+            SolverBackendRegistry.get(backend)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    solver = SolverController(
+        {"problema_definicion": problem}, backend=backend, solver_options=solver_options,
+        include_visualization=False, include_tableaus=include_tableaus, persist=persist,
+        profile=profiling_requested()
+    )
+    report = solver.run()
+    if not report:
+        return jsonify({"error": "Ocurrió un error durante la resolución."}), 500
+
+    response = {
+        "solucion_encontrada": report["solucion_encontrada"],
+        "diagnostico": report.get("diagnostico", {}),
+    }
+    if include_tableaus:
+        response["tablas_intermedias"] = report.get("tablas_intermedias", [])
+    if persist:
+        response["solucion_id"] = solver.solution_id
+    if solver.profile_info:
+        response["perfil"] = solver.profile_info
+    return jsonify(response)
+
+
+@api_bp.route('/metricas/persistencia', methods=['GET'])
+def persistence_metrics():
+    """Modo de persistencia, profundidad de la cola de escritura y contadores."""
+    return jsonify(SolutionWriter.metrics())
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Métricas de todos los workers en el formato de texto de Prometheus."""
+    if not config.METRICS_ENABLED:
+        return jsonify({"error": "Las métricas están deshabilitadas."}), 404
+    return Response(Metrics.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
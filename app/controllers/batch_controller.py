@@ -0,0 +1,267 @@
+"""
+Controlador para la resolución en lote, sin interacción (python app.py).
+
+Lee problemas en el formato que exporta la aplicación ({"problema_definicion":
+{...}}, opcionalmente con "backend" y "opciones" como en la API), desde
+archivos .json (uno por archivo), .jsonl o la entrada estándar (uno por
+línea). Los resuelve en un pool de procesos y entrega un registro por
+problema a medida que terminan (o en el orden de entrada, con 'ordered').
+"""
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from app import config
+from app.controllers.solver_controller import SolverController
+from app.controllers.ui_controller import validate_problem_structure
+from app.services import storage_service
+
+logger = logging.getLogger(__name__)
+
+# Estado de los registros que no llegaron al solver (JSON inválido, archivo inexistente, etc.)
+ESTADO_INVALIDO = "Invalido"
+
+# (origen, documento, error): origen es "archivo.json", "archivo.jsonl:3" o "stdin:3"
+Entry = Tuple[str, Optional[dict], Optional[str]]
+
+
+# --- Código que corre en los procesos del pool ---
+
+def _init_worker(output_dir: str):
+    """Mismo directorio de salida que el proceso principal y su misma configuración."""
+    from app.utils.logging_setup import configure_logging
+
+    storage_service.OUTPUT_DIR = output_dir
+    BatchController.configure()
+    configure_logging()
+
+
+def _solve_entry(index: int, entry: Entry, settings: Dict) -> dict:
+    """Resuelve un problema y arma su registro (nunca lanza: los errores van en el registro)."""
+    start = time.perf_counter()
+    origin, document, error = entry
+    record = {"indice": index, "origen": origin}
+    try:
+        if error is None:
+            definition, backend, options = BatchController.unpack(document, settings)
+    except ValueError as e:
+        error = str(e)
+    if error is not None:
+        record.update(estado=ESTADO_INVALIDO, error=error)
+        return record
+
+    try:
+        solver = SolverController(
+            {"problema_definicion": definition}, backend=backend, solver_options=options,
+            include_visualization=settings["visualizacion"], include_tableaus=settings["tablas"],
+            persist=settings["guardar"]
+        )
+        report = solver.run()
+    except Exception as e:
+        logger.exception("Error al resolver '%s': %s", origin, e)
+        report = None
+    if report is None:
+        record.update(estado="Error", error="Ocurrió un error durante la resolución.")
+    else:
+        record["estado"] = report["solucion_encontrada"]["status"]
+        record["solucion_encontrada"] = report["solucion_encontrada"]
+        record["diagnostico"] = report.get("diagnostico", {})
+        if settings["tablas"]:
+            record["tablas_intermedias"] = report.get("tablas_intermedias", [])
+        if settings["visualizacion"]:
+            record["visualizacion_gilp_html"] = report.get("visualizacion_gilp_html", "")
+        if settings["guardar"]:
+            record["solucion_id"] = solver.solution_id
+    record["tiempo_segundos"] = time.perf_counter() - start
+    return record
+
+
+# --- Controlador ---
+
+class BatchController:
+    """Lectura de las entradas, resolución en paralelo y registros JSONL."""
+
+    @staticmethod
+    def configure():
+        """
+        Ajustes del proceso para un lote: se resuelve en el mismo proceso (el
+        paralelismo es el del lote), sin métricas y guardando en el momento.
+        """
+        config.SOLVE_EXECUTOR = "inline"
+        config.METRICS_ENABLED = False
+        config.PERSISTENCE_MODE = "sync"
+
+    @staticmethod
+    def settings(backend: str = None, time_limit: float = None, visualization: bool = False,
+                 tableaus: bool = False, persist: bool = False) -> Dict:
+        """Opciones del lote (las mismas para todos los problemas)."""
+        return {"backend": backend, "tiempo_limite": time_limit, "visualizacion": visualization,
+                "tablas": tableaus, "guardar": persist}
+
+    @staticmethod
+    def read(sources: List[str], stdin: TextIO = None) -> Iterator[Entry]:
+        """
+        Una entrada por problema. Cada fuente es "-" (JSONL por 'stdin'), una
+        carpeta (sus .json y .jsonl), un patrón glob o un archivo. Los errores
+        de lectura se entregan como entradas con 'error', para informarlos en
+        su registro sin cortar el lote.
+        """
+        for source in sources:
+            if source == "-":
+                yield from BatchController._read_lines(stdin, "stdin")
+                continue
+            if os.path.isdir(source):
+                paths = sorted(glob.glob(os.path.join(source, "*.json")) +
+                               glob.glob(os.path.join(source, "*.jsonl")))
+            elif glob.has_magic(source):
+                paths = sorted(glob.glob(source, recursive=True))
+            else:
+                paths = [source]
+            if not paths:
+                yield source, None, f"No se encontraron archivos para '{source}'."
+            for path in paths:
+                yield from BatchController._read_file(path)
+
+    @staticmethod
+    def _read_file(path: str) -> Iterator[Entry]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                if path.endswith(".jsonl"):
+                    yield from BatchController._read_lines(f, path)
+                    return
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            yield path, None, f"No se pudo leer el archivo: {e}"
+            return
+        yield path, document, None
+
+    @staticmethod
+    def _read_lines(stream: TextIO, name: str) -> Iterator[Entry]:
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            origin = f"{name}:{number}"
+            try:
+                yield origin, json.loads(line), None
+            except ValueError as e:
+                yield origin, None, f"JSON inválido: {e}"
+
+    @staticmethod
+    def unpack(document, settings: Dict) -> Tuple[dict, Optional[str], dict]:
+        """
+        (definición, backend, opciones) de un documento. Acepta el JSON
+        exportado ({"problema_definicion": ...}) o solo la definición.
+        El backend del lote reemplaza al del documento; el tiempo límite del
+        lote es un máximo (si el documento pide menos, se respeta).
+        Lanza ValueError si el problema no es válido.
+        """
+        if not isinstance(document, dict):
+            raise ValueError("Cada problema debe ser un objeto JSON.")
+        definition = document.get("problema_definicion", document)
+        is_valid, message = validate_problem_structure(definition)
+        if not is_valid:
+            raise ValueError(message)
+        options = document.get("opciones") or {}
+        if not isinstance(options, dict):
+            raise ValueError("'opciones' debe ser un objeto.")
+        options = dict(options)
+        limit = settings["tiempo_limite"]
+        if limit is not None:
+            options["time_limit"] = min(float(options.get("time_limit", limit)), limit)
+        return definition, settings["backend"] or document.get("backend"), options
+
+    @staticmethod
+    def run(entries: Iterable[Entry], settings: Dict, workers: int = 1, ordered: bool = False) -> Iterator[dict]:
+        """
+        Resuelve las entradas y entrega un registro por cada una. Con más de un
+        worker, en un pool de procesos con a lo sumo 2 problemas por proceso en
+        espera (las entradas se leen a medida que se necesitan).
+        """
+        records = BatchController._solve_all(entries, settings, workers)
+        return BatchController._in_order(records) if ordered else records
+
+    @staticmethod
+    def _solve_all(entries: Iterable[Entry], settings: Dict, workers: int) -> Iterator[dict]:
+        if workers <= 1:
+            for index, entry in enumerate(entries):
+                yield _solve_entry(index, entry, settings)
+            return
+
+        remaining = enumerate(entries)
+        retry: List[Tuple[int, Entry]] = []
+        while True:
+            # Tras la caída de un proceso, los problemas que estaban en curso van de a uno
+            # en un pool nuevo: el que lo vuelve a romper solo es el que falla
+            isolated = bool(retry)
+            source = iter(retry) if isolated else remaining
+            in_flight = yield from BatchController._solve_in_new_pool(source, settings, 1 if isolated else workers)
+            if len(in_flight) == 1:
+                index, entry = in_flight[0]
+                yield {"indice": index, "origen": entry[0], "estado": "Error",
+                       "error": "El proceso que lo resolvía terminó de forma inesperada."}
+            retry = (in_flight if len(in_flight) > 1 else []) + (list(source) if isolated else [])
+            if not retry and not isolated and not in_flight:
+                return
+
+    @staticmethod
+    def _solve_in_new_pool(source: Iterator[Tuple[int, Entry]], settings: Dict, workers: int):
+        """
+        Resuelve las entradas de 'source' en un pool nuevo y entrega sus registros.
+        Retorna (al terminar el generador) las entradas en curso si se cayó un
+        proceso del pool (queda inservible); lista vacía si se terminó 'source'.
+        """
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(storage_service.OUTPUT_DIR,),
+        ) as pool:
+            pending, unsent = {}, []
+
+            def submit_next():
+                item = next(source, None)
+                if item is not None:
+                    unsent.append(item)  # Ya salió de 'source': si el pool está roto, vuelve con las demás
+                    pending[pool.submit(_solve_entry, *item, settings)] = item
+                    unsent.pop()
+
+            try:
+                for _ in range(2 * workers if workers > 1 else 1):
+                    submit_next()
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, entry = pending.pop(future)
+                        try:
+                            record = future.result()
+                        except BrokenProcessPool:
+                            # Los demás futures del pool fallan igual: todos vuelven como "en curso"
+                            return [(index, entry)] + list(pending.values())
+                        except Exception as e:
+                            # Ej: el registro no se pudo enviar de vuelta al proceso principal
+                            record = {"indice": index, "origen": entry[0], "estado": "Error", "error": str(e)}
+                        yield record
+                        submit_next()
+            except BrokenProcessPool:
+                return unsent + list(pending.values())
+        return []
+
+    @staticmethod
+    def _in_order(records: Iterator[dict]) -> Iterator[dict]:
+        """Reordena los registros por 'indice' (retiene solo los que llegaron antes de tiempo)."""
+        waiting, next_index = {}, 0
+        for record in records:
+            waiting[record["indice"]] = record
+            while next_index in waiting:
+                yield waiting.pop(next_index)
+                next_index += 1
+
+    @staticmethod
+    def to_jsonl(record: dict) -> str:
+        return json.dumps(record, ensure_ascii=False, default=str)
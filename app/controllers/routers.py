@@ -4,10 +4,13 @@ Definición de rutas e inicialización de la aplicación Flask.
 
 from flask import Flask
 from app.controllers.ui_controller import ui_bp
+from app.controllers.api_controller import api_bp, metrics_bp
+from app.utils.logging_setup import configure_logging
 import os
 
 def init_app():
     """Crea e inicializa la aplicación Flask con sus rutas."""
+    configure_logging()
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 
     app = Flask(
@@ -18,6 +21,8 @@ def init_app():
 
     # Registro de blueprints
     app.register_blueprint(ui_bp)
+    app.register_blueprint(api_bp)
+    app.register_blueprint(metrics_bp)
 
     # Soporte para mensajes flash
     app.secret_key = "simplex_Secret_key"
@@ -5,172 +5,503 @@ Estrategia Híbrida de Visualización:
 1. Intenta generar la visualización con 'gilp' (Plan A).
 2. Si 'gilp' falla, usa 'simple_simplex' (Plan B)
 """
+import logging
+import time
+
 import numpy as np
-from scipy.optimize import linprog
-from app.services import StorageService
-import tempfile
-import os
+from app.services import (StorageService, SolutionWriter, Metrics, SolveProfiler, SolveExecutor,
+                          VisualizationPolicy, VisualizationPlan)
+from app.services.solver_backends import (
+    OptimizeResult,
+    SolverBackendRegistry,
+    SolverModel,
+    build_scipy_model,
+    run_simple_simplex
+)
+from app.core import (Presolver, PresolveResult, ModelScaler, ScalingResult, NonNegativeForm,
+                      SolveBudget, BudgetExceeded)
+from app import config
 
 from typing import Tuple, List, Any, Dict 
-import json
 import io
 
-# Plan A
-from gilp import LP, simplex_visual
+from app.utils.lazy_imports import lazy_callable
 
-# Plan B (Fallback)
-from simple_simplex import (
-    create_tableau,
-    add_constraint,
-    add_objective,
-    optimize_json_format
-)
+# Plan A (gilp importa Plotly y networkx: se carga con la primera visualización)
+LP = lazy_callable("gilp", "LP")
+simplex_visual = lazy_callable("gilp", "simplex_visual")
+
+logger = logging.getLogger(__name__)
+
+# Etapas que se miden en cada resolución (se informan juntas en un solo registro)
+TIMED_STAGES = ("parse", "build", "solve", "visualize", "persist")
 
 
 class SolverController:
     """Controlador para el flujo de cálculo de la solución."""
 
-    def __init__(self, problem_data_wrapper: dict):
+    def __init__(self, problem_data_wrapper: dict, backend: str = None, solver_options: dict = None,
+                 include_visualization: bool = True, include_tableaus: bool = True, persist: bool = True,
+                 profile: bool = False):
         """
         Inicializa el solver con los datos del problema desde la sesión.
+        'backend' y 'solver_options' permiten elegir el solver por problema
+        (por defecto, los de app.config).
+        'include_visualization' (HTML de gilp), 'include_tableaus' (tablas
+        intermedias) y 'persist' (guardar solucion_N.json) permiten omitir
+        trabajo que el cliente no necesita (ej: la API JSON).
+        'profile' ejecuta run() bajo cProfile (ver SolveProfiler).
+        Las opciones 'time_limit' y 'maxiter' fijan el presupuesto de toda la
+        resolución, visualización incluida (por defecto SOLVE_TIME_LIMIT y
+        SOLVE_ITERATION_LIMIT).
         """
+        start = time.perf_counter()
+        self.timings = dict.fromkeys(TIMED_STAGES, 0.0)  # Segundos por etapa (ver _log_solve_record)
         self.storage = StorageService()
+        self.solution_id = None  # Número de 'solucion_N.json' una vez guardado el reporte
+        self.solution_path = None
+        self.profile = profile
+        self.profile_info = None  # Rutas del perfil y funciones más costosas (si se perfiló)
+        self.outcome = ("Error", None, None)  # Estado, backend e iteraciones (ver _record_solve)
+        self.budget = None  # Presupuesto de tiempo e iteraciones de la resolución (ver _new_budget)
+        self.backend = backend
+        self.solver_options = solver_options or {}
+        self.include_visualization = include_visualization
+        self.include_tableaus = include_tableaus
+        self.persist = persist
         
         # Los datos se cargan aquí, desde la memoria
         definition = problem_data_wrapper.get("problema_definicion", {})
         
         self.objective_data = definition.get("funcion_objetivo")
         self.constraints_data = definition.get("restricciones")
+        # Tipo de cada variable: "continuous" (por defecto), "integer" o "binary"
+        self.variable_types = definition.get("tipos_variables") or {}
+        # Cotas por variable: {"lower": l, "upper": u}; null = sin cota (por defecto x >= 0)
+        self.variable_bounds = definition.get("cotas_variables") or {}
 
         if self.objective_data:
             self.variables = sorted(list(self.objective_data['coefficients'].keys()))
         else:
             self.variables = []
         
-        print("SolverController inicializado con datos en memoria.")
+        self.timings["parse"] = time.perf_counter() - start
+        logger.debug("SolverController inicializado con datos en memoria.")
 
 
     def run(self):
+        """
+        Resuelve el problema (ver _solve). Con 'profile', bajo cProfile: el perfil
+        se guarda junto al reporte y el reporte devuelto incluye 'perfil' (no se
+        guarda en solucion_N.json).
+        """
+        if not self.profile:
+            if SolveExecutor.enabled():
+                return self._run_in_executor()
+            return self._solve_and_record()
+        # El perfil es siempre del proceso actual (no del pool de resoluciones)
+        report, profiler = SolveProfiler.profile(self._solve_and_record)
+        if profiler is None:
+            return report
+        self.profile_info = SolveProfiler.save(profiler, self.solution_path)
+        return {**report, "perfil": self.profile_info} if report else report
+
+    def _solve_and_record(self):
+        try:
+            return self._solve()
+        finally:
+            self._record_solve()
+
+    def _run_in_executor(self):
+        """
+        Resuelve en el pool de SolveExecutor (sin guardar) y guarda, registra y
+        mide acá: la persistencia write-behind, los logs y las métricas son del
+        proceso web.
+        """
+        persist, self.persist = self.persist, False
+        try:
+            # Si la resolución no respeta su presupuesto (ej: código nativo), se cancela el proceso
+            report, self.timings, self.outcome = SolveExecutor.call(
+                _solve_in_worker, self, timeout=self._time_limit() + config.SOLVE_CANCEL_GRACE)
+        except TimeoutError:
+            logger.error("La resolución no terminó en %.1f s y se canceló.", self._time_limit())
+            report = self._cancelled_report()
+        except Exception as e:
+            logger.exception("La resolución falló en el pool de procesos: %s", e)
+            report = None
+        finally:
+            self.persist = persist
+        try:
+            if report is not None and self.persist:
+                self._save_report(report)
+            return report
+        finally:
+            self._record_solve()
+
+    def _solve(self):
         """
         Ejecuta el flujo principal del cálculo:
         1. Carga los datos (YA HECHO EN __INIT__)
-        2. Prepara el modelo para Scipy.
-        3. Ejecuta el solver de Scipy.
+        2. Presolve y escalado del modelo.
+        3. Ejecuta el backend elegido (ver SolverBackendRegistry).
         4. Si es factible, genera la visualización (Plan A o B).
         5. Muestra, guarda y DEVUELVE los resultados.
         """
-        print("=== 3. Solución del Problema ===")
+        logger.debug("=== 3. Solución del Problema ===")
         
         # Verificamos que los datos se cargaron en __init__
         if self.objective_data is None or self.constraints_data is None:
-            print("Error: El solver no recibió datos válidos en la inicialización.")
+            logger.error("El solver no recibió datos válidos en la inicialización.")
             return None
             
+        backend_info = None
+        status = "Error"
+        iterations = None
         try:
-            print("Preparando modelo para el solver (Scipy)...")
-            c, A_ub, b_ub, A_eq, b_eq, bounds = self._prepare_model_for_scipy(
-                self.objective_data, self.constraints_data, self.variables
-            )
-            
-            print("Ejecutando solver principal (Scipy)...")
-            solver_options = {"presolve": True, "time_limit": 10} 
-            
-            result = linprog(
-                c, 
-                A_ub=A_ub, b_ub=b_ub, 
-                A_eq=A_eq, b_eq=b_eq, 
-                bounds=bounds, 
-                method='highs-ds',
-                options=solver_options
-            )
+            budget = self.budget = self._new_budget()
+            mark = time.perf_counter()
+            logger.debug("Ejecutando presolve...")
+            presolved = self._presolve()
+            scaled = None
+            backend_info = None
+
+            if presolved.infeasible:
+                result = OptimizeResult({
+                    'success': False,
+                    'status': 2,
+                    'message': f"Presolve: {presolved.message}"
+                })
+            elif presolved.is_empty:
+                logger.info("El presolve fijó todas las variables. No se ejecuta el solver.")
+                result = OptimizeResult({
+                    'success': True,
+                    'status': 0,
+                    'x': np.array([]),
+                    'fun': 0.0,
+                    'message': "Problema resuelto completamente por el presolve."
+                })
+            else:
+                scaled = self._scale(presolved)
+
+                logger.debug("Preparando modelo para el solver...")
+                integers = self._integer_variables()
+                model = SolverModel(
+                    scaled.objective_data, scaled.constraints_data,
+                    scaled.variables, bounds=scaled.scipy_bounds(),
+                    integrality=[1 if var in integers else 0 for var in scaled.variables]
+                )
+
+                self.timings["build"] = time.perf_counter() - mark
+                mark = time.perf_counter()
+                logger.debug("Ejecutando solver principal...")
+                result, backend_info = SolverBackendRegistry.solve(
+                    model, backend=self.backend, options=self.solver_options, budget=budget
+                )
+                self.timings["solve"] = time.perf_counter() - mark
+                if result.get('status') == 1:
+                    # Límite de tiempo o de iteraciones (milp puede traer igual una solución entera)
+                    budget.record("solve", "tiempo" if budget.expired() else "iteraciones")
+
+            if scaled is None:
+                self.timings["build"] = time.perf_counter() - mark
+            mark = time.perf_counter()
 
             visualization_html_str = "" 
+            plan = None
+
+            if not (self.include_visualization or self.include_tableaus):
+                visualization_tableaus_data = []
 
-            if result.success:
-                print("Generando visualización (Plan A: gilp)...")
+            elif result.success and presolved.is_empty:
+                visualization_html_str = "<p>Visualización no disponible (el presolve fijó todas las variables).</p>"
+                visualization_tableaus_data = []
+
+            elif result.success:
+                logger.debug("Generando visualización (Plan A: gilp)...")
                 
-                # 1. Generamos el HTML (Plan A o B, el que funcione)
-                visualization_html_str, tablas_del_plan_b = self._generate_visualization_html_and_tables()
+                # 1. Generamos el HTML (Plan A o B, el que funcione) sobre el modelo reducido
+                #    y escalado, llevado a x >= 0 (las tablas no conocen otras cotas).
+                #    Si el backend fue el método de tablas, reutilizamos su historia de pivoteos.
+                #    Qué se genera depende del tamaño del modelo (ver VisualizationPolicy).
+                form = NonNegativeForm.build(
+                    scaled.objective_data, scaled.constraints_data, scaled.variables, scaled.bounds
+                )
+                plan = VisualizationPolicy.for_model(form.constraints_data, form.variables)
+                if self.include_visualization:
+                    visualization_html_str, tablas_del_plan_b = self._generate_visualization_html_and_tables(
+                        form.objective_data,
+                        form.constraints_data,
+                        form.variables,
+                        simplex_json=result.get('simplex_json'),
+                        budget=budget,
+                        plan=plan
+                    )
+                elif not plan.tableaus:
+                    logger.info("Tablas intermedias omitidas: %s", "; ".join(plan.reasons))
+                    tablas_del_plan_b = []
+                else:
+                    # Solo las tablas (sin gilp ni HTML)
+                    try:
+                        tablas_del_plan_b = self._extract_tableaus_from_simple_simplex(
+                            result.get('simplex_json') or self._run_simple_simplex(
+                                form.objective_data, form.constraints_data, form.variables, budget=budget)
+                        )
+                    except BudgetExceeded as e_budget:
+                        logger.warning("Tablas intermedias incompletas: %s", e_budget)
+                        budget.record(e_budget.stage, e_budget.reason)
+                        tablas_del_plan_b = self._extract_tableaus_from_simple_simplex(e_budget.partial or {})
+                    except Exception as e_tablas:
+                        logger.warning("No se pudieron generar las tablas intermedias: %s", e_tablas)
+                        tablas_del_plan_b = []
                 
                 # 2. Guardamos las tablas del Plan B (que sabemos que funcionan)
                 visualization_tableaus_data = tablas_del_plan_b
 
+                if self._integer_variables() and self.include_visualization:
+                    visualization_html_str = (
+                        "<p>La visualización corresponde a la relajación lineal "
+                        "(sin las condiciones de integralidad).</p>" + visualization_html_str
+                    )
+
             else:
-                print("Problema infactible o no acotado. Omitiendo visualización.")
+                logger.info("Problema infactible o no acotado. Omitiendo visualización.")
                 visualization_html_str = "<p>Visualización no disponible (Problema infactible o no acotado).</p>"
                 visualization_tableaus_data = [] # Añadimos esto para que no falle
 
+            self.timings["visualize"] = time.perf_counter() - mark
+
+            # Llevamos la solución al espacio original de variables
+            diagnostics = {"presolve": presolved.summary(), "presupuesto": budget.summary()}
+            if backend_info is not None:
+                diagnostics["backend"] = backend_info
+            if plan is not None:
+                diagnostics["visualizacion"] = plan.summary()
+            if scaled is not None:
+                result = self._unscale(result, scaled)
+                diagnostics["escalado"] = scaled.summary()
+            if result.get('nit') is not None:
+                iterations = diagnostics["iteraciones"] = int(result.nit)
+            result = self._postsolve(result, presolved)
+            if result.get('mip_node_count') is not None:
+                diagnostics["mip"] = {
+                    "variables_enteras": sorted(self._integer_variables()),
+                    "gap": result.mip_gap,
+                    "nodos": int(result.mip_node_count),
+                    "cota_dual": self._objective_value(result.mip_dual_bound),
+                    "tiempo_segundos": backend_info["tiempo_segundos"],
+                }
+
             # Ahora capturamos el 'return'
             final_report = self._display_and_save_results(
                 result, 
                 self.objective_data['type'], 
                 visualization_html_str,
-                visualization_tableaus_data # Pasamos las tablas
+                visualization_tableaus_data, # Pasamos las tablas
+                diagnostics=diagnostics
             )
+            status = final_report["solucion_encontrada"]["status"]
             return final_report
 
         except KeyError as e:
-            print(f"Error inesperado: No se encontró la llave {e} en los archivos JSON.")
-            print("Parece que los archivos JSON no tienen el formato esperado.")
+            logger.error("Error inesperado: No se encontró la llave %s en los archivos JSON. "
+                         "Parece que los archivos JSON no tienen el formato esperado.", e)
             return None
         except Exception as e:
-            print(f"Ha ocurrido un error inesperado durante el cálculo: {e}")
-            import traceback # Importamos traceback
-            traceback.print_exc() # Imprimimos el stack trace completo
+            logger.exception("Ha ocurrido un error inesperado durante el cálculo: %s", e)
             return None
+        finally:
+            self.outcome = (status, backend_info, iterations)
+
+    def _record_solve(self):
+        """Registro de log y métricas de la resolución terminada (ver self.outcome)."""
+        status, backend_info, iterations = self.outcome
+        self._log_solve_record(status, backend_info)
+        Metrics.observe_stages(self.timings)
+        Metrics.observe_solve(status, backend_info, iterations)
+
+    def _log_solve_record(self, status: str, backend_info: dict = None):
+        """Un único registro por resolución con el tiempo de cada etapa."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        timings_ms = {stage: round(seconds * 1000, 3) for stage, seconds in self.timings.items()}
+        timings_ms["total"] = round(sum(self.timings.values()) * 1000, 3)
+        backend = backend_info["backend"] if backend_info else None
+        logger.info(
+            "Resolución: estado=%s backend=%s variables=%d restricciones=%d tiempos_ms=%s",
+            status, backend, len(self.variables), len(self.constraints_data or []), timings_ms,
+            extra={"solve": {
+                "estado": status,
+                "backend": backend,
+                "variables": len(self.variables),
+                "restricciones": len(self.constraints_data or []),
+                "tiempos_ms": timings_ms,
+            }},
+        )
 
-    def _prepare_model_for_scipy(self, objective_data: dict, constraints_data: list, variables: list):
+    def _time_limit(self) -> float:
+        """Segundos de presupuesto de la resolución ('time_limit' del problema o SOLVE_TIME_LIMIT)."""
+        return float(self.solver_options.get("time_limit", config.SOLVE_TIME_LIMIT))
+
+    def _new_budget(self) -> SolveBudget:
+        """Presupuesto de la resolución: empieza a correr al crearlo (ver app.core.budget)."""
+        return SolveBudget(self._time_limit(),
+                           int(self.solver_options.get("maxiter", config.SOLVE_ITERATION_LIMIT)))
+
+    def _cancelled_report(self) -> dict:
+        """Reporte de una resolución cancelada por no terminar a tiempo (sin solución ni tablas)."""
+        seconds = self._time_limit()
+        result = OptimizeResult({
+            'success': False, 'status': 1,
+            'message': f"La resolución no terminó en el tiempo límite ({seconds:g} s) y se canceló."
+        })
+        diagnostics = {"presupuesto": {
+            "limite_tiempo_segundos": seconds,
+            "limite_iteraciones": int(self.solver_options.get("maxiter", config.SOLVE_ITERATION_LIMIT)),
+            "tiempo_segundos": seconds + config.SOLVE_CANCEL_GRACE,
+            "agotado": {"etapa": "cancelada", "motivo": "tiempo"},
+        }}
+        report = self._display_and_save_results(result, self.objective_data['type'], "", [], diagnostics)
+        self.outcome = (report["solucion_encontrada"]["status"], None, None)
+        return report
+
+    def _integer_variables(self) -> set:
+        """Variables marcadas como enteras o binarias en 'tipos_variables'."""
+        return {var for var in self.variables
+                if self.variable_types.get(var, "continuous") in ("integer", "binary")}
+
+    def _initial_bounds(self) -> Dict[str, Tuple]:
         """
-        Traduce los datos de los JSON al formato de matrices que 
-        entiende scipy.optimize.linprog.
+        Cotas de partida según 'cotas_variables' (por defecto x >= 0).
+        Las binarias además quedan dentro de [0, 1].
         """
-        
-        objective_type = objective_data['type']
-        coefficients = objective_data['coefficients']
-        
-        c = [coefficients.get(var, 0) for var in variables]
-        
-        if objective_type == 'maximize':
-            c = [-val for val in c]
+        bounds = {}
+        for var in self.variables:
+            spec = self.variable_bounds.get(var, {})
+            lower, upper = spec.get("lower", 0), spec.get("upper")
+            if upper == float("inf"):  # Infinity en el JSON: sin cota superior
+                upper = None
+            if self.variable_types.get(var) == "binary":
+                lower = 0 if lower is None else max(lower, 0)
+                upper = 1 if upper is None else min(upper, 1)
+            bounds[var] = (lower, upper)
+        return bounds
+
+    def _objective_value(self, fun):
+        """Convierte un valor en sentido "minimizar" (como 'fun') al sentido de Z."""
+        if fun is None:
+            return None
+        return -fun if self.objective_data['type'] == 'maximize' else fun
+
+    def _presolve(self) -> PresolveResult:
+        """Reduce el modelo antes de resolverlo (ver app.core.presolve)."""
+        if not config.PRESOLVE_ENABLED:
+            return Presolver.passthrough(self.objective_data, self.constraints_data, self.variables,
+                                         bounds=self._initial_bounds())
+        return Presolver.run(self.objective_data, self.constraints_data, self.variables,
+                             bounds=self._initial_bounds(), integers=self._integer_variables())
+
+    def _scale(self, presolved: PresolveResult) -> ScalingResult:
+        """Equilibra filas y columnas del modelo reducido (ver app.core.scaling)."""
+        return ModelScaler.run(
+            presolved.objective_data, presolved.constraints_data, presolved.variables,
+            presolved.bounds, mode=config.SCALING_MODE, threshold=config.SCALING_RANGE_THRESHOLD,
+            integers=self._integer_variables()
+        )
+
+    def _unscale(self, result, scaled: ScalingResult):
+        """
+        Devuelve una copia del resultado con el primal y los duales desescalados.
+        Los duales quedan en 'row_duals' / 'lower_marginals' / 'upper_marginals'
+        (sentido "minimizar", como los entrega linprog).
+        """
+        if not result.success:
+            return result
+
+        unscaled = OptimizeResult(dict(result))
+        unscaled.x = scaled.unscale_primal(result.x)
 
-        A_ub = [] 
-        b_ub = [] 
-        A_eq = [] 
-        b_eq = [] 
+        row_duals = self._extract_row_duals(result, scaled.constraints_data)
+        if row_duals is not None:
+            unscaled.row_duals = scaled.unscale_row_duals(row_duals)
+            unscaled.lower_marginals = scaled.unscale_bound_duals(result.lower.marginals)
+            unscaled.upper_marginals = scaled.unscale_bound_duals(result.upper.marginals)
+        return unscaled
 
+    def _extract_row_duals(self, result, constraints_data: list):
+        """
+        Suma los marginales de linprog por restricción, recorriendo las filas en el
+        mismo orden que _prepare_model_for_scipy (los '>=' van negados y los '='
+        aparecen en A_eq y dos veces en A_ub).
+        Retorna None si el resultado no trae marginales (ej. otro backend o un mock).
+        """
+        if 'ineqlin' not in result or 'lower' not in result:
+            return None
+
+        ub_marginals = list(result.ineqlin.marginals)
+        eq_marginals = list(result.eqlin.marginals) if 'eqlin' in result else []
+        ub_i, eq_i = 0, 0
+        duals = []
         for const in constraints_data:
-            A_row = [const['coefficients'].get(var, 0) for var in variables]
             operator = const['operator']
-            rhs_value = const['rhs'] 
-
             if operator == '<=':
-                A_ub.append(A_row)
-                b_ub.append(rhs_value)
-                
+                duals.append(ub_marginals[ub_i])
+                ub_i += 1
             elif operator == '>=':
-                A_ub.append([-x for x in A_row])
-                b_ub.append(-rhs_value)
-                
+                duals.append(-ub_marginals[ub_i])
+                ub_i += 1
             elif operator == '=':
-                A_eq.append(A_row)
-                b_eq.append(rhs_value)
-                # Y también la convertimos para A_ub
-                A_ub.append(A_row)
-                b_ub.append(rhs_value)
-                A_ub.append([-x for x in A_row])
-                b_ub.append(-rhs_value)
+                duals.append(eq_marginals[eq_i] + ub_marginals[ub_i] - ub_marginals[ub_i + 1])
+                eq_i += 1
+                ub_i += 2
+        return duals
 
-        bounds = [(0, None) for _ in variables]
-
-        A_ub_np = None if not A_ub else np.array(A_ub)
-        b_ub_np = None if not b_ub else np.array(b_ub)
-        A_eq_np = None if not A_eq else np.array(A_eq)
-        b_eq_np = None if not b_eq else np.array(b_eq)
+    def _postsolve(self, result, presolved: PresolveResult):
+        """
+        Devuelve una copia del resultado con 'x' y 'fun' en el espacio original.
+        (No modificamos el resultado recibido: puede venir compartido, ej. en los tests)
+        """
+        if not result.success:
+            return result
+
+        values = presolved.postsolve(result.x)
+        integers = self._integer_variables()
+        full_result = OptimizeResult(dict(result))
+        # Las enteras se redondean para no reportar residuos del branch-and-bound (ej: 2.9999999)
+        full_result.x = np.array([float(round(values[var])) if var in integers else values[var]
+                                  for var in self.variables])
+
+        # 'fun' está en sentido "minimizar" (linprog); el aporte fijo está en sentido Z
+        offset = -presolved.objective_offset if self.objective_data['type'] == 'maximize' else presolved.objective_offset
+        full_result.fun = result.fun + offset
+        if result.get('mip_dual_bound') is not None:
+            full_result.mip_dual_bound = result.mip_dual_bound + offset
+
+        if result.get('row_duals') is not None:
+            full_result.duals = presolved.postsolve_duals(
+                result.row_duals, result.lower_marginals, result.upper_marginals
+            )
+        return full_result
 
-        return np.array(c), A_ub_np, b_ub_np, A_eq_np, b_eq_np, bounds
+    def _prepare_model_for_scipy(self, objective_data: dict, constraints_data: list, variables: list, bounds: list = None):
+        """
+        Traduce los datos de los JSON al formato de matrices que 
+        entiende scipy.optimize.linprog (ver solver_backends.build_scipy_model).
+        """
+        return build_scipy_model(objective_data, constraints_data, variables, bounds)
 
-    def _generate_visualization_html_and_tables(self) -> Tuple[str, List[Dict[str, Any]]]:
+    def _generate_visualization_html_and_tables(self, objective_data: dict = None, constraints_data: list = None,
+                                                variables: list = None, simplex_json: dict = None,
+                                                budget: SolveBudget = None,
+                                                plan: VisualizationPlan = None) -> Tuple[str, List[Dict[str, Any]]]:
         """
+        Por defecto usa el modelo original; run() le pasa el modelo reducido por el presolve.
+        Si se recibe 'simplex_json' (historia ya calculada por el backend de tablas),
+        no se vuelve a ejecutar simple_simplex.
+        Con 'budget', simple_simplex se corta al agotarlo (quedan las tablas hechas
+        hasta ahí) y gilp no se ejecuta si ya no queda tiempo.
+        'plan' (por defecto, el de VisualizationPolicy para este modelo) indica
+        si se generan las tablas y si se intenta gilp; si no va ninguna, solo
+        se devuelve un resumen.
         Estrategia híbrida:
         1. (Plan B) Ejecuta simple_simplex para OBTENER LOS DATOS DE LAS TABLAS.
         2. (Plan A) Intenta usar 'gilp' para la visualización HTML interactiva (con io.StringIO).
@@ -178,45 +509,44 @@ class SolverController:
         
         Retorna: (html_string, lista_de_tablas_extraidas)
         """
+        objective_data = objective_data if objective_data is not None else self.objective_data
+        constraints_data = constraints_data if constraints_data is not None else self.constraints_data
+        variables = variables if variables is not None else self.variables
+        plan = plan or VisualizationPolicy.for_model(constraints_data, variables)
+        if plan.mode == "resumen":
+            logger.info("Visualización omitida: %s", "; ".join(plan.reasons))
+            return plan.summary_html(), []
         
         # --- (PASO 1: EJECUTAMOS EL PLAN B PRIMERO) ---
-        print("Ejecutando Plan B (simple_simplex) para extraer tablas...")
-        plan_b_html = ""
-        plan_b_tableaus = []
-        try:
-            resultado_json_plan_b = self._run_simple_simplex()
-            plan_b_tableaus = self._extract_tableaus_from_simple_simplex(resultado_json_plan_b)
-            
-            html_output = []
-            for table_data in plan_b_tableaus:
-                title = table_data.get("title", "Tabla")
-                table_list = table_data.get("table", [])
-                pivot = table_data.get("pivot")
-                pivot_r, pivot_c = (pivot[0], pivot[1]) if pivot else (None, None)
-                
-                html_output.append(f"<h4>{title}</h4>")
-                html_output.append(self._tableau_to_html(table_list, pivot_r, pivot_c))
-            
-            plan_b_html = "<br>".join(html_output)
-            print("Plan B (simple_simplex) completado exitosamente.")
-            
-        except Exception as e_plan_b:
-            print(f"Error crítico en Plan B (simple_simplex): {e_plan_b}")
-            plan_b_html = f"<p>Error en Plan B: {e_plan_b}</p>"
+        if plan.tableaus:
+            plan_b_html, plan_b_tableaus = self._run_plan_b(objective_data, constraints_data, variables,
+                                                            simplex_json, budget)
+        else:
+            logger.info("Tablas intermedias omitidas: %s", "; ".join(plan.reasons))
+            plan_b_html, plan_b_tableaus = plan.summary_html(), []
         
         # --- (PASO 2: EL PLAN A PARA EL HTML ) ---
+        if not plan.gilp:
+            logger.debug("gilp omitido: %s", "; ".join(plan.reasons))
+            return plan_b_html, plan_b_tableaus
+        if budget is not None and budget.expired():
+            logger.info("gilp: no queda tiempo en el presupuesto. Usando HTML de Plan B.")
+            budget.record("gilp", "tiempo")
+            return plan_b_html, plan_b_tableaus
+
+        mark = time.perf_counter()
         try:
             # Ahora intentamos el Plan A (gilp) solo para el HTML
             c_gilp = []
-            if self.objective_data['type'] == 'maximize':
-                c_gilp = [self.objective_data['coefficients'].get(var, 0) for var in self.variables]
+            if objective_data['type'] == 'maximize':
+                c_gilp = [objective_data['coefficients'].get(var, 0) for var in variables]
             else: # minimize
-                c_gilp = [-self.objective_data['coefficients'].get(var, 0) for var in self.variables]
+                c_gilp = [-objective_data['coefficients'].get(var, 0) for var in variables]
             
             A_gilp = []
             b_gilp = []
-            for const in self.constraints_data:
-                A_row = [const['coefficients'].get(var, 0) for var in self.variables]
+            for const in constraints_data:
+                A_row = [const['coefficients'].get(var, 0) for var in variables]
                 operator = const['operator']
                 rhs_value = const['rhs']
                 if operator == '<=':
@@ -232,91 +562,77 @@ class SolverController:
                     b_gilp.append(-rhs_value)
             
             if not A_gilp:
-                print("gilp: No se encontraron restricciones. Usando HTML de Plan B.")
+                logger.info("gilp: No se encontraron restricciones. Usando HTML de Plan B.")
                 return plan_b_html, plan_b_tableaus # Devolvemos datos de Plan B
 
             lp = LP(A=A_gilp, b=b_gilp, c=c_gilp)
-            visual = simplex_visual(lp=lp)
+            visual = simplex_visual(lp=lp, iteration_limit=budget.iteration_limit if budget else None)
             
             f = io.StringIO()
             visual.write_html(f, include_mathjax=False, include_plotlyjs=True)
             html_content = f.getvalue()
             f.close()
+            Metrics.observe_stages({"gilp": time.perf_counter() - mark})
             
-            print("Visualización gilp (Plan A) generada (en memoria).")
+            logger.debug("Visualización gilp (Plan A) generada (en memoria).")
             # Devolvemos el HTML de gilp (Plan A)
             # Pero los DATOS de simple_simplex (Plan B)
             return html_content, plan_b_tableaus
 
         except Exception as e_plan_a:
             # --- Plan A falló ---
-            print(f"Error en 'gilp' (Plan A): {e_plan_a}. Usando HTML de Plan B.")
+            logger.warning("Error en 'gilp' (Plan A): %s. Usando HTML de Plan B.", e_plan_a)
             # Devolvemos el HTML y los datos del Plan B
             return plan_b_html, plan_b_tableaus
 
-    def _tableau_to_html(self, tableau_list: list, pivot_r: int, pivot_c: int) -> str:
+    def _run_plan_b(self, objective_data: dict, constraints_data: list, variables: list,
+                    simplex_json: dict = None, budget: SolveBudget = None) -> Tuple[str, List[Dict[str, Any]]]:
         """
-        Convierte una lista de listas en una tabla HTML.
-        (Usamos la versión de 'main' (HEAD) que es más detallada)
+        Plan B: la historia de tablas de simple_simplex (o la de 'simplex_json')
+        y el HTML que se muestra si gilp no está disponible.
         """
-        if pivot_r is None: pivot_r = -1
-        if pivot_c is None: pivot_c = -1
-        pivot_style = 'style="background-color:#fff0f0; color:#d00; font-weight:bold;"'
-        html = [
-            '<table class="table table-bordered table-striped" style="border:1px solid #ccc; justify-content:center; float:none; margin-left:auto; margin-right:auto;">'
-        ]
-        
-        for r_idx, row in enumerate(tableau_list):
-            html.append('<tr>')
-            for c_idx, cell in enumerate(row):
-                cell_tag = 'th' if c_idx == 0 or r_idx == 0 else 'td'
-                style = ""
-                
-                
-                if r_idx == (pivot_r + 1) and c_idx == (pivot_c + 1): # +1 para saltar headers
-                    style = pivot_style
-                
-                # Lógica de para formato
-                cell_content = cell
-                if isinstance(cell, float):
-                    cell_content = f"{cell:.4f}"
-                html.append(f'<{cell_tag} {style}>{cell_content}</{cell_tag}>')
-            html.append('</tr>')
+        logger.debug("Ejecutando Plan B (simple_simplex) para extraer tablas...")
+        plan_b_html = ""
+        plan_b_tableaus = []
+        mark = time.perf_counter()
+        try:
+            resultado_json_plan_b = simplex_json or self._run_simple_simplex(objective_data, constraints_data,
+                                                                              variables, budget=budget)
+            plan_b_tableaus = self._extract_tableaus_from_simple_simplex(resultado_json_plan_b)
             
-        html.append('</table>')
-        return "".join(html)
-
+            # Las tablas no se concatenan en el HTML: solution.html las muestra aparte
+            # (historial paginado si la solución se guardó); acá solo va el aviso.
+            plan_b_html = (
+                "<p>Visualización interactiva no disponible: ver las tablas intermedias "
+                f"más abajo ({len(plan_b_tableaus)} tablas).</p>"
+            )
+            logger.debug("Plan B (simple_simplex) completado exitosamente.")
+
+        except BudgetExceeded as e_budget:
+            logger.warning("Plan B (simple_simplex) interrumpido: %s", e_budget)
+            budget.record(e_budget.stage, e_budget.reason)
+            plan_b_tableaus = self._extract_tableaus_from_simple_simplex(e_budget.partial or {})
+            plan_b_html = (
+                f"<p>Visualización interrumpida: {e_budget} "
+                f"Se muestran las primeras {len(plan_b_tableaus)} tablas.</p>"
+            )
+            
+        except Exception as e_plan_b:
+            logger.error("Error crítico en Plan B (simple_simplex): %s", e_plan_b)
+            plan_b_html = f"<p>Error en Plan B: {e_plan_b}</p>"
+        Metrics.observe_stages({"simple_simplex": time.perf_counter() - mark})
+        return plan_b_html, plan_b_tableaus
 
-    def _run_simple_simplex(self) -> dict:
+    def _run_simple_simplex(self, objective_data: dict = None, constraints_data: list = None,
+                            variables: list = None, budget: SolveBudget = None) -> dict:
         """
         Ejecuta el solver 'simple_simplex' y devuelve el JSON de resultados.
+        Con 'budget', lanza BudgetExceeded si se agota (ver run_simple_simplex).
         """
-        num_vars = len(self.variables)
-        num_constraints = len(self.constraints_data)
-        
-        tableau = create_tableau(
-            number_of_variables=num_vars,
-            number_of_constraints=num_constraints
-        )
-
-        for const in self.constraints_data:
-            coeffs_list = [str(const['coefficients'].get(var, 0)) for var in self.variables]
-            coeffs_str = ",".join(coeffs_list)
-            op = const['operator']
-            op_str = "L" if op == '<=' else ("G" if op == '>=' else "E")
-            rhs_str = str(const['rhs'])
-            constraint_string = f"{coeffs_str},{op_str},{rhs_str}"
-            add_constraint(tableau, constraint_string)
-
-        obj_coeffs_list = [str(self.objective_data['coefficients'].get(var, 0)) for var in self.variables]
-        obj_coeffs_str = ",".join(obj_coeffs_list)
-        is_maximize = (self.objective_data['type'] == 'maximize')
-        obj_type_str = "1" if is_maximize else "0"
-        objective_string = f"{obj_coeffs_str},{obj_type_str}"
-        add_objective(tableau, objective_string)
-
-        resultado_json = optimize_json_format(tableau, maximize=is_maximize)
-        return resultado_json
+        objective_data = objective_data if objective_data is not None else self.objective_data
+        constraints_data = constraints_data if constraints_data is not None else self.constraints_data
+        variables = variables if variables is not None else self.variables
+        return run_simple_simplex(objective_data, constraints_data, variables, budget=budget)
 
 
     def _extract_tableaus_from_simple_simplex(self, simplex_json: dict) -> List[Dict[str, Any]]:
@@ -363,35 +679,30 @@ class SolverController:
         return extracted_data
 
 
-    def _display_and_save_results(self, result, objective_type: str, gilp_html_output: str, gilp_tableaus: list):
+    def _display_and_save_results(self, result, objective_type: str, gilp_html_output: str, gilp_tableaus: list,
+                                  diagnostics: dict = None):
         """
         Muestra la solución de forma amigable, guarda el reporte completo y DEVUELVE el reporte.
         (Fusión de ambas lógicas)
         """
         
-        print("----------------------------------")
-        print("         SOLUCIÓN ÓPTIMA          ")
-        print("----------------------------------")
-        
         problem_definition = {
             "funcion_objetivo": self.objective_data,
             "restricciones": self.constraints_data
         }
+        if self.variable_types:
+            problem_definition["tipos_variables"] = self.variable_types
+        if self.variable_bounds:
+            problem_definition["cotas_variables"] = self.variable_bounds
         solution_found = {}
 
         if result.success:
-            print("¡Se encontró una solución factible! \n")
-            print("Valores de las variables:")
-            
-            solution_vars = {}
-            for i, var_name in enumerate(self.variables):
-                var_value = result.x[i]
-                solution_vars[var_name] = var_value
-                print(f"   {var_name} = {var_value:.4f}")
-            
-            print("\nValor de la Función Objetivo (Z):")
+            solution_vars = dict(zip(self.variables, result.x))
             final_z = -result.fun if objective_type == 'maximize' else result.fun
-            print(f"   Z = {final_z:.4f}")
+            logger.info("¡Se encontró una solución factible! Z = %.4f", final_z)
+            if logger.isEnabledFor(logging.DEBUG):
+                for var_name, var_value in solution_vars.items():
+                    logger.debug("   %s = %.4f", var_name, var_value)
             
             solution_found = {
                 "status": "Solucion Factible",
@@ -399,12 +710,23 @@ class SolverController:
                 "valores_variables": solution_vars, 
                 "valor_optimo_z": final_z
             }
+
+            # Precios sombra (dZ/d rhs) por restricción original, si el solver los informa
+            if result.get('duals') is not None:
+                sign = -1.0 if objective_type == 'maximize' else 1.0
+                solution_found["precios_sombra"] = [
+                    None if d is None else sign * d + 0.0 for d in result.duals
+                ]
             
         else:
-            status_message = "Sin Solucion Factible" if result.status == 2 else "Error"
-            print(f"{status_message} ")
-            if result.status != 2:
-                print(f"(Estado: {result.message})")
+            if result.status == 2:
+                status_message = "Sin Solucion Factible"
+            elif result.status == 1:
+                # Se agotó el tiempo o las iteraciones (ver app.core.budget)
+                status_message = "Limite Alcanzado"
+            else:
+                status_message = "Error"
+            logger.info("%s (Estado: %s)", status_message, result.message)
 
             solution_found = {
                 "status": status_message,
@@ -420,13 +742,33 @@ class SolverController:
             "visualizacion_gilp_html": gilp_html_output,
             "tablas_intermedias": gilp_tableaus 
         }
+        if diagnostics:
+            final_report["diagnostico"] = diagnostics
         
+        if not self.include_tableaus:
+            final_report.pop("tablas_intermedias")
+        if self.persist:
+            self._save_report(final_report)
+        # Devolvemos el reporte para que la UI lo use
+        return final_report
+
+    def _save_report(self, final_report: dict):
+        """Guarda el reporte y anota su número (solution_id) y ruta."""
+        mark = time.perf_counter()
         try:
-            # Usamos el método estático como en 'main'
-            filename = StorageService.save_solution(final_report)
-            print(f"\nReporte de solución guardado en: {filename}")
+            # Según config.PERSISTENCE_MODE: en el momento, encolado (write-behind) o nada
+            filename = SolutionWriter.save(final_report)
+            if filename is not None:
+                self.solution_id = StorageService.solution_id_from_path(filename)
+                self.solution_path = filename
+                logger.info("Reporte de solución guardado en: %s", filename)
         except Exception as e:
-            print(f"\nAdvertencia: No se pudo guardar el reporte de solución: {e}")
-        
-        # Devolvemos el reporte para que la UI lo use
-        return final_report
\ No newline at end of file
+            logger.warning("No se pudo guardar el reporte de solución: %s", e)
+        finally:
+            self.timings["persist"] = time.perf_counter() - mark
+
+
+def _solve_in_worker(solver: SolverController):
+    """En un proceso del pool: resuelve (sin guardar ni registrar) y devuelve lo que necesita el proceso web."""
+    report = solver._solve()
+    return report, solver.timings, solver.outcome
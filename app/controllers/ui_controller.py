@@ -2,23 +2,39 @@
 Controlador para la interfaz gráfica.
 Define un conjunto de rutas relacionadas con la interfaz del usuario.
 """
+import logging
+import math
+import time
 
 from flask import (
     Blueprint, render_template, request, redirect, 
-    url_for, flash, json, jsonify, session, send_file
+    url_for, flash, json, jsonify, session, send_file, Response
 )
 
 from app.controllers.solver_controller import SolverController
-from app.services import StorageService
-from app.config import PREFIX_PROBLEMA
-# Imports de main (PDF) que Git añadió automáticamente
-from app.services.pdf_report_service import PdfReportService 
+from app.services import (
+    StorageService, SolverBackendRegistry, PdfBatchService, TableauHtmlRenderer, Metrics, SolveProfiler
+)
+from app.config import PREFIX_PROBLEMA, PREFIX_PDF, SOLVER_DEFAULT_BACKEND
+from app import config
 import os 
 
 
+logger = logging.getLogger(__name__)
+
 ui_bp = Blueprint('ui', __name__)
 storage = StorageService() # Aún lo usamos para guardar la SOLUCIÓN FINAL
 
+
+@ui_bp.context_processor
+def inject_solver_backends():
+    """Backends disponibles para el selector de la vista previa."""
+    return {
+        "solver_backends": SolverBackendRegistry.describe(),
+        "default_backend": SOLVER_DEFAULT_BACKEND
+    }
+
+
 @ui_bp.route('/')
 def index():
     """
@@ -35,10 +51,14 @@ def new_problem():
     Convierte los datos del formulario en el formato JSON esperado por el solver.
     """
     if request.method == 'POST':
+        start = time.perf_counter()
         problem_type = request.form.get('problem_type', 'maximize')
         objective_list = request.form.getlist('objective[]')
         constraint_signs = request.form.getlist('constraint_sign[]')
         constraint_rhs = request.form.getlist('constraint_rhs[]')
+        variable_types = request.form.getlist('variable_type[]')
+        variable_lower = request.form.getlist('variable_lower[]')
+        variable_upper = request.form.getlist('variable_upper[]')
 
         num_vars = len(objective_list)
         num_constraints = len(constraint_signs)
@@ -64,7 +84,21 @@ def new_problem():
             "funcion_objetivo": objective,
             "restricciones": restricciones
         }
+        # Solo se guardan las variables no continuas
+        tipos = {f"x{i+1}": t for i, t in enumerate(variable_types[:num_vars]) if t in ("integer", "binary")}
+        if tipos:
+            problem_data["tipos_variables"] = tipos
+
+        try:
+            cotas = parse_variable_bounds(variable_lower, variable_upper, num_vars)
+        except ValueError as e:
+            flash(f"Cota inválida: {e}", "error")
+            return redirect(url_for("ui.new_problem"))
+        if cotas:
+            problem_data["cotas_variables"] = cotas
+
         session['problem_data_wrapper'] = {"problema_definicion": problem_data}
+        Metrics.observe_stages({"form": time.perf_counter() - start})
         return render_template("preview.html", problem_data=problem_data, from_page="new")
 
     return render_template("new_problem.html")
@@ -82,6 +116,7 @@ def load_problem():
             flash("Selecciona un archivo antes de continuar.", "error")
             return redirect(url_for("ui.load_problem"))
 
+        start = time.perf_counter()
         try:
             content = json.load(file)
         except Exception as e:
@@ -98,12 +133,45 @@ def load_problem():
             flash(msg, "error")
             return redirect(url_for("ui.load_problem"))
 
-        session['problem_data_wrapper'] = {"problema_definicion": problem}        
+        session['problem_data_wrapper'] = {"problema_definicion": problem}
+        Metrics.observe_stages({"form": time.perf_counter() - start})
         return render_template("preview.html", problem_data=problem, from_page="load")
 
     return render_template("load_problem.html")
 
 
+def parse_variable_bounds(lower_values: list, upper_values: list, num_vars: int) -> dict:
+    """
+    Convierte los campos de cotas del formulario en 'cotas_variables'.
+    Vacío = cota por defecto (inferior 0, superior sin cota); "-inf" = sin cota
+    inferior y "inf" / "+inf" = sin cota superior. Una cota inferior +inf o una
+    superior -inf no se puede cumplir: lanza ValueError.
+    Solo se guardan las variables con cotas distintas de x >= 0.
+    """
+    def parse(value, default, unbounded, name):
+        value = (value or "").strip()
+        if not value:
+            return default
+        number = float(value)  # ValueError si no es un número
+        if math.isnan(number):
+            raise ValueError(f"x{i+1} tiene una cota {name} que no es un número.")
+        if math.isinf(number):
+            if number != unbounded:
+                raise ValueError(f"x{i+1} no puede tener cota {name} {value}.")
+            return None
+        return number
+
+    cotas = {}
+    for i in range(num_vars):
+        lower = parse(lower_values[i] if i < len(lower_values) else "", 0.0, float("-inf"), "inferior")
+        upper = parse(upper_values[i] if i < len(upper_values) else "", None, float("inf"), "superior")
+        if lower is not None and upper is not None and lower > upper:
+            raise ValueError(f"x{i+1} tiene cota inferior mayor que la superior.")
+        if lower != 0 or upper is not None:
+            cotas[f"x{i+1}"] = {"lower": lower, "upper": upper}
+    return cotas
+
+
 def validate_problem_structure(problem: dict) -> tuple[bool, str]:
     """
     Valida que el JSON subido cumpla con la estructura mínima esperada.
@@ -144,6 +212,34 @@ def validate_problem_structure(problem: dict) -> tuple[bool, str]:
         if not all(isinstance(v, (int, float)) for v in coefs_r.values()):
             return False, "Los coeficientes de cada restricción deben ser numéricos."
 
+    tipos = problem.get("tipos_variables")
+    if tipos is not None:
+        if not isinstance(tipos, dict):
+            return False, "'tipos_variables' debe ser un objeto {variable: tipo}."
+        if any(var not in coef for var in tipos):
+            return False, "'tipos_variables' solo puede referirse a variables de la función objetivo."
+        if any(t not in ("continuous", "integer", "binary") for t in tipos.values()):
+            return False, "Cada tipo de variable debe ser 'continuous', 'integer' o 'binary'."
+
+    cotas = problem.get("cotas_variables")
+    if cotas is not None:
+        if not isinstance(cotas, dict) or any(var not in coef for var in cotas):
+            return False, "'cotas_variables' debe ser un objeto {variable: {lower, upper}} sobre variables existentes."
+        for var, spec in cotas.items():
+            if not isinstance(spec, dict) or not set(spec) <= {"lower", "upper"}:
+                return False, f"La cota de {var} debe tener solo 'lower' y/o 'upper'."
+            lower, upper = spec.get("lower", 0), spec.get("upper")
+            # bool es subclase de int; json acepta Infinity y NaN
+            if any(v is not None and (isinstance(v, bool) or not isinstance(v, (int, float)))
+                   for v in (lower, upper)):
+                return False, f"Las cotas de {var} deben ser numéricas o null."
+            if lower is not None and not math.isfinite(lower):
+                return False, f"La cota inferior de {var} debe ser finita (null = sin cota)."
+            if upper is not None and (math.isnan(upper) or upper == float("-inf")):
+                return False, f"La cota superior de {var} debe ser finita, Infinity o null."
+            if lower is not None and upper is not None and lower > upper:
+                return False, f"La cota inferior de {var} es mayor que la superior."
+
     return True, ""
 
 
@@ -173,7 +269,7 @@ def preview_problem():
 @ui_bp.route('/procesar_formulario', methods=['POST'])
 def procesar_formulario():
     data = request.get_json()  # si el formulario se envía como JSON
-    print("Datos recibidos:", data)
+    logger.debug("Datos recibidos: %s", data)
     return jsonify({"status": "ok", "data_recibida": data}), 200
 
 
@@ -191,7 +287,9 @@ def solve_problem():
             return redirect(url_for("ui.new_problem"))
 
         # 2. Ejecutar el controlador principal del solver pasándole los datos
-        solver = SolverController(problem_data_wrapper)
+        backend, solver_options = parse_solver_selection(request.form)
+        solver = SolverController(problem_data_wrapper, backend=backend, solver_options=solver_options,
+                                  profile=profiling_requested())
         solution_report = solver.run() # Ahora devuelve el reporte
 
         # 3. Limpiar la sesión
@@ -202,40 +300,160 @@ def solve_problem():
             flash("Ocurrió un error durante la resolución.", "error")
             return redirect(url_for("ui.index"))
 
-        return render_template("solution.html", solucion=solution_report)
+        # Sin id (PERSISTENCE_MODE = "off" o falló el guardado) no hay historial que
+        # pedir a /solucion/<id>/tablas: la primera página va en la misma respuesta
+        inline_tableaus = [] if solver.solution_id else _tableau_page_items(
+            solution_report.get("tablas_intermedias") or [], 0, config.TABLEAU_PAGE_SIZE)
+        return render_template("solution.html", solucion=solution_report, solucion_id=solver.solution_id,
+                               tablas_en_linea=inline_tableaus)
 
     except Exception as e:
         flash(f"Error durante la resolución: {e}", "error")
         return redirect(url_for("ui.index"))
 
+def _tableau_page_items(tableaus, start: int, per_page: int) -> list:
+    """Las tablas de una página, cada una con su HTML."""
+    items = []
+    for offset, tableau in enumerate(tableaus[start:start + per_page]):
+        pivot = tableau.get("pivot")
+        items.append({
+            "indice": start + offset,
+            "iteracion": tableau.get("iteration"),
+            "titulo": tableau.get("title", "Tabla"),
+            "pivote": pivot,
+            "html": TableauHtmlRenderer.render(tableau.get("table", []), pivot),
+        })
+    return items
+
+
+@ui_bp.route('/solucion/<int:solution_id>/tablas', methods=['GET'])
+def tablas_solucion(solution_id):
+    """
+    Historial de tablas de una solución, paginado (?pagina=1&por_pagina=N).
+    Solo las tablas de la página pedida se envían como HTML.
+    """
+    page = request.args.get('pagina', 1, type=int)
+    per_page = request.args.get('por_pagina', config.TABLEAU_PAGE_SIZE, type=int)
+    if page < 1 or not 1 <= per_page <= config.TABLEAU_PAGE_SIZE_MAX:
+        return jsonify({"error": f"Página inválida (por_pagina entre 1 y {config.TABLEAU_PAGE_SIZE_MAX})."}), 400
+
+    try:
+        tableaus = StorageService.load_solution_tableaus(solution_id)
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+
+    total = len(tableaus)
+    pages = max(1, -(-total // per_page))
+    if page > pages:
+        return jsonify({"error": f"La solución tiene {pages} página(s)."}), 404
+
+    start = (page - 1) * per_page
+    items = _tableau_page_items(tableaus, start, per_page)
+
+    response = jsonify({
+        "solucion_id": solution_id,
+        "pagina": page,
+        "por_pagina": per_page,
+        "total": total,
+        "paginas": pages,
+        "tablas": items,
+    })
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+def profiling_requested() -> bool:
+    """
+    True si la request pide perfilar la resolución con el token de administrador
+    en la cabecera X-Simplex-Perfil. No se acepta en la query ni en el formulario:
+    quedaría en los logs de acceso, el historial y el Referer.
+    """
+    token = request.headers.get("X-Simplex-Perfil")
+    if token and not SolveProfiler.is_authorized(token):
+        logger.warning("Pedido de perfil con un token inválido desde %s.", request.remote_addr)
+        return False
+    return bool(token)
+
+
+def parse_solver_selection(form) -> tuple[str, dict]:
+    """
+    Lee el backend y las opciones del solver elegidos en la vista previa.
+    Los campos vacíos se omiten para usar los valores de app.config.
+    """
+    backend = form.get('backend') or None
+    if backend and backend != SolverBackendRegistry.AUTO:
+        SolverBackendRegistry.get(backend)  # Valida el nombre (ValueError si no existe)
+
+    solver_options = {}
+    time_limit = form.get('time_limit')
+    if time_limit:
+        solver_options['time_limit'] = float(time_limit)
+    # Opciones de branch-and-bound (solo se muestran para problemas enteros)
+    node_limit = form.get('node_limit')
+    if node_limit:
+        solver_options['node_limit'] = int(node_limit)
+    mip_gap = form.get('mip_rel_gap')
+    if mip_gap:
+        solver_options['mip_rel_gap'] = float(mip_gap)
+    return backend, solver_options
+
+
 @ui_bp.route('/exportar-pdf', methods=['GET'])
 def exportar_pdf():
     """
-    Genera un reporte en PDF de la última solución (incluyendo tablas)
-    y lo envía al usuario para su descarga.
+    Envía el reporte en PDF de una solución (por defecto, la última; o ?id=N).
+    Los PDFs se guardan en caché por solución + hash del contenido: solo se
+    regeneran si el reporte cambió. Responde 304 si el cliente ya tiene esa
+    versión (If-None-Match con el ETag).
     """
     try:
-        # 1. Cargar el último reporte de solución (el JSON)
-        solution_report = StorageService.load_solution()
+        # 1. Cargar el reporte de solución (el JSON). El id se resuelve una sola vez:
+        #    si otro worker guarda mientras tanto, el PDF y su caché siguen siendo de esta solución
+        solution_id = request.args.get('id', type=int)
+        if solution_id is None:
+            solution_id = StorageService.get_latest_solution_id()
+        solution_report = StorageService.load_solution_by_id(solution_id) if solution_id is not None else None
         if not solution_report:
             flash("No se encontró una solución para exportar.", "error")
             return redirect(url_for("ui.index"))
 
-        # 2. Obtener un nombre para el nuevo archivo PDF
-        pdf_filepath = StorageService.get_new_pdf_path()
-
-        # 3. Inicializar el servicio de PDF
-        pdf_service = PdfReportService(solution_report, pdf_filepath)
-        
-        # 4. Generar el PDF
-        pdf_service.generate()
-
-        # 5. Enviar el archivo generado al usuario
-        return send_file(
-            pdf_filepath,
-            as_attachment=True,
-            download_name=os.path.basename(pdf_filepath) # ej: "reporte_solucion_3.pdf"
+        # Import diferido: ReportLab se carga con el primer PDF, no al iniciar la app
+        from app.services.pdf_report_service import PdfReportService
+
+        download_name = f"{PREFIX_PDF}{solution_id}.pdf"
+        content_hash = PdfReportService.content_hash(solution_report)
+
+        # 2. GET condicional: el cliente ya tiene esta versión
+        if content_hash in request.if_none_match:
+            response = Response(status=304)
+            response.set_etag(content_hash)
+            return response
+
+        # 3. PDF ya generado para este contenido
+        cached_path = StorageService.get_cached_pdf_path(solution_id, content_hash) \
+            if config.PDF_CACHE_ENABLED else None
+        if config.PDF_CACHE_ENABLED:
+            Metrics.inc("simplex_cache_requests_total", cache="pdf", resultado="hit" if cached_path else "miss")
+        if cached_path:
+            response = send_file(cached_path, as_attachment=True, download_name=download_name,
+                                 etag=content_hash, conditional=True)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+
+        # 4. Generar (los errores de maquetación se lanzan acá), guardar en caché y enviar en bloques
+        start = time.perf_counter()
+        pdf_buffer = PdfReportService(solution_report).render()
+        Metrics.observe_stages({"pdf": time.perf_counter() - start})
+        if config.PDF_CACHE_ENABLED:
+            StorageService.save_cached_pdf(solution_id, content_hash, pdf_buffer.getvalue())
+
+        response = Response(
+            PdfReportService.iter_chunks(pdf_buffer),
+            mimetype="application/pdf",
+            headers={"Content-Disposition": f'attachment; filename="{download_name}"',
+                     "Cache-Control": "no-cache"}
         )
+        response.set_etag(content_hash)
+        return response
 
     except FileNotFoundError as e:
         flash(f"Error al cargar el reporte: {e}", "error")
@@ -244,6 +462,57 @@ def exportar_pdf():
         flash(f"Error al generar el PDF: {e}", "error")
         return redirect(url_for("ui.index")) # Redirigir a una ruta GET segura
 
+@ui_bp.route('/exportar-pdf/lote', methods=['POST'])
+def exportar_pdf_lote():
+    """
+    Crea un lote de exportación a partir de {"ids": [1, 2, ...]} (JSON o
+    'ids' repetido en un formulario). Responde 202 con el id del lote y las
+    URLs para consultar el progreso y descargar el .zip.
+    """
+    if request.is_json:
+        solution_ids = (request.get_json(silent=True) or {}).get("ids")
+    else:
+        try:
+            solution_ids = [int(v) for v in request.form.getlist("ids")]
+        except ValueError:
+            return jsonify({"error": "Los ids de solución deben ser enteros."}), 400
+
+    try:
+        job_id = PdfBatchService.start(solution_ids)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "job_id": job_id,
+        "estado_url": url_for("ui.estado_pdf_lote", job_id=job_id),
+        "descarga_url": url_for("ui.descargar_pdf_lote", job_id=job_id),
+    }), 202
+
+
+@ui_bp.route('/exportar-pdf/lote/<job_id>', methods=['GET'])
+def estado_pdf_lote(job_id):
+    """Progreso del lote: estado, total, completados, fallidos y fracción procesada."""
+    status = PdfBatchService.get_status(job_id)
+    if status is None:
+        return jsonify({"error": "No existe el lote."}), 404
+    return jsonify(status)
+
+
+@ui_bp.route('/exportar-pdf/lote/<job_id>/zip', methods=['GET'])
+def descargar_pdf_lote(job_id):
+    """Descarga el .zip del lote; 409 mientras se está procesando."""
+    status = PdfBatchService.get_status(job_id)
+    if status is None:
+        return jsonify({"error": "No existe el lote."}), 404
+
+    zip_path = PdfBatchService.get_zip_path(job_id)
+    if zip_path is None:
+        return jsonify({"error": "El lote todavía no tiene un .zip para descargar.",
+                        "estado": status["estado"], "progreso": status["progreso"]}), 409
+
+    return send_file(zip_path, as_attachment=True, mimetype="application/zip",
+                     download_name=f"reportes_lote_{job_id[:8]}.zip")
+
 @ui_bp.route("/descargar-problema-json")
 def descargar_problema_json():
     filepath = StorageService._get_latest_filename(PREFIX_PROBLEMA, extension=".json")
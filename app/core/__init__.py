@@ -1,9 +1,20 @@
 from .objective_function import ObjectiveFunctionParser
 from .constraints import Constraint, ConstraintsParser, ConstraintsValidator
+from .presolve import Presolver, PresolveResult
+from .scaling import ModelScaler, ScalingResult
+from .bounds import NonNegativeForm
+from .budget import SolveBudget, BudgetExceeded
 
 __all__ = [
     'ObjectiveFunctionParser',
     'Constraint', 
     'ConstraintsParser', 
-    'ConstraintsValidator'
+    'ConstraintsValidator',
+    'Presolver',
+    'PresolveResult',
+    'ModelScaler',
+    'ScalingResult',
+    'NonNegativeForm',
+    'SolveBudget',
+    'BudgetExceeded'
 ]
\ No newline at end of file
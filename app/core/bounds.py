@@ -0,0 +1,87 @@
+"""
+Módulo core: Cotas de variables para los métodos de tablas.
+
+Los métodos de tablas ('simple_simplex', la visualización) solo conocen
+x >= 0. En lugar de agregar una fila por cada cota, el modelo se lleva
+a esa forma con cambios de variable:
+
+    l <= x            ->  x = l + y            (y >= 0)
+    x libre           ->  x = x_pos - x_neg    (x_pos, x_neg >= 0)
+
+Solo las cotas superiores finitas quedan como filas (y <= u - l).
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.presolve import Bound
+
+
+class NonNegativeForm:
+    """Modelo equivalente con todas las variables >= 0 + cómo volver al original."""
+
+    def __init__(self, variables: List[str]):
+        self.original_variables = variables
+        self.variables: List[str] = []
+        self.objective_data: Dict = {}
+        self.constraints_data: List[Dict] = []
+        self.objective_offset = 0.0  # Aporte de los desplazamientos a Z
+        # var original -> (cota inferior usada como desplazamiento, columna +, columna - o None)
+        self._mapping: Dict[str, tuple] = {}
+
+    @staticmethod
+    def build(objective_data: Dict, constraints_data: List[Dict], variables: List[str],
+              bounds: Dict[str, Bound]) -> "NonNegativeForm":
+        form = NonNegativeForm(list(variables))
+
+        # 1. Columnas nuevas: desplazamiento por la cota inferior o división de las libres
+        for var in variables:
+            lower, _ = bounds.get(var, (0, None))
+            if lower is None:
+                pos, neg = f"{var}_pos", f"{var}_neg"
+                form.variables += [pos, neg]
+                form._mapping[var] = (0.0, pos, neg)
+            else:
+                form.variables.append(var)
+                form._mapping[var] = (float(lower), var, None)
+
+        def substitute(coefficients: Dict) -> tuple:
+            """Reescribe sum(a_j * x_j) en las columnas nuevas; retorna (coeficientes, constante)."""
+            new_coeffs = {v: 0.0 for v in form.variables}
+            constant = 0.0
+            for var in variables:
+                a = coefficients.get(var, 0)
+                shift, pos, neg = form._mapping[var]
+                new_coeffs[pos] += a
+                if neg is not None:
+                    new_coeffs[neg] -= a
+                constant += a * shift
+            return new_coeffs, constant
+
+        obj_coeffs, form.objective_offset = substitute(objective_data['coefficients'])
+        form.objective_data = {"type": objective_data['type'], "coefficients": obj_coeffs}
+
+        for const in constraints_data:
+            coeffs, constant = substitute(const['coefficients'])
+            form.constraints_data.append(
+                {"coefficients": coeffs, "operator": const['operator'], "rhs": const['rhs'] - constant})
+
+        # 2. Las cotas superiores finitas quedan como filas
+        for var in variables:
+            upper = bounds.get(var, (0, None))[1]
+            if upper is None:
+                continue
+            coeffs, constant = substitute({var: 1.0})
+            form.constraints_data.append({"coefficients": coeffs, "operator": "<=", "rhs": upper - constant})
+        return form
+
+    def recover(self, values: Dict[str, float]) -> np.ndarray:
+        """Valores de las columnas nuevas -> x en el orden de las variables originales."""
+        x = []
+        for var in self.original_variables:
+            shift, pos, neg = self._mapping[var]
+            value = shift + float(values.get(pos, 0.0))
+            if neg is not None:
+                value -= float(values.get(neg, 0.0))
+            x.append(value)
+        return np.array(x)
@@ -0,0 +1,72 @@
+"""
+Módulo core: Presupuesto de tiempo e iteraciones de una resolución.
+
+Un mismo SolveBudget acompaña todas las etapas (solver y visualización):
+el tiempo es uno solo para toda la resolución y el límite de iteraciones
+vale para cada algoritmo (HiGHS, simple_simplex, gilp). Los algoritmos
+propios llaman a check() en cada pivoteo; a HiGHS se le pasan los límites
+como opciones (ver SolverBackendRegistry.solve).
+"""
+import math
+import time
+from typing import Callable, Dict, Optional
+
+
+class BudgetExceeded(Exception):
+    """
+    Se agotó el presupuesto en 'stage'. 'reason' es "tiempo" o "iteraciones";
+    'partial' lleva lo calculado hasta ese momento (ej: los pivoteos hechos).
+    """
+
+    def __init__(self, stage: str, reason: str, iterations: int = 0, partial: Optional[Dict] = None):
+        self.stage = stage
+        self.reason = reason
+        self.iterations = iterations
+        self.partial = partial
+        super().__init__(f"Se agotó el presupuesto de {reason} en la etapa '{stage}' "
+                         f"(después de {iterations} iteraciones).")
+
+
+class SolveBudget:
+    """Límite de tiempo (desde la creación) y de iteraciones; None = sin límite."""
+
+    def __init__(self, time_limit: Optional[float] = None, iteration_limit: Optional[int] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.time_limit = time_limit
+        self.iteration_limit = iteration_limit
+        self._clock = clock
+        self._start = clock()
+        self.exceeded: Optional[Dict] = None  # Primera etapa que agotó el presupuesto
+
+    def elapsed(self) -> float:
+        return self._clock() - self._start
+
+    def remaining(self) -> float:
+        """Segundos que quedan (infinito si no hay límite de tiempo)."""
+        if self.time_limit is None:
+            return math.inf
+        return max(0.0, self.time_limit - self.elapsed())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str, iterations: int = 0, partial: Optional[Dict] = None):
+        """Lanza BudgetExceeded si se acabó el tiempo o si 'iterations' llegó al límite."""
+        if self.expired():
+            raise BudgetExceeded(stage, "tiempo", iterations, partial)
+        if self.iteration_limit is not None and iterations >= self.iteration_limit:
+            raise BudgetExceeded(stage, "iteraciones", iterations, partial)
+
+    def record(self, stage: str, reason: str):
+        """Anota la etapa que agotó el presupuesto (solo la primera)."""
+        if self.exceeded is None:
+            self.exceeded = {"etapa": stage, "motivo": reason}
+
+    def summary(self) -> Dict:
+        """Datos para el diagnóstico del reporte."""
+        return {
+            "limite_tiempo_segundos": self.time_limit,
+            "limite_iteraciones": self.iteration_limit,
+            "tiempo_segundos": self.elapsed(),
+            "agotado": self.exceeded,
+        }
@@ -0,0 +1,436 @@
+"""
+Módulo core: Presolve (reducción del modelo antes de resolver).
+
+Elimina del modelo lo que no aporta al cálculo:
+- Filas vacías (sin coeficientes distintos de cero).
+- Filas singleton (una sola variable), que se convierten en cotas.
+- Restricciones duplicadas o dominadas por otra paralela.
+- Filas redundantes según las cotas de las variables.
+- Variables fijas (cota inferior == cota superior) y columnas vacías.
+
+El resultado guarda un mapa de postsolve para reportar los valores
+de las variables en el espacio ORIGINAL del problema.
+"""
+import logging
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+Bound = Tuple[Optional[float], Optional[float]]
+
+
+def bounds_to_constraints(variables: List[str], bounds: Dict[str, Bound]) -> List[Dict]:
+    """
+    Expresa como filas las cotas que un método de tablas (x >= 0) no
+    puede representar de forma nativa: cotas superiores finitas y
+    cotas inferiores distintas de cero.
+    """
+    rows = []
+    for var in variables:
+        lower, upper = bounds[var]
+        for operator, rhs in ((">=", lower if lower != 0 else None), ("<=", upper)):
+            if rhs is None:
+                continue
+            coefficients = {v: (1.0 if v == var else 0.0) for v in variables}
+            rows.append({"coefficients": coefficients, "operator": operator, "rhs": rhs})
+    return rows
+
+
+class PresolveResult:
+    """Modelo reducido + la información necesaria para deshacer la reducción."""
+
+    def __init__(self, original_variables: List[str], objective_type: str):
+        self.original_variables = original_variables
+        self.objective_type = objective_type
+        self.variables: List[str] = []
+        self.objective_data: Dict = {}
+        self.constraints_data: List[Dict] = []
+        self.bounds: Dict[str, Bound] = {}
+        self.fixed_values: Dict[str, float] = {}
+        self.objective_offset = 0.0  # Aporte de las variables fijas a Z
+        self.row_map: List[int] = []  # fila reducida -> fila original
+        # Fila original que definió cada cota: var -> {"lower"/"upper": (fila, coeficiente)}
+        self.bound_origin: Dict[str, Dict[str, Tuple[int, float]]] = {}
+        self.removed_rows: List[Dict] = []
+        self.removed_variables: List[Dict] = []
+        self.infeasible = False
+        self.message = ""
+
+    @property
+    def is_empty(self) -> bool:
+        """True si el presolve fijó todas las variables."""
+        return not self.variables
+
+    def scipy_bounds(self) -> List[Bound]:
+        """Cotas del modelo reducido en el orden de 'variables' (formato linprog)."""
+        return [self.bounds[var] for var in self.variables]
+
+    def bounds_as_constraints(self) -> List[Dict]:
+        """Cotas del modelo reducido expresadas como filas (para los métodos de tablas)."""
+        return bounds_to_constraints(self.variables, self.bounds)
+
+    def postsolve(self, reduced_x) -> Dict[str, float]:
+        """Lleva la solución del modelo reducido al espacio original de variables."""
+        reduced_index = {var: i for i, var in enumerate(self.variables)}
+        values = {}
+        for var in self.original_variables:
+            if var in self.fixed_values:
+                values[var] = self.fixed_values[var]
+            else:
+                values[var] = float(reduced_x[reduced_index[var]])
+        return values
+
+    def postsolve_duals(self, reduced_duals, lower_marginals, upper_marginals) -> List[Optional[float]]:
+        """
+        Lleva los duales del modelo reducido a las filas originales.
+        - Filas conservadas: su dual.
+        - Filas convertidas en cota: marginal de la cota / coeficiente.
+        - Filas que fijaron una variable: None (el dual no se recupera).
+        - Resto de las eliminadas (vacías, duplicadas, redundantes): 0.
+        """
+        num_rows = len(self.row_map) + len(self.removed_rows)
+        duals: List[Optional[float]] = [0.0] * num_rows
+        for reduced_i, original_i in enumerate(self.row_map):
+            duals[original_i] = float(reduced_duals[reduced_i])
+
+        index = {var: i for i, var in enumerate(self.variables)}
+        for var, origins in self.bound_origin.items():
+            for side, (row_i, coef) in origins.items():
+                if var not in index:
+                    duals[row_i] = None
+                    continue
+                marginals = lower_marginals if side == "lower" else upper_marginals
+                duals[row_i] = float(marginals[index[var]]) / coef
+        return duals
+
+    def summary(self) -> Dict:
+        """Resumen serializable de lo que eliminó el presolve."""
+        return {
+            "filas_originales": len(self.row_map) + len(self.removed_rows),
+            "filas_resultantes": len(self.row_map),
+            "variables_originales": len(self.original_variables),
+            "variables_resultantes": len(self.variables),
+            "filas_eliminadas": self.removed_rows,
+            "variables_eliminadas": self.removed_variables,
+            "infactible": self.infeasible,
+            "mensaje": self.message,
+        }
+
+
+class Presolver:
+    """Aplica las reducciones sobre la definición del problema (formato JSON de la app)."""
+
+    TOLERANCE = 1e-9
+    MAX_PASSES = 20
+
+    @staticmethod
+    def passthrough(objective_data: Dict, constraints_data: List[Dict], variables: List[str],
+                    bounds: Optional[Dict[str, Bound]] = None) -> PresolveResult:
+        """Resultado sin reducciones (presolve desactivado por configuración)."""
+        result = PresolveResult(list(variables), objective_data['type'])
+        result.variables = list(variables)
+        result.objective_data = objective_data
+        result.constraints_data = list(constraints_data)
+        result.row_map = list(range(len(constraints_data)))
+        result.bounds = {var: (bounds or {}).get(var, (0, None)) for var in variables}
+        return result
+
+    @staticmethod
+    def run(objective_data: Dict, constraints_data: List[Dict], variables: List[str],
+            bounds: Optional[Dict[str, Bound]] = None,
+            integers: Optional[Set[str]] = None) -> PresolveResult:
+        """
+        Ejecuta el presolve. Las cotas por defecto son x >= 0.
+        Las cotas de las variables de 'integers' se redondean hacia adentro.
+        Retorna un PresolveResult con el modelo reducido.
+        """
+        integers = integers or set()
+        objective_type = objective_data['type']
+        result = PresolveResult(list(variables), objective_type)
+
+        # Trabajamos siempre en sentido "minimizar"
+        sign = -1.0 if objective_type == 'maximize' else 1.0
+        cost = {var: sign * objective_data['coefficients'].get(var, 0) for var in variables}
+
+        lower = {}
+        upper = {}
+        for var in variables:
+            lb, ub = (bounds or {}).get(var, (0, None))
+            if var in integers:
+                lb, ub = Presolver._integral_bounds(lb, ub)
+            lower[var], upper[var] = lb, ub
+            if Presolver._bounds_cross(lb, ub):
+                result.infeasible = True
+                result.message = f"Cotas incompatibles para {var}: [{lb}, {ub}]"
+                logger.info("Presolve: problema infactible (%s).", result.message)
+                return result
+
+        rows = []
+        for i, const in enumerate(constraints_data):
+            coeffs = {var: float(const['coefficients'].get(var, 0)) for var in variables}
+            rows.append({
+                "index": i,
+                "coefficients": {k: v for k, v in coeffs.items() if v != 0},
+                "operator": const['operator'],
+                "rhs": float(const['rhs']),
+            })
+
+        fixed: Dict[str, float] = {}
+        for _ in range(Presolver.MAX_PASSES):
+            changed = False
+            changed |= Presolver._substitute_fixed(rows, fixed)
+            changed |= Presolver._drop_empty_rows(rows, result)
+            changed |= Presolver._singleton_rows(rows, lower, upper, result, integers)
+            changed |= Presolver._fix_variables(lower, upper, fixed, result)
+            changed |= Presolver._drop_duplicate_rows(rows, result)
+            changed |= Presolver._drop_redundant_rows(rows, lower, upper, result)
+            if result.infeasible:
+                break
+            changed |= Presolver._empty_columns(rows, cost, lower, upper, fixed, result)
+            if result.infeasible or not changed:
+                break
+
+        if result.infeasible:
+            logger.info("Presolve: problema infactible (%s).", result.message)
+            return result
+
+        # --- Armado del modelo reducido ---
+        result.fixed_values = fixed
+        result.objective_offset = sum(sign * cost[var] * val for var, val in fixed.items())
+        result.variables = [var for var in variables if var not in fixed]
+        result.objective_data = {
+            "type": objective_type,
+            "coefficients": {var: objective_data['coefficients'].get(var, 0) for var in result.variables},
+        }
+        for row in rows:
+            result.row_map.append(row["index"])
+            result.constraints_data.append({
+                "coefficients": {var: row["coefficients"].get(var, 0.0) for var in result.variables},
+                "operator": row["operator"],
+                "rhs": row["rhs"],
+            })
+        result.bounds = {var: (lower[var], upper[var]) for var in result.variables}
+
+        logger.log(logging.INFO if result.removed_rows or result.removed_variables else logging.DEBUG,
+                   "Presolve: %d filas y %d variables eliminadas.",
+                   len(result.removed_rows), len(result.removed_variables))
+        if logger.isEnabledFor(logging.DEBUG):
+            for removed in result.removed_rows:
+                logger.debug("   - Restricción %d: %s", removed['indice'] + 1, removed['motivo'])
+            for removed in result.removed_variables:
+                logger.debug("   - Variable %s = %.4f: %s", removed['variable'], removed['valor'], removed['motivo'])
+        return result
+
+    # --- REDUCCIONES ---
+
+    @staticmethod
+    def _substitute_fixed(rows: List[Dict], fixed: Dict[str, float]) -> bool:
+        """Pasa al RHS el aporte de las variables ya fijadas."""
+        changed = False
+        for row in rows:
+            for var in [v for v in row["coefficients"] if v in fixed]:
+                row["rhs"] -= row["coefficients"].pop(var) * fixed[var]
+                changed = True
+        return changed
+
+    @staticmethod
+    def _drop_empty_rows(rows: List[Dict], result: PresolveResult) -> bool:
+        """Elimina filas sin coeficientes, verificando que 0 (op) rhs se cumpla."""
+        tol = Presolver.TOLERANCE
+        changed = False
+        for row in list(rows):
+            if row["coefficients"]:
+                continue
+            op, rhs = row["operator"], row["rhs"]
+            satisfied = ((op == '<=' and rhs >= -tol) or
+                         (op == '>=' and rhs <= tol) or
+                         (op == '=' and abs(rhs) <= tol))
+            if not satisfied:
+                result.infeasible = True
+                result.message = f"La restricción {row['index'] + 1} queda 0 {op} {rhs}"
+                return True
+            rows.remove(row)
+            result.removed_rows.append({"indice": row["index"], "motivo": "fila vacía"})
+            changed = True
+        return changed
+
+    @staticmethod
+    def _singleton_rows(rows: List[Dict], lower: Dict, upper: Dict, result: PresolveResult,
+                        integers: Optional[Set[str]] = None) -> bool:
+        """
+        Convierte las filas de una sola variable en cotas de esa variable.
+        Si la variable es entera, la cota se redondea (ej: 2x <= 7 -> x <= 3).
+        """
+        changed = False
+        for row in list(rows):
+            if len(row["coefficients"]) != 1:
+                continue
+            (var, coef), = row["coefficients"].items()
+            value = row["rhs"] / coef
+            op = row["operator"]
+            if coef < 0 and op != '=':
+                op = '>=' if op == '<=' else '<='
+
+            new_lower = value if op in ('>=', '=') else None
+            new_upper = value if op in ('<=', '=') else None
+            if integers and var in integers:
+                new_lower, new_upper = Presolver._integral_bounds(new_lower, new_upper)
+
+            tightened = False
+            origin = result.bound_origin.setdefault(var, {})
+            if new_upper is not None and (upper[var] is None or new_upper < upper[var]):
+                upper[var] = new_upper
+                origin["upper"] = (row["index"], coef)
+                tightened = True
+            if new_lower is not None and (lower[var] is None or new_lower > lower[var]):
+                lower[var] = new_lower
+                origin["lower"] = (row["index"], coef)
+                tightened = True
+            if not origin:
+                del result.bound_origin[var]
+
+            rows.remove(row)
+            motivo = "fila singleton convertida en cota" if tightened else "cota dominada"
+            result.removed_rows.append({"indice": row["index"], "motivo": motivo})
+            changed = True
+
+            if Presolver._bounds_cross(lower[var], upper[var]):
+                result.infeasible = True
+                result.message = f"Cotas incompatibles para {var}: [{lower[var]}, {upper[var]}]"
+                return True
+        return changed
+
+    @staticmethod
+    def _integral_bounds(lb: Optional[float], ub: Optional[float]) -> Bound:
+        """Redondea hacia adentro las cotas de una variable entera."""
+        tol = Presolver.TOLERANCE
+        lb = None if lb is None else float(math.ceil(lb - tol))
+        ub = None if ub is None else float(math.floor(ub + tol))
+        return lb, ub
+
+    @staticmethod
+    def _bounds_cross(lb: Optional[float], ub: Optional[float]) -> bool:
+        return lb is not None and ub is not None and lb > ub + Presolver.TOLERANCE
+
+    @staticmethod
+    def _fix_variables(lower: Dict, upper: Dict, fixed: Dict, result: PresolveResult) -> bool:
+        """Fija las variables cuyas cotas coinciden."""
+        changed = False
+        for var in lower:
+            if var in fixed or lower[var] is None or upper[var] is None:
+                continue
+            if abs(upper[var] - lower[var]) <= Presolver.TOLERANCE:
+                fixed[var] = lower[var]
+                result.removed_variables.append(
+                    {"variable": var, "valor": lower[var], "motivo": "variable fija"})
+                changed = True
+        return changed
+
+    @staticmethod
+    def _row_key(row: Dict) -> Tuple[Tuple, float]:
+        """Clave normalizada (coeficientes divididos por el mayor en valor absoluto)."""
+        scale = max(abs(v) for v in row["coefficients"].values())
+        coeffs = tuple(sorted((var, round(v / scale, 12)) for var, v in row["coefficients"].items()))
+        return coeffs, scale
+
+    @staticmethod
+    def _drop_duplicate_rows(rows: List[Dict], result: PresolveResult) -> bool:
+        """Elimina filas repetidas (o paralelas) y se queda con la más ajustada."""
+        tol = Presolver.TOLERANCE
+        changed = False
+        seen: Dict[Tuple, Dict] = {}
+        for row in list(rows):
+            if not row["coefficients"]:
+                continue
+            coeffs, scale = Presolver._row_key(row)
+            key = (coeffs, row["operator"])
+            rhs = row["rhs"] / scale
+            kept = seen.get(key)
+            if kept is None:
+                seen[key] = {"row": row, "rhs": rhs, "scale": scale}
+                continue
+
+            op = row["operator"]
+            if op == '=' and abs(kept["rhs"] - rhs) > tol:
+                result.infeasible = True
+                result.message = (f"Las restricciones {kept['row']['index'] + 1} y "
+                                  f"{row['index'] + 1} son igualdades incompatibles")
+                return True
+
+            tighter = (op == '<=' and rhs < kept["rhs"]) or (op == '>=' and rhs > kept["rhs"])
+            if tighter:
+                # La nueva fila domina: se conserva ella (su índice recibe el dual) y sale la ya vista
+                dropped, motivo = kept["row"], "fila dominada por una paralela"
+                seen[key] = {"row": row, "rhs": rhs, "scale": scale}
+            else:
+                dropped = row
+                motivo = "restricción duplicada" if abs(kept["rhs"] - rhs) <= tol else "fila dominada por una paralela"
+            rows.remove(dropped)
+            result.removed_rows.append({"indice": dropped["index"], "motivo": motivo})
+            changed = True
+        return changed
+
+    @staticmethod
+    def _drop_redundant_rows(rows: List[Dict], lower: Dict, upper: Dict, result: PresolveResult) -> bool:
+        """
+        Usa las cotas para calcular la actividad mínima/máxima de cada fila.
+        Si la fila se cumple siempre, es redundante; si no puede cumplirse, es infactible.
+        """
+        tol = Presolver.TOLERANCE
+        changed = False
+        for row in list(rows):
+            min_act, max_act = Presolver._activity_range(row["coefficients"], lower, upper)
+            op, rhs = row["operator"], row["rhs"]
+
+            if (op in ('<=', '=') and min_act is not None and min_act > rhs + tol) or \
+               (op in ('>=', '=') and max_act is not None and max_act < rhs - tol):
+                result.infeasible = True
+                result.message = f"La restricción {row['index'] + 1} no puede cumplirse con las cotas"
+                return True
+
+            redundant = ((op == '<=' and max_act is not None and max_act <= rhs + tol) or
+                         (op == '>=' and min_act is not None and min_act >= rhs - tol))
+            if redundant:
+                rows.remove(row)
+                result.removed_rows.append({"indice": row["index"], "motivo": "fila redundante por cotas"})
+                changed = True
+        return changed
+
+    @staticmethod
+    def _activity_range(coefficients: Dict[str, float], lower: Dict, upper: Dict):
+        """Retorna (actividad mínima, actividad máxima); None si es infinita."""
+        min_act, max_act = 0.0, 0.0
+        for var, coef in coefficients.items():
+            lo, hi = (lower[var], upper[var]) if coef > 0 else (upper[var], lower[var])
+            min_act = None if min_act is None or lo is None else min_act + coef * lo
+            max_act = None if max_act is None or hi is None else max_act + coef * hi
+        return min_act, max_act
+
+    @staticmethod
+    def _empty_columns(rows: List[Dict], cost: Dict, lower: Dict, upper: Dict,
+                       fixed: Dict, result: PresolveResult) -> bool:
+        """
+        Una variable que no aparece en ninguna fila se fija en su mejor cota.
+        Si esa cota es infinita se deja en el modelo (el solver informará 'no acotado').
+        """
+        used = {var for row in rows for var in row["coefficients"]}
+        changed = False
+        for var in cost:
+            if var in fixed or var in used:
+                continue
+            c = cost[var]
+            if c > 0:
+                value = lower[var]
+            elif c < 0:
+                value = upper[var]
+            else:
+                value = lower[var] if lower[var] is not None else upper[var]
+                if value is None:
+                    value = 0.0
+            if value is None:
+                continue
+            fixed[var] = value
+            result.removed_variables.append({"variable": var, "valor": value, "motivo": "columna vacía"})
+            changed = True
+        return changed
@@ -0,0 +1,196 @@
+"""
+Módulo core: Escalado (equilibrado) de filas y columnas del modelo.
+
+Los modelos con coeficientes de órdenes muy distintos (ej: 1e-4 y 1e6)
+hacen que el pivoteo por tablas sea inestable. El escalado multiplica
+cada fila por r_i y cada columna por s_j:
+
+    a'_ij = r_i * a_ij * s_j      b'_i = r_i * b_i      c'_j = c_j * s_j
+    x_j = s_j * y_j               (y es la variable del modelo escalado)
+
+Los factores son potencias de 2, así el escalado no introduce errores
+de redondeo. Los resultados (primal y duales) se desescalan al final.
+Las columnas de variables enteras no se escalan (x = s * y rompería la integralidad).
+"""
+import logging
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.presolve import Bound, bounds_to_constraints
+
+logger = logging.getLogger(__name__)
+
+
+class ScalingResult:
+    """Modelo escalado + los factores necesarios para desescalar los resultados."""
+
+    def __init__(self, variables: List[str], objective_data: Dict, constraints_data: List[Dict],
+                 bounds: Dict[str, Bound]):
+        self.variables = variables
+        self.objective_data = objective_data
+        self.constraints_data = constraints_data
+        self.bounds = bounds
+        self.row_factors = [1.0] * len(constraints_data)
+        self.col_factors = [1.0] * len(variables)
+        self.applied = False
+        self.passes = 0
+        self.range_before = ModelScaler.coefficient_range(constraints_data, variables)
+        self.range_after = self.range_before
+
+    def scipy_bounds(self) -> List[Bound]:
+        """Cotas del modelo escalado en el orden de 'variables' (formato linprog)."""
+        return [self.bounds[var] for var in self.variables]
+
+    def bounds_as_constraints(self) -> List[Dict]:
+        """Cotas del modelo escalado expresadas como filas (para los métodos de tablas)."""
+        return bounds_to_constraints(self.variables, self.bounds)
+
+    def unscale_primal(self, y) -> np.ndarray:
+        """x_j = s_j * y_j"""
+        return np.asarray(y, dtype=float) * np.array(self.col_factors)
+
+    def unscale_row_duals(self, duals) -> List[float]:
+        """Dual de la fila original: d(fun)/d(b_i) = r_i * d(fun)/d(b'_i)."""
+        return [r * d for r, d in zip(self.row_factors, duals)]
+
+    def unscale_bound_duals(self, marginals) -> List[float]:
+        """Marginal de la cota original: d(fun)/d(u_j) = d(fun)/d(u'_j) / s_j."""
+        return [m / s for s, m in zip(self.col_factors, marginals)]
+
+    def summary(self) -> Dict:
+        """Diagnóstico serializable del rango de coeficientes antes y después."""
+        return {
+            "aplicado": self.applied,
+            "pasadas": self.passes,
+            "rango_antes": self._range_dict(self.range_before),
+            "rango_despues": self._range_dict(self.range_after),
+        }
+
+    @staticmethod
+    def _range_dict(value: Tuple[Optional[float], Optional[float]]) -> Dict:
+        min_abs, max_abs = value
+        ratio = max_abs / min_abs if min_abs else None
+        return {"min_abs": min_abs, "max_abs": max_abs, "ratio": ratio}
+
+
+class ModelScaler:
+    """Equilibrado por media geométrica (iterativo) seguido de un equilibrado por máximo."""
+
+    MAX_PASSES = 8
+    MIN_IMPROVEMENT = 0.9  # Se detiene si el rango no mejora al menos un 10%
+
+    @staticmethod
+    def coefficient_range(constraints_data: List[Dict], variables: List[str]) -> Tuple[Optional[float], Optional[float]]:
+        """(mínimo, máximo) de los |a_ij| distintos de cero; (None, None) si no hay."""
+        values = [abs(const['coefficients'].get(var, 0)) for const in constraints_data for var in variables]
+        values = [v for v in values if v != 0]
+        if not values:
+            return None, None
+        return min(values), max(values)
+
+    @staticmethod
+    def needs_scaling(constraints_data: List[Dict], variables: List[str], threshold: float) -> bool:
+        """True si max|a_ij| / min|a_ij| supera el umbral."""
+        min_abs, max_abs = ModelScaler.coefficient_range(constraints_data, variables)
+        return bool(min_abs) and max_abs / min_abs > threshold
+
+    @staticmethod
+    def run(objective_data: Dict, constraints_data: List[Dict], variables: List[str],
+            bounds: Dict[str, Bound], mode: str = "auto", threshold: float = 1e4,
+            integers: Optional[Set[str]] = None) -> ScalingResult:
+        """
+        Escala el modelo según el modo:
+        - "off": nunca.   - "on": siempre.
+        - "auto": solo si el rango de coeficientes supera 'threshold'.
+        Las columnas de 'integers' conservan factor 1.
+        """
+        result = ScalingResult(variables, objective_data, constraints_data, bounds)
+        if mode == "off" or not constraints_data or not variables:
+            return result
+        if mode == "auto" and not ModelScaler.needs_scaling(constraints_data, variables, threshold):
+            return result
+
+        A = np.array([[float(const['coefficients'].get(var, 0)) for var in variables]
+                      for const in constraints_data])
+        abs_A = np.abs(A)
+        mask = abs_A > 0
+        row_f = np.ones(A.shape[0])
+        col_f = np.ones(A.shape[1])
+        fixed_cols = np.array([var in (integers or set()) for var in variables])
+
+        def current_ratio():
+            scaled = abs_A * row_f[:, None] * col_f[None, :]
+            return scaled[mask].max() / scaled[mask].min()
+
+        ratio = current_ratio()
+        for _ in range(ModelScaler.MAX_PASSES):
+            scaled = abs_A * row_f[:, None] * col_f[None, :]
+            row_f = row_f / ModelScaler._geometric_factors(scaled, mask, axis=1)
+            scaled = abs_A * row_f[:, None] * col_f[None, :]
+            col_f = col_f / ModelScaler._geometric_factors(scaled, mask, axis=0)
+            col_f[fixed_cols] = 1.0
+            result.passes += 1
+
+            new_ratio = current_ratio()
+            if new_ratio > ModelScaler.MIN_IMPROVEMENT * ratio:
+                ratio = new_ratio
+                break
+            ratio = new_ratio
+
+        # Equilibrado final: el mayor |a_ij| de cada fila queda cerca de 1
+        scaled = abs_A * row_f[:, None] * col_f[None, :]
+        row_max = np.where(mask.any(axis=1), np.where(mask, scaled, 0).max(axis=1), 1.0)
+        row_f = row_f / row_max
+
+        row_f = ModelScaler._power_of_two(row_f)
+        col_f = ModelScaler._power_of_two(col_f)
+
+        result.row_factors = row_f.tolist()
+        result.col_factors = col_f.tolist()
+        result.applied = True
+
+        # --- Armado del modelo escalado (mismo formato JSON de la app) ---
+        s = dict(zip(variables, result.col_factors))
+        result.objective_data = {
+            "type": objective_data['type'],
+            "coefficients": {var: objective_data['coefficients'].get(var, 0) * s[var] for var in variables},
+        }
+        result.constraints_data = [
+            {
+                "coefficients": {var: const['coefficients'].get(var, 0) * r * s[var] for var in variables},
+                "operator": const['operator'],
+                "rhs": const['rhs'] * r,
+            }
+            for const, r in zip(constraints_data, result.row_factors)
+        ]
+        result.bounds = {}
+        for var in variables:
+            lb, ub = bounds[var]
+            result.bounds[var] = (None if lb is None else lb / s[var], None if ub is None else ub / s[var])
+        result.range_after = ModelScaler.coefficient_range(result.constraints_data, variables)
+
+        logger.info("Escalado aplicado: rango de coeficientes %s -> %s",
+                    _ratio_str(result.range_before), _ratio_str(result.range_after))
+        return result
+
+    @staticmethod
+    def _geometric_factors(scaled: np.ndarray, mask: np.ndarray, axis: int) -> np.ndarray:
+        """sqrt(max * min) de cada fila (axis=1) o columna (axis=0), ignorando ceros."""
+        big = np.where(mask, scaled, 0).max(axis=axis)
+        small = np.where(mask, scaled, np.inf).min(axis=axis)
+        factors = np.sqrt(big * small)
+        return np.where(np.isfinite(factors) & (factors > 0), factors, 1.0)
+
+    @staticmethod
+    def _power_of_two(factors: np.ndarray) -> np.ndarray:
+        return np.array([2.0 ** round(math.log2(f)) for f in factors])
+
+
+def _ratio_str(value: Tuple[Optional[float], Optional[float]]) -> str:
+    """Formatea el rango (min, max) como 'max/min' para los logs."""
+    min_abs, max_abs = value
+    if not min_abs:
+        return "n/a"
+    return f"{max_abs / min_abs:.3g}"
@@ -6,10 +6,35 @@ para facilitar las importaciones.
 """
 
 from .storage_service import StorageService
-from .pdf_report_service import PdfReportService
+from .solver_backends import SolverBackendRegistry, SolverModel
+from .pdf_batch_service import PdfBatchService
+from .tableau_renderer import TableauHtmlRenderer
+from .solution_writer import SolutionWriter
+from .metrics_service import Metrics
+from .profiling_service import SolveProfiler
+from .solve_executor import SolveExecutor
+from .visualization_policy import VisualizationPolicy, VisualizationPlan
 
 # Define la API pública de este módulo
 __all__ = [
     'StorageService',
-    'PdfReportService'
-]
\ No newline at end of file
+    'PdfReportService',
+    'SolverBackendRegistry',
+    'SolverModel',
+    'PdfBatchService',
+    'TableauHtmlRenderer',
+    'SolutionWriter',
+    'Metrics',
+    'SolveProfiler',
+    'SolveExecutor',
+    'VisualizationPolicy',
+    'VisualizationPlan'
+]
+
+
+def __getattr__(name):
+    # PdfReportService importa ReportLab: se carga recién cuando alguien lo pide
+    if name == 'PdfReportService':
+        from .pdf_report_service import PdfReportService
+        return PdfReportService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
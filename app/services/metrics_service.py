@@ -0,0 +1,285 @@
+"""
+Módulo de Servicios: Métricas de la aplicación en formato de texto de Prometheus.
+
+Cada proceso acumula sus métricas en memoria (histogramas de latencia por
+etapa, tamaños de modelo, iteraciones, contadores de resoluciones y de
+cachés) y las vuelca a METRICS_DIR/metricas_<pid>.json como mucho una vez
+cada METRICS_FLUSH_INTERVAL segundos, desde un timer y no desde la request.
+
+/metrics suma los archivos de todos los procesos, así el resultado es el
+mismo sin importar qué worker de gunicorn atiende la consulta:
+- Contadores e histogramas se suman (incluidos los de workers ya terminados,
+  para que los contadores no retrocedan cuando gunicorn recicla un worker).
+- Los gauges (profundidad de cola, entradas en caché) solo de procesos vivos.
+"""
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from app import config
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10_000, 50_000, 100_000)
+ITERATION_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+# nombre -> (tipo, ayuda, buckets)
+METRICS = {
+    "simplex_stage_seconds": ("histogram", "Duración de cada etapa (segundos).", LATENCY_BUCKETS),
+    "simplex_model_rows": ("histogram", "Filas del modelo enviado al solver.", SIZE_BUCKETS),
+    "simplex_model_columns": ("histogram", "Columnas del modelo enviado al solver.", SIZE_BUCKETS),
+    "simplex_model_nonzeros": ("histogram", "No-ceros del modelo enviado al solver.", SIZE_BUCKETS),
+    "simplex_solver_iterations": ("histogram", "Iteraciones informadas por el backend.", ITERATION_BUCKETS),
+    "simplex_solves_total": ("counter", "Resoluciones por backend y estado.", None),
+    "simplex_cache_requests_total": ("counter", "Consultas a cada caché por resultado (hit/miss).", None),
+    "simplex_persistence_queue_depth": ("gauge", "Reportes encolados para escribir (write-behind).", None),
+    "simplex_tableau_html_cache_entries": ("gauge", "Tablas en la caché de HTML.", None),
+    "simplex_metrics_processes": ("gauge", "Procesos vivos que informan métricas.", None),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Metrics:
+    """Registro de métricas del proceso + agregación entre procesos para /metrics."""
+
+    _lock = threading.Lock()
+    _pid = None
+    _counters: Dict[Tuple[str, Labels], float] = {}
+    _histograms: Dict[Tuple[str, Labels], list] = {}  # [conteo por bucket..., suma, cantidad]
+    _timer = None
+    _last_flush = 0.0
+
+    # --- Registro (proceso actual) ---
+
+    @staticmethod
+    def observe(name: str, value: float, **labels):
+        """Suma una observación al histograma 'name'."""
+        if not config.METRICS_ENABLED or value is None:
+            return
+        buckets = METRICS[name][2]
+        key = (name, _labels(labels))
+        with Metrics._lock:
+            Metrics._check_fork()
+            series = Metrics._histograms.get(key)
+            if series is None:
+                series = Metrics._histograms[key] = [0] * len(buckets) + [0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+        Metrics._schedule_flush()
+
+    @staticmethod
+    def inc(name: str, amount: float = 1, **labels):
+        """Incrementa el contador 'name'."""
+        if not config.METRICS_ENABLED:
+            return
+        key = (name, _labels(labels))
+        with Metrics._lock:
+            Metrics._check_fork()
+            Metrics._counters[key] = Metrics._counters.get(key, 0) + amount
+        Metrics._schedule_flush()
+
+    @staticmethod
+    def observe_stages(timings: Dict[str, float]):
+        """Tiempos por etapa (segundos) de una resolución o de cualquier otra operación."""
+        for stage, seconds in timings.items():
+            Metrics.observe("simplex_stage_seconds", seconds, stage=stage)
+
+    @staticmethod
+    def observe_solve(status: str, backend_info: dict = None, iterations: int = None):
+        """Resolución terminada: estado, backend, tamaño del modelo e iteraciones."""
+        backend = backend_info["backend"] if backend_info else "ninguno"
+        Metrics.inc("simplex_solves_total", backend=backend, estado=status)
+        if backend_info and backend_info.get("modelo"):
+            model = backend_info["modelo"]
+            Metrics.observe("simplex_model_rows", model["filas"])
+            Metrics.observe("simplex_model_columns", model["columnas"])
+            Metrics.observe("simplex_model_nonzeros", model["no_ceros"])
+        if iterations is not None:
+            Metrics.observe("simplex_solver_iterations", iterations, backend=backend)
+
+    @staticmethod
+    def reset():
+        """Descarta las métricas del proceso (no toca los archivos de otros procesos)."""
+        with Metrics._lock:
+            Metrics._counters, Metrics._histograms = {}, {}
+            Metrics._pid = os.getpid()
+
+    @staticmethod
+    def clear_directory():
+        """Borra las métricas volcadas por todos los procesos (al arrancar el servidor)."""
+        if not os.path.isdir(config.METRICS_DIR):
+            return
+        for name in os.listdir(config.METRICS_DIR):
+            if name.startswith("metricas_"):
+                os.remove(os.path.join(config.METRICS_DIR, name))
+
+    @staticmethod
+    def _check_fork():
+        """Tras un fork (gunicorn), el worker empieza con sus propias métricas."""
+        if Metrics._pid != os.getpid():
+            Metrics._pid = os.getpid()
+            Metrics._counters, Metrics._histograms = {}, {}
+            Metrics._timer = None
+
+    # --- Volcado a disco ---
+
+    @staticmethod
+    def _schedule_flush():
+        with Metrics._lock:
+            if Metrics._timer is not None:
+                return
+            delay = max(0.0, Metrics._last_flush + config.METRICS_FLUSH_INTERVAL - time.monotonic())
+            Metrics._timer = threading.Timer(delay, Metrics._timed_flush)
+            Metrics._timer.daemon = True
+            Metrics._timer.start()
+
+    @staticmethod
+    def _timed_flush():
+        with Metrics._lock:
+            Metrics._timer = None
+        try:
+            Metrics.flush()
+        except OSError:
+            pass  # Se reintenta con la próxima observación o consulta
+
+    @staticmethod
+    def flush():
+        """Escribe de forma atómica el estado del proceso en metricas_<pid>.json."""
+        snapshot = Metrics._snapshot()
+        os.makedirs(config.METRICS_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=config.METRICS_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, os.path.join(config.METRICS_DIR, f"metricas_{snapshot['pid']}.json"))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        Metrics._last_flush = time.monotonic()
+
+    @staticmethod
+    def _snapshot() -> dict:
+        """Contadores e histogramas propios + los valores que se leen de otros servicios."""
+        # Import diferido: los servicios de caché/persistencia no dependen de las métricas
+        from app.services.solution_writer import SolutionWriter
+        from app.services.storage_service import _read_tableaus
+        from app.services.tableau_renderer import TableauHtmlRenderer
+
+        html_cache = TableauHtmlRenderer.cache_info()
+        history_cache = _read_tableaus.cache_info()
+        collected = {
+            (("cache", "tablas_html"), ("resultado", "hit")): html_cache["hits"],
+            (("cache", "tablas_html"), ("resultado", "miss")): html_cache["misses"],
+            (("cache", "historial_tablas"), ("resultado", "hit")): history_cache.hits,
+            (("cache", "historial_tablas"), ("resultado", "miss")): history_cache.misses,
+        }
+        with Metrics._lock:
+            Metrics._check_fork()
+            counters = [[name, list(labels), value] for (name, labels), value in Metrics._counters.items()]
+            histograms = [[name, list(labels), list(series)]
+                          for (name, labels), series in Metrics._histograms.items()]
+        counters += [["simplex_cache_requests_total", list(labels), value] for labels, value in collected.items()]
+        gauges = [
+            ["simplex_persistence_queue_depth", [], SolutionWriter.metrics()["profundidad_cola"]],
+            ["simplex_tableau_html_cache_entries", [], html_cache["size"]],
+        ]
+        return {"pid": os.getpid(), "counters": counters, "histograms": histograms, "gauges": gauges}
+
+    # --- Agregación y formato de texto ---
+
+    @staticmethod
+    def collect() -> Tuple[dict, dict, dict]:
+        """Suma los archivos de todos los procesos: (contadores, histogramas, gauges)."""
+        Metrics.flush()
+        counters, histograms, gauges = {}, {}, {}
+        live = 0
+        for name in sorted(os.listdir(config.METRICS_DIR)):
+            if not (name.startswith("metricas_") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(config.METRICS_DIR, name), "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # Un archivo a medio borrar no invalida la consulta
+            for metric, labels, value in snapshot["counters"]:
+                key = (metric, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for metric, labels, series in snapshot["histograms"]:
+                key = (metric, tuple(map(tuple, labels)))
+                total = histograms.setdefault(key, [0] * len(series))
+                histograms[key] = [a + b for a, b in zip(total, series)]
+            if Metrics._is_alive(snapshot["pid"]):
+                live += 1
+                for metric, labels, value in snapshot["gauges"]:
+                    key = (metric, tuple(map(tuple, labels)))
+                    gauges[key] = gauges.get(key, 0) + value
+        gauges[("simplex_metrics_processes", ())] = live
+        return counters, histograms, gauges
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        if pid == os.getpid():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    @staticmethod
+    def render() -> str:
+        """Texto de exposición de Prometheus (version 0.0.4) con las métricas de todos los procesos."""
+        counters, histograms, gauges = Metrics.collect()
+        lines: List[str] = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            source = {"counter": counters, "gauge": gauges, "histogram": histograms}[kind]
+            series = sorted((labels, value) for (metric, labels), value in source.items() if metric == name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                if kind == "histogram":
+                    lines.extend(Metrics._histogram_lines(name, labels, buckets, value))
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_lines(name: str, labels: Labels, buckets: tuple, series: list) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip(buckets, series):
+            cumulative += count
+            yield f"{name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {cumulative}"
+        yield f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {series[-1]}"
+        yield f"{name}_sum{_format_labels(labels)} {_format_value(series[-2])}"
+        yield f"{name}_count{_format_labels(labels)} {series[-1]}"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(float(value))
+    return repr(float(value))
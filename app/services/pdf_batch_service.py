@@ -0,0 +1,337 @@
+"""
+Módulo de Servicios: Exportación de PDFs en lote.
+
+Funcionalidad:
+- Recibe una lista de ids de solución y maqueta sus PDFs en un pool de
+  procesos (ReportLab es CPU-bound y no libera el GIL).
+- Reutiliza la caché de PDFs: las soluciones sin cambios no se vuelven a maquetar.
+- Junta los PDFs en un único .zip, escrito en disco a medida que llegan.
+- Publica el progreso en un 'estado.json' por lote, así cualquier proceso
+  web puede responder la consulta de progreso o la descarga.
+- Limita la memoria de cada lote (PDF_BATCH_MEMORY_LIMIT_MB) con un límite
+  de espacio de direcciones en sus procesos: un reporte que lo supere falla
+  solo, sin afectar al resto del lote ni al servidor. Si el proceso muere
+  (rompe el pool), se arma otro pool y los ids que estaban en curso se
+  reintentan de a uno para saber cuál fue.
+- Los lotes se borran PDF_BATCH_TTL segundos después de creados.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List
+
+try:  # Solo disponible en sistemas Unix
+    import resource
+except ImportError:
+    resource = None
+
+from app import config
+from app.services import storage_service
+from app.services.solution_writer import SolutionWriter
+from app.services.storage_service import StorageService
+
+ESTADO_EN_COLA = "en_cola"
+ESTADO_PROCESANDO = "procesando"
+ESTADO_COMPLETADO = "completado"
+ESTADO_FALLIDO = "fallido"
+
+_JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+_STATUS_FILENAME = "estado.json"
+_ZIP_FILENAME = "reportes.zip"
+
+_WORKER_DIED = "El proceso que maquetaba el reporte terminó de forma inesperada (¿límite de memoria del lote?)."
+
+logger = logging.getLogger(__name__)
+
+_job_slots = threading.BoundedSemaphore(config.PDF_BATCH_MAX_CONCURRENT_JOBS)
+_threads: Dict[str, threading.Thread] = {}
+
+
+# --- Código que corre en los procesos del pool ---
+
+def _init_worker(output_dir: str, cache_dir: str, memory_limit_bytes: int):
+    """Configura cada proceso: mismos directorios que el proceso web y límite de memoria."""
+    storage_service.OUTPUT_DIR = output_dir
+    storage_service.PDF_CACHE_DIR = cache_dir
+    if not memory_limit_bytes or resource is None or not os.path.exists("/proc/self/statm"):
+        return
+    # El límite es adicional a lo que ya ocupa el proceso con sus imports
+    with open("/proc/self/statm") as f:
+        current = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    limit = current + memory_limit_bytes
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _render_solution_pdf(solution_id: int, scratch_dir: str, cache_enabled: bool) -> str:
+    """
+    Maqueta (o toma de la caché) el PDF de una solución. Retorna el path del
+    archivo: el PDF nunca viaja entre procesos, solo su ubicación.
+    """
+    from app.services.pdf_report_service import PdfReportService  # ReportLab, solo en los procesos del lote
+
+    report = StorageService.load_solution_by_id(solution_id)
+    content_hash = PdfReportService.content_hash(report)
+
+    if cache_enabled:
+        cached_path = StorageService.get_cached_pdf_path(solution_id, content_hash)
+        if cached_path:
+            return cached_path
+
+    pdf_bytes = PdfReportService(report).render().getvalue()
+    if cache_enabled:
+        return StorageService.save_cached_pdf(solution_id, content_hash, pdf_bytes)
+
+    path = os.path.join(scratch_dir, f"{config.PREFIX_PDF}{solution_id}.pdf")
+    with open(path, "wb") as f:
+        f.write(pdf_bytes)
+    return path
+
+
+# --- Servicio ---
+
+class PdfBatchService:
+    """Lotes de exportación: creación, ejecución en segundo plano, progreso y descarga."""
+
+    @staticmethod
+    def start(solution_ids: List[int], workers: int = None) -> str:
+        """Crea el lote, lo encola en un hilo de fondo y retorna su id."""
+        ids = PdfBatchService._validate_ids(solution_ids)
+        PdfBatchService._purge_expired()
+        job_id = uuid.uuid4().hex
+        os.makedirs(PdfBatchService._job_dir(job_id))
+        PdfBatchService._write_status(job_id, {
+            "job_id": job_id,
+            "estado": ESTADO_EN_COLA,
+            "ids": ids,
+            "total": len(ids),
+            "completados": 0,
+            "exportados": [],
+            "fallidos": [],
+            "progreso": 0.0,
+            "creado": time.time(),
+        })
+
+        thread = threading.Thread(target=PdfBatchService.run, args=(job_id, workers),
+                                  name=f"pdf-lote-{job_id[:8]}", daemon=True)
+        # Los hilos de lotes terminados que nadie esperó con wait() no se acumulan
+        for finished_id in [jid for jid, t in list(_threads.items()) if not t.is_alive()]:
+            _threads.pop(finished_id, None)
+        _threads[job_id] = thread
+        thread.start()
+        return job_id
+
+    @staticmethod
+    def wait(job_id: str, timeout: float = None) -> dict:
+        """Espera a que termine un lote lanzado por este proceso; retorna su estado."""
+        thread = _threads.get(job_id)
+        if thread is not None:
+            thread.join(timeout)
+            if not thread.is_alive():
+                _threads.pop(job_id, None)
+        return PdfBatchService.get_status(job_id)
+
+    @staticmethod
+    def run(job_id: str, workers: int = None):
+        """Procesa el lote (bloqueante). Se llama desde el hilo creado por start()."""
+        with _job_slots:
+            status = PdfBatchService.get_status(job_id)
+            ids = status["ids"]
+            workers = max(1, min(workers or config.PDF_BATCH_MAX_WORKERS, len(ids)))
+            job_dir = PdfBatchService._job_dir(job_id)
+            memory_per_worker = config.PDF_BATCH_MEMORY_LIMIT_MB * 1024 * 1024 // workers
+
+            status["estado"] = ESTADO_PROCESANDO
+            PdfBatchService._write_status(job_id, status)
+            # Los procesos del pool leen los reportes de disco: los que este
+            # proceso todavía tiene encolados (write-behind) se escriben antes
+            if not SolutionWriter.flush(timeout=config.PDF_BATCH_FLUSH_TIMEOUT):
+                logger.warning("Lote %s: quedaron reportes sin escribir tras %g s.",
+                               job_id, config.PDF_BATCH_FLUSH_TIMEOUT)
+
+            tmp_zip = os.path.join(job_dir, _ZIP_FILENAME + ".tmp")
+            try:
+                with zipfile.ZipFile(tmp_zip, "w", zipfile.ZIP_DEFLATED) as archive:
+                    queued, suspects = list(ids), []
+                    while queued or suspects:
+                        # Tras la caída de un proceso, los ids que estaban en curso van de a uno
+                        todo = suspects or queued
+                        in_flight = PdfBatchService._collect_in_new_pool(
+                            job_id, status, todo, archive, 1 if suspects else workers, memory_per_worker)
+                        if len(in_flight) == 1:  # Era el único en curso: fue él
+                            status["fallidos"].append({"id": in_flight[0], "error": _WORKER_DIED})
+                        processed = PdfBatchService._processed(status)
+                        if not suspects and len(in_flight) > 1:
+                            suspects = in_flight
+                        else:
+                            suspects = [sid for sid in suspects if sid not in processed]
+                        queued = [sid for sid in queued if sid not in processed and sid not in suspects]
+            except Exception as e:
+                # Fallo del lote entero (ej: disco lleno al escribir el .zip): lo pendiente falla
+                processed = PdfBatchService._processed(status)
+                status["fallidos"] += [{"id": sid, "error": f"Error del lote: {e}"}
+                                       for sid in ids if sid not in processed]
+
+            if status["exportados"]:
+                os.replace(tmp_zip, os.path.join(job_dir, _ZIP_FILENAME))
+                status["estado"] = ESTADO_COMPLETADO
+            else:
+                if os.path.exists(tmp_zip):
+                    os.remove(tmp_zip)
+                status["estado"] = ESTADO_FALLIDO
+            status["progreso"] = 1.0
+            status["terminado"] = time.time()
+            PdfBatchService._write_status(job_id, status)
+
+    @staticmethod
+    def _collect_in_new_pool(job_id: str, status: dict, ids: List[int], archive,
+                             workers: int, memory_per_worker: int) -> List[int]:
+        """
+        Procesa los ids en un pool nuevo. Retorna los ids que estaban en curso
+        si se cayó un proceso (el pool queda inservible); lista vacía si no.
+        """
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(storage_service.OUTPUT_DIR, storage_service.PDF_CACHE_DIR, memory_per_worker),
+        ) as pool:
+            return PdfBatchService._collect(job_id, status, ids, pool, archive, workers)
+
+    @staticmethod
+    def _collect(job_id: str, status: dict, ids: List[int], pool, archive, window: int) -> List[int]:
+        """
+        Envía los ids al pool de a 'window' y agrega al .zip cada PDF que llega.
+        Retorna los ids en curso si se rompió el pool; lista vacía si terminó.
+        """
+        pending = {}
+        remaining = iter(ids)
+        scratch_dir = PdfBatchService._job_dir(job_id)
+
+        def submit_next():
+            sid = next(remaining, None)
+            if sid is not None:
+                future = pool.submit(_render_solution_pdf, sid, scratch_dir, config.PDF_CACHE_ENABLED)
+                pending[future] = sid
+
+        try:
+            for _ in range(window):
+                submit_next()
+        except BrokenProcessPool:
+            if not pending:  # Ni el primer envío: el pool no sirve para ningún id
+                raise
+            return list(pending.values())
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                sid = pending.pop(future)
+                try:
+                    path = future.result()
+                    archive.write(path, arcname=f"{config.PREFIX_PDF}{sid}.pdf")
+                    if os.path.dirname(path) == scratch_dir:
+                        os.remove(path)
+                    status["exportados"].append(sid)
+                    status["completados"] += 1
+                except BrokenProcessPool:
+                    # Los demás futures del pool fallan igual: todos vuelven como "en curso"
+                    return [sid] + list(pending.values())
+                except MemoryError:
+                    status["fallidos"].append(
+                        {"id": sid, "error": "Se superó el límite de memoria del lote."})
+                except Exception as e:
+                    status["fallidos"].append({"id": sid, "error": str(e)})
+                try:
+                    submit_next()
+                except BrokenProcessPool:  # El id que no se pudo enviar sigue sin procesar
+                    return list(pending.values())
+
+            processed = status["completados"] + len(status["fallidos"])
+            status["progreso"] = round(processed / status["total"], 4)
+            PdfBatchService._write_status(job_id, status)
+
+        return []
+
+    # --- Consulta ---
+
+    @staticmethod
+    def get_status(job_id: str) -> dict:
+        """Estado del lote; None si no existe."""
+        if not _JOB_ID_PATTERN.match(job_id or ""):
+            return None
+        path = os.path.join(PdfBatchService._job_dir(job_id), _STATUS_FILENAME)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def get_zip_path(job_id: str) -> str:
+        """Path del .zip de un lote terminado; None si no existe (todavía)."""
+        if not _JOB_ID_PATTERN.match(job_id or ""):
+            return None
+        path = os.path.join(PdfBatchService._job_dir(job_id), _ZIP_FILENAME)
+        return path if os.path.exists(path) else None
+
+    # --- Internos ---
+
+    @staticmethod
+    def _validate_ids(solution_ids) -> List[int]:
+        if not isinstance(solution_ids, list) or not solution_ids:
+            raise ValueError("Se espera una lista no vacía de ids de solución.")
+        if len(solution_ids) > config.PDF_BATCH_MAX_IDS:
+            raise ValueError(f"Un lote admite como máximo {config.PDF_BATCH_MAX_IDS} soluciones.")
+        ids = []
+        for sid in solution_ids:
+            if isinstance(sid, bool) or not isinstance(sid, int) or sid < 1:
+                raise ValueError(f"Id de solución inválido: {sid!r}.")
+            if sid not in ids:
+                ids.append(sid)
+        return ids
+
+    @staticmethod
+    def _processed(status: dict) -> set:
+        return set(status["exportados"]) | {item["id"] for item in status["fallidos"]}
+
+    @staticmethod
+    def _purge_expired():
+        """Borra los lotes creados hace más de PDF_BATCH_TTL segundos (estado, .zip y temporales)."""
+        if not os.path.isdir(config.PDF_BATCH_DIR):
+            return
+        now = time.time()
+        for job_id in os.listdir(config.PDF_BATCH_DIR):
+            job_dir = PdfBatchService._job_dir(job_id)
+            if not _JOB_ID_PATTERN.match(job_id) or (job_id in _threads and _threads[job_id].is_alive()):
+                continue
+            try:
+                status = PdfBatchService.get_status(job_id) or {}
+                created = status.get("creado") or os.path.getmtime(job_dir)
+            except (OSError, ValueError):  # Estado a medio escribir o lote ya borrado
+                continue
+            if now - created > config.PDF_BATCH_TTL:
+                shutil.rmtree(job_dir, ignore_errors=True)
+
+    @staticmethod
+    def _job_dir(job_id: str) -> str:
+        return os.path.join(config.PDF_BATCH_DIR, job_id)
+
+    @staticmethod
+    def _write_status(job_id: str, status: dict):
+        """Escritura atómica: quien consulta el progreso nunca lee un JSON a medias."""
+        job_dir = PdfBatchService._job_dir(job_id)
+        fd, tmp_path = tempfile.mkstemp(dir=job_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(status, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(job_dir, _STATUS_FILENAME))
@@ -3,63 +3,190 @@ Servicio de Generación de Reportes PDF. (NUEVO)
 
 Utiliza ReportLab para "dibujar" el reporte de la solución en un archivo PDF,
 incluyendo las tablas intermedias del Simplex.
+
+Las tablas intermedias no se arman todas de antemano: el documento consume
+la "story" por tramos (ver ChunkedStory), así un reporte con cientos de
+iteraciones no tiene todas sus Table en memoria a la vez. 'stream()' entrega
+el PDF en bloques para enviarlo sin pasar por disco.
 """
+import hashlib
+import io
+import json
+import logging
+from typing import Iterable, Iterator
+
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch, cm
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from types import MappingProxyType
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+
+def _build_styles() -> MappingProxyType:
+    """Estilos de párrafo del reporte (los de ReportLab + los propios), de solo lectura."""
+    styles = getSampleStyleSheet()
+    
+    # Renombramos los estilos para que no choquen con los de ReportLab
+    styles.add(ParagraphStyle(name='PDFTitle', fontSize=18, alignment=TA_CENTER, spaceAfter=20))
+    styles.add(ParagraphStyle(name='PDFHeading1', fontSize=14, spaceAfter=12, spaceBefore=10, textColor=colors.HexColor("#0d6efd")))
+    styles.add(ParagraphStyle(name='PDFHeading2', fontSize=12, spaceAfter=8, spaceBefore=8, textColor=colors.HexColor("#343a40")))
+    styles.add(ParagraphStyle(name='PDFHeading3', fontSize=10, spaceAfter=6, spaceBefore=6, textColor=colors.HexColor("#555555")))
+    styles.add(ParagraphStyle(name='PDFCode', fontName='Courier', fontSize=9, alignment=TA_LEFT, spaceAfter=6, borderPadding=8, backgroundColor=colors.whitesmoke, borderRadius=5, paddingLeft=10, paddingRight=10, paddingTop=10, paddingBottom=10))
+    styles.add(ParagraphStyle(name='PDFSuccess', fontSize=12, textColor=colors.darkgreen))
+    styles.add(ParagraphStyle(name='PDFFail', fontSize=12, textColor=colors.red))
+    
+    return MappingProxyType(dict(styles.byName))
+
+
+# --- Estilos compartidos (se arman una sola vez por proceso; no modificarlos) ---
+STYLES = _build_styles()
+
+SOLUTION_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#343a40")),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+])
+
+TABLEAU_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#343a40")),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
+    ('ALIGN', (0, 1), (0, -1), 'CENTER'),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+    ('FONTNAME', (1, 1), (-1, -1), 'Courier'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+])
+
+PIVOT_BACKGROUND = colors.HexColor("#fff0f0")
+
+
+class ChunkedStory(list):
+    """
+    Lista de flowables que se rellena desde un generador a medida que
+    SimpleDocTemplate.build la consume (build solo usa len(), [0], del [0]
+    e inserciones al principio). Nunca tiene más de 'chunk_size' pendientes.
+    """
+
+    def __init__(self, source: Iterable, chunk_size: int):
+        super().__init__()
+        self._source = iter(source)
+        self._chunk_size = chunk_size
+        self._exhausted = False
+
+    def _refill(self):
+        while not self._exhausted and list.__len__(self) < self._chunk_size:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._exhausted = True
+
+    def __len__(self):
+        self._refill()
+        return list.__len__(self)
+
 
 class PdfReportService:
     """Genera un PDF a partir del diccionario 'final_report'."""
 
+    # Cambiarlo invalida la caché de PDFs cuando cambia el diseño del reporte
+    LAYOUT_VERSION = 1
+
     # --- INICIO DE CORRECCIÓN (¡EL BUG ESTABA AQUÍ!) ---
-    def __init__(self, report_data: dict, output_filename: str): # ¡DOBLE GUIÓN BAJO!
+    def __init__(self, report_data: dict, output_filename: str = None): # ¡DOBLE GUIÓN BAJO!
     # --- FIN DE CORRECCIÓN ---
+        """'output_filename' solo es necesario para generate(); stream() no usa disco."""
         self.report_data = report_data
         self.output_filename = output_filename
-        self.doc = SimpleDocTemplate(output_filename, pagesize=A4,
-                                     rightMargin=1.5*cm, leftMargin=1.5*cm,
-                                     topMargin=1.5*cm, bottomMargin=1.5*cm)
+        self.doc = self._new_document(output_filename) if output_filename else None
         self.story = []
-        self.styles = self._setup_styles()
+        self.styles = STYLES
 
-    def _setup_styles(self):
-        """Configura estilos de párrafo personalizados."""
-        styles = getSampleStyleSheet()
-        
-        # Renombramos los estilos para que no choquen con los de ReportLab
-        styles.add(ParagraphStyle(name='PDFTitle', fontSize=18, alignment=TA_CENTER, spaceAfter=20))
-        styles.add(ParagraphStyle(name='PDFHeading1', fontSize=14, spaceAfter=12, spaceBefore=10, textColor=colors.HexColor("#0d6efd")))
-        styles.add(ParagraphStyle(name='PDFHeading2', fontSize=12, spaceAfter=8, spaceBefore=8, textColor=colors.HexColor("#343a40")))
-        styles.add(ParagraphStyle(name='PDFHeading3', fontSize=10, spaceAfter=6, spaceBefore=6, textColor=colors.HexColor("#555555")))
-        styles.add(ParagraphStyle(name='PDFCode', fontName='Courier', fontSize=9, alignment=TA_LEFT, spaceAfter=6, borderPadding=8, backgroundColor=colors.whitesmoke, borderRadius=5, paddingLeft=10, paddingRight=10, paddingTop=10, paddingBottom=10))
-        styles.add(ParagraphStyle(name='PDFSuccess', fontSize=12, textColor=colors.darkgreen))
-        styles.add(ParagraphStyle(name='PDFFail', fontSize=12, textColor=colors.red))
-        
-        return styles
+    @staticmethod
+    def _new_document(target) -> SimpleDocTemplate:
+        """'target' puede ser un path o un objeto tipo archivo (ej: io.BytesIO)."""
+        return SimpleDocTemplate(target, pagesize=A4,
+                                 rightMargin=1.5*cm, leftMargin=1.5*cm,
+                                 topMargin=1.5*cm, bottomMargin=1.5*cm)
 
     def generate(self) -> str:
         """Construye y guarda el documento PDF. Retorna el path."""
         try:
-            self.story.append(Paragraph("Reporte de Solución Simplex", self.styles['PDFTitle']))
-
-            problem = self.report_data.get('problema_definicion', {})
-            solution = self.report_data.get('solucion_encontrada', {})
-            tableaus = self.report_data.get('tablas_intermedias', [])
-
-            self._build_problem_section(problem)
-            self._build_solution_section(solution)
-            self._build_tableaus_section(tableaus)
-
-            self.doc.build(self.story)
+            self.doc.build(self._story())
             return self.output_filename
 
         except Exception as e:
-            print(f"Error al generar el archivo PDF: {e}")
+            logger.error("Error al generar el archivo PDF: %s", e)
             raise 
 
+    def render(self) -> io.BytesIO:
+        """Construye el PDF en memoria (sin archivo en disco)."""
+        buffer = io.BytesIO()
+        try:
+            self._new_document(buffer).build(self._story())
+        except Exception as e:
+            logger.error("Error al generar el archivo PDF: %s", e)
+            raise
+        buffer.seek(0)
+        return buffer
+
+    def stream(self, chunk_size: int = None) -> Iterator[bytes]:
+        """
+        Construye el PDF y lo devuelve en bloques de 'chunk_size' bytes.
+        El armado se hace al crear el iterador, así los errores se lanzan
+        antes de empezar a responder.
+        (ReportLab escribe la tabla de referencias al final, por eso el
+        primer byte sale recién cuando termina la maquetación)
+        """
+        buffer = self.render()
+        return self.iter_chunks(buffer, chunk_size)
+
+    @staticmethod
+    def iter_chunks(buffer: io.BytesIO, chunk_size: int = None) -> Iterator[bytes]:
+        """Recorre un PDF ya armado en bloques de 'chunk_size' bytes."""
+        chunk_size = chunk_size or config.PDF_STREAM_CHUNK_SIZE
+        with buffer:
+            while True:
+                chunk = buffer.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    @staticmethod
+    def content_hash(report_data: dict) -> str:
+        """Hash (sha256) del reporte + versión del diseño: identifica el PDF resultante."""
+        canonical = json.dumps(report_data, sort_keys=True, ensure_ascii=False, default=str)
+        payload = f"{PdfReportService.LAYOUT_VERSION}:{canonical}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def _story(self) -> ChunkedStory:
+        return ChunkedStory(self._iter_flowables(), config.PDF_STORY_CHUNK_SIZE)
+
+    def _iter_flowables(self) -> Iterator:
+        """Flowables del reporte en orden; las tablas se crean recién cuando el documento las pide."""
+        problem = self.report_data.get('problema_definicion', {})
+        solution = self.report_data.get('solucion_encontrada', {})
+        tableaus = self.report_data.get('tablas_intermedias', [])
+
+        self.story = [Paragraph("Reporte de Solución Simplex", self.styles['PDFTitle'])]
+        self._build_problem_section(problem)
+        self._build_solution_section(solution)
+        yield from self.story
+        self.story = []
+
+        yield from self._build_tableaus_section(tableaus)
+
     def _build_problem_section(self, problem: dict):
         """Añade la sección de Definición del Problema al PDF."""
         self.story.append(Paragraph("1. Definición del Problema", self.styles['PDFHeading1']))
@@ -79,7 +206,6 @@ class PdfReportService:
         self.story.append(Paragraph("Restricciones", self.styles['PDFHeading2']))
         if not constraints_data:
             self.story.append(Paragraph("No se ingresaron restricciones.", self.styles['Normal']))
-            return
 
         for i, const in enumerate(constraints_data):
             coeffs = const.get('coefficients', {})
@@ -88,6 +214,18 @@ class PdfReportService:
             const_str = " + ".join(f"{v}*{k}" for k, v in coeffs.items() if v != 0).replace("+-", "- ")
             full_str = f"<b>{i+1})</b> {const_str} {op} {rhs}"
             self.story.append(Paragraph(full_str, self.styles['PDFCode']))
+
+        tipos = problem.get('tipos_variables') or {}
+        enteras = [f"{var} ({'binaria' if t == 'binary' else 'entera'})"
+                   for var, t in tipos.items() if t != 'continuous']
+        if enteras:
+            self.story.append(Paragraph(f"<b>Variables enteras:</b> {', '.join(enteras)}", self.styles['Normal']))
+
+        for var, cota in (problem.get('cotas_variables') or {}).items():
+            lower, upper = cota.get('lower', 0), cota.get('upper')
+            lower_str = "-inf" if lower is None else lower
+            upper_str = "inf" if upper is None else upper
+            self.story.append(Paragraph(f"{lower_str} &lt;= {var} &lt;= {upper_str}", self.styles['PDFCode']))
         
         self.story.append(Spacer(1, 0.25 * inch))
 
@@ -114,14 +252,7 @@ class PdfReportService:
             for var, val in var_data.items():
                 table_data.append([var, f"{val:.4f}"])
 
-            t = Table(table_data, colWidths=[2 * inch, 3 * inch], hAlign='LEFT')
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#343a40")),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('BOX', (0, 0), (-1, -1), 1, colors.black),
-            ]))
+            t = Table(table_data, colWidths=[2 * inch, 3 * inch], hAlign='LEFT', style=SOLUTION_TABLE_STYLE)
             self.story.append(t)
         else:
             status = solution.get('status', 'Error')
@@ -132,12 +263,12 @@ class PdfReportService:
         
         self.story.append(PageBreak()) # Salto de página antes de las tablas
 
-    def _build_tableaus_section(self, tableaus: list):
-        """Añade la sección de Tablas Intermedias."""
-        self.story.append(Paragraph("3. Tablas Intermedias (Iteraciones)", self.styles['PDFHeading1']))
+    def _build_tableaus_section(self, tableaus: list) -> Iterator:
+        """Genera (de a una) los flowables de la sección de Tablas Intermedias."""
+        yield Paragraph("3. Tablas Intermedias (Iteraciones)", self.styles['PDFHeading1'])
         
         if not tableaus:
-            self.story.append(Paragraph("No se generaron tablas intermedias (el solver de visualización no pudo procesar el problema).", self.styles['Normal']))
+            yield Paragraph("No se generaron tablas intermedias (el solver de visualización no pudo procesar el problema).", self.styles['Normal'])
             return
 
         for tableau_data in tableaus:
@@ -147,32 +278,21 @@ class PdfReportService:
             if not table_list:
                 continue
 
-            self.story.append(Paragraph(title, self.styles['PDFHeading2']))
+            yield Paragraph(title, self.styles['PDFHeading2'])
             
-            t = Table(table_list, hAlign='LEFT', repeatRows=1)
-            
-            table_style = TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#343a40")),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
-                ('ALIGN', (0, 1), (0, -1), 'CENTER'),
-                ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-                ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-                ('FONTNAME', (1, 1), (-1, -1), 'Courier'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('BOX', (0, 0), (-1, -1), 1, colors.black),
+            yield self._tableau_table(table_list, tableau_data.get("pivot"))
+            yield Spacer(1, 0.25 * inch)
+
+    @staticmethod
+    def _tableau_table(table_list: list, pivot) -> Table:
+        """Tabla con el estilo compartido; solo el resaltado del pivote es propio de cada tabla."""
+        t = Table(table_list, hAlign='LEFT', repeatRows=1, style=TABLEAU_TABLE_STYLE)
+        if pivot:
+            row, col = pivot
+            cell = (col + 1, row + 1)
+            t.setStyle([
+                ('BACKGROUND', cell, cell, PIVOT_BACKGROUND),
+                ('TEXTCOLOR', cell, cell, colors.red),
+                ('FONTNAME', cell, cell, 'Courier-Bold'),
             ])
-            
-            pivot = tableau_data.get("pivot")
-            if pivot:
-                row, col = pivot
-                table_style.add('BACKGROUND', (col + 1, row + 1), (col + 1, row + 1), colors.HexColor("#fff0f0"))
-                table_style.add('TEXTCOLOR', (col + 1, row + 1), (col + 1, row + 1), colors.red)
-                table_style.add('FONTNAME', (col + 1, row + 1), (col + 1, row + 1), 'Courier-Bold')
-
-            t.setStyle(table_style)
-            
-            self.story.append(t)
-            self.story.append(Spacer(1, 0.25 * inch))
\ No newline at end of file
+        return t
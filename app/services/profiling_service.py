@@ -0,0 +1,114 @@
+"""
+Módulo de Servicios: Perfilado de una resolución a pedido (cProfile).
+
+Se activa para una sola resolución (cabecera X-Simplex-Perfil con el token
+de administrador en la web, --interactivo --perfil en app.py). El perfil se guarda junto
+al reporte (perfil_solucion_N.prof, legible con pstats o snakeviz) con
+un resumen en texto (perfil_solucion_N.txt), y los N puntos más costosos
+se devuelven para mostrarlos sin entrar al servidor.
+"""
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+
+class SolveProfiler:
+    """Envuelve una llamada con cProfile y guarda/resume el resultado."""
+
+    # Un solo perfil a la vez: cProfile no admite dos perfiladores activos en el proceso
+    _lock = threading.Lock()
+
+    @staticmethod
+    def is_authorized(token: Optional[str]) -> bool:
+        """True si el token coincide con PROFILING_TOKEN (sin token configurado, nunca)."""
+        expected = config.PROFILING_TOKEN
+        if not expected or not token:
+            return False
+        return hmac.compare_digest(str(token).encode(), expected.encode())
+
+    @staticmethod
+    def profile(func: Callable, *args, **kwargs) -> Tuple[Any, Optional[cProfile.Profile]]:
+        """
+        Ejecuta func(*args, **kwargs) bajo cProfile. Si ya hay otro perfil en curso,
+        la ejecuta sin perfilar y devuelve (resultado, None).
+        """
+        if not SolveProfiler._lock.acquire(blocking=False):
+            logger.warning("Ya hay un perfil en curso; la resolución se ejecuta sin perfilar.")
+            return func(*args, **kwargs), None
+        try:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                profiler.disable()
+            return result, profiler
+        finally:
+            SolveProfiler._lock.release()
+
+    @staticmethod
+    def hotspots(profiler: cProfile.Profile, top: int = None) -> List[dict]:
+        """Las 'top' funciones con más tiempo propio (sin contar las que llaman)."""
+        stats = pstats.Stats(profiler)
+        rows = []
+        for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({
+                "funcion": f"{_short_path(filename)}:{line}({name})",
+                "llamadas": calls,
+                "tiempo_propio": round(own, 6),
+                "tiempo_acumulado": round(cumulative, 6),
+            })
+        rows.sort(key=lambda row: row["tiempo_propio"], reverse=True)
+        return rows[:top or config.PROFILING_TOP_N]
+
+    @staticmethod
+    def save(profiler: cProfile.Profile, report_path: str = None, top: int = None) -> dict:
+        """
+        Guarda el perfil (.prof) y el resumen (.txt) junto al reporte de la solución
+        (solucion_N.json -> perfil_solucion_N.prof), o en PROFILING_DIR con un nombre
+        por fecha si la solución no se guardó. Retorna las rutas y el top N.
+        """
+        if report_path:
+            directory = os.path.dirname(report_path)
+            base = "perfil_" + os.path.splitext(os.path.basename(report_path))[0]
+        else:
+            directory = config.PROFILING_DIR
+            base = f"perfil_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, base)
+        top = top or config.PROFILING_TOP_N
+
+        profiler.dump_stats(f"{path}.prof")
+        summary = io.StringIO()
+        stats = pstats.Stats(profiler, stream=summary)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        with open(f"{path}.txt", "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+
+        logger.info("Perfil de la resolución guardado en: %s.prof", path)
+        return {
+            "archivo": f"{path}.prof",
+            "resumen": f"{path}.txt",
+            "tiempo_total": round(stats.total_tt, 6),
+            "top": SolveProfiler.hotspots(profiler, top),
+        }
+
+
+def _short_path(filename: str) -> str:
+    """Ruta relativa al proyecto o a site-packages, para que el resumen sea legible."""
+    for root in (config.BASE_DIR + os.sep, "site-packages" + os.sep):
+        index = filename.find(root)
+        if index != -1:
+            return filename[index + len(root):]
+    return filename
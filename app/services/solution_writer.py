@@ -0,0 +1,234 @@
+"""
+Módulo de Servicios: Persistencia de los reportes de solución.
+
+Funcionalidad:
+- Guarda cada reporte según config.PERSISTENCE_MODE:
+    "sync"          StorageService.save_solution antes de responder.
+    "write-behind"  Reserva el 'solucion_N.json' (lo crea vacío), encola el reporte y un hilo
+                    de fondo lo escribe en lotes: cada archivo del lote se
+                    escribe en un temporal con fsync y se renombra a su lugar;
+                    al final, un solo fsync del directorio deja los renombres en disco.
+    "off"           No se guarda.
+- La cola es acotada (PERSISTENCE_QUEUE_SIZE): con la cola llena, el
+  reporte se escribe en el momento (no se pierde ni crece la memoria).
+- Expone métricas (profundidad de la cola, escritos, errores, lotes).
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+
+from app import config
+from app.services.metrics_service import Metrics
+from app.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+MODE_OFF = "off"
+MODE_SYNC = "sync"
+MODE_WRITE_BEHIND = "write-behind"
+MODES = (MODE_OFF, MODE_SYNC, MODE_WRITE_BEHIND)
+
+
+class SolutionWriter:
+    """Punto único de guardado de los reportes de solución."""
+
+    _queue: queue.Queue = None
+    _thread: threading.Thread = None
+    _lock = threading.Lock()
+    _stats = {
+        "encolados": 0,
+        "escritos": 0,
+        "errores": 0,
+        "lotes": 0,
+        "fsyncs": 0,
+        "sincronos_por_cola_llena": 0,
+        "max_profundidad": 0,
+        "ultimo_lote_segundos": 0.0,
+    }
+
+    @staticmethod
+    def save(report_data: dict) -> str:
+        """
+        Guarda (o encola) el reporte según el modo configurado. Retorna el
+        path del 'solucion_N.json' asignado; None si la persistencia está apagada.
+        """
+        mode = config.PERSISTENCE_MODE
+        if mode not in MODES:
+            raise ValueError(f"PERSISTENCE_MODE inválido: '{mode}'. Opciones: {', '.join(MODES)}.")
+        if mode == MODE_OFF:
+            return None
+        if mode == MODE_SYNC:
+            return StorageService.save_solution(report_data)
+
+        filename = StorageService.reserve_solution_filename(report_data)
+        # Se encola con el mismo lock con el que shutdown() cierra la cola: ningún
+        # reporte queda detrás de la señal de fin de un hilo que ya no lo va a leer
+        with SolutionWriter._lock:
+            work_queue = SolutionWriter._ensure_worker()
+            try:
+                work_queue.put_nowait((filename, report_data))
+                queued = True
+            except queue.Full:
+                queued = False
+            if queued:
+                SolutionWriter._stats["encolados"] += 1
+                depth = work_queue.qsize()
+                if depth > SolutionWriter._stats["max_profundidad"]:
+                    SolutionWriter._stats["max_profundidad"] = depth
+        if queued:
+            return filename
+
+        # Contrapresión: se escribe en el hilo del pedido
+        SolutionWriter._write_batch([(filename, report_data)])
+        with SolutionWriter._lock:
+            SolutionWriter._stats["sincronos_por_cola_llena"] += 1
+        return filename
+
+    @staticmethod
+    def flush(timeout: float = None) -> bool:
+        """Espera a que se escriba todo lo encolado. Retorna False si venció el timeout."""
+        work_queue = SolutionWriter._queue
+        if work_queue is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with work_queue.all_tasks_done:
+            while work_queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                work_queue.all_tasks_done.wait(remaining)
+        return True
+
+    @staticmethod
+    def shutdown(timeout: float = 10):
+        """Escribe lo pendiente y detiene el hilo (se vuelve a crear con el próximo reporte)."""
+        with SolutionWriter._lock:
+            # Desde acá save() ya no ve esta cola: la señal de fin queda última
+            work_queue, thread = SolutionWriter._queue, SolutionWriter._thread
+            SolutionWriter._queue = SolutionWriter._thread = None
+        if work_queue is None:
+            return
+        work_queue.put(None)
+        thread.join(timeout)
+
+    @staticmethod
+    def metrics() -> dict:
+        """Estado de la persistencia: modo, profundidad de la cola y contadores."""
+        work_queue = SolutionWriter._queue
+        with SolutionWriter._lock:
+            stats = dict(SolutionWriter._stats)
+        stats.update({
+            "modo": config.PERSISTENCE_MODE,
+            "profundidad_cola": work_queue.qsize() if work_queue is not None else 0,
+            "capacidad_cola": config.PERSISTENCE_QUEUE_SIZE,
+            "hilo_activo": bool(SolutionWriter._thread and SolutionWriter._thread.is_alive()),
+        })
+        return stats
+
+    # --- Hilo de escritura ---
+
+    @staticmethod
+    def _ensure_worker() -> queue.Queue:
+        """Cola del hilo de escritura (lo crea si no existe). Se llama con _lock tomado."""
+        if SolutionWriter._queue is None:
+            SolutionWriter._queue = queue.Queue(maxsize=config.PERSISTENCE_QUEUE_SIZE)
+            SolutionWriter._thread = threading.Thread(
+                target=SolutionWriter._worker_loop, args=(SolutionWriter._queue,),
+                name="solution-writer", daemon=True)
+            SolutionWriter._thread.start()
+        return SolutionWriter._queue
+
+    @staticmethod
+    def _worker_loop(work_queue: queue.Queue):
+        stop = False
+        while not stop:
+            batch = [work_queue.get()]
+            # Junta lo que llegue durante PERSISTENCE_BATCH_WAIT (hasta PERSISTENCE_BATCH_SIZE)
+            deadline = time.monotonic() + config.PERSISTENCE_BATCH_WAIT
+            while batch[-1] is not None and len(batch) < config.PERSISTENCE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(work_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:  # Señal de shutdown(): se escribe lo juntado y se termina
+                stop = True
+            items = [item for item in batch if item is not None]
+            try:
+                if items:
+                    SolutionWriter._write_batch(items)
+            except Exception as e:
+                logger.exception("Error en el hilo de persistencia: %s", e)
+            finally:
+                for _ in batch:
+                    work_queue.task_done()
+
+    @staticmethod
+    def _write_batch(batch: list):
+        """Escribe un lote: archivos temporales, fsync de cada uno, renombre y un fsync del directorio."""
+        start = time.perf_counter()
+        staged, written, errors, fsyncs = [], 0, 0, 0
+        directories = set()
+
+        for filename, report_data in batch:
+            directory = os.path.dirname(filename)
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(report_data, f, indent=4, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    fsyncs += 1
+                staged.append((tmp_path, filename))
+            except Exception as e:
+                errors += 1
+                logger.error("Error al guardar el reporte %s: %s", filename, e)
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                # La reserva vacía queda en disco: el número no se vuelve a asignar
+                StorageService.release_pending(filename)
+
+        for tmp_path, filename in staged:
+            try:
+                os.replace(tmp_path, filename)
+                written += 1
+                directories.add(os.path.dirname(filename))
+            except OSError as e:
+                errors += 1
+                logger.error("Error al guardar el reporte %s: %s", filename, e)
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            finally:
+                # Escrito o no, el resto del proceso deja de leerlo de memoria
+                StorageService.release_pending(filename)
+
+        for directory in directories:
+            if hasattr(os, "O_DIRECTORY"):  # fsync del directorio: los renombres quedan en disco
+                dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                    fsyncs += 1
+                finally:
+                    os.close(dir_fd)
+
+        with SolutionWriter._lock:
+            SolutionWriter._stats["escritos"] += written
+            SolutionWriter._stats["errores"] += errors
+            SolutionWriter._stats["lotes"] += 1
+            SolutionWriter._stats["fsyncs"] += fsyncs
+            SolutionWriter._stats["ultimo_lote_segundos"] = round(time.perf_counter() - start, 6)
+        Metrics.observe_stages({"persist_lote": time.perf_counter() - start})
+
+
+# Al terminar el proceso, lo encolado se escribe antes de salir
+atexit.register(SolutionWriter.shutdown)
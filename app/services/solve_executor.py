@@ -0,0 +1,231 @@
+"""
+Módulo de Servicios: Ejecución de las resoluciones fuera del hilo web.
+
+Con SOLVE_EXECUTOR = "process", cada proceso web (worker de gunicorn) tiene
+su propio pool de procesos para las resoluciones: el solver, gilp y
+simple_simplex son CPU-bound y no liberan el GIL, así que en un worker con
+hilos (gthread) bloquearían a /, /load y los estáticos. El hilo del pedido
+solo espera el resultado. Con "inline" se resuelve en el mismo hilo.
+
+Cada proceso del pool atiende un pedido a la vez por su propio canal, así
+una resolución que no termina a tiempo se corta terminando solo su proceso
+(con un ProcessPoolExecutor, matar un proceso rompe el pool entero y hace
+fallar a los demás pedidos en curso).
+
+Los procesos se crean con SOLVE_EXECUTOR_START_METHOD: 'spawn' (importan
+SOLVE_EXECUTOR_PRELOAD al iniciar) o 'fork', que comparte con el worker lo que
+el master de gunicorn precalentó. Un fork desde un proceso con hilos no es
+seguro, así que en ese caso se vuelve a 'spawn'.
+"""
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional
+
+from app import config
+from app.services import storage_service
+
+logger = logging.getLogger(__name__)
+
+
+# --- Código que corre en los procesos del pool ---
+
+def _init_worker(output_dir: str, preload: tuple):
+    """Mismos directorios y logs que el proceso web; los módulos pesados se importan una sola vez."""
+    from app.utils.logging_setup import configure_logging
+
+    # Con fork se heredan los manejadores de señales del worker de gunicorn
+    for sig in (signal.SIGTERM, signal.SIGQUIT, signal.SIGHUP, signal.SIGUSR1, signal.SIGUSR2,
+                signal.SIGWINCH, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    storage_service.OUTPUT_DIR = output_dir
+    configure_logging()
+    for module in preload:
+        importlib.import_module(module)
+
+
+def _worker_loop(conn, output_dir: str, preload: tuple):
+    """Recibe (func, args), responde (True, resultado) o (False, excepción); None termina."""
+    _init_worker(output_dir, preload)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:  # Se cerró el proceso web
+            return
+        if task is None:
+            return
+        func, args = task
+        try:
+            response = (True, func(*args))
+        except Exception as e:
+            response = (False, e)
+        try:
+            conn.send(response)
+        except Exception as e:  # El resultado o la excepción no se pueden enviar
+            conn.send((False, RuntimeError(f"No se pudo enviar el resultado al proceso web: {e!r}")))
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+class _Worker:
+    """Un proceso del pool y el extremo de su canal del lado del proceso web."""
+
+    def __init__(self, context, generation: int):
+        self.generation = generation
+        self.slots = None  # Semáforo del pool que lo prestó
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_loop, name="simplex-solve", daemon=True,
+            args=(child_conn, storage_service.OUTPUT_DIR, tuple(config.SOLVE_EXECUTOR_PRELOAD)),
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, terminate: bool = False, timeout: float = 5.0):
+        try:
+            if terminate:
+                self.process.terminate()
+            else:
+                self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+# --- Servicio ---
+
+class SolveExecutor:
+    """Pool de procesos (uno por proceso web) para las resoluciones."""
+
+    _lock = threading.Lock()
+    _idle: List[_Worker] = []
+    _slots: Optional[threading.BoundedSemaphore] = None
+    _generation = 0
+    _pid = None
+
+    @staticmethod
+    def enabled() -> bool:
+        return config.SOLVE_EXECUTOR == "process"
+
+    @staticmethod
+    def call(func: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """
+        Ejecuta func(*args) en un proceso del pool y espera el resultado (func
+        y sus argumentos deben poder enviarse a otro proceso). Si el proceso
+        muere, se reemplaza y se lanza BrokenProcessPool.
+        Si no termina en 'timeout' segundos, se termina ese proceso (los demás
+        pedidos en curso siguen en los suyos) y se lanza TimeoutError.
+        """
+        worker = SolveExecutor._checkout()
+        reusable = finished = False
+        try:
+            worker.conn.send((func, args))
+            if worker.conn.poll(timeout):
+                ok, value = worker.conn.recv()
+                reusable = finished = True
+        except (EOFError, OSError) as e:
+            raise BrokenProcessPool(f"El proceso de resolución terminó de forma inesperada: {e!r}") from e
+        finally:
+            SolveExecutor._checkin(worker, reusable)
+        if not finished:
+            raise TimeoutError(f"La tarea no terminó en {timeout:g} s.")
+        if not ok:
+            raise value
+        return value
+
+    @staticmethod
+    def warm_up(timeout: float = 120.0) -> int:
+        """Inicia todos los procesos del pool (con sus imports) antes del primer pedido. Retorna cuántos respondieron."""
+        if not SolveExecutor.enabled():
+            return 0
+        workers = [SolveExecutor._checkout() for _ in range(config.SOLVE_EXECUTOR_MAX_WORKERS)]
+        deadline = time.monotonic() + timeout
+        pids = set()
+        for worker in workers:
+            reusable = False
+            try:
+                worker.conn.send((_ready, ()))
+                if worker.conn.poll(max(0.0, deadline - time.monotonic())):
+                    ok, value = worker.conn.recv()
+                    reusable = True
+                    if ok:
+                        pids.add(value)
+            except (EOFError, OSError):
+                pass
+            finally:
+                SolveExecutor._checkin(worker, reusable)
+        logger.info("Pool de resoluciones listo: %d proceso(s).", len(pids))
+        return len(pids)
+
+    @staticmethod
+    def shutdown():
+        """Detiene los procesos libres; los que están resolviendo terminan al devolver su resultado."""
+        with SolveExecutor._lock:
+            idle = SolveExecutor._idle if SolveExecutor._pid == os.getpid() else []
+            SolveExecutor._idle = []
+            SolveExecutor._generation += 1
+            SolveExecutor._pid = None  # El próximo pedido arma el pool con la configuración de ese momento
+        for worker in idle:
+            worker.stop()
+
+    # --- Procesos del pool ---
+
+    @staticmethod
+    def _context():
+        method = config.SOLVE_EXECUTOR_START_METHOD
+        if method == "fork" and threading.active_count() > 1:
+            method = "spawn"
+        return multiprocessing.get_context(method)
+
+    @staticmethod
+    def _checkout() -> _Worker:
+        """Un proceso libre (o uno nuevo); espera si ya hay SOLVE_EXECUTOR_MAX_WORKERS ocupados."""
+        with SolveExecutor._lock:
+            # Tras un fork, los procesos (y sus canales) pertenecen al proceso padre
+            if SolveExecutor._pid != os.getpid():
+                SolveExecutor._idle = []
+                SolveExecutor._slots = threading.BoundedSemaphore(config.SOLVE_EXECUTOR_MAX_WORKERS)
+                SolveExecutor._pid = os.getpid()
+            slots = SolveExecutor._slots
+        slots.acquire()
+        try:
+            with SolveExecutor._lock:
+                while SolveExecutor._idle:
+                    worker = SolveExecutor._idle.pop()
+                    if worker.process.is_alive():
+                        worker.slots = slots
+                        return worker
+                    worker.stop(terminate=True)
+                context, generation = SolveExecutor._context(), SolveExecutor._generation
+            worker = _Worker(context, generation)
+            worker.slots = slots
+            logger.debug("Proceso de resolución %d creado con '%s'.",
+                         worker.process.pid, context.get_start_method())
+            return worker
+        except BaseException:
+            slots.release()
+            raise
+
+    @staticmethod
+    def _checkin(worker: _Worker, reusable: bool):
+        """Devuelve el proceso al pool, o lo termina si quedó en un estado desconocido."""
+        with SolveExecutor._lock:
+            keep = (reusable and worker.generation == SolveExecutor._generation
+                    and SolveExecutor._pid == os.getpid())
+            if keep:
+                SolveExecutor._idle.append(worker)
+        if not keep:
+            worker.stop(terminate=not reusable)
+        worker.slots.release()
@@ -0,0 +1,447 @@
+"""
+Servicio de Backends de Resolución.
+
+Registro de solvers intercambiables (HiGHS en sus variantes, branch-and-bound
+de HiGHS para problemas enteros y el método de tablas propio basado en
+'simple_simplex'). Cada problema puede pedir un
+backend por nombre o dejar que se elija automáticamente según el tamaño y
+la densidad del modelo. Todos los backends devuelven un OptimizeResult con
+la misma convención que scipy.optimize.linprog ('fun' en sentido minimizar).
+"""
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app import config
+from app.core.bounds import NonNegativeForm
+from app.core.budget import BudgetExceeded, SolveBudget
+from app.utils.lazy_imports import lazy_callable
+
+# scipy.optimize y simple_simplex se importan con la primera resolución
+linprog = lazy_callable("scipy.optimize", "linprog")
+milp = lazy_callable("scipy.optimize", "milp")
+Bounds = lazy_callable("scipy.optimize", "Bounds")
+LinearConstraint = lazy_callable("scipy.optimize", "LinearConstraint")
+OptimizeResult = lazy_callable("scipy.optimize", "OptimizeResult")
+
+create_tableau = lazy_callable("simple_simplex", "create_tableau")
+add_constraint = lazy_callable("simple_simplex", "add_constraint")
+add_objective = lazy_callable("simple_simplex", "add_objective")
+
+logger = logging.getLogger(__name__)
+
+
+# --- CONSTRUCCIÓN DEL MODELO ---
+
+def build_scipy_model(objective_data: dict, constraints_data: list, variables: list, bounds: list = None):
+    """
+    Traduce los datos de los JSON al formato de matrices que
+    entiende scipy.optimize.linprog.
+    Si no se indican cotas, se asume x >= 0 para todas las variables.
+    """
+    objective_type = objective_data['type']
+    coefficients = objective_data['coefficients']
+
+    c = [coefficients.get(var, 0) for var in variables]
+
+    if objective_type == 'maximize':
+        c = [-val for val in c]
+
+    A_ub = []
+    b_ub = []
+    A_eq = []
+    b_eq = []
+
+    for const in constraints_data:
+        A_row = [const['coefficients'].get(var, 0) for var in variables]
+        operator = const['operator']
+        rhs_value = const['rhs']
+
+        if operator == '<=':
+            A_ub.append(A_row)
+            b_ub.append(rhs_value)
+
+        elif operator == '>=':
+            A_ub.append([-x for x in A_row])
+            b_ub.append(-rhs_value)
+
+        elif operator == '=':
+            A_eq.append(A_row)
+            b_eq.append(rhs_value)
+            # Y también la convertimos para A_ub
+            A_ub.append(A_row)
+            b_ub.append(rhs_value)
+            A_ub.append([-x for x in A_row])
+            b_ub.append(-rhs_value)
+
+    if bounds is None:
+        bounds = [(0, None) for _ in variables]
+
+    A_ub_np = None if not A_ub else np.array(A_ub)
+    b_ub_np = None if not b_ub else np.array(b_ub)
+    A_eq_np = None if not A_eq else np.array(A_eq)
+    b_eq_np = None if not b_eq else np.array(b_eq)
+
+    return np.array(c), A_ub_np, b_ub_np, A_eq_np, b_eq_np, bounds
+
+
+def run_simple_simplex(objective_data: dict, constraints_data: list, variables: list,
+                       budget: SolveBudget = None, stage: str = "simple_simplex") -> dict:
+    """
+    Ejecuta el solver 'simple_simplex' y devuelve el JSON de resultados.
+    'simple_simplex' no acepta igualdades: cada '=' se carga como un par '<=' y '>='.
+    Con 'budget', lanza BudgetExceeded (con los pivoteos hechos) si se agota.
+    """
+    rows = []
+    for const in constraints_data:
+        if const['operator'] == '=':
+            rows.append(dict(const, operator='<='))
+            rows.append(dict(const, operator='>='))
+        else:
+            rows.append(const)
+
+    tableau = create_tableau(
+        number_of_variables=len(variables),
+        number_of_constraints=len(rows)
+    )
+
+    for const in rows:
+        coeffs_list = [str(const['coefficients'].get(var, 0)) for var in variables]
+        coeffs_str = ",".join(coeffs_list)
+        op_str = "L" if const['operator'] == '<=' else "G"
+        rhs_str = str(const['rhs'])
+        constraint_string = f"{coeffs_str},{op_str},{rhs_str}"
+        add_constraint(tableau, constraint_string)
+
+    obj_coeffs_list = [str(objective_data['coefficients'].get(var, 0)) for var in variables]
+    obj_coeffs_str = ",".join(obj_coeffs_list)
+    is_maximize = (objective_data['type'] == 'maximize')
+    # El último elemento es el término constante de Z (no el sentido de optimización)
+    objective_string = f"{obj_coeffs_str},0"
+    add_objective(tableau, objective_string)
+
+    return _optimize_json_format(tableau, is_maximize, budget or SolveBudget(), stage)
+
+
+def _optimize_json_format(tableau, maximize: bool, budget: SolveBudget, stage: str) -> dict:
+    """
+    simple_simplex.optimize_json_format (versión 0.0.3) con un control del
+    presupuesto antes de cada pivoteo: sin él, un problema infactible o
+    degenerado puede pivotear para siempre.
+    """
+    from simple_simplex import solver
+
+    current = tableau.copy()
+    if not maximize:
+        current = solver._convert_min_to_max(current)
+    steps = []
+    solver._log_pivot_step(current, (None, None), 0, steps)
+    # Primero la fase de factibilidad y después la de optimización, como la librería
+    for can_pivot, select_pivot in ((solver._is_infeasible, solver._select_infeasible_pivot),
+                                    (solver._can_optimize, solver._select_pivot)):
+        while can_pivot(current):
+            done = len(steps) - 1
+            budget.check(stage, done, partial={"pivotSteps": steps, "numSteps": done})
+            pivot_row, pivot_column = select_pivot(current)
+            current = solver._apply_pivot(pivot_row, pivot_column, current)
+            solver._log_pivot_step(current, (pivot_row, pivot_column), done + 1, steps)
+    return solver._format_json_output(current, len(steps) - 1, steps, maximize)
+
+
+class SolverModel:
+    """
+    Modelo listo para los backends: definición JSON + cotas + estadísticas de tamaño.
+    'integrality' sigue la convención de scipy.optimize.milp (0 = continua, 1 = entera).
+    """
+
+    def __init__(self, objective_data: dict, constraints_data: list, variables: list, bounds: list = None,
+                 integrality: list = None):
+        self.objective_data = objective_data
+        self.constraints_data = constraints_data
+        self.variables = variables
+        self.bounds = bounds if bounds is not None else [(0, None) for _ in variables]
+        self.integrality = integrality if integrality is not None else [0 for _ in variables]
+        self._scipy_model = None
+
+    @property
+    def is_mip(self) -> bool:
+        """True si alguna variable es entera."""
+        return any(self.integrality)
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.constraints_data)
+
+    @property
+    def num_cols(self) -> int:
+        return len(self.variables)
+
+    @property
+    def nonzeros(self) -> int:
+        return sum(1 for const in self.constraints_data
+                   for var in self.variables if const['coefficients'].get(var, 0) != 0)
+
+    @property
+    def density(self) -> float:
+        size = self.num_rows * self.num_cols
+        return self.nonzeros / size if size else 0.0
+
+    def to_scipy(self):
+        """Matrices para linprog (se construyen una sola vez)."""
+        if self._scipy_model is None:
+            self._scipy_model = build_scipy_model(
+                self.objective_data, self.constraints_data, self.variables, self.bounds)
+        return self._scipy_model
+
+    def stats(self) -> Dict:
+        return {"filas": self.num_rows, "columnas": self.num_cols, "no_ceros": self.nonzeros,
+                "enteras": int(sum(self.integrality))}
+
+
+# --- BACKENDS ---
+
+class SolverBackend:
+    """Interfaz común de los backends."""
+
+    name = ""
+    description = ""
+    SUPPORTED_OPTIONS: set = set()
+    supports_integrality = False
+
+    def solve(self, model: SolverModel, options: Dict) -> OptimizeResult:
+        raise NotImplementedError
+
+
+class HighsBackend(SolverBackend):
+    """scipy.optimize.linprog con uno de los métodos de HiGHS."""
+
+    SUPPORTED_OPTIONS = {
+        "time_limit", "presolve", "disp", "maxiter",
+        "dual_feasibility_tolerance", "primal_feasibility_tolerance", "ipm_optimality_tolerance",
+    }
+
+    def __init__(self, method: str, description: str):
+        self.name = method
+        self.description = description
+
+    def solve(self, model: SolverModel, options: Dict) -> OptimizeResult:
+        c, A_ub, b_ub, A_eq, b_eq, bounds = model.to_scipy()
+        return linprog(
+            c,
+            A_ub=A_ub, b_ub=b_ub,
+            A_eq=A_eq, b_eq=b_eq,
+            bounds=bounds,
+            method=self.name,
+            options=options
+        )
+
+
+class MilpBackend(SolverBackend):
+    """
+    scipy.optimize.milp (branch-and-bound de HiGHS) para problemas enteros y mixtos.
+    Si se alcanza un límite (tiempo o nodos) con una solución entera ya encontrada,
+    se la informa como factible junto con el gap restante.
+    """
+
+    name = "highs-milp"
+    description = "HiGHS branch-and-bound (enteras / mixtas)"
+    SUPPORTED_OPTIONS = {"time_limit", "node_limit", "mip_rel_gap", "presolve", "disp"}
+    supports_integrality = True
+
+    def solve(self, model: SolverModel, options: Dict) -> OptimizeResult:
+        c = build_scipy_model(model.objective_data, [], model.variables)[0]
+
+        A, lower_rhs, upper_rhs = [], [], []
+        for const in model.constraints_data:
+            A.append([const['coefficients'].get(var, 0) for var in model.variables])
+            rhs = const['rhs']
+            lower_rhs.append(rhs if const['operator'] in ('>=', '=') else -np.inf)
+            upper_rhs.append(rhs if const['operator'] in ('<=', '=') else np.inf)
+        constraints = [LinearConstraint(np.array(A), lower_rhs, upper_rhs)] if A else []
+
+        bounds = Bounds(
+            [-np.inf if lb is None else lb for lb, _ in model.bounds],
+            [np.inf if ub is None else ub for _, ub in model.bounds]
+        )
+        result = milp(c, integrality=np.array(model.integrality), bounds=bounds,
+                      constraints=constraints, options=options)
+
+        if result.status == 1 and result.x is not None:
+            result.success = True
+            result.message = (f"Límite alcanzado: se informa la mejor solución entera encontrada "
+                              f"(gap {result.mip_gap:.2%}).")
+        return result
+
+
+class TableauBackend(SolverBackend):
+    """
+    Método de tablas propio ('simple_simplex'). Solo conoce x >= 0, así que el
+    modelo se lleva a esa forma con cambios de variable (ver NonNegativeForm).
+    Pensado para problemas chicos y didácticos: su historia de pivoteos se
+    reutiliza luego para la visualización. Con 'time_limit' o 'maxiter'
+    agotados devuelve status 1, como linprog.
+    """
+
+    name = "tableau"
+    description = "Método de tablas (simple_simplex)"
+    SUPPORTED_OPTIONS = {"tolerance", "time_limit", "maxiter"}
+    DEFAULT_TOLERANCE = 1e-6
+
+    def solve(self, model: SolverModel, options: Dict) -> OptimizeResult:
+        form = NonNegativeForm.build(model.objective_data, model.constraints_data, model.variables,
+                                     dict(zip(model.variables, model.bounds)))
+        budget = SolveBudget(options.get("time_limit"), options.get("maxiter"))
+        try:
+            simplex_json = run_simple_simplex(form.objective_data, form.constraints_data, form.variables,
+                                              budget=budget, stage=self.name)
+        except BudgetExceeded as e:
+            return OptimizeResult({
+                'success': False, 'status': 1, 'nit': e.iterations,
+                'message': f"Límite de {e.reason} alcanzado en el método de tablas ({e.iterations} pivoteos)."
+            })
+
+        values = simplex_json.get("solutionValues", {})
+        x = form.recover({var: values.get(f"x{i+1}", 0.0) for i, var in enumerate(form.variables)})
+        optimal_value = simplex_json.get("optimalValue", 0.0) + form.objective_offset
+        fun = -optimal_value if model.objective_data['type'] == 'maximize' else optimal_value
+
+        tolerance = options.get("tolerance", self.DEFAULT_TOLERANCE)
+        violated = self._violated_rows(model.constraints_data, model.variables, x, model.bounds, tolerance)
+        if violated:
+            return OptimizeResult({
+                'success': False, 'status': 4, 'x': x, 'fun': fun,
+                'nit': simplex_json.get("numSteps", 0), 'simplex_json': simplex_json,
+                'message': (f"La solución del método de tablas no cumple {len(violated)} restricción(es). "
+                            "El problema puede ser infactible o no acotado.")
+            })
+
+        return OptimizeResult({
+            'success': True, 'status': 0, 'x': x, 'fun': fun,
+            'nit': simplex_json.get("numSteps", 0), 'simplex_json': simplex_json,
+            'message': "Optimización finalizada (método de tablas)."
+        })
+
+    @staticmethod
+    def _violated_rows(rows: List[Dict], variables: List[str], x: np.ndarray, bounds: List[Tuple],
+                       tolerance: float) -> List[int]:
+        """Índices de las filas no cumplidas; -1 si alguna variable sale de sus cotas."""
+        violated = []
+        for i, const in enumerate(rows):
+            activity = sum(const['coefficients'].get(var, 0) * val for var, val in zip(variables, x))
+            slack_tol = tolerance * max(1.0, abs(const['rhs']))
+            op, rhs = const['operator'], const['rhs']
+            if (op == '<=' and activity > rhs + slack_tol) or \
+               (op == '>=' and activity < rhs - slack_tol) or \
+               (op == '=' and abs(activity - rhs) > slack_tol):
+                violated.append(i)
+        if any((lower is not None and val < lower - tolerance) or (upper is not None and val > upper + tolerance)
+               for val, (lower, upper) in zip(x, bounds)):
+            violated.append(-1)
+        return violated
+
+
+class SolverBackendRegistry:
+    """Registro de backends disponibles y política de selección automática."""
+
+    AUTO = "auto"
+    _backends: Dict[str, SolverBackend] = {}
+
+    @classmethod
+    def register(cls, backend: SolverBackend):
+        """Registra (o reemplaza) un backend por su nombre."""
+        cls._backends[backend.name] = backend
+
+    @classmethod
+    def get(cls, name: str) -> SolverBackend:
+        if name not in cls._backends:
+            raise ValueError(f"Backend de resolución desconocido: '{name}'. "
+                             f"Disponibles: {', '.join(cls.names())}")
+        return cls._backends[name]
+
+    @classmethod
+    def names(cls) -> List[str]:
+        return list(cls._backends.keys())
+
+    @classmethod
+    def describe(cls) -> List[Dict]:
+        """Lista (nombre, descripción) para la UI."""
+        return [{"name": b.name, "description": b.description} for b in cls._backends.values()]
+
+    @staticmethod
+    def select(model: SolverModel) -> str:
+        """
+        Elige el backend según tamaño y densidad:
+        - Con variables enteras: branch-and-bound ('highs-milp').
+        - Modelos chicos: simplex dual ('highs-ds'), como hasta ahora.
+        - Grandes y ralos: punto interior ('highs-ipm').
+        - Grandes y densos: 'highs' (HiGHS decide el método).
+        """
+        if model.is_mip:
+            return "highs-milp"
+        nonzeros = model.nonzeros
+        if nonzeros < config.SOLVER_AUTO_LARGE_NONZEROS:
+            return "highs-ds"
+        if model.density <= config.SOLVER_AUTO_SPARSE_DENSITY:
+            return "highs-ipm"
+        return "highs"
+
+    @classmethod
+    def solve(cls, model: SolverModel, backend: Optional[str] = None,
+              options: Optional[Dict] = None, budget: SolveBudget = None) -> Tuple[OptimizeResult, Dict]:
+        """
+        Resuelve con el backend pedido (o el automático) y devuelve
+        (resultado, info) donde info incluye el tiempo y las opciones usadas.
+        Con 'budget', el backend recibe el tiempo que queda y el límite de
+        iteraciones como 'time_limit' / 'maxiter' (si los soporta).
+        """
+        requested = backend or config.SOLVER_DEFAULT_BACKEND
+        name = cls.select(model) if requested == cls.AUTO else requested
+        solver = cls.get(name)
+        if model.is_mip and not solver.supports_integrality:
+            raise ValueError(f"El backend '{name}' no admite variables enteras. "
+                             f"Use 'highs-milp' o '{cls.AUTO}'.")
+
+        merged = dict(config.SOLVER_DEFAULT_OPTIONS)
+        merged.update(options or {})
+        used = {k: v for k, v in merged.items() if k in solver.SUPPORTED_OPTIONS}
+        ignored = sorted(k for k in merged if k not in solver.SUPPORTED_OPTIONS)
+        if budget is not None:
+            used = cls._apply_budget(used, solver.SUPPORTED_OPTIONS, budget)
+
+        start = time.perf_counter()
+        if budget is not None and budget.expired():
+            result = OptimizeResult({'success': False, 'status': 1,
+                                     'message': "Límite de tiempo alcanzado antes de ejecutar el solver."})
+        else:
+            result = solver.solve(model, used)
+        elapsed = time.perf_counter() - start
+
+        info = {
+            "backend": name,
+            "seleccion": "automatica" if requested == cls.AUTO else "solicitada",
+            "tiempo_segundos": elapsed,
+            "opciones": used,
+            "opciones_ignoradas": ignored,
+            "modelo": model.stats(),
+        }
+        logger.debug("Backend '%s' (%s) resolvió en %.4fs.", name, info['seleccion'], elapsed)
+        return result, info
+
+    @staticmethod
+    def _apply_budget(options: Dict, supported: set, budget: SolveBudget) -> Dict:
+        """Lleva 'time_limit' al tiempo que queda y 'maxiter' al límite de iteraciones."""
+        options = dict(options)
+        if "time_limit" in supported and budget.time_limit is not None:
+            options["time_limit"] = min(options.get("time_limit", budget.remaining()), budget.remaining())
+        if "maxiter" in supported and budget.iteration_limit is not None:
+            options["maxiter"] = min(options.get("maxiter", budget.iteration_limit), budget.iteration_limit)
+        return options
+
+
+SolverBackendRegistry.register(HighsBackend("highs-ds", "HiGHS simplex dual"))
+SolverBackendRegistry.register(HighsBackend("highs-ipm", "HiGHS punto interior"))
+SolverBackendRegistry.register(HighsBackend("highs", "HiGHS (elige el método automáticamente)"))
+SolverBackendRegistry.register(MilpBackend())
+SolverBackendRegistry.register(TableauBackend())
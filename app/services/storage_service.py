@@ -5,9 +5,13 @@ Funcionalidad:
 - Guarda la F.O., Restricciones y Solución en archivos JSON secuenciales.
 - Carga la F.O. y Restricciones MÁS RECIENTES para el solver.
 """
+import functools
 import json
+import logging
 import os
 import re # Para encontrar el archivo más reciente
+import tempfile
+import threading
 from typing import Any, Dict, List
 # Asume que config.py está en el directorio 'app' o en el PYTHONPATH
 from app.config import (
@@ -17,17 +21,31 @@ from app.config import (
     PREFIX_SOLUCION,
     # --- INICIO DE CAMBIOS ---
     PREFIX_PROBLEMA, # Importamos el prefijo del problema
-    PREFIX_PDF         # Importamos el nuevo prefijo del PDF
+    PREFIX_PDF,         # Importamos el nuevo prefijo del PDF
     # --- FIN DE CAMBIOS ---
+    PDF_CACHE_DIR
 )
 
+logger = logging.getLogger(__name__)
+
+# Reportes aceptados pero todavía no escritos (persistencia write-behind):
+# path -> datos. Las lecturas de este proceso los ven antes de llegar a disco.
+_pending: Dict[str, Any] = {}
+_pending_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _read_tableaus(filename: str, mtime: float) -> tuple:
+    with open(filename, "r", encoding="utf-8") as f:
+        return tuple(json.load(f).get("tablas_intermedias") or [])
+
+
 class StorageService:
     """Servicio reutilizable para manejar persistencia en archivos JSON."""
 
     def __init__(self):
-        """Asegura que el directorio de salida exista."""
-        if not os.path.exists(OUTPUT_DIR):
-            os.makedirs(OUTPUT_DIR)
+        """Asegura que el directorio de salida exista (varios procesos pueden crearlo a la vez)."""
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     # --- LÓGICA DE NOMBRES DE ARCHIVO ---
 
@@ -37,7 +55,7 @@ class StorageService:
         number = 1
         while True:
             filename = os.path.join(OUTPUT_DIR, f"{prefix}{number}{extension}")
-            if not os.path.exists(filename):
+            if not os.path.exists(filename) and filename not in _pending:
                 return filename
             number += 1
 
@@ -57,7 +75,9 @@ class StorageService:
         latest_num = -1
         latest_file = None
 
-        for f in os.listdir(OUTPUT_DIR):
+        pending_names = [os.path.basename(path) for path in list(_pending)
+                         if os.path.dirname(path) == OUTPUT_DIR]
+        for f in os.listdir(OUTPUT_DIR) + pending_names:
             match = pattern.match(f)
             if match:
                 num = int(match.group(1))
@@ -75,16 +95,24 @@ class StorageService:
     @staticmethod
     def save_json(data: Any, prefix: str, extension: str = ".json") -> str: # <-- CAMBIO: Añadido extension
         """Guarda datos en un nuevo archivo JSON secuencial."""
-        # --- INICIO DE CAMBIOS ---
-        # Pasamos la extensión al helper
-        filename = StorageService._get_next_filename(prefix=prefix, extension=extension)
-        # --- FIN DE CAMBIOS ---
+        filename = None
         try:
-            with open(filename, "w", encoding="utf-8") as f:
+            # El nombre se toma creando el archivo (modo "x"): dos hilos o dos
+            # workers que buscan el siguiente número al mismo tiempo no pueden
+            # quedarse con el mismo.
+            while True:
+                with _pending_lock:
+                    filename = StorageService._get_next_filename(prefix=prefix, extension=extension)
+                    try:
+                        f = open(filename, "x", encoding="utf-8")
+                        break
+                    except FileExistsError:
+                        continue
+            with f:
                 json.dump(data, f, indent=4, ensure_ascii=False)
             return filename
         except IOError as e:
-            print(f"Error al guardar el archivo {filename}: {e}")
+            logger.error("Error al guardar el archivo %s: %s", filename, e)
             return None
 
     @staticmethod
@@ -111,6 +139,32 @@ class StorageService:
             prefix=PREFIX_SOLUCION
         )
     
+    @staticmethod
+    def reserve_solution_filename(report_data: Dict) -> str:
+        """
+        Asigna el próximo 'solucion_N.json' a un reporte que se escribirá más
+        tarde (write-behind). Hasta entonces, las lecturas de este proceso lo
+        toman de memoria. El nombre se toma creando el archivo vacío (modo "x",
+        como en save_json), así otro worker no puede reservar el mismo; el
+        hilo de escritura lo reemplaza con el reporte.
+        """
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        while True:
+            with _pending_lock:
+                filename = StorageService._get_next_filename(prefix=PREFIX_SOLUCION, extension=".json")
+                try:
+                    open(filename, "x", encoding="utf-8").close()
+                except FileExistsError:
+                    continue
+                _pending[filename] = report_data
+                return filename
+
+    @staticmethod
+    def release_pending(filename: str):
+        """Quita un reporte de la lista de pendientes (ya está en disco o no se pudo escribir)."""
+        with _pending_lock:
+            _pending.pop(filename, None)
+
     # --- INICIO DE CAMBIOS ---
     # Convertido a staticmethod para que ui_controller pueda llamarlo
     @staticmethod
@@ -129,6 +183,8 @@ class StorageService:
         filename = StorageService._get_latest_filename(prefix, extension=".json")
         # --- FIN DE CAMBIOS ---
         
+        if filename in _pending:
+            return _pending[filename]
         if not filename or not os.path.exists(filename):
             raise FileNotFoundError(f"No se encontró ningún archivo con prefijo '{prefix}' en {OUTPUT_DIR}.")
             
@@ -137,10 +193,10 @@ class StorageService:
                 data = json.load(f)
             return data
         except json.JSONDecodeError:
-            print(f"Error: El archivo {filename} está corrupto o mal formateado.")
+            logger.error("El archivo %s está corrupto o mal formateado.", filename)
             return None
         except IOError as e:
-            print(f"Error al leer el archivo {filename}: {e}")
+            logger.error("Error al leer el archivo %s: %s", filename, e)
             return None
 
     @staticmethod
@@ -166,9 +222,99 @@ class StorageService:
         """Carga la última solución guardada."""
         return StorageService.load_json(prefix=PREFIX_SOLUCION)
 
+    @staticmethod
+    def load_solution_by_id(solution_id: int) -> dict:
+        """Carga la solución 'solucion_<id>.json'."""
+        filename = os.path.join(OUTPUT_DIR, f"{PREFIX_SOLUCION}{solution_id}.json")
+        pending = _pending.get(filename)
+        if pending is not None:
+            return pending
+        if not StorageService._is_written(filename):
+            raise FileNotFoundError(f"No existe la solución {solution_id} en {OUTPUT_DIR}.")
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _is_written(filename: str) -> bool:
+        """False si no existe o si es la reserva vacía de un reporte que otro worker todavía no escribió."""
+        return os.path.exists(filename) and os.path.getsize(filename) > 0
+
+    @staticmethod
+    def get_latest_solution_id() -> int:
+        """Número de la última solución guardada (ej: 3 para 'solucion_3.json'); None si no hay."""
+        filename = StorageService._get_latest_filename(PREFIX_SOLUCION, extension=".json")
+        return StorageService.solution_id_from_path(filename)
+
+    @staticmethod
+    def solution_id_from_path(filename: str) -> int:
+        """'.../solucion_3.json' -> 3; None si el path no es de una solución."""
+        if not filename:
+            return None
+        match = re.match(f"^{re.escape(PREFIX_SOLUCION)}(\\d+)\\.json$", os.path.basename(filename))
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def load_solution_tableaus(solution_id: int) -> tuple:
+        """
+        Tablas intermedias de una solución. Se guardan en memoria las de las
+        últimas soluciones consultadas (invalidadas si el archivo cambia), para
+        que paginar el historial no vuelva a leer el JSON completo en cada página.
+        """
+        filename = os.path.join(OUTPUT_DIR, f"{PREFIX_SOLUCION}{solution_id}.json")
+        pending = _pending.get(filename)
+        if pending is not None:
+            return tuple(pending.get("tablas_intermedias") or [])
+        if not StorageService._is_written(filename):
+            raise FileNotFoundError(f"No existe la solución {solution_id} en {OUTPUT_DIR}.")
+        return _read_tableaus(filename, os.path.getmtime(filename))
+
     # --- INICIO DE CAMBIOS (exportación en pdf) ---
     @staticmethod
     def get_new_pdf_path() -> str:
         """Obtiene la ruta completa para el *próximo* archivo PDF."""
         return StorageService._get_next_filename(prefix=PREFIX_PDF, extension=".pdf")
-    # --- FIN DE CAMBIOS ---
\ No newline at end of file
+    # --- FIN DE CAMBIOS ---
+
+    # --- CACHÉ DE PDFs ---
+
+    @staticmethod
+    def _cached_pdf_filename(solution_id: int, content_hash: str) -> str:
+        return os.path.join(PDF_CACHE_DIR, f"{PREFIX_PDF}{solution_id}_{content_hash[:16]}.pdf")
+
+    @staticmethod
+    def get_cached_pdf_path(solution_id: int, content_hash: str) -> str:
+        """Path del PDF ya generado para esta solución y contenido; None si no existe."""
+        filename = StorageService._cached_pdf_filename(solution_id, content_hash)
+        return filename if os.path.exists(filename) else None
+
+    @staticmethod
+    def save_cached_pdf(solution_id: int, content_hash: str, pdf_bytes: bytes) -> str:
+        """
+        Guarda el PDF en la caché (escritura atómica) y borra las versiones
+        anteriores de la misma solución. Retorna el path.
+        """
+        os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+        filename = StorageService._cached_pdf_filename(solution_id, content_hash)
+
+        fd, tmp_path = tempfile.mkstemp(dir=PDF_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, filename)
+        except BaseException:
+            # Sin el replace, el temporal quedaría huérfano en la caché
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        stale = re.compile(f"^{re.escape(PREFIX_PDF)}{solution_id}_[0-9a-f]+\\.pdf$")
+        for name in os.listdir(PDF_CACHE_DIR):
+            path = os.path.join(PDF_CACHE_DIR, name)
+            if stale.match(name) and path != filename:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:  # Otro worker ya la borró
+                    pass
+        return filename
@@ -0,0 +1,145 @@
+"""
+Módulo de Servicios: Tablas intermedias en HTML.
+
+Funcionalidad:
+- Convierte una tabla (lista de listas: encabezado + filas con etiqueta)
+  al HTML que muestra solution.html.
+- Las filas numéricas se pasan a un bloque NumPy y se formatean de una
+  sola vez por fila (una cadena de formato precalculada), sin revisar
+  el tipo de cada celda.
+- El marcado sale de una macro Jinja que se compila una sola vez.
+- El HTML se memoriza por hash de la tabla + pivote: una historia
+  idéntica no se vuelve a convertir.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import Optional, Sequence
+
+import numpy as np
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup, escape
+
+from app import config
+
+PIVOT_STYLE = 'style="background-color:#fff0f0; color:#d00; font-weight:bold;"'
+_FLOAT_TYPES = {float, np.float64}
+
+# La macro se compila al importar el módulo y se reutiliza en cada llamada
+_env = Environment(
+    loader=FileSystemLoader(os.path.join(config.BASE_DIR, "templates")),
+    autoescape=select_autoescape(["html"]),
+)
+_render_tableau = _env.get_template("macros/tableau.html").module.render_tableau
+
+
+def _cell_text(cell) -> str:
+    """Formato de una celda suelta (igual que en el bloque: 4 decimales para los float)."""
+    return f"{cell:.4f}" if isinstance(cell, float) else str(cell)
+
+
+class TableauHtmlRenderer:
+    """Conversión (memorizada) de tablas intermedias a HTML."""
+
+    _cache: "OrderedDict[str, str]" = OrderedDict()
+    _lock = threading.Lock()
+    _hits = 0
+    _misses = 0
+
+    @staticmethod
+    def render(table: Sequence[Sequence], pivot: Optional[Sequence[int]] = None,
+               use_cache: bool = True) -> str:
+        """
+        HTML de la tabla. 'pivot' = (fila, columna) en el bloque numérico
+        (sin contar encabezado ni etiqueta); None si no hay pivote.
+        """
+        pivot = tuple(pivot) if pivot else None
+        header, labels, body = TableauHtmlRenderer._split(table)
+        block = TableauHtmlRenderer._numeric_block(body)
+
+        key = TableauHtmlRenderer._hash(header, labels, body, block, pivot) if use_cache else None
+        if key is not None:
+            with TableauHtmlRenderer._lock:
+                html = TableauHtmlRenderer._cache.get(key)
+                if html is not None:
+                    TableauHtmlRenderer._cache.move_to_end(key)
+                    TableauHtmlRenderer._hits += 1
+                    return html
+
+        html = TableauHtmlRenderer._render(header, labels, body, block, pivot)
+
+        if key is not None:
+            with TableauHtmlRenderer._lock:
+                TableauHtmlRenderer._misses += 1
+                TableauHtmlRenderer._cache[key] = html
+                while len(TableauHtmlRenderer._cache) > config.TABLEAU_HTML_CACHE_SIZE:
+                    TableauHtmlRenderer._cache.popitem(last=False)
+        return html
+
+    @staticmethod
+    def cache_info() -> dict:
+        with TableauHtmlRenderer._lock:
+            return {"hits": TableauHtmlRenderer._hits, "misses": TableauHtmlRenderer._misses,
+                    "size": len(TableauHtmlRenderer._cache), "max_size": config.TABLEAU_HTML_CACHE_SIZE}
+
+    @staticmethod
+    def clear_cache():
+        with TableauHtmlRenderer._lock:
+            TableauHtmlRenderer._cache.clear()
+            TableauHtmlRenderer._hits = TableauHtmlRenderer._misses = 0
+
+    # --- Internos ---
+
+    @staticmethod
+    def _split(table: Sequence[Sequence]) -> tuple:
+        """(encabezado, etiquetas de fila, celdas de cada fila sin la etiqueta)."""
+        if not table:
+            return [], [], []
+        rows = table[1:]
+        return list(table[0]), [row[0] if row else "" for row in rows], [list(row[1:]) for row in rows]
+
+    @staticmethod
+    def _numeric_block(body: list) -> Optional[np.ndarray]:
+        """Bloque float64 si todas las celdas son float y las filas tienen el mismo largo; si no, None."""
+        if not body or len({len(row) for row in body}) != 1:
+            return None
+        if not set(map(type, chain.from_iterable(body))) <= _FLOAT_TYPES:
+            return None
+        return np.asarray(body, dtype=np.float64)
+
+    @staticmethod
+    def _hash(header, labels, body, block, pivot) -> str:
+        digest = hashlib.sha1(repr((header, labels, pivot)).encode("utf-8"))
+        if block is not None:
+            digest.update(repr(block.shape).encode())
+            digest.update(block.tobytes())
+        else:
+            digest.update(repr(body).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _render(header, labels, body, block, pivot) -> str:
+        pivot_r, pivot_c = pivot if pivot else (-1, -1)
+
+        if block is not None:
+            # Una cadena de formato por fila; la del pivote lleva el estilo en su columna
+            cell_fmt = "<td >%.4f</td>"
+            row_fmt = cell_fmt * block.shape[1]
+            cells = [row_fmt % tuple(values) for values in block.tolist()]
+            if 0 <= pivot_r < len(cells) and 0 <= pivot_c < block.shape[1]:
+                pivot_fmt = (cell_fmt * pivot_c + f"<td {PIVOT_STYLE}>%.4f</td>"
+                             + cell_fmt * (block.shape[1] - pivot_c - 1))
+                cells[pivot_r] = pivot_fmt % tuple(block[pivot_r].tolist())
+        else:
+            cells = []
+            for r, row in enumerate(body):
+                parts = []
+                for c, cell in enumerate(row):
+                    style = PIVOT_STYLE if (r, c) == (pivot_r, pivot_c) else ""
+                    parts.append(f"<td {style}>{escape(_cell_text(cell))}</td>")
+                cells.append("".join(parts))
+
+        rows = [(_cell_text(label), Markup(row_cells)) for label, row_cells in zip(labels, cells)]
+        return str(_render_tableau([_cell_text(cell) for cell in header], rows))
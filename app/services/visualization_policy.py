@@ -0,0 +1,81 @@
+"""
+Módulo de Servicios: Qué visualización se genera según el tamaño del modelo.
+
+gilp solo dibuja modelos de 2 o 3 variables, y con muchas restricciones
+enumerar los vértices lleva segundos. La historia de tablas deja de ser
+legible con unas pocas decenas de columnas y es la parte más pesada del
+reporte (JSON, PDF). La política elige, con los umbrales de app.config:
+
+    gilp     gráfico 2D/3D de gilp (y las tablas, si entran en el umbral)
+    tablas   solo la historia de tablas de simple_simplex
+    resumen  ninguna de las dos: un aviso con el tamaño del modelo
+"""
+from typing import Dict, List
+
+from app import config
+
+
+class VisualizationPlan:
+    """Decisión para un modelo: qué generar y por qué."""
+
+    def __init__(self, variables: int, rows: int, gilp: bool, tableaus: bool, reasons: List[str]):
+        self.variables = variables
+        self.rows = rows
+        self.gilp = gilp
+        self.tableaus = tableaus
+        self.reasons = reasons
+
+    @property
+    def columns(self) -> int:
+        """Columnas de la tabla de simple_simplex: variables, holguras, Z y término independiente."""
+        return self.variables + self.rows + 2
+
+    @property
+    def mode(self) -> str:
+        if self.gilp:
+            return "gilp"
+        return "tablas" if self.tableaus else "resumen"
+
+    def summary_html(self) -> str:
+        """Aviso para la página cuando se omite alguna visualización."""
+        return (f"<p>Visualización omitida para un modelo de {self.variables} variables y "
+                f"{self.rows} restricciones: {'; '.join(self.reasons)}.</p>")
+
+    def summary(self) -> Dict:
+        """Datos para el diagnóstico del reporte."""
+        return {"modo": self.mode, "variables": self.variables, "filas": self.rows,
+                "columnas_tabla": self.columns, "motivos": self.reasons}
+
+
+class VisualizationPolicy:
+    """Elige la visualización a partir de las dimensiones del modelo."""
+
+    @staticmethod
+    def choose(num_variables: int, num_rows: int) -> VisualizationPlan:
+        """
+        'num_rows' cuenta las filas como las ven gilp y simple_simplex
+        (cada '=' son dos desigualdades).
+        """
+        reasons = []
+        gilp = num_variables in config.VISUALIZATION_GILP_VARIABLES
+        if not gilp:
+            dimensions = " o ".join(str(n) for n in config.VISUALIZATION_GILP_VARIABLES)
+            reasons.append(f"gilp solo dibuja modelos de {dimensions} variables")
+        elif num_rows > config.VISUALIZATION_GILP_MAX_ROWS:
+            gilp = False
+            reasons.append(f"gilp se usa hasta {config.VISUALIZATION_GILP_MAX_ROWS} restricciones")
+
+        plan = VisualizationPlan(num_variables, num_rows, gilp, True, reasons)
+        if plan.rows + 1 > config.VISUALIZATION_TABLEAU_MAX_ROWS or \
+                plan.columns > config.VISUALIZATION_TABLEAU_MAX_COLUMNS:
+            plan.tableaus = False
+            reasons.append(f"las tablas se generan hasta {config.VISUALIZATION_TABLEAU_MAX_ROWS} filas y "
+                           f"{config.VISUALIZATION_TABLEAU_MAX_COLUMNS} columnas "
+                           f"(este modelo tiene {plan.rows + 1} x {plan.columns})")
+        return plan
+
+    @staticmethod
+    def for_model(constraints_data: List[Dict], variables: List[str]) -> VisualizationPlan:
+        """Plan para un modelo en el formato de los JSON (ya llevado a x >= 0)."""
+        rows = sum(2 if const['operator'] == '=' else 1 for const in constraints_data)
+        return VisualizationPolicy.choose(len(variables), rows)
@@ -0,0 +1,115 @@
+"""
+Módulo de utilidades: Importación diferida de las librerías pesadas.
+
+scipy.optimize, gilp (con Plotly y networkx), simple_simplex y ReportLab
+tardan segundos en importarse y solo hacen falta al resolver o al exportar
+un PDF. Los módulos que los usan dejan en su lugar un lazy_callable(): un
+nombre que importa la librería en su primera llamada. Así cargar la app (un
+worker de gunicorn, el CLI) no paga ese costo hasta que lo necesita.
+
+preload() los importa todos de una vez (config.PRELOAD_MODULES) y
+warm_up() además resuelve un problema chico y arma su PDF: lo usa gunicorn
+con --preload, para que el master haga ese trabajo antes del fork y los
+workers compartan esas páginas de memoria (copy-on-write).
+"""
+import gc
+import importlib
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterable
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+
+def lazy_callable(module: str, name: str) -> Callable:
+    """
+    Función que reenvía la llamada a module.name, importando el módulo la
+    primera vez. Sirve para funciones y clases que solo se llaman (no para
+    isinstance ni para leer atributos).
+    """
+    target = None
+
+    def call(*args, **kwargs):
+        nonlocal target
+        if target is None:
+            target = getattr(importlib.import_module(module), name)
+        return target(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = name
+    call.__doc__ = f"{module}.{name} (se importa en la primera llamada)."
+    return call
+
+
+def preload(modules: Iterable[str] = None) -> Dict[str, float]:
+    """Importa de antemano los módulos diferidos. Retorna los segundos de cada import."""
+    seconds = {}
+    for module in config.PRELOAD_MODULES if modules is None else modules:
+        start = time.perf_counter()
+        importlib.import_module(module)
+        seconds[module] = time.perf_counter() - start
+    logger.info("Módulos precargados en %.2f s: %s", sum(seconds.values()), ", ".join(seconds))
+    return seconds
+
+
+# max 3x1 + 5x2 (2 variables: gilp arma el gráfico con Plotly)
+WARM_UP_PROBLEM = {"problema_definicion": {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}},
+    "restricciones": [
+        {"coefficients": {"x1": 1.0, "x2": 0.0}, "operator": "<=", "rhs": 4.0},
+        {"coefficients": {"x1": 0.0, "x2": 2.0}, "operator": "<=", "rhs": 12.0},
+        {"coefficients": {"x1": 3.0, "x2": 2.0}, "operator": "<=", "rhs": 18.0},
+    ],
+}}
+
+
+def warm_up(freeze: bool = True) -> Dict[str, float]:
+    """
+    preload() + una resolución chica y su PDF en este proceso (sin pool, sin
+    guardar, sin métricas ni el registro de la resolución), para llenar las
+    cachés de gilp, Plotly y ReportLab. Pensado para el master de gunicorn
+    antes del fork. Retorna los segundos de cada paso.
+
+    La resolución usa el backend 'tableau': HiGHS puede crear sus hilos en la
+    primera resolución, y un fork no se los lleva a los workers.
+    Con 'freeze', gc.freeze() deja lo creado hasta acá fuera de las
+    recolecciones, así el GC de cada worker no escribe en esas páginas.
+    """
+    from app.controllers.solver_controller import SolverController
+    from app.services import PdfReportService
+
+    seconds = {"importacion": sum(preload().values())}
+    saved = (config.SOLVE_EXECUTOR, config.METRICS_ENABLED)
+    config.SOLVE_EXECUTOR, config.METRICS_ENABLED = "inline", False
+    logging.disable(logging.INFO)
+    try:
+        start = time.perf_counter()
+        report = SolverController(WARM_UP_PROBLEM, backend="tableau", persist=False).run()
+        seconds["resolucion"] = time.perf_counter() - start
+        start = time.perf_counter()
+        PdfReportService(report).render()
+        seconds["pdf"] = time.perf_counter() - start
+    finally:
+        logging.disable(logging.NOTSET)
+        config.SOLVE_EXECUTOR, config.METRICS_ENABLED = saved
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    threads = _os_threads()
+    if threads > 1:
+        logger.warning("El proceso tiene %d hilos después del precalentamiento: "
+                       "los procesos creados con fork no los heredan.", threads)
+    logger.info("Precalentamiento en %.2f s (importación %.2f s, resolución %.2f s, PDF %.2f s).",
+                sum(seconds.values()), seconds["importacion"], seconds["resolucion"], seconds["pdf"])
+    return seconds
+
+
+def _os_threads() -> int:
+    """Hilos del proceso, incluidos los de librerías nativas (0 si no hay /proc)."""
+    try:
+        return len(os.listdir("/proc/self/task"))
+    except OSError:
+        return 0
@@ -0,0 +1,57 @@
+"""
+Módulo de utilidades: Configuración de los logs de la aplicación.
+
+Todos los módulos usan logging.getLogger(__name__), así que cuelgan del
+logger "app". Acá se le asigna un único handler (stderr) con el nivel y
+el formato de app/config.py (LOG_LEVEL, LOG_FORMAT, LOG_LEVELS).
+"""
+import json
+import logging
+import sys
+
+from app import config
+
+APP_LOGGER = "app"
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Atributos que todo LogRecord trae; el resto son los campos pasados en 'extra'.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea: momento, nivel, logger, mensaje y los campos 'extra'."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "momento": self.formatTime(record),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS})
+        if record.exc_info:
+            entry["excepcion"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: str = None, fmt: str = None, levels: dict = None) -> logging.Logger:
+    """
+    Configura el logger "app". Se puede llamar varias veces (init_app, CLI):
+    reemplaza el handler propio en lugar de duplicarlo.
+    """
+    logger = logging.getLogger(APP_LOGGER)
+    logger.setLevel((level or config.LOG_LEVEL).upper())
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.set_name(APP_LOGGER)
+    if (fmt or config.LOG_FORMAT) == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    for old in [h for h in logger.handlers if h.get_name() == APP_LOGGER]:
+        logger.removeHandler(old)
+    logger.addHandler(handler)
+
+    for name, name_level in (config.LOG_LEVELS if levels is None else levels).items():
+        logging.getLogger(name).setLevel(name_level.upper())
+    return logger
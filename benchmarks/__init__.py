@@ -0,0 +1,18 @@
+"""
+Benchmarks del Simplex Solver.
+
+Genera familias de problemas con semilla (benchmarks/generators.py), mide
+cada etapa por separado (benchmarks/suite.py) y escribe un archivo de
+resultados JSON para comparar versiones.
+
+Uso: python -m benchmarks --help
+"""
+from .generators import FAMILIES, generate
+from .suite import STAGES, run_suite
+
+__all__ = [
+    'FAMILIES',
+    'generate',
+    'STAGES',
+    'run_suite'
+]
@@ -0,0 +1,93 @@
+"""
+Ejecuta la suite de benchmarks y guarda los resultados en JSON.
+
+Ejemplos:
+    python -m benchmarks
+    python -m benchmarks --familias densa,transporte --tamanos 10,100 --etapas solver,modelo
+    python -m benchmarks --salida resultados.json --semilla 7
+    python -m benchmarks --guardar-linea-base      (guarda la corrida como línea base)
+    python -m benchmarks --comparar                (sale con 1 si hay regresiones)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from app import config
+from benchmarks.compare import DEFAULT_BASELINE, add_threshold_arguments, load_results, report, save_baseline
+from benchmarks.generators import FAMILIES
+from benchmarks.suite import DEFAULT_SIZES, STAGES, format_table, run_suite
+
+DEFAULT_OUTPUT_DIR = os.path.join(config.OUTPUT_DIR, "benchmarks")
+
+
+def _csv(value: str) -> list:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _choices(values: list, allowed, what: str) -> list:
+    unknown = [v for v in values if v not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"{what} desconocida(s): {', '.join(unknown)}. "
+                                         f"Disponibles: {', '.join(allowed)}")
+    return values
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--familias", type=lambda v: _choices(_csv(v), FAMILIES, "Familia"),
+                        default=list(FAMILIES), help=f"Separadas por coma (por defecto, todas: {', '.join(FAMILIES)}).")
+    parser.add_argument("--tamanos", type=lambda v: [int(x) for x in _csv(v)], default=list(DEFAULT_SIZES),
+                        help="Cantidad de variables, separadas por coma (por defecto 10,50,200).")
+    parser.add_argument("--etapas", type=lambda v: _choices(_csv(v), STAGES, "Etapa"), default=list(STAGES),
+                        help=f"Separadas por coma (por defecto, todas: {', '.join(STAGES)}).")
+    parser.add_argument("--backends", type=_csv, default=None, help="Backends a medir (por defecto, todos).")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--min-rondas", type=int, default=5, help="Mediciones mínimas por benchmark.")
+    parser.add_argument("--tiempo-max", type=float, default=0.5,
+                        help="Segundos por benchmark a partir de los cuales no se agregan rondas.")
+    parser.add_argument("--salida", default=None,
+                        help="Archivo de resultados (por defecto outputs/benchmarks/resultados_<fecha>.json).")
+    parser.add_argument("--guardar-linea-base", nargs="?", const=DEFAULT_BASELINE, default=None, metavar="RUTA",
+                        help="Guardar la corrida como línea base (por defecto outputs/benchmarks/linea_base.json).")
+    parser.add_argument("--comparar", nargs="?", const=DEFAULT_BASELINE, default=None, metavar="RUTA",
+                        help="Comparar la corrida contra una línea base y salir con 1 si hay regresiones.")
+    add_threshold_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    baseline = None
+    if args.comparar:
+        # Se lee antes de correr la suite: si falta, no se pierden minutos midiendo
+        try:
+            baseline = load_results(args.comparar)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+    output = args.salida or os.path.join(DEFAULT_OUTPUT_DIR, f"resultados_{time.strftime('%Y%m%d_%H%M%S')}.json")
+
+    def progress(name, stats):
+        print(f"{name:<50} {stats['mediana'] * 1000:>10.3f} ms  ({stats['rondas']} rondas)", file=sys.stderr)
+
+    results = run_suite(families=args.familias, sizes=args.tamanos, stages=args.etapas, seed=args.semilla,
+                        backends=args.backends, min_rounds=args.min_rondas, max_time=args.tiempo_max,
+                        progress=progress)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(format_table(results))
+    print(f"\nResultados guardados en: {output}")
+    if args.guardar_linea_base:
+        print(f"Línea base guardada en: {save_baseline(results, args.guardar_linea_base)}")
+    if baseline is not None:
+        print()
+        return report(baseline, results, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Compara una corrida de benchmarks contra una línea base guardada.
+
+Un benchmark es una regresión si su mediana (o su p95) empeora más que la
+tolerancia, la diferencia supera un mínimo absoluto (para no reaccionar al
+ruido de los benchmarks de microsegundos) y la prueba t de Welch sobre las
+medias es significativa. Sale con código 1 si hay alguna regresión.
+
+Ejemplos:
+    python -m benchmarks --guardar-linea-base
+    python -m benchmarks --comparar
+    python -m benchmarks.compare linea_base.json resultados.json --tolerancia 0.05
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from scipy import stats as scipy_stats
+
+from app import config
+from benchmarks.suite import RESULTS_FORMAT, _ms
+
+DEFAULT_BASELINE = os.path.join(config.OUTPUT_DIR, "benchmarks", "linea_base.json")
+# Estadísticas que se guardan por benchmark en la línea base
+BASELINE_STATS = ("rondas", "media", "desvio", "mediana", "p90", "p95", "p99")
+# Versiones que, si cambian, hacen que la comparación no sea entre iguales
+ENVIRONMENT_KEYS = ("python", "plataforma", "procesador", "numpy", "scipy")
+
+REGRESSION, IMPROVEMENT, UNCHANGED, NEW, MISSING = "regresion", "mejora", "sin cambio", "nuevo", "faltante"
+
+
+class Thresholds:
+    """Cuándo un cambio cuenta como regresión (o mejora)."""
+
+    def __init__(self, tolerance: float = 0.10, tail_tolerance: float = 0.25, alpha: float = 0.01,
+                 min_delta: float = 50e-6):
+        self.tolerance = tolerance            # Cambio relativo de la mediana
+        self.tail_tolerance = tail_tolerance  # Cambio relativo del p95 (más ruidoso)
+        self.alpha = alpha                    # Nivel de la prueba t de Welch
+        self.min_delta = min_delta            # Diferencia mínima en segundos
+
+
+def make_baseline(results: dict) -> dict:
+    """Resultados de run_suite -> línea base (solo mediana, percentiles y lo que usa la prueba t)."""
+    return {
+        "formato": RESULTS_FORMAT,
+        "fecha": results.get("fecha") or datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "entorno": results.get("entorno", {}),
+        "parametros": results.get("parametros", {}),
+        "benchmarks": {name: {key: stats[key] for key in BASELINE_STATS if key in stats}
+                       for name, stats in results["benchmarks"].items()},
+    }
+
+
+def save_baseline(results: dict, path: str = DEFAULT_BASELINE) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(make_baseline(results), f, indent=2, ensure_ascii=False)
+    return path
+
+
+def load_results(path: str) -> dict:
+    """Lee una línea base o un archivo de resultados (el formato de benchmarks es el mismo)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("formato") != RESULTS_FORMAT or not isinstance(data.get("benchmarks"), dict):
+        raise ValueError(f"'{path}' no es un archivo de resultados de benchmarks (formato {RESULTS_FORMAT}).")
+    return data
+
+
+def _relative(current: float, base: float) -> float:
+    return current / base - 1 if base > 0 else (math.inf if current > 0 else 0.0)
+
+
+def _welch_p_value(base: dict, current: dict, alternative: str) -> Optional[float]:
+    """p de la prueba t de Welch sobre las medias; None si no hay rondas o dispersión suficientes."""
+    if base.get("rondas", 0) < 2 or current.get("rondas", 0) < 2:
+        return None
+    if not base.get("desvio") and not current.get("desvio"):
+        return None
+    result = scipy_stats.ttest_ind_from_stats(
+        current["media"], current["desvio"], current["rondas"],
+        base["media"], base["desvio"], base["rondas"],
+        equal_var=False, alternative=alternative)
+    return float(result.pvalue)
+
+
+def compare_benchmark(base: dict, current: dict, thresholds: Thresholds) -> dict:
+    """Estado de un benchmark presente en las dos corridas, con los cambios que lo explican."""
+    median_change = _relative(current["mediana"], base["mediana"])
+    tail_change = _relative(current["p95"], base["p95"])
+    row = {"base": base["mediana"], "actual": current["mediana"], "cambio": median_change,
+           "p95_base": base["p95"], "p95_actual": current["p95"], "cambio_p95": tail_change,
+           "p_valor": None, "estado": UNCHANGED}
+
+    slower_median = (median_change > thresholds.tolerance
+                     and current["mediana"] - base["mediana"] > thresholds.min_delta)
+    slower_tail = (tail_change > thresholds.tail_tolerance
+                   and current["p95"] - base["p95"] > thresholds.min_delta)
+    faster = (median_change < -thresholds.tolerance
+              and base["mediana"] - current["mediana"] > thresholds.min_delta)
+
+    if slower_median or slower_tail:
+        row["p_valor"] = _welch_p_value(base, current, "greater")
+        if row["p_valor"] is None or row["p_valor"] < thresholds.alpha:
+            row["estado"] = REGRESSION
+    elif faster:
+        row["p_valor"] = _welch_p_value(base, current, "less")
+        if row["p_valor"] is None or row["p_valor"] < thresholds.alpha:
+            row["estado"] = IMPROVEMENT
+    return row
+
+
+def compare(baseline: dict, current: dict, thresholds: Thresholds = None) -> List[dict]:
+    """Una fila por benchmark (en el orden de la corrida actual; los faltantes al final)."""
+    thresholds = thresholds or Thresholds()
+    base_benchmarks, current_benchmarks = baseline["benchmarks"], current["benchmarks"]
+    rows = []
+    for name, stats in current_benchmarks.items():
+        if name in base_benchmarks:
+            rows.append({"benchmark": name, **compare_benchmark(base_benchmarks[name], stats, thresholds)})
+        else:
+            rows.append({"benchmark": name, "estado": NEW, "actual": stats["mediana"], "p95_actual": stats["p95"]})
+    for name, stats in base_benchmarks.items():
+        if name not in current_benchmarks:
+            rows.append({"benchmark": name, "estado": MISSING, "base": stats["mediana"], "p95_base": stats["p95"]})
+    return rows
+
+
+def environment_differences(baseline: dict, current: dict) -> List[str]:
+    base_env, current_env = baseline.get("entorno", {}), current.get("entorno", {})
+    return [f"{key}: {base_env.get(key)} -> {current_env.get(key)}" for key in ENVIRONMENT_KEYS
+            if base_env.get(key) != current_env.get(key)]
+
+
+def has_regressions(rows: List[dict]) -> bool:
+    return any(row["estado"] == REGRESSION for row in rows)
+
+
+def format_diff(rows: List[dict], only_changes: bool = False) -> str:
+    """Tabla de texto con las medianas y p95 (ms) de ambas corridas y el estado de cada benchmark."""
+    header = ("benchmark", "base ms", "actual ms", "cambio", "p95 base", "p95 actual", "cambio p95", "p", "estado")
+    table = [header]
+    for row in rows:
+        if row["estado"] == MISSING or (only_changes and row["estado"] == UNCHANGED):
+            continue
+        table.append((
+            row["benchmark"],
+            _ms(row.get("base", math.nan)), _ms(row.get("actual", math.nan)), _percent(row.get("cambio")),
+            _ms(row.get("p95_base", math.nan)), _ms(row.get("p95_actual", math.nan)),
+            _percent(row.get("cambio_p95")),
+            f"{row['p_valor']:.3g}" if row.get("p_valor") is not None else "-",
+            row["estado"].upper() if row["estado"] == REGRESSION else row["estado"],
+        ))
+    widths = [max(len(line[i]) for line in table) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(widths[i]) if i in (0, len(header) - 1) else cell.rjust(widths[i])
+                       for i, cell in enumerate(line)).rstrip() for line in table]
+    lines.insert(1, "-" * max(len(line) for line in lines))
+
+    counts = {state: sum(1 for row in rows if row["estado"] == state)
+              for state in (REGRESSION, IMPROVEMENT, UNCHANGED, NEW, MISSING)}
+    lines.append("")
+    lines.append(", ".join(f"{count} {state}" for state, count in counts.items() if count) or "Sin benchmarks")
+    return "\n".join(lines)
+
+
+def _percent(change: Optional[float]) -> str:
+    if change is None:
+        return "-"
+    return f"{change * 100:+.1f}%" if math.isfinite(change) else "+inf"
+
+
+def add_threshold_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = Thresholds()
+    parser.add_argument("--tolerancia", type=float, default=defaults.tolerance,
+                        help="Empeoramiento relativo tolerado de la mediana (por defecto 0.10 = 10%%).")
+    parser.add_argument("--tolerancia-p95", type=float, default=defaults.tail_tolerance,
+                        help="Empeoramiento relativo tolerado del p95 (por defecto 0.25).")
+    parser.add_argument("--alfa", type=float, default=defaults.alpha,
+                        help="Nivel de significación de la prueba t de Welch (por defecto 0.01).")
+    parser.add_argument("--min-delta-ms", type=float, default=defaults.min_delta * 1000,
+                        help="Diferencia mínima en ms para considerar un cambio (por defecto 0.05).")
+    parser.add_argument("--solo-cambios", action="store_true", help="Ocultar los benchmarks sin cambio.")
+
+
+def thresholds_from_args(args: argparse.Namespace) -> Thresholds:
+    return Thresholds(tolerance=args.tolerancia, tail_tolerance=args.tolerancia_p95, alpha=args.alfa,
+                      min_delta=args.min_delta_ms / 1000)
+
+
+def report(baseline: dict, current: dict, args: argparse.Namespace, out=None) -> int:
+    """Imprime la tabla de diferencias y retorna el código de salida (1 si hay regresiones)."""
+    for difference in environment_differences(baseline, current):
+        print(f"Aviso: el entorno de la línea base es distinto ({difference})", file=sys.stderr)
+    rows = compare(baseline, current, thresholds_from_args(args))
+    print(format_diff(rows, only_changes=args.solo_cambios), file=out or sys.stdout)
+    return 1 if has_regressions(rows) else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare",
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument("linea_base", help="Línea base (o resultados de una corrida anterior).")
+    parser.add_argument("resultados", help="Resultados de la corrida a comparar.")
+    add_threshold_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        baseline, current = load_results(args.linea_base), load_results(args.resultados)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return report(baseline, current, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Familias de problemas de programación lineal para los benchmarks.
+
+Cada generador recibe un tamaño y una semilla, y devuelve una
+'problema_definicion' en el mismo formato que la carga de archivos
+(variables x1..xn). Con la misma semilla, el problema es el mismo.
+
+    densa           max c·x, A x <= b con A > 0 (acotado y factible)
+    rala            igual, con ~5% de no-ceros (al menos uno por columna)
+    transporte      min costo, oferta (<=) y demanda (>=) balanceadas
+    asignacion      min costo, n x n variables, filas y columnas = 1
+    degenerada      m > n restricciones activas en el óptimo
+    infactible      densa + sum(x) >= algo inalcanzable
+    no_acotada      max c·x con filas de suma negativa (x = t·1 es factible)
+"""
+import math
+from typing import Callable, Dict, List
+
+import numpy as np
+
+FAMILIES: Dict[str, Callable[[int, int], dict]] = {}
+# Estado esperado de la solución de cada familia
+EXPECTED_STATUS = {
+    "densa": "Solucion Factible",
+    "rala": "Solucion Factible",
+    "transporte": "Solucion Factible",
+    "asignacion": "Solucion Factible",
+    "degenerada": "Solucion Factible",
+    "infactible": "Sin Solucion Factible",
+    "no_acotada": "Error",
+}
+
+
+def family(name: str):
+    def decorator(func):
+        FAMILIES[name] = func
+        return func
+    return decorator
+
+
+def generate(name: str, size: int, seed: int = 0) -> dict:
+    """Problema de la familia 'name'; 'size' es la cantidad de variables (aprox. en transporte y asignación)."""
+    if name not in FAMILIES:
+        raise ValueError(f"Familia desconocida: '{name}'. Disponibles: {', '.join(FAMILIES)}")
+    return FAMILIES[name](size, seed)
+
+
+def _problem(objective_type: str, c, rows: List[tuple]) -> dict:
+    """(coeficientes, operador, rhs) -> problema_definicion con variables x1..xn."""
+    names = [f"x{j + 1}" for j in range(len(c))]
+    return {
+        "funcion_objetivo": {"type": objective_type,
+                             "coefficients": {var: float(v) for var, v in zip(names, c)}},
+        "restricciones": [
+            {"coefficients": {var: float(v) for var, v in zip(names, a)}, "operator": op, "rhs": float(rhs)}
+            for a, op, rhs in rows
+        ],
+    }
+
+
+def _rows(A, operator, b) -> List[tuple]:
+    return [(a, operator, rhs) for a, rhs in zip(A, b)]
+
+
+@family("densa")
+def dense(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    m = max(1, n // 2)
+    A = rng.integers(1, 10, size=(m, n)).astype(float)
+    b = A.sum(axis=1) * rng.uniform(1.0, 3.0, size=m)
+    c = rng.integers(1, 20, size=n)
+    return _problem("maximize", c, _rows(A, "<=", np.round(b, 2)))
+
+
+@family("rala")
+def sparse(n: int, seed: int = 0, density: float = 0.05) -> dict:
+    rng = np.random.default_rng(seed)
+    m = max(1, n // 2)
+    mask = rng.random((m, n)) < density
+    mask[rng.integers(0, m, size=n), np.arange(n)] = True  # Toda columna acotada por alguna fila
+    A = np.where(mask, rng.integers(1, 10, size=(m, n)), 0).astype(float)
+    b = np.maximum(A.sum(axis=1), 1.0) * rng.uniform(1.0, 3.0, size=m)
+    c = rng.integers(1, 20, size=n)
+    return _problem("maximize", c, _rows(A, "<=", np.round(b, 2)))
+
+
+@family("transporte")
+def transportation(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    sources = max(2, int(math.sqrt(n)))
+    sinks = max(2, n // sources)
+    supply = rng.integers(20, 100, size=sources).astype(float)
+    demand = rng.multinomial(int(supply.sum()), np.ones(sinks) / sinks).astype(float)
+    cost = rng.integers(1, 30, size=sources * sinks)
+    rows = []
+    for i in range(sources):
+        a = np.zeros(sources * sinks)
+        a[i * sinks:(i + 1) * sinks] = 1
+        rows.append((a, "<=", supply[i]))
+    for j in range(sinks):
+        a = np.zeros(sources * sinks)
+        a[j::sinks] = 1
+        rows.append((a, ">=", demand[j]))
+    return _problem("minimize", cost, rows)
+
+
+@family("asignacion")
+def assignment(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    k = max(2, int(round(math.sqrt(n))))
+    cost = rng.integers(1, 50, size=k * k)
+    rows = []
+    for i in range(k):
+        a = np.zeros(k * k)
+        a[i * k:(i + 1) * k] = 1
+        rows.append((a, "=", 1.0))
+    for j in range(k):
+        a = np.zeros(k * k)
+        a[j::k] = 1
+        rows.append((a, "=", 1.0))
+    return _problem("minimize", cost, rows)
+
+
+@family("degenerada")
+def degenerate(n: int, seed: int = 0) -> dict:
+    # Todas las filas pasan por x0 = 1 y c = A^T w (w >= 0): x0 es óptimo con m > n filas activas
+    rng = np.random.default_rng(seed)
+    m = 2 * n
+    A = rng.integers(1, 10, size=(m, n)).astype(float)
+    b = A @ np.ones(n)
+    w = np.zeros(m)
+    w[rng.choice(m, size=max(1, n // 2), replace=False)] = rng.integers(1, 5, size=max(1, n // 2))
+    return _problem("maximize", A.T @ w, _rows(A, "<=", b))
+
+
+@family("infactible")
+def infeasible(n: int, seed: int = 0) -> dict:
+    problem = dense(n, seed)
+    # Con A >= 1, cada fila acota sum(x) <= rhs: pedir más que el menor rhs es infactible
+    limit = min(row["rhs"] for row in problem["restricciones"])
+    problem["restricciones"].append({
+        "coefficients": {var: 1.0 for var in problem["funcion_objetivo"]["coefficients"]},
+        "operator": ">=", "rhs": float(limit + 1),
+    })
+    return problem
+
+
+@family("no_acotada")
+def unbounded(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    m = max(1, n // 2)
+    A = rng.integers(-5, 6, size=(m, n)).astype(float)
+    A -= ((A.sum(axis=1) + 1) / n)[:, None]  # Suma de cada fila = -1: x = t·(1, ..., 1) es factible
+    b = rng.integers(1, 20, size=m)
+    c = rng.integers(1, 20, size=n)
+    return _problem("maximize", c, _rows(np.round(A, 6), "<=", b))
+
+
+def to_expressions(problem: dict) -> tuple:
+    """Problema -> (función objetivo, restricciones) como los escribe el usuario en la consola."""
+    def terms(coefficients: dict) -> str:
+        return " + ".join(f"{value:.12g}{var}" for var, value in coefficients.items()).replace("+ -", "- ")
+
+    objective = terms(problem["funcion_objetivo"]["coefficients"])
+    constraints = [f"{terms(row['coefficients'])} {row['operator']} {row['rhs']:.12g}"
+                   for row in problem["restricciones"]]
+    return objective, constraints
+
+
+def to_form(problem: dict) -> dict:
+    """Problema -> datos del formulario de /new (mismo formato que new_problem.html)."""
+    coefficients = problem["funcion_objetivo"]["coefficients"]
+    variables = list(coefficients)
+    form = {
+        "problem_type": problem["funcion_objetivo"]["type"],
+        "objective[]": [str(coefficients[var]) for var in variables],
+        "variable_type[]": ["continuous"] * len(variables),
+        "constraint_sign[]": [row["operator"] for row in problem["restricciones"]],
+        "constraint_rhs[]": [str(row["rhs"]) for row in problem["restricciones"]],
+    }
+    for j, var in enumerate(variables):
+        form[f"constraint_{j + 1}[]"] = [str(row["coefficients"].get(var, 0.0)) for row in problem["restricciones"]]
+    return form
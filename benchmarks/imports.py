@@ -0,0 +1,182 @@
+"""
+Benchmark de importación: cuánto tarda en arrancar la app y cuánto cuesta
+el primer uso de cada librería pesada, cada medición en un proceso nuevo
+(sin nada importado ni calentado de antemano).
+
+Casos:
+    importacion/<módulo>   import del módulo (web_app y cada librería)
+    precarga               lazy_imports.preload() (lo que gunicorn --preload hace en el master)
+    primer_uso/resolucion  primera resolución después de importar web_app
+    primer_uso/pdf         primer PDF después de una resolución
+
+Los resultados tienen el mismo formato que los de la suite, así se guardan
+como línea base y se comparan con benchmarks.compare.
+
+Ejemplos:
+    python -m benchmarks.imports
+    python -m benchmarks.imports --rondas 10 --casos importacion/web_app,primer_uso/resolucion
+    python -m benchmarks.imports --comparar outputs/benchmarks/linea_base_importacion.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app import config
+from benchmarks.compare import add_threshold_arguments, load_results, report, save_baseline
+from benchmarks.suite import RESULTS_FORMAT, environment, format_table, summarize
+
+DEFAULT_OUTPUT_DIR = os.path.join(config.OUTPUT_DIR, "benchmarks")
+DEFAULT_BASELINE = os.path.join(DEFAULT_OUTPUT_DIR, "linea_base_importacion.json")
+
+# Librerías que la app importa recién al usarlas (se informa cuáles quedaron cargadas)
+HEAVY_MODULES = ("scipy.optimize", "simple_simplex", "gilp", "plotly", "networkx", "reportlab")
+
+# Un problema chico escrito a mano: importar benchmarks.generators cargaría la suite (y scipy)
+_SOLVE_SETUP = """
+import web_app
+from app import config
+from app.controllers.solver_controller import SolverController
+config.METRICS_ENABLED = False
+problem = {"problema_definicion": {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}},
+    "restricciones": [
+        {"coefficients": {"x1": 1.0, "x2": 0.0}, "operator": "<=", "rhs": 4.0},
+        {"coefficients": {"x1": 0.0, "x2": 2.0}, "operator": "<=", "rhs": 12.0},
+        {"coefficients": {"x1": 3.0, "x2": 2.0}, "operator": "<=", "rhs": 18.0},
+    ],
+}}
+"""
+
+# nombre -> (preparación, sin medir; lo que se mide)
+CASES: Dict[str, Tuple[str, str]] = {
+    "importacion/web_app": ("", "import web_app"),
+    "importacion/numpy": ("", "import numpy"),
+    "importacion/flask": ("", "import flask"),
+    "importacion/scipy.optimize": ("", "import scipy.optimize"),
+    "importacion/simple_simplex": ("", "import simple_simplex"),
+    "importacion/gilp": ("", "import gilp"),
+    "importacion/reportlab": ("", "import reportlab.platypus"),
+    "precarga": ("from app.utils.lazy_imports import preload", "preload()"),
+    "primer_uso/resolucion": (_SOLVE_SETUP, "SolverController(problem, persist=False).run()"),
+    "primer_uso/pdf": (_SOLVE_SETUP + "report = SolverController(problem, persist=False).run()\n",
+                       "from app.services import PdfReportService\nPdfReportService(report).render()"),
+}
+
+_CHILD = """
+import json, sys, time
+{setup}
+_start = time.perf_counter()
+{statement}
+_seconds = time.perf_counter() - _start
+print(json.dumps({{"segundos": _seconds, "cargados": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_once(name: str, env: Optional[dict] = None, timeout: float = 300) -> dict:
+    """Ejecuta un caso en un intérprete nuevo. Retorna {"segundos", "cargados"}."""
+    setup, statement = CASES[name]
+    code = _CHILD.format(setup=setup, statement=statement, heavy=HEAVY_MODULES)
+    completed = subprocess.run([sys.executable, "-c", code], cwd=config.BASE_DIR, env=env,
+                               capture_output=True, text=True, timeout=timeout)
+    if completed.returncode != 0:
+        raise RuntimeError(f"El caso '{name}' falló:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _child_env(metrics_dir: str) -> dict:
+    """Sin logs por resolución y con las métricas fuera del directorio de la app."""
+    return {**os.environ, "SIMPLEX_LOG_LEVEL": "WARNING", "SIMPLEX_METRICS_DIR": metrics_dir}
+
+
+def run_imports(cases: List[str] = None, rounds: int = 5,
+                progress: Optional[Callable[[str, dict], None]] = None) -> dict:
+    """
+    Mide cada caso 'rounds' veces, después de una corrida sin medir que deja
+    los .pyc compilados y los archivos en la caché del sistema.
+    """
+    cases = list(cases or CASES)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="simplex_bench_") as tmp:
+        env = _child_env(tmp)
+        for name in cases:
+            loaded = run_once(name, env)["cargados"]
+            times = [run_once(name, env)["segundos"] for _ in range(rounds)]
+            stats = summarize(times)
+            results[name] = {"etapa": name.split("/")[0], "cargados": loaded, **stats}
+            if progress:
+                progress(name, stats)
+    return {
+        "formato": RESULTS_FORMAT,
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "entorno": environment(),
+        "parametros": {"casos": cases, "rondas": rounds},
+        "benchmarks": results,
+    }
+
+
+def _cases(value: str) -> list:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Caso(s) desconocido(s): {', '.join(unknown)}. "
+                                         f"Disponibles: {', '.join(CASES)}")
+    return names
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.imports",
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--casos", type=_cases, default=list(CASES),
+                        help=f"Separados por coma (por defecto, todos: {', '.join(CASES)}).")
+    parser.add_argument("--rondas", type=int, default=5, help="Procesos medidos por caso.")
+    parser.add_argument("--salida", default=None,
+                        help="Archivo de resultados (por defecto outputs/benchmarks/importacion_<fecha>.json).")
+    parser.add_argument("--guardar-linea-base", nargs="?", const=DEFAULT_BASELINE, default=None, metavar="RUTA",
+                        help="Guardar la corrida como línea base "
+                             "(por defecto outputs/benchmarks/linea_base_importacion.json).")
+    parser.add_argument("--comparar", nargs="?", const=DEFAULT_BASELINE, default=None, metavar="RUTA",
+                        help="Comparar la corrida contra una línea base y salir con 1 si hay regresiones.")
+    add_threshold_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    baseline = None
+    if args.comparar:
+        try:
+            baseline = load_results(args.comparar)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+    output = args.salida or os.path.join(DEFAULT_OUTPUT_DIR, f"importacion_{time.strftime('%Y%m%d_%H%M%S')}.json")
+
+    def progress(name, stats):
+        print(f"{name:<30} {stats['mediana'] * 1000:>10.1f} ms  ({stats['rondas']} rondas)", file=sys.stderr)
+
+    results = run_imports(args.casos, rounds=args.rondas, progress=progress)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(format_table(results))
+    loaded = results["benchmarks"].get("importacion/web_app", {}).get("cargados")
+    if loaded:
+        print(f"\nAviso: 'import web_app' cargó {', '.join(loaded)}")
+    print(f"\nResultados guardados en: {output}")
+    if args.guardar_linea_base:
+        print(f"Línea base guardada en: {save_baseline(results, args.guardar_linea_base)}")
+    if baseline is not None:
+        print()
+        return report(baseline, results, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,501 @@
+"""
+Prueba de carga HTTP contra un servidor gunicorn real (web_app:app).
+
+Levanta gunicorn en un puerto libre con la cantidad y el tipo de workers
+pedidos, y recorre el flujo completo de un usuario (POST /new -> POST /solve
+-> GET /exportar-pdf) con llegadas a tasa fija (lazo abierto: cada usuario
+llega a su hora aunque el servidor no haya respondido a los anteriores).
+La latencia se mide desde la hora de llegada programada, así que la espera
+en cola también cuenta. Por cada tasa informa el rendimiento logrado y los
+percentiles 50/95/99 del flujo y de cada paso. En paralelo, una sonda pide
+una ruta liviana (por defecto /) para ver si queda bloqueada detrás de las
+resoluciones. Al terminar se mide la memoria del master, de los workers y
+de sus pools (RSS y PSS: la PSS reparte las páginas compartidas), y se
+informa cuánto tardó el primer flujo después de arrancar.
+
+Ejemplos:
+    python -m benchmarks.load
+    python -m benchmarks.load --workers 1,4 --tipo-worker sync,gthread --hilos 4 --tasas 1,2,4,8 --duracion 20
+    python -m benchmarks.load --tipo-worker gthread --hilos 8 --ejecutor inline,process
+    python -m benchmarks.load --tipo-worker gthread --hilos 8 --precarga no,si   (gunicorn --preload)
+    python -m benchmarks.load --url http://localhost:8000 --tasas 5   (contra un servidor ya levantado)
+
+El servidor local usa el directorio outputs/ del proyecto (las soluciones
+y PDFs generados quedan ahí).
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app import config
+from benchmarks.generators import FAMILIES, generate, to_form
+from benchmarks.suite import _ms, environment
+
+LOAD_FORMAT = 1
+DEFAULT_OUTPUT_DIR = os.path.join(config.OUTPUT_DIR, "benchmarks")
+FLOW_STEPS = ("new", "solve", "pdf")
+ARRIVALS = ("poisson", "constante")
+_SOLUTION_ID = re.compile(r"exportar-pdf\?id=(\d+)")
+
+
+class FlowError(Exception):
+    """Un paso del flujo respondió algo distinto de lo esperado."""
+
+    def __init__(self, step: str, message: str):
+        super().__init__(f"{step}: {message}")
+        self.step = step
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # La aplicación redirige a / cuando algo falla: una redirección es un error del flujo
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class GunicornServer:
+    """gunicorn web_app:app en 127.0.0.1 como subproceso (usar con 'with')."""
+
+    def __init__(self, workers: int = 2, worker_class: str = "sync", threads: int = 1, executor: str = None,
+                 preload: bool = False, port: int = None, startup_timeout: float = 60.0,
+                 extra_args: List[str] = ()):
+        self.workers = workers
+        self.worker_class = worker_class
+        # gunicorn cambia 'sync' por 'gthread' si se le pasan hilos
+        self.threads = 1 if worker_class == "sync" else threads
+        self.executor = executor  # SOLVE_EXECUTOR de los workers (None: el de gunicorn.conf.py)
+        self.preload = preload    # --preload: el master precalienta la app antes del fork
+        self.port = port or _free_port()
+        self.startup_timeout = startup_timeout
+        self.extra_args = list(extra_args)
+        self.process = None
+        self._tmp = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory(prefix="simplex_carga_")
+        env = {**os.environ, "SIMPLEX_METRICS_DIR": os.path.join(self._tmp.name, "metricas"),
+               "SIMPLEX_LOG_LEVEL": os.environ.get("SIMPLEX_LOG_LEVEL", "WARNING")}
+        if self.executor:
+            env["SIMPLEX_SOLVE_EXECUTOR"] = self.executor
+        command = [sys.executable, "-m", "gunicorn", "web_app:app", "--bind", f"127.0.0.1:{self.port}",
+                   "--workers", str(self.workers), "--worker-class", self.worker_class,
+                   "--threads", str(self.threads), "--timeout", "300",
+                   *(["--preload"] if self.preload else []), *self.extra_args]
+        self._log = open(os.path.join(self._tmp.name, "gunicorn.log"), "w+", encoding="utf-8")
+        self.process = subprocess.Popen(command, cwd=config.BASE_DIR, env=env,
+                                        stdout=self._log, stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn terminó al iniciar (código {self.process.returncode}):\n{self.log()}")
+            try:
+                with urllib.request.urlopen(self.url + "/", timeout=2) as response:
+                    if response.status == 200:
+                        return
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"gunicorn no respondió en {self.startup_timeout} s:\n{self.log()}")
+
+    def stop(self) -> None:
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self._tmp:
+            self._log.close()
+            self._tmp.cleanup()
+            self._tmp = None
+
+    def log(self) -> str:
+        self._log.flush()
+        self._log.seek(0)
+        return self._log.read()[-4000:]
+
+    def memory(self) -> Optional[dict]:
+        """
+        Memoria del master, de sus workers y de los procesos de cada worker
+        (pool de resoluciones y auxiliares de multiprocessing), en bytes.
+        None si no hay /proc/<pid>/smaps_rollup (fuera de Linux).
+        """
+        master = process_memory(self.process.pid)
+        if master is None:
+            return None
+        workers = _children(self.process.pid)
+        pool = [child for worker in workers for child in _children(worker)]
+        processes = {"maestro": [master],
+                     "workers": [m for m in map(process_memory, workers) if m],
+                     "pool": [m for m in map(process_memory, pool) if m]}
+        summary = {group: {"procesos": len(values),
+                           "rss": sum(m["rss"] for m in values),
+                           "pss": sum(m["pss"] for m in values),
+                           "privada": sum(m["privada"] for m in values)}
+                   for group, values in processes.items()}
+        summary["pss_total"] = sum(group["pss"] for group in summary.values())
+        return summary
+
+
+def process_memory(pid: int) -> Optional[dict]:
+    """RSS, PSS y memoria privada (bytes) de un proceso, de /proc/<pid>/smaps_rollup."""
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[key] = int(value.split()[0]) * 1024
+    except OSError:
+        return None
+    return {"rss": fields.get("Rss", 0), "pss": fields.get("Pss", 0),
+            "privada": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)}
+
+
+def _children(pid: int) -> List[int]:
+    """Procesos hijos de 'pid' (recorriendo /proc)."""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii", errors="replace") as f:
+                # El nombre va entre paréntesis y puede tener espacios: el ppid es el 2.º campo después
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_flow(base_url: str, form: dict, export_pdf: bool = True, timeout: float = 120.0) -> Dict[str, float]:
+    """
+    Un usuario: crea el problema, lo resuelve y descarga el PDF, con su propia
+    sesión (cookie). Retorna la duración de cada paso en segundos; lanza
+    FlowError si alguno falla.
+    """
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+                                         _NoRedirect())
+    timings = {}
+
+    def request(step: str, path: str, data: dict = None) -> bytes:
+        body = urllib.parse.urlencode(data, doseq=True).encode() if data is not None else None
+        start = time.perf_counter()
+        try:
+            with opener.open(base_url + path, data=body, timeout=timeout) as response:
+                content = response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            raise FlowError(step, f"HTTP {e.code}") from None
+        except OSError as e:
+            raise FlowError(step, type(e).__name__) from None
+        timings[step] = time.perf_counter() - start
+        if status != 200:
+            raise FlowError(step, f"HTTP {status}")
+        return content
+
+    request("new", "/new", form)
+    page = request("solve", "/solve", {}).decode("utf-8", errors="replace")
+    if export_pdf:
+        match = _SOLUTION_ID.search(page)
+        if not match:
+            raise FlowError("solve", "la página de la solución no tiene id (¿persistencia apagada?)")
+        if not request("pdf", f"/exportar-pdf?id={match.group(1)}").startswith(b"%PDF"):
+            raise FlowError("pdf", "la respuesta no es un PDF")
+    return timings
+
+
+def arrival_times(rate: float, duration: float, arrivals: str = "poisson", seed: int = 0) -> List[float]:
+    """Segundos (desde el inicio) en que llega cada usuario."""
+    if arrivals == "constante":
+        return [i / rate for i in range(int(rate * duration))]
+    rng = np.random.default_rng(seed)
+    times, t = [], rng.exponential(1 / rate)
+    while t < duration:
+        times.append(t)
+        t += rng.exponential(1 / rate)
+    return times
+
+
+def run_open_loop(flow: Callable[[], Dict[str, float]], rate: float, duration: float,
+                  arrivals: str = "poisson", seed: int = 0, max_in_flight: int = 256) -> dict:
+    """
+    Lanza flow() en cada llegada programada sin esperar a los anteriores
+    (hasta 'max_in_flight' a la vez; el resto espera y esa espera cuenta en
+    la latencia) y resume el resultado de la tasa.
+    """
+    schedule = arrival_times(rate, duration, arrivals, seed)
+    records, lock = [], threading.Lock()
+
+    def user(scheduled: float):
+        try:
+            steps, error = flow(), None
+        except FlowError as e:
+            steps, error = {}, str(e)
+        end = time.perf_counter()
+        with lock:
+            records.append({"llegada": scheduled, "fin": end, "pasos": steps, "error": error})
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        origin = time.perf_counter()
+        for offset in schedule:
+            delay = origin + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(user, origin + offset)
+    return summarize_point(rate, duration, records, origin)
+
+
+def summarize_point(rate: float, duration: float, records: List[dict], origin: float) -> dict:
+    """Rendimiento, errores y percentiles (del flujo y de cada paso) de una tasa."""
+    ok = [r for r in records if r["error"] is None]
+    errors: Dict[str, int] = {}
+    for record in records:
+        if record["error"]:
+            errors[record["error"]] = errors.get(record["error"], 0) + 1
+    elapsed = max((r["fin"] for r in records), default=origin) - origin
+    return {
+        "tasa": rate,
+        "duracion": duration,
+        "enviados": len(records),
+        "completados": len(ok),
+        "errores": sum(errors.values()),
+        "detalle_errores": errors,
+        "rendimiento": len(ok) / elapsed if elapsed > 0 else 0.0,
+        "latencia": _percentiles([r["fin"] - r["llegada"] for r in ok]),
+        "pasos": {step: _percentiles([r["pasos"][step] for r in ok if step in r["pasos"]])
+                  for step in FLOW_STEPS},
+    }
+
+
+def _percentiles(values: List[float]) -> dict:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "media": None, "max": None}
+    p50, p95, p99 = (float(v) for v in np.percentile(values, [50, 95, 99]))
+    return {"p50": p50, "p95": p95, "p99": p99, "media": float(np.mean(values)), "max": float(max(values))}
+
+
+def _probe(url: str, stop: threading.Event, interval: float, latencies: List[float]):
+    """GET a 'url' cada 'interval' segundos hasta 'stop'; anota la latencia de cada respuesta."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=120) as response:
+                response.read()
+            latencies.append(time.perf_counter() - start)
+        except OSError:
+            pass
+        stop.wait(interval)
+
+
+def run_curve(base_url: str, rates: List[float], duration: float, form: dict, export_pdf: bool = True,
+              arrivals: str = "poisson", seed: int = 0, warmup: int = 2, probe: Optional[str] = "/",
+              probe_interval: float = 0.1, progress: Optional[Callable[[dict], None]] = None) -> List[dict]:
+    """Una medición por tasa, de menor a mayor, contra el mismo servidor (con la sonda en 'probe')."""
+    def flow():
+        return run_flow(base_url, form, export_pdf)
+
+    # Calentamiento: que cada worker ya haya importado y resuelto algo
+    with ThreadPoolExecutor(max_workers=max(1, warmup)) as pool:
+        for result in [pool.submit(flow) for _ in range(warmup)]:
+            result.result()
+
+    points = []
+    for i, rate in enumerate(sorted(rates)):
+        stop, probe_latencies = threading.Event(), []
+        if probe:
+            prober = threading.Thread(target=_probe, args=(base_url + probe, stop, probe_interval, probe_latencies),
+                                      daemon=True)
+            prober.start()
+        point = run_open_loop(flow, rate, duration, arrivals, seed + i)
+        if probe:
+            stop.set()
+            prober.join()
+            point["sonda"] = {"ruta": probe, **_percentiles(probe_latencies)}
+        points.append(point)
+        if progress:
+            progress(point)
+    return points
+
+
+def format_curve(results: dict) -> str:
+    """Tabla de texto: una fila por configuración y tasa, latencias del flujo en ms."""
+    rows = [("workers", "tasa/s", "enviados", "errores", "rend./s", "p50 ms", "p95 ms", "p99 ms", "sonda p95 ms")]
+    for run in results["corridas"]:
+        label = f"{run['workers']}x{run['tipo_worker']}" + (f"/{run['hilos']}h" if run["hilos"] > 1 else "")
+        if run.get("ejecutor"):
+            label += f" ({run['ejecutor']})"
+        if run.get("precarga"):
+            label += " precarga"
+        for point in run["puntos"]:
+            latency = point["latencia"]
+            rows.append((label, f"{point['tasa']:g}", str(point["enviados"]), str(point["errores"]),
+                         f"{point['rendimiento']:.2f}",
+                         *(_ms(latency[p]) if latency[p] is not None else "-" for p in ("p50", "p95", "p99")),
+                         _ms(point["sonda"]["p95"]) if point.get("sonda", {}).get("p95") is not None else "-"))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(widths[0]) if i == 0 else cell.rjust(widths[i]) for i, cell in enumerate(row))
+             for row in rows]
+    lines.insert(1, "-" * len(lines[0]))
+    return "\n".join(lines)
+
+
+def format_memory(run: dict) -> str:
+    """Una línea: memoria al terminar (PSS total y RSS/PSS por worker) y el primer flujo."""
+    parts = []
+    memory = run.get("memoria")
+    if memory:
+        workers = max(1, memory["workers"]["procesos"])
+        parts.append(f"PSS total {_mb(memory['pss_total'])} MB (maestro {_mb(memory['maestro']['pss'])}, "
+                     f"workers {_mb(memory['workers']['pss'])}, pool {_mb(memory['pool']['pss'])}), "
+                     f"por worker RSS {_mb(memory['workers']['rss'] / workers)} / "
+                     f"PSS {_mb(memory['workers']['pss'] / workers)} MB")
+    if run.get("primer_flujo") is not None:
+        parts.append(f"primer flujo {_ms(run['primer_flujo'])} ms")
+    return "; ".join(parts)
+
+
+def _mb(size: float) -> str:
+    return f"{size / 2**20:.1f}"
+
+
+def _csv(value: str, cast=str) -> list:
+    return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def _yes_no(value: str) -> bool:
+    if value not in ("si", "no"):
+        raise argparse.ArgumentTypeError(f"Se esperaba 'si' o 'no', no '{value}'.")
+    return value == "si"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=lambda v: _csv(v, int), default=[2],
+                        help="Cantidades de workers, separadas por coma (por defecto 2).")
+    parser.add_argument("--tipo-worker", type=_csv, default=["sync"],
+                        help="Clases de worker de gunicorn, separadas por coma (sync, gthread, ...).")
+    parser.add_argument("--hilos", type=int, default=1,
+                        help="Hilos por worker (--threads de gunicorn; no aplica a 'sync').")
+    parser.add_argument("--ejecutor", type=_csv, default=[None],
+                        help="SOLVE_EXECUTOR de los workers: inline, process o ambos separados por coma "
+                             "(por defecto, el de gunicorn.conf.py).")
+    parser.add_argument("--precarga", type=lambda v: [_yes_no(x) for x in _csv(v)], default=[False],
+                        help="Con gunicorn --preload: no, si o ambos separados por coma (por defecto no).")
+    parser.add_argument("--url", default=None, help="Usar un servidor ya levantado en vez de iniciar gunicorn.")
+    parser.add_argument("--tasas", type=lambda v: _csv(v, float), default=[1.0, 2.0, 4.0],
+                        help="Llegadas por segundo, separadas por coma (por defecto 1,2,4).")
+    parser.add_argument("--duracion", type=float, default=10.0, help="Segundos de llegadas por tasa.")
+    parser.add_argument("--llegadas", choices=ARRIVALS, default="poisson")
+    parser.add_argument("--familia", choices=list(FAMILIES), default="densa")
+    parser.add_argument("--tamano", type=int, default=10, help="Variables del problema de cada usuario.")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--sin-pdf", action="store_true", help="Terminar el flujo en /solve.")
+    parser.add_argument("--sonda", default="/", help="Ruta liviana que se pide en paralelo (vacío: sin sonda).")
+    parser.add_argument("--calentamiento", type=int, default=None,
+                        help="Flujos previos no medidos (por defecto, dos por worker).")
+    parser.add_argument("--salida", default=None,
+                        help="Archivo de resultados (por defecto outputs/benchmarks/carga_<fecha>.json).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    output = args.salida or os.path.join(DEFAULT_OUTPUT_DIR, f"carga_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    form = to_form(generate(args.familia, args.tamano, args.semilla))
+
+    def progress(point):
+        latency = point["latencia"]
+        p95 = f"{latency['p95'] * 1000:.1f} ms" if latency["p95"] is not None else "-"
+        print(f"  tasa {point['tasa']:g}/s: {point['completados']}/{point['enviados']} ok, "
+              f"{point['rendimiento']:.2f}/s, p95 {p95}", file=sys.stderr)
+
+    def measure(url, workers):
+        # El primer flujo después de arrancar paga los imports y cachés que el master no precalentó
+        start = time.perf_counter()
+        run_flow(url, form, export_pdf=not args.sin_pdf)
+        first_flow = time.perf_counter() - start
+        warmup = args.calentamiento if args.calentamiento is not None else 2 * workers
+        points = run_curve(url, args.tasas, args.duracion, form, export_pdf=not args.sin_pdf,
+                           arrivals=args.llegadas, seed=args.semilla, warmup=warmup, probe=args.sonda or None,
+                           progress=progress)
+        return {"primer_flujo": first_flow, "puntos": points}
+
+    runs = []
+    if args.url:
+        print(f"Servidor: {args.url}", file=sys.stderr)
+        runs.append({"workers": None, "tipo_worker": "externo", "hilos": 1,
+                     **measure(args.url.rstrip("/"), 1)})
+    else:
+        for executor in args.ejecutor:
+            for preload in args.precarga:
+                for worker_class in args.tipo_worker:
+                    for workers in args.workers:
+                        server = GunicornServer(workers, worker_class, args.hilos, executor, preload)
+                        print(f"gunicorn: {workers} worker(s) {worker_class}, {server.threads} hilo(s)"
+                              + (f", ejecutor {executor}" if executor else "")
+                              + (", con --preload" if preload else ""), file=sys.stderr)
+                        try:
+                            with server:
+                                run = measure(server.url, workers)
+                                run["memoria"] = server.memory()
+                        except (RuntimeError, FlowError) as e:
+                            print(f"Error: {e}", file=sys.stderr)
+                            return 2
+                        runs.append({"workers": workers, "tipo_worker": worker_class, "hilos": server.threads,
+                                     "ejecutor": executor, "precarga": preload, **run})
+                        print(f"  {format_memory(runs[-1])}", file=sys.stderr)
+
+    results = {
+        "formato": LOAD_FORMAT,
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "entorno": {**environment(), "cpus": os.cpu_count()},
+        "parametros": {"tasas": args.tasas, "duracion": args.duracion, "llegadas": args.llegadas,
+                       "familia": args.familia, "tamano": args.tamano, "semilla": args.semilla,
+                       "pdf": not args.sin_pdf, "sonda": args.sonda or None},
+        "corridas": runs,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(format_curve(results))
+    print(f"\nResultados guardados en: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+Suite de benchmarks: mide por separado cada etapa del flujo sobre las
+familias de benchmarks/generators.py y arma el archivo de resultados.
+
+Etapas:
+    parser          ObjectiveFunctionParser / ConstraintsParser (entrada por consola)
+    formulario      POST /new con el cliente de pruebas de Flask
+    validacion      validate_problem_structure (carga de JSON y API)
+    modelo          presolve + escalado + SolverModel
+    solver          cada backend de SolverBackendRegistry sobre el mismo modelo
+    visualizacion   simple_simplex + gilp (_generate_visualization_html_and_tables)
+    tablas_html     TableauHtmlRenderer sin caché
+    resolucion      SolverController.run completo (sin guardar)
+    almacenamiento  StorageService.save_solution + load_solution_by_id
+    pdf             PdfReportService.render
+"""
+import contextlib
+import logging
+import math
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import scipy
+
+from app import config
+from app.controllers.solver_controller import SolverController
+from app.controllers.ui_controller import validate_problem_structure
+from app.core import ObjectiveFunctionParser, ConstraintsParser, NonNegativeForm
+from app.services import (
+    PdfReportService, SolverBackendRegistry, SolverModel, StorageService, TableauHtmlRenderer,
+)
+from app.services import storage_service
+from benchmarks.generators import FAMILIES, generate, to_expressions, to_form
+
+STAGES = ("parser", "formulario", "validacion", "modelo", "solver", "visualizacion",
+          "tablas_html", "resolucion", "almacenamiento", "pdf")
+DEFAULT_SIZES = (10, 50, 200)
+RESULTS_FORMAT = 1
+
+# simple_simplex (backend 'tableau', visualización y tablas) no termina con filas
+# >= o =, ni con problemas infactibles o no acotados: solo se mide en estas familias.
+TABLEAU_FAMILIES = {"densa", "rala", "degenerada"}
+TABLEAU_MAX_SIZE = 50
+
+
+class BenchmarkCase:
+    """Un benchmark: qué se mide (func, sin argumentos) y con qué etiquetas se informa."""
+
+    def __init__(self, stage: str, family: str, size: int, func: Callable, backend: str = None):
+        self.stage = stage
+        self.family = family
+        self.size = size
+        self.func = func
+        self.backend = backend
+
+    @property
+    def name(self) -> str:
+        stage = f"{self.stage}[{self.backend}]" if self.backend else self.stage
+        return f"{stage}/{self.family}/{self.size}"
+
+
+def measure(func: Callable, min_rounds: int = 5, max_time: float = 0.5, max_rounds: int = 1000) -> dict:
+    """
+    Ejecuta func una vez para calentar y luego al menos 'min_rounds' veces
+    (más, mientras no se superen 'max_time' segundos). Tiempos en segundos.
+    """
+    func()
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_rounds and (len(times) < min_rounds or time.perf_counter() - start < max_time):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return summarize(times)
+
+
+def summarize(times: List[float]) -> dict:
+    ordered = sorted(times)
+    return {
+        "rondas": len(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "media": statistics.fmean(ordered),
+        "mediana": statistics.median(ordered),
+        "desvio": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "p90": float(np.percentile(ordered, 90)),
+        "p95": float(np.percentile(ordered, 95)),
+        "p99": float(np.percentile(ordered, 99)),
+    }
+
+
+@contextlib.contextmanager
+def _quiet_and_isolated() -> Iterator[str]:
+    """Sin logs por resolución, sin persistencia ni métricas, y un OUTPUT_DIR temporal."""
+    saved = (config.PERSISTENCE_MODE, config.METRICS_ENABLED, storage_service.OUTPUT_DIR)
+    with tempfile.TemporaryDirectory(prefix="simplex_bench_") as tmp:
+        # logging.disable y no setLevel: init_app() vuelve a configurar el nivel del logger "app"
+        logging.disable(logging.WARNING)
+        config.PERSISTENCE_MODE, config.METRICS_ENABLED = "off", False
+        storage_service.OUTPUT_DIR = tmp
+        try:
+            yield tmp
+        finally:
+            logging.disable(logging.NOTSET)
+            config.PERSISTENCE_MODE, config.METRICS_ENABLED, storage_service.OUTPUT_DIR = saved
+
+
+def _variables(problem: dict) -> List[str]:
+    return sorted(problem["funcion_objetivo"]["coefficients"], key=lambda var: int(var[1:]))
+
+
+def build_cases(families=None, sizes=DEFAULT_SIZES, stages=STAGES, seed: int = 0,
+                backends=None) -> Iterator[BenchmarkCase]:
+    """Casos de la suite; el trabajo previo (generar, armar el modelo, resolver) se hace acá, fuera de la medición."""
+    from app.controllers.routers import init_app
+
+    client = None
+    if "formulario" in stages:
+        app = init_app()
+        app.config.update({"TESTING": True, "SECRET_KEY": "benchmarks"})
+        client = app.test_client()
+
+    for family in families or FAMILIES:
+        for size in sizes:
+            problem = generate(family, size, seed)
+            wrapper = {"problema_definicion": problem}
+            variables = _variables(problem)
+            tableau_ok = family in TABLEAU_FAMILIES and size <= TABLEAU_MAX_SIZE
+
+            if "parser" in stages:
+                objective, constraints = to_expressions(problem)
+
+                def parse(objective=objective, constraints=constraints):
+                    ObjectiveFunctionParser.parse(objective)
+                    for expression in constraints:
+                        ConstraintsParser.parse(expression)
+                yield BenchmarkCase("parser", family, size, parse)
+
+            if "formulario" in stages:
+                form = to_form(problem)
+                yield BenchmarkCase("formulario", family, size,
+                                    lambda form=form: client.post("/new", data=form))
+
+            if "validacion" in stages:
+                yield BenchmarkCase("validacion", family, size,
+                                    lambda problem=problem: validate_problem_structure(problem))
+
+            if "modelo" in stages:
+                def build_model(wrapper=wrapper):
+                    solver = SolverController(wrapper)
+                    presolved = solver._presolve()
+                    if presolved.infeasible or presolved.is_empty:
+                        return
+                    scaled = solver._scale(presolved)
+                    SolverModel(scaled.objective_data, scaled.constraints_data, scaled.variables,
+                                bounds=scaled.scipy_bounds())
+                yield BenchmarkCase("modelo", family, size, build_model)
+
+            if "solver" in stages:
+                model = SolverModel(problem["funcion_objetivo"], problem["restricciones"], variables)
+                for backend in backends or SolverBackendRegistry.names():
+                    if backend == "tableau" and not tableau_ok:
+                        continue
+                    yield BenchmarkCase("solver", family, size, backend=backend,
+                                        func=lambda model=model, backend=backend:
+                                        SolverBackendRegistry.solve(model, backend=backend))
+
+            if "visualizacion" in stages and tableau_ok:
+                solver = SolverController(wrapper)
+                nonneg = NonNegativeForm.build(problem["funcion_objetivo"], problem["restricciones"],
+                                               variables, {var: (0, None) for var in variables})
+                yield BenchmarkCase("visualizacion", family, size, lambda solver=solver, nonneg=nonneg:
+                                    solver._generate_visualization_html_and_tables(
+                                        nonneg.objective_data, nonneg.constraints_data, nonneg.variables))
+
+            if {"tablas_html", "resolucion", "almacenamiento", "pdf"}.isdisjoint(stages):
+                continue
+            # Reporte completo (con tablas solo donde simple_simplex termina)
+            run_kwargs = {"include_visualization": False, "include_tableaus": tableau_ok, "persist": False}
+            report = SolverController(wrapper, **run_kwargs).run()
+
+            if "tablas_html" in stages and tableau_ok and report.get("tablas_intermedias"):
+                def render_tables(tables=report["tablas_intermedias"]):
+                    for tableau in tables:
+                        TableauHtmlRenderer.render(tableau["table"], tableau.get("pivot"), use_cache=False)
+                yield BenchmarkCase("tablas_html", family, size, render_tables)
+
+            if "resolucion" in stages:
+                yield BenchmarkCase("resolucion", family, size,
+                                    lambda wrapper=wrapper: SolverController(wrapper, **run_kwargs).run())
+
+            if "almacenamiento" in stages:
+                def store(report=report):
+                    filename = StorageService.save_solution(report)
+                    StorageService.load_solution_by_id(StorageService.solution_id_from_path(filename))
+                yield BenchmarkCase("almacenamiento", family, size, store)
+
+            if "pdf" in stages:
+                yield BenchmarkCase("pdf", family, size, lambda report=report: PdfReportService(report).render())
+
+
+def run_suite(families=None, sizes=DEFAULT_SIZES, stages=STAGES, seed: int = 0, backends=None,
+              min_rounds: int = 5, max_time: float = 0.5,
+              progress: Optional[Callable[[str, dict], None]] = None) -> dict:
+    """Ejecuta la suite y devuelve el contenido del archivo de resultados."""
+    results = {}
+    with _quiet_and_isolated():
+        for case in build_cases(families, sizes, stages, seed, backends):
+            stats = measure(case.func, min_rounds=min_rounds, max_time=max_time)
+            results[case.name] = {"etapa": case.stage, "familia": case.family, "tamano": case.size,
+                                  "backend": case.backend, **stats}
+            if progress:
+                progress(case.name, stats)
+    return {
+        "formato": RESULTS_FORMAT,
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "entorno": environment(),
+        "parametros": {"familias": list(families or FAMILIES), "tamanos": list(sizes), "etapas": list(stages),
+                       "semilla": seed, "min_rondas": min_rounds, "tiempo_max": max_time},
+        "benchmarks": results,
+    }
+
+
+def environment() -> dict:
+    """Versión del código y del entorno, para comparar resultados entre corridas."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=5, cwd=config.BASE_DIR).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+    }
+
+
+def format_table(results: dict) -> str:
+    """Tabla de texto: una fila por benchmark con mediana y p95 en milisegundos."""
+    rows = [("benchmark", "rondas", "mediana ms", "p95 ms")]
+    for name, stats in results["benchmarks"].items():
+        rows.append((name, str(stats["rondas"]), _ms(stats["mediana"]), _ms(stats["p95"])))
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    lines = [f"{r[0]:<{widths[0]}}  {r[1]:>{widths[1]}}  {r[2]:>{widths[2]}}  {r[3]:>{widths[3]}}" for r in rows]
+    lines.insert(1, "-" * len(lines[0]))
+    return "\n".join(lines)
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.3f}" if math.isfinite(seconds) else "-"
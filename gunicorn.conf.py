@@ -0,0 +1,50 @@
+"""
+Configuración de gunicorn (se carga sola desde el directorio de trabajo).
+Las opciones de la línea de comandos (--workers, --bind, --worker-class)
+siguen valiendo y tienen prioridad.
+
+Por defecto, workers gthread: cada worker atiende varios pedidos a la vez
+(un cliente lento no lo bloquea) y las resoluciones, CPU-bound, van al
+pool de procesos del worker (SOLVE_EXECUTOR = "process"), así /, /load y
+los estáticos no esperan detrás de ellas.
+
+scipy, gilp, simple_simplex y ReportLab se importan recién al usarlos. Con
+--preload (o SIMPLEX_PRELOAD=1) el master carga la app, importa esos módulos
+y hace una resolución y un PDF de prueba (warm_up) antes del fork: los
+workers arrancan con todo importado y comparten esas páginas de memoria
+(copy-on-write), y sus pools de resoluciones se crean con fork.
+"""
+import os
+
+# Antes de importar app.config: los workers heredan el valor
+os.environ.setdefault("SIMPLEX_SOLVE_EXECUTOR", "process")
+
+from app import config as app_config  # noqa: E402  ("config" es una opción de gunicorn)
+from app.services.metrics_service import Metrics  # noqa: E402
+from app.services.solve_executor import SolveExecutor  # noqa: E402
+from app.utils.lazy_imports import warm_up  # noqa: E402
+
+workers = int(os.environ.get("SIMPLEX_WORKERS", "2"))
+worker_class = os.environ.get("SIMPLEX_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("SIMPLEX_THREADS", "8"))
+preload_app = os.environ.get("SIMPLEX_PRELOAD", "0") == "1"
+
+
+def on_starting(server):
+    """
+    En el master, antes de crear los workers: descarta las métricas de
+    ejecuciones anteriores y, con --preload, precalienta la app.
+    """
+    Metrics.clear_directory()
+    if server.cfg.preload_app:
+        warm_up()
+        app_config.SOLVE_EXECUTOR_START_METHOD = "fork"
+
+
+def post_worker_init(worker):
+    """En cada worker, antes del primer pedido: inicia su pool de resoluciones."""
+    SolveExecutor.warm_up()
+
+
+def worker_exit(server, worker):
+    SolveExecutor.shutdown()
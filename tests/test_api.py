@@ -0,0 +1,108 @@
+"""
+Tests para la API JSON (app/controllers/api_controller.py).
+Verifican que /api/v1/solve resuelva sin plantillas, sin sesión, sin
+visualización y sin escribir en disco (salvo que se pida).
+"""
+import pytest
+from flask import template_rendered
+
+from app.controllers.routers import init_app
+from app.controllers.solver_controller import SolverController
+
+PROBLEMA = {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}},
+    "restricciones": [
+        {"coefficients": {"x1": 1.0, "x2": 0.0}, "operator": "<=", "rhs": 4.0},
+        {"coefficients": {"x1": 0.0, "x2": 2.0}, "operator": "<=", "rhs": 12.0},
+        {"coefficients": {"x1": 3.0, "x2": 2.0}, "operator": "<=", "rhs": 18.0},
+    ]
+}
+
+
+@pytest.fixture
+def app():
+    app = init_app()
+    app.config.update({"TESTING": True})
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def save_solution(mocker):
+    return mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_7.json")
+
+
+def test_solve_returns_solution_json_without_side_effects(mocker, app, client, save_solution):
+    visualization = mocker.spy(SolverController, '_generate_visualization_html_and_tables')
+    rendered = []
+    template_rendered.connect(lambda sender, template, context, **extra: rendered.append(template), app)
+
+    response = client.post('/api/v1/solve', json={"problema_definicion": PROBLEMA})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["solucion_encontrada"]["status"] == "Solucion Factible"
+    assert data["solucion_encontrada"]["valores_variables"] == pytest.approx({"x1": 2.0, "x2": 6.0})
+    assert data["solucion_encontrada"]["valor_optimo_z"] == pytest.approx(36.0)
+    assert "backend" in data["diagnostico"]
+    assert "tablas_intermedias" not in data and "solucion_id" not in data
+    # Sin plantillas, sin cookie de sesión, sin gilp y sin disco
+    assert rendered == []
+    assert "Set-Cookie" not in response.headers
+    visualization.assert_not_called()
+    save_solution.assert_not_called()
+
+
+def test_solve_with_tableaus_and_persistence(client, save_solution):
+    response = client.post('/api/v1/solve', json={
+        "problema_definicion": PROBLEMA, "backend": "tableau", "incluir_tablas": True, "guardar": True})
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert len(data["tablas_intermedias"]) >= 2
+    assert data["tablas_intermedias"][0]["table"][0][0] == "Base"
+    assert data["solucion_id"] == 7
+    saved_report = save_solution.call_args.args[0]
+    assert saved_report["visualizacion_gilp_html"] == ""
+
+
+def test_infeasible_problem_is_not_an_http_error(client, save_solution):
+    problema = {
+        "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 1.0}},
+        "restricciones": [
+            {"coefficients": {"x1": 1.0}, "operator": "<=", "rhs": 5.0},
+            {"coefficients": {"x1": 1.0}, "operator": ">=", "rhs": 10.0},
+        ]
+    }
+    response = client.post('/api/v1/solve', json={"problema_definicion": problema})
+
+    assert response.status_code == 200
+    assert response.get_json()["solucion_encontrada"]["status"] == "Sin Solucion Factible"
+
+
+@pytest.mark.parametrize("payload", [
+    None,
+    {"problema": PROBLEMA},
+    {"problema_definicion": {"funcion_objetivo": PROBLEMA["funcion_objetivo"]}},
+    {"problema_definicion": PROBLEMA, "backend": "no-existe"},
+    {"problema_definicion": PROBLEMA, "opciones": [1]},
+    {"problema_definicion": PROBLEMA, "incluir_tablas": "si"},
+])
+def test_invalid_requests_are_rejected(client, payload):
+    if payload is None:
+        response = client.post('/api/v1/solve', data="no es json", content_type="application/json")
+    else:
+        response = client.post('/api/v1/solve', json=payload)
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_solver_error_returns_500(mocker, client):
+    mocker.patch.object(SolverController, 'run', return_value=None)
+    response = client.post('/api/v1/solve', json={"problema_definicion": PROBLEMA})
+    assert response.status_code == 500
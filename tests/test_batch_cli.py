@@ -0,0 +1,161 @@
+"""
+Tests para la resolución en lote por consola (app.py y
+app/controllers/batch_controller.py).
+"""
+import importlib.util
+import io
+import json
+import os
+
+import pytest
+
+from app import config
+from app.controllers import BatchController
+
+# El script app.py queda tapado por el paquete 'app': se carga por su ruta
+_spec = importlib.util.spec_from_file_location("app_cli", os.path.join(config.BASE_DIR, "app.py"))
+app_cli = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(app_cli)
+
+# max 3x1 + 5x2  s.a.  x1 <= 4,  2x2 <= 12,  3x1 + 2x2 <= 18  ->  Z = 36
+DEFINICION = {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}},
+    "restricciones": [
+        {"coefficients": {"x1": 1.0, "x2": 0.0}, "operator": "<=", "rhs": 4.0},
+        {"coefficients": {"x1": 0.0, "x2": 2.0}, "operator": "<=", "rhs": 12.0},
+        {"coefficients": {"x1": 3.0, "x2": 2.0}, "operator": "<=", "rhs": 18.0},
+    ],
+}
+
+# Con el backend 'tableau', simple_simplex pivotea para siempre (ver test_solve_budget.py)
+CICLA = {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 1.0, "x2": 2.0}},
+    "restricciones": [
+        {"coefficients": {"x1": 1.0, "x2": 1.0}, "operator": ">=", "rhs": 5.0},
+        {"coefficients": {"x1": 1.0, "x2": 1.0}, "operator": "<=", "rhs": 3.0},
+        {"coefficients": {"x1": 1.0, "x2": 3.0}, "operator": "<=", "rhs": 9.0},
+    ],
+}
+
+
+@pytest.fixture
+def batch_config(mocker, tmp_path):
+    """configure() cambia app.config: se restaura al terminar."""
+    mocker.patch('app.services.storage_service.OUTPUT_DIR', str(tmp_path / "outputs"))
+    for name in ("SOLVE_EXECUTOR", "METRICS_ENABLED", "PERSISTENCE_MODE"):
+        mocker.patch.object(config, name, getattr(config, name))
+    return tmp_path
+
+
+def _write(path, content):
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+    return path
+
+
+def test_read_expands_folders_globs_and_jsonl(tmp_path):
+    _write(tmp_path / "a.json", {"problema_definicion": DEFINICION})
+    _write(tmp_path / "b.jsonl", json.dumps(DEFINICION) + "\n\n{roto\n")
+    _write(tmp_path / "c.json", "{roto")
+    _write(tmp_path / "notas.txt", "no es un problema")
+
+    entries = list(BatchController.read([str(tmp_path), str(tmp_path / "*.json"), str(tmp_path / "nada*")]))
+
+    origins = [origin for origin, _, _ in entries]
+    assert origins == [str(tmp_path / "a.json"), f"{tmp_path / 'b.jsonl'}:1", f"{tmp_path / 'b.jsonl'}:3",
+                       str(tmp_path / "c.json"), str(tmp_path / "a.json"), str(tmp_path / "c.json"),
+                       str(tmp_path / "nada*")]
+    errors = [error for _, _, error in entries]
+    assert errors[0] is None and errors[1] is None
+    assert errors[2].startswith("JSON inválido") and errors[3].startswith("No se pudo leer")
+    assert errors[-1] == f"No se encontraron archivos para '{tmp_path / 'nada*'}'."
+
+
+def test_unpack_accepts_both_formats_and_caps_the_time_limit():
+    settings = BatchController.settings(time_limit=5)
+
+    definition, backend, options = BatchController.unpack(
+        {"problema_definicion": DEFINICION, "backend": "highs-ds", "opciones": {"time_limit": 2}}, settings)
+    assert definition == DEFINICION and backend == "highs-ds" and options == {"time_limit": 2}
+
+    _, backend, options = BatchController.unpack(DEFINICION, BatchController.settings(backend="tableau",
+                                                                                      time_limit=5))
+    assert backend == "tableau" and options == {"time_limit": 5}
+
+    with pytest.raises(ValueError, match="funcion_objetivo"):
+        BatchController.unpack({"problema_definicion": {}}, settings)
+
+
+def test_cli_writes_one_record_per_problem(batch_config, capsys):
+    folder = batch_config / "problemas"
+    folder.mkdir()
+    _write(folder / "1.json", {"problema_definicion": DEFINICION})
+    _write(folder / "2.json", {"problema_definicion": CICLA, "backend": "tableau", "opciones": {"maxiter": 50}})
+    output = batch_config / "resultados.jsonl"
+
+    code = app_cli.main([str(folder), "--workers", "1", "--tablas", "--guardar", "--salida", str(output)])
+
+    assert code == 0
+    first, second = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert first["origen"].endswith("1.json") and first["estado"] == "Solucion Factible"
+    assert first["solucion_encontrada"]["valor_optimo_z"] == pytest.approx(36.0)
+    assert first["tablas_intermedias"] and first["solucion_id"] == 1 and first["tiempo_segundos"] > 0
+    assert "visualizacion_gilp_html" not in first
+    assert second["estado"] == "Limite Alcanzado"
+    assert second["diagnostico"]["presupuesto"]["agotado"] == {"etapa": "solve", "motivo": "iteraciones"}
+    assert (batch_config / "outputs" / "solucion_2.json").exists()
+    assert "2 problema(s)" in capsys.readouterr().err
+
+
+def test_cli_reads_jsonl_from_stdin_and_fails_on_invalid_input(batch_config, monkeypatch, capsys):
+    lines = [json.dumps({"problema_definicion": DEFINICION}), "{roto", json.dumps(DEFINICION)]
+    monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(lines) + "\n"))
+
+    assert app_cli.main(["--workers", "1"]) == 1
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["origen"], r["estado"]) for r in records] == [
+        ("stdin:1", "Solucion Factible"), ("stdin:2", "Invalido"), ("stdin:3", "Solucion Factible")]
+    # Sin --guardar no se escribe nada
+    assert not list(batch_config.glob("outputs/solucion_*"))
+
+
+@pytest.mark.timeout(180)
+def test_parallel_batch_keeps_the_input_order_and_time_limit(batch_config):
+    # El límite va solo en el problema que cicla: la primera resolución de cada
+    # proceso importa scipy dentro de su presupuesto y, con la máquina cargada,
+    # podría pasar de 1 s
+    entries = [("lento", {"problema_definicion": CICLA, "backend": "tableau", "opciones": {"time_limit": 1.0}},
+                None)]
+    entries += [(f"p{i}", {"problema_definicion": DEFINICION}, None) for i in range(4)]
+    settings = BatchController.settings(time_limit=30)
+
+    records = list(BatchController.run(iter(entries), settings, workers=2, ordered=True))
+
+    assert [r["origen"] for r in records] == ["lento", "p0", "p1", "p2", "p3"]
+    assert records[0]["estado"] == "Limite Alcanzado"
+    # Corta el tiempo (o, en una máquina rápida, el límite de iteraciones)
+    assert records[0]["diagnostico"]["presupuesto"]["agotado"]["etapa"] == "solve"
+    assert all(r["estado"] == "Solucion Factible" for r in records[1:])
+
+
+
+def _solve_or_crash(index, entry, settings):
+    """Corre en los procesos del lote: el problema 'cae' mata a su proceso."""
+    from app.controllers import batch_controller
+    if entry[0] == "cae":
+        os._exit(1)
+    return batch_controller._solve_entry(index, entry, settings)
+
+
+@pytest.mark.timeout(180)
+def test_parallel_batch_survives_a_dead_worker(mocker, batch_config):
+    mocker.patch('app.controllers.batch_controller._solve_entry', _solve_or_crash)
+    entries = [(f"p{i}", {"problema_definicion": DEFINICION}, None) for i in range(6)]
+    entries.insert(2, ("cae", {"problema_definicion": DEFINICION}, None))
+    settings = BatchController.settings(time_limit=30)
+
+    records = list(BatchController.run(iter(entries), settings, workers=2, ordered=True))
+
+    assert [r["origen"] for r in records] == ["p0", "p1", "cae", "p2", "p3", "p4", "p5"]
+    assert records[2]["estado"] == "Error" and "terminó de forma inesperada" in records[2]["error"]
+    assert all(r["estado"] == "Solucion Factible" for r in records if r["origen"] != "cae")
@@ -0,0 +1,131 @@
+"""
+Tests para la suite de benchmarks (benchmarks/).
+Verifican que las familias generadas sean reproducibles y tengan el estado
+esperado, que una corrida mínima escriba un archivo de resultados válido
+y que la comparación contra la línea base detecte regresiones.
+"""
+import json
+
+import pytest
+
+from app import config
+from app.controllers.solver_controller import SolverController
+from app.core import ConstraintsParser, ObjectiveFunctionParser
+from app.controllers.ui_controller import validate_problem_structure
+from benchmarks.__main__ import main
+from benchmarks.compare import (
+    IMPROVEMENT, MISSING, NEW, REGRESSION, UNCHANGED, Thresholds, compare, format_diff, make_baseline,
+)
+from benchmarks.compare import main as compare_main
+from benchmarks.generators import EXPECTED_STATUS, FAMILIES, generate, to_expressions
+from benchmarks.suite import RESULTS_FORMAT, summarize
+
+
+def _results(**medians):
+    """Resultados con 20 rondas por benchmark, desvío del 2% y p95 = 1.1 * mediana."""
+    return {"formato": RESULTS_FORMAT, "entorno": {}, "benchmarks": {
+        name: {"rondas": 20, "media": median, "desvio": median * 0.02, "mediana": median,
+               "p90": median * 1.05, "p95": median * 1.1, "p99": median * 1.2}
+        for name, median in medians.items()}}
+
+
+def test_generators_are_reproducible():
+    for family in FAMILIES:
+        assert generate(family, 12, seed=3) == generate(family, 12, seed=3)
+        assert generate(family, 12, seed=3) != generate(family, 12, seed=4)
+
+
+@pytest.mark.parametrize("family", list(FAMILIES))
+def test_families_have_the_expected_status(mocker, family):
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "off")
+    problem = generate(family, 12, seed=1)
+
+    assert validate_problem_structure(problem)[0]
+    report = SolverController({"problema_definicion": problem}, include_visualization=False,
+                              include_tableaus=False).run()
+    assert report["solucion_encontrada"]["status"] == EXPECTED_STATUS[family]
+
+
+def test_expressions_parse_back_to_the_problem():
+    problem = generate("no_acotada", 6, seed=2)
+    objective, constraints = to_expressions(problem)
+
+    assert ObjectiveFunctionParser.parse(objective) == pytest.approx(problem["funcion_objetivo"]["coefficients"])
+    first = ConstraintsParser.parse(constraints[0])
+    assert first.to_dict()["coefficients"] == pytest.approx(problem["restricciones"][0]["coefficients"])
+
+
+def test_summarize_percentiles():
+    stats = summarize([float(i) for i in range(1, 101)])
+    assert stats["rondas"] == 100
+    assert stats["mediana"] == pytest.approx(50.5)
+    assert stats["p95"] == pytest.approx(95.05)
+    assert stats["min"] == 1.0 and stats["max"] == 100.0
+
+
+def test_cli_writes_results_file(tmp_path, capsys):
+    output = tmp_path / "resultados.json"
+
+    assert main(["--familias", "densa,transporte", "--tamanos", "6", "--min-rondas", "1",
+                 "--tiempo-max", "0", "--salida", str(output)]) == 0
+
+    results = json.loads(output.read_text(encoding="utf-8"))
+    assert results["parametros"]["tamanos"] == [6]
+    assert {"commit", "python", "numpy", "scipy"} <= set(results["entorno"])
+    names = set(results["benchmarks"])
+    assert {"parser/densa/6", "formulario/densa/6", "modelo/transporte/6", "solver[highs-ds]/densa/6",
+            "solver[tableau]/densa/6", "visualizacion/densa/6", "pdf/transporte/6"} <= names
+    # simple_simplex no termina con filas >=: el backend de tablas no se mide en transporte
+    assert "solver[tableau]/transporte/6" not in names
+    bench = results["benchmarks"]["solver[highs-ds]/densa/6"]
+    assert bench["etapa"] == "solver" and bench["backend"] == "highs-ds" and bench["rondas"] >= 1
+    assert "solver[highs-ds]/densa/6" in capsys.readouterr().out
+
+
+def test_compare_flags_only_significant_slowdowns():
+    baseline = make_baseline(_results(lento=0.010, rapido=0.010, igual=0.010, ruido=10e-6, viejo=0.010))
+    current = _results(lento=0.013, rapido=0.007, igual=0.0102, ruido=20e-6, nuevo=0.010)
+
+    states = {row["benchmark"]: row["estado"] for row in compare(baseline, current)}
+    assert states == {"lento": REGRESSION, "rapido": IMPROVEMENT, "igual": UNCHANGED,
+                      "ruido": UNCHANGED,  # +100% pero por debajo de la diferencia mínima
+                      "nuevo": NEW, "viejo": MISSING}
+
+
+def test_compare_requires_statistical_significance():
+    baseline = _results(a=0.010)
+    current = _results(a=0.012)
+    current["benchmarks"]["a"]["desvio"] = 0.02  # Mucho ruido: +20% no es significativo
+    assert compare(baseline, current)[0]["estado"] == UNCHANGED
+    assert compare(baseline, _results(a=0.012), Thresholds(tolerance=0.25))[0]["estado"] == UNCHANGED
+
+
+def test_compare_cli_exit_code_and_diff_table(tmp_path, capsys):
+    baseline, current = tmp_path / "base.json", tmp_path / "actual.json"
+    baseline.write_text(json.dumps(make_baseline(_results(a=0.010, b=0.010))), encoding="utf-8")
+    current.write_text(json.dumps(_results(a=0.010, b=0.020)), encoding="utf-8")
+
+    assert compare_main([str(baseline), str(current)]) == 1
+    out = capsys.readouterr().out
+    assert "REGRESION" in out and "+100.0%" in out and "1 regresion, 1 sin cambio" in out
+    assert compare_main([str(baseline), str(baseline)]) == 0
+    assert compare_main([str(baseline), str(tmp_path / "no_existe.json")]) == 2
+
+
+def test_cli_saves_and_compares_baseline(tmp_path, capsys):
+    baseline = tmp_path / "linea_base.json"
+    args = ["--familias", "densa", "--tamanos", "6", "--etapas", "validacion", "--min-rondas", "20",
+            "--tiempo-max", "0", "--salida", str(tmp_path / "resultados.json")]
+
+    assert main(args + ["--guardar-linea-base", str(baseline)]) == 0
+    saved = json.loads(baseline.read_text(encoding="utf-8"))
+    assert set(saved["benchmarks"]["validacion/densa/6"]) == {"rondas", "media", "desvio", "mediana",
+                                                              "p90", "p95", "p99"}
+    # Contra una línea base 100 veces más rápida, la misma corrida es una regresión
+    for stats in saved["benchmarks"].values():
+        for key in ("media", "desvio", "mediana", "p90", "p95", "p99"):
+            stats[key] /= 100
+    baseline.write_text(json.dumps(saved), encoding="utf-8")
+    capsys.readouterr()
+    assert main(args + ["--comparar", str(baseline), "--min-delta-ms", "0"]) == 1
+    assert "REGRESION" in capsys.readouterr().out
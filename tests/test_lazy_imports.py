@@ -0,0 +1,76 @@
+"""
+Tests para la importación diferida de las librerías pesadas
+(app/utils/lazy_imports.py) y para el benchmark de importación.
+"""
+import json
+import sys
+
+import pytest
+
+from app import config
+from app.services import Metrics, SolveExecutor
+from app.utils.lazy_imports import lazy_callable, preload, warm_up
+from benchmarks.imports import HEAVY_MODULES, main, run_once
+
+
+def test_lazy_callable_imports_on_first_call(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    rgb_to_hsv = lazy_callable("colorsys", "rgb_to_hsv")
+
+    assert "colorsys" not in sys.modules
+    assert rgb_to_hsv.__name__ == "rgb_to_hsv"
+    assert rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in sys.modules
+
+
+def test_preload_reports_each_module(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    seconds = preload(("colorsys", "json"))
+
+    assert list(seconds) == ["colorsys", "json"] and all(s >= 0 for s in seconds.values())
+    assert "colorsys" in sys.modules
+
+
+def test_warm_up_solves_and_renders_without_side_effects(mocker, tmp_path):
+    from app.services import PdfReportService
+
+    mocker.patch('app.services.storage_service.OUTPUT_DIR', str(tmp_path))
+    mocker.patch.object(config, 'SOLVE_EXECUTOR', "process")
+    mocker.patch.object(config, 'METRICS_ENABLED', True)
+    mocker.patch.object(config, 'METRICS_DIR', str(tmp_path / "metricas"))
+    Metrics.reset()
+    call = mocker.spy(SolveExecutor, "call")
+    render = mocker.spy(PdfReportService, "render")
+    freeze = mocker.patch('app.utils.lazy_imports.gc.freeze')
+
+    seconds = warm_up()
+
+    assert set(seconds) == {"importacion", "resolucion", "pdf"}
+    assert render.spy_return.getvalue().startswith(b"%PDF")
+    # Todo en este proceso, sin guardar ni medir, y la configuración queda como estaba
+    call.assert_not_called()
+    assert not list(tmp_path.glob("solucion_*")) and Metrics._counters == {} and Metrics._histograms == {}
+    assert config.SOLVE_EXECUTOR == "process" and config.METRICS_ENABLED
+    freeze.assert_called_once()
+
+
+@pytest.mark.timeout(120)
+def test_app_import_does_not_load_heavy_libraries():
+    assert run_once("importacion/web_app")["cargados"] == []
+    # La primera resolución carga lo que necesita (sin ReportLab)
+    loaded = run_once("primer_uso/resolucion")["cargados"]
+    assert {"scipy.optimize", "simple_simplex", "gilp"} <= set(loaded)
+    assert "reportlab" not in loaded
+
+
+@pytest.mark.timeout(120)
+def test_import_benchmark_cli(tmp_path, capsys):
+    output = tmp_path / "importacion.json"
+    assert main(["--casos", "importacion/web_app,importacion/reportlab", "--rondas", "2",
+                 "--salida", str(output)]) == 0
+
+    results = json.loads(output.read_text(encoding="utf-8"))
+    web_app, reportlab = results["benchmarks"]["importacion/web_app"], results["benchmarks"]["importacion/reportlab"]
+    assert results["formato"] == 1 and web_app["rondas"] == 2 and web_app["mediana"] > 0
+    assert reportlab["cargados"] == ["reportlab"] and set(reportlab["cargados"]) <= set(HEAVY_MODULES)
+    assert "importacion/web_app" in capsys.readouterr().out
@@ -0,0 +1,91 @@
+"""
+Tests para la prueba de carga HTTP (benchmarks/load.py).
+Verifican las llegadas en lazo abierto con un flujo simulado y una corrida
+corta contra un gunicorn real.
+"""
+import json
+import os
+import time
+
+import pytest
+
+from benchmarks.generators import generate, to_form
+from benchmarks.load import (
+    FlowError, GunicornServer, arrival_times, main, process_memory, run_flow, run_open_loop,
+)
+
+
+def test_arrival_times():
+    assert arrival_times(4, 1.0, "constante") == [0.0, 0.25, 0.5, 0.75]
+    poisson = arrival_times(50, 2.0, "poisson", seed=1)
+    assert poisson == arrival_times(50, 2.0, "poisson", seed=1)
+    assert 60 < len(poisson) < 140 and all(0 < t < 2.0 for t in poisson)
+
+
+def test_open_loop_counts_queueing_in_latency():
+    def flow():
+        time.sleep(0.2)
+        return {"new": 0.2}
+
+    # Llegan 10 por segundo pero solo se atiende uno a la vez: cada uno espera a los anteriores
+    point = run_open_loop(flow, rate=10, duration=0.5, arrivals="constante", max_in_flight=1)
+
+    assert point["enviados"] == point["completados"] == 5
+    # El último llega a los 0.4 s y termina a los 1.0 s (5 x 0.2 s)
+    assert point["latencia"]["max"] >= 0.55
+    assert point["latencia"]["p50"] > point["pasos"]["new"]["p50"] == pytest.approx(0.2)
+    assert point["pasos"]["pdf"]["p50"] is None
+
+
+def test_open_loop_reports_errors():
+    calls = []
+
+    def flow():
+        calls.append(1)
+        if len(calls) % 2:
+            raise FlowError("solve", "HTTP 302")
+        return {"new": 0.01, "solve": 0.01}
+
+    point = run_open_loop(flow, rate=20, duration=0.2, arrivals="constante")
+    assert point["enviados"] == 4
+    assert point["errores"] == 2 and point["detalle_errores"] == {"solve: HTTP 302": 2}
+
+
+@pytest.mark.timeout(120)
+def test_full_flow_against_gunicorn(tmp_path, capsys):
+    pytest.importorskip("gunicorn")
+    with GunicornServer(workers=1) as server:
+        steps = run_flow(server.url, to_form(generate("densa", 4)))
+        assert set(steps) == {"new", "solve", "pdf"}
+        # Con una cota inválida, /new redirige al formulario: es un error del flujo
+        invalid = {**to_form(generate("densa", 1)), "variable_lower[]": ["5"], "variable_upper[]": ["1"]}
+        with pytest.raises(FlowError, match="new: HTTP 302"):
+            run_flow(server.url, invalid)
+
+    output = tmp_path / "carga.json"
+    assert main(["--workers", "1", "--tasas", "2", "--duracion", "1", "--tamano", "4",
+                 "--calentamiento", "1", "--sin-pdf", "--salida", str(output)]) == 0
+    results = json.loads(output.read_text(encoding="utf-8"))
+    point = results["corridas"][0]["puntos"][0]
+    assert results["corridas"][0]["tipo_worker"] == "sync"
+    assert point["errores"] == 0 and point["completados"] == point["enviados"] > 0
+    assert point["latencia"]["p99"] >= point["latencia"]["p50"] > 0
+    assert "1xsync" in capsys.readouterr().out
+
+
+@pytest.mark.timeout(120)
+def test_preloaded_server_reports_memory():
+    pytest.importorskip("gunicorn")
+    if process_memory(os.getpid()) is None:
+        pytest.skip("Sin /proc/<pid>/smaps_rollup")
+
+    with GunicornServer(workers=1, worker_class="gthread", threads=2, executor="process", preload=True) as server:
+        assert set(run_flow(server.url, to_form(generate("densa", 4)))) == {"new", "solve", "pdf"}
+        memory = server.memory()
+
+    assert memory["maestro"]["procesos"] == 1 and memory["workers"]["procesos"] == 1
+    # El pool del worker (y los auxiliares de multiprocessing)
+    assert memory["pool"]["procesos"] >= 1
+    assert memory["pss_total"] == sum(memory[group]["pss"] for group in ("maestro", "workers", "pool"))
+    # Con --preload, el worker comparte con el master las páginas precalentadas
+    assert memory["workers"]["pss"] < memory["workers"]["rss"]
@@ -0,0 +1,95 @@
+"""
+Tests para los logs de la aplicación (app/utils/logging_setup.py).
+Cubren el registro único de tiempos por resolución, el formato JSON y
+los niveles configurables.
+"""
+import json
+import logging
+
+import pytest
+
+from app import config
+from app.controllers.solver_controller import SolverController, TIMED_STAGES
+from app.utils.logging_setup import APP_LOGGER, JsonFormatter, configure_logging
+
+PROBLEMA = {"problema_definicion": {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}},
+    "restricciones": [{"coefficients": {"x1": 1.0, "x2": 2.0}, "operator": "<=", "rhs": 8.0}],
+}}
+
+
+@pytest.fixture
+def app_logger():
+    """Restaura el logger "app" (nivel y handlers) al terminar cada test."""
+    logger = logging.getLogger(APP_LOGGER)
+    level, handlers = logger.level, list(logger.handlers)
+    yield logger
+    logger.handlers[:] = handlers
+    logger.setLevel(level)
+    logging.getLogger("app.core.presolve").setLevel(logging.NOTSET)
+
+
+def _solve_records(caplog):
+    return [r for r in caplog.records if hasattr(r, "solve")]
+
+
+def test_one_timing_record_per_solve(mocker, caplog):
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "off")
+    caplog.set_level(logging.INFO, logger=APP_LOGGER)
+
+    solver = SolverController(PROBLEMA)
+    solver.run()
+
+    records = _solve_records(caplog)
+    assert len(records) == 1
+    solve = records[0].solve
+    assert solve["estado"] == "Solucion Factible"
+    assert solve["variables"] == 2 and solve["restricciones"] == 1
+    assert set(solve["tiempos_ms"]) == set(TIMED_STAGES) | {"total"}
+    assert solve["tiempos_ms"]["solve"] > 0
+    assert solve["tiempos_ms"]["total"] == pytest.approx(sum(solver.timings.values()) * 1000, abs=0.01)
+
+
+def test_timing_record_is_emitted_when_the_solve_fails(mocker, caplog):
+    mocker.patch('app.services.SolverBackendRegistry.solve', side_effect=RuntimeError("falla"))
+    caplog.set_level(logging.INFO, logger=APP_LOGGER)
+
+    assert SolverController(PROBLEMA).run() is None
+    assert [r.solve["estado"] for r in _solve_records(caplog)] == ["Error"]
+
+
+def test_detail_is_only_logged_at_debug(mocker, caplog):
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "off")
+    caplog.set_level(logging.INFO, logger=APP_LOGGER)
+    SolverController(PROBLEMA).run()
+    assert "x1 = " not in caplog.text
+
+    caplog.clear()
+    caplog.set_level(logging.DEBUG, logger=APP_LOGGER)
+    SolverController(PROBLEMA).run()
+    assert "   x1 = 8.0000" in caplog.text
+    assert "Ejecutando solver principal..." in caplog.text
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "Z = %.1f", (2.5,), None)
+    record.solve = {"estado": "Solucion Factible", "tiempos_ms": {"solve": 1.5}}
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["nivel"] == "INFO"
+    assert entry["logger"] == "app.test"
+    assert entry["mensaje"] == "Z = 2.5"
+    assert entry["solve"]["tiempos_ms"] == {"solve": 1.5}
+
+
+def test_configure_logging_levels_and_single_handler(app_logger):
+    configure_logging(level="warning", fmt="json", levels={"app.core.presolve": "debug"})
+    configure_logging(level="warning", fmt="json", levels={"app.core.presolve": "debug"})
+
+    own = [h for h in app_logger.handlers if h.get_name() == APP_LOGGER]
+    assert len(own) == 1
+    assert isinstance(own[0].formatter, JsonFormatter)
+    assert app_logger.level == logging.WARNING
+    assert logging.getLogger("app.core.presolve").getEffectiveLevel() == logging.DEBUG
+    assert logging.getLogger("app.services.storage_service").getEffectiveLevel() == logging.WARNING
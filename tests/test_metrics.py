@@ -0,0 +1,138 @@
+"""
+Tests para las métricas de Prometheus (app/services/metrics_service.py).
+Cubren las métricas de una resolución, el formato de texto, la suma entre
+procesos y la ruta /metrics.
+"""
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from app import config
+from app.controllers.routers import init_app
+from app.controllers.solver_controller import SolverController
+from app.services import Metrics, TableauHtmlRenderer
+
+PROBLEMA = {"problema_definicion": {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}},
+    "restricciones": [
+        {"coefficients": {"x1": 1.0, "x2": 2.0}, "operator": "<=", "rhs": 8.0},
+        {"coefficients": {"x1": 3.0, "x2": 1.0}, "operator": "<=", "rhs": 9.0},
+    ],
+}}
+
+
+@pytest.fixture
+def metrics_dir(mocker, tmp_path):
+    mocker.patch.object(config, 'METRICS_DIR', str(tmp_path))
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "off")
+    Metrics.reset()
+    TableauHtmlRenderer.clear_cache()
+    yield tmp_path
+    if Metrics._timer is not None:
+        Metrics._timer.cancel()
+        Metrics._timer = None
+    Metrics.reset()
+
+
+def _samples(text: str) -> dict:
+    """Texto de exposición -> {'nombre{labels}': valor}."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def _child_solves(count):
+    for _ in range(count):
+        Metrics.inc("simplex_solves_total", backend="tableau", estado="Solucion Factible")
+    Metrics.flush()
+
+
+def test_solve_records_stages_model_size_and_iterations(metrics_dir):
+    SolverController(PROBLEMA, backend="highs-ds").run()
+
+    text = Metrics.render()
+    samples = _samples(text)
+
+    assert "# TYPE simplex_stage_seconds histogram" in text
+    for stage in ("parse", "build", "solve", "visualize", "persist", "simple_simplex", "gilp"):
+        assert samples[f'simplex_stage_seconds_count{{stage="{stage}"}}'] == 1
+    assert samples['simplex_solves_total{backend="highs-ds",estado="Solucion Factible"}'] == 1
+    assert samples['simplex_model_rows_sum'] == 2
+    assert samples['simplex_model_columns_sum'] == 2
+    assert samples['simplex_model_nonzeros_sum'] == 4
+    assert samples['simplex_solver_iterations_count{backend="highs-ds"}'] == 1
+
+
+def test_histogram_buckets_are_cumulative(metrics_dir):
+    for value in (0.002, 0.02, 0.2, 50.0):
+        Metrics.observe("simplex_stage_seconds", value, stage="pdf")
+
+    samples = _samples(Metrics.render())
+
+    assert samples['simplex_stage_seconds_bucket{stage="pdf",le="0.001"}'] == 0
+    assert samples['simplex_stage_seconds_bucket{stage="pdf",le="0.005"}'] == 1
+    assert samples['simplex_stage_seconds_bucket{stage="pdf",le="0.025"}'] == 2
+    assert samples['simplex_stage_seconds_bucket{stage="pdf",le="30"}'] == 3
+    assert samples['simplex_stage_seconds_bucket{stage="pdf",le="+Inf"}'] == 4
+    assert samples['simplex_stage_seconds_count{stage="pdf"}'] == 4
+    assert samples['simplex_stage_seconds_sum{stage="pdf"}'] == pytest.approx(50.222)
+
+
+def test_metrics_are_summed_across_processes(metrics_dir):
+    Metrics.inc("simplex_solves_total", backend="tableau", estado="Solucion Factible")
+    context = multiprocessing.get_context("fork")
+    child = context.Process(target=_child_solves, args=(2,))
+    child.start()
+    child.join(10)
+
+    samples = _samples(Metrics.render())
+
+    # El hijo no hereda el contador del padre: 1 + 2
+    assert samples['simplex_solves_total{backend="tableau",estado="Solucion Factible"}'] == 3
+    # El hijo ya terminó: sus contadores cuentan, pero no como proceso vivo
+    assert samples['simplex_metrics_processes'] == 1
+    assert len(list(metrics_dir.glob("metricas_*.json"))) == 2
+
+
+def test_gauges_of_dead_processes_are_ignored(metrics_dir):
+    dead = {"pid": 2 ** 22 + 1, "histograms": [],
+            "counters": [["simplex_cache_requests_total", [["cache", "pdf"], ["resultado", "hit"]], 5]],
+            "gauges": [["simplex_persistence_queue_depth", [], 40]]}
+    (metrics_dir / f"metricas_{dead['pid']}.json").write_text(json.dumps(dead))
+
+    samples = _samples(Metrics.render())
+
+    assert samples['simplex_cache_requests_total{cache="pdf",resultado="hit"}'] == 5
+    assert samples['simplex_persistence_queue_depth'] == 0
+
+
+def test_cache_hits_and_misses_are_exported(metrics_dir):
+    table = [["Base", "x1", "RHS"], ["s1", 1.0, 4.0], ["Z", -3.0, 0.0]]
+    TableauHtmlRenderer.render(table)
+    TableauHtmlRenderer.render(table)
+
+    samples = _samples(Metrics.render())
+
+    assert samples['simplex_cache_requests_total{cache="tablas_html",resultado="hit"}'] == 1
+    assert samples['simplex_cache_requests_total{cache="tablas_html",resultado="miss"}'] == 1
+    assert samples['simplex_tableau_html_cache_entries'] == 1
+
+
+def test_metrics_endpoint(metrics_dir, mocker):
+    app = init_app()
+    app.config.update({"TESTING": True})
+    client = app.test_client()
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert "simplex_metrics_processes 1" in response.get_data(as_text=True)
+    assert (metrics_dir / f"metricas_{os.getpid()}.json").exists()
+
+    mocker.patch.object(config, 'METRICS_ENABLED', False)
+    assert client.get('/metrics').status_code == 404
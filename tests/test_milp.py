@@ -0,0 +1,124 @@
+"""
+Tests para los problemas enteros y mixtos (scipy.optimize.milp).
+Cubren el esquema 'tipos_variables', el backend 'highs-milp', el redondeo
+de cotas en el presolve y el diagnóstico de branch-and-bound del reporte.
+"""
+import numpy as np
+import pytest
+from scipy.optimize import OptimizeResult
+
+from app.core import Presolver, ModelScaler
+from app.services import SolverBackendRegistry, SolverModel
+from app.controllers.solver_controller import SolverController
+from app.controllers.ui_controller import validate_problem_structure
+
+OBJECTIVE = {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}}
+CONSTRAINTS = [
+    {"coefficients": {"x1": 3.0, "x2": 2.0}, "operator": "<=", "rhs": 18.5},
+    {"coefficients": {"x1": 1.0, "x2": 4.0}, "operator": "<=", "rhs": 13.3},
+]
+
+
+def _problem(tipos):
+    return {"problema_definicion": {
+        "funcion_objetivo": OBJECTIVE, "restricciones": CONSTRAINTS, "tipos_variables": tipos}}
+
+
+def test_integer_problem_is_solved_with_branch_and_bound(mocker):
+    mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
+
+    report = SolverController(_problem({"x1": "integer", "x2": "integer"})).run()
+
+    solution = report['solucion_encontrada']
+    assert solution['valores_variables'] == {"x1": 4.0, "x2": 2.0}
+    assert solution['valor_optimo_z'] == pytest.approx(22.0)
+    assert report['diagnostico']['backend']['backend'] == "highs-milp"
+    mip = report['diagnostico']['mip']
+    assert mip['variables_enteras'] == ["x1", "x2"]
+    assert mip['gap'] == pytest.approx(0.0)
+    assert mip['nodos'] >= 1
+    assert mip['cota_dual'] == pytest.approx(22.0)
+    assert mip['tiempo_segundos'] >= 0
+    assert report['problema_definicion']['tipos_variables'] == {"x1": "integer", "x2": "integer"}
+
+
+def test_mixed_problem_keeps_continuous_variables(mocker):
+    mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
+
+    report = SolverController(_problem({"x2": "integer"})).run()
+
+    values = report['solucion_encontrada']['valores_variables']
+    assert values["x2"] == 2.0
+    # x1 continua: 3x1 + 2*2 <= 18.5 -> x1 = 4.8333
+    assert values["x1"] == pytest.approx(14.5 / 3)
+
+
+def test_binary_variables_are_bounded_by_one(mocker):
+    mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
+
+    report = SolverController(_problem({"x1": "binary", "x2": "binary"})).run()
+
+    assert report['solucion_encontrada']['valores_variables'] == {"x1": 1.0, "x2": 1.0}
+    assert report['solucion_encontrada']['valor_optimo_z'] == pytest.approx(8.0)
+
+
+def test_lp_backend_rejects_integer_model():
+    model = SolverModel(OBJECTIVE, CONSTRAINTS, ["x1", "x2"], integrality=[1, 0])
+    assert SolverBackendRegistry.select(model) == "highs-milp"
+    with pytest.raises(ValueError, match="no admite variables enteras"):
+        SolverBackendRegistry.solve(model, backend="highs-ds")
+
+
+def test_milp_options_and_limit_with_incumbent(mocker):
+    mock_milp = mocker.patch('app.services.solver_backends.milp', return_value=OptimizeResult({
+        'success': False, 'status': 1, 'x': np.array([3.0, 2.0]), 'fun': -19.0,
+        'message': 'Time limit reached.', 'mip_node_count': 50, 'mip_dual_bound': -22.5, 'mip_gap': 0.18
+    }))
+    model = SolverModel(OBJECTIVE, CONSTRAINTS, ["x1", "x2"], integrality=[1, 1])
+
+    result, info = SolverBackendRegistry.solve(
+        model, options={"time_limit": 2, "node_limit": 50, "mip_rel_gap": 0.01})
+
+    assert mock_milp.call_args.kwargs["options"] == {
+        "presolve": True, "time_limit": 2, "node_limit": 50, "mip_rel_gap": 0.01}
+    np.testing.assert_array_equal(mock_milp.call_args.kwargs["integrality"], [1, 1])
+    assert info["opciones_ignoradas"] == []
+    # Con una solución entera disponible, el límite no se informa como fracaso
+    assert result.success
+    assert "gap 18.00%" in result.message
+
+
+def test_presolve_rounds_integer_bounds():
+    constraints = [
+        {"coefficients": {"x1": 2.0, "x2": 0.0}, "operator": "<=", "rhs": 7.0},   # x1 <= 3.5 -> 3
+        {"coefficients": {"x1": 1.0, "x2": 1.0}, "operator": "<=", "rhs": 10.0},
+    ]
+    result = Presolver.run(OBJECTIVE, constraints, ["x1", "x2"], integers={"x1"})
+    assert result.bounds["x1"] == (0.0, 3.0)
+
+    fractional_equality = [{"coefficients": {"x1": 2.0, "x2": 0.0}, "operator": "=", "rhs": 3.0}]
+    assert Presolver.run(OBJECTIVE, fractional_equality + constraints[1:], ["x1", "x2"],
+                         integers={"x1"}).infeasible
+
+
+def test_scaling_keeps_integer_columns_unscaled():
+    constraints = [
+        {"coefficients": {"x1": 1e-3, "x2": 5e3}, "operator": "<=", "rhs": 10.0},
+        {"coefficients": {"x1": 2e-3, "x2": 1e2}, "operator": "<=", "rhs": 8.0},
+    ]
+    result = ModelScaler.run(OBJECTIVE, constraints, ["x1", "x2"],
+                             {"x1": (0, None), "x2": (0, None)}, mode="on", integers={"x2"})
+    assert result.applied
+    assert result.col_factors[1] == 1.0
+
+
+@pytest.mark.parametrize("tipos, expected_ok", [
+    ({"x1": "integer", "x2": "binary"}, True),
+    ({"x1": "entero"}, False),
+    ({"x9": "integer"}, False),
+    (["x1"], False),
+])
+def test_validate_variable_types(tipos, expected_ok):
+    problem = dict(_problem(tipos)["problema_definicion"])
+    ok, _ = validate_problem_structure(problem)
+    assert ok is expected_ok
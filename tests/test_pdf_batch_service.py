@@ -0,0 +1,190 @@
+"""
+Tests para la exportación de PDFs en lote (app/services/pdf_batch_service.py).
+Usan un pool de procesos real sobre soluciones guardadas en un directorio
+temporal: verifican el .zip, la caché, el progreso y el límite de memoria.
+"""
+import io
+import json
+import os
+import time
+import zipfile
+
+import pytest
+
+from app import config
+from app.controllers.routers import init_app
+from app.services import PdfBatchService, SolutionWriter, StorageService
+from app.services import pdf_batch_service
+
+REPORT = {
+    "problema_definicion": {
+        "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 1, "x2": 2}},
+        "restricciones": [{"coefficients": {"x1": 1, "x2": 1}, "operator": "<=", "rhs": 10}]
+    },
+    "solucion_encontrada": {
+        "status": "Solucion Factible",
+        "valores_variables": {"x1": 0.0, "x2": 10.0},
+        "valor_optimo_z": 20.0
+    },
+    "tablas_intermedias": []
+}
+
+
+@pytest.fixture
+def batch_dirs(mocker, tmp_path):
+    """Soluciones 1..3 guardadas, caché y lotes en directorios temporales."""
+    output_dir = tmp_path / "outputs"
+    output_dir.mkdir()
+    for sid in (1, 2, 3):
+        report = dict(REPORT, solucion_encontrada=dict(REPORT["solucion_encontrada"], valor_optimo_z=sid))
+        (output_dir / f"solucion_{sid}.json").write_text(json.dumps(report), encoding="utf-8")
+
+    mocker.patch('app.services.storage_service.OUTPUT_DIR', str(output_dir))
+    mocker.patch('app.services.storage_service.PDF_CACHE_DIR', str(tmp_path / "cache"))
+    mocker.patch.object(config, 'PDF_BATCH_DIR', str(tmp_path / "lotes"))
+    return tmp_path
+
+
+def test_batch_renders_every_solution_into_one_zip(batch_dirs):
+    job_id = PdfBatchService.start([1, 2, 3, 2], workers=2)
+    status = PdfBatchService.wait(job_id, timeout=120)
+
+    assert status["estado"] == "completado"
+    assert status["total"] == 3  # Ids repetidos se exportan una sola vez
+    assert status["completados"] == 3
+    assert status["progreso"] == 1.0
+    with zipfile.ZipFile(PdfBatchService.get_zip_path(job_id)) as archive:
+        names = sorted(archive.namelist())
+        assert names == ["reporte_solucion_1.pdf", "reporte_solucion_2.pdf", "reporte_solucion_3.pdf"]
+        assert archive.read(names[0]).startswith(b"%PDF")
+    # Los PDFs quedan en la caché para /exportar-pdf y para el próximo lote
+    assert len(list((batch_dirs / "cache").glob("reporte_solucion_*.pdf"))) == 3
+
+
+def test_batch_waits_for_reports_queued_by_write_behind(mocker, batch_dirs):
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "write-behind")
+    mocker.patch.object(config, 'PERSISTENCE_BATCH_WAIT', 1.0)
+    try:
+        solution_id = StorageService.solution_id_from_path(SolutionWriter.save(REPORT))
+        # Recién resuelta: sigue en la cola del hilo de escritura
+        assert (batch_dirs / "outputs" / f"solucion_{solution_id}.json").stat().st_size == 0
+
+        status = PdfBatchService.wait(PdfBatchService.start([solution_id], workers=1), timeout=120)
+    finally:
+        SolutionWriter.shutdown()
+
+    assert status["estado"] == "completado" and status["exportados"] == [solution_id]
+
+
+def test_missing_solution_fails_alone(batch_dirs):
+    status = PdfBatchService.wait(PdfBatchService.start([1, 99], workers=1), timeout=120)
+
+    assert status["estado"] == "completado"
+    assert status["exportados"] == [1]
+    assert status["fallidos"][0]["id"] == 99
+    assert "No existe la solución 99" in status["fallidos"][0]["error"]
+
+
+def test_memory_limit_is_enforced_per_job(mocker, batch_dirs):
+    # Reportes con muchas tablas: maquetarlos necesita bastante más de 1 MB
+    table = [["Base"] + [f"C{j}" for j in range(20)]] + [[f"F{i}"] + [float(i * j) for j in range(20)]
+                                                         for i in range(20)]
+    big = dict(REPORT, tablas_intermedias=[{"title": f"Iteración {k}", "table": table} for k in range(200)])
+    for sid in (1, 2):
+        (batch_dirs / "outputs" / f"solucion_{sid}.json").write_text(json.dumps(big), encoding="utf-8")
+    mocker.patch.object(config, 'PDF_BATCH_MEMORY_LIMIT_MB', 1)
+
+    status = PdfBatchService.wait(PdfBatchService.start([1, 2], workers=1), timeout=120)
+
+    assert status["estado"] == "fallido"
+    assert sorted(item["id"] for item in status["fallidos"]) == [1, 2]
+    assert PdfBatchService.get_zip_path(status["job_id"]) is None
+
+
+def _render_or_crash(solution_id, scratch_dir, cache_enabled):
+    """Corre en los procesos del lote: la solución 2 mata a su proceso (como un corte por memoria)."""
+    if solution_id == 2:
+        os._exit(1)
+    return pdf_batch_service._render_solution_pdf(solution_id, scratch_dir, cache_enabled)
+
+
+def test_dead_worker_fails_only_its_solution(mocker, batch_dirs):
+    mocker.patch('app.services.pdf_batch_service._render_solution_pdf', _render_or_crash)
+
+    status = PdfBatchService.wait(PdfBatchService.start([1, 2, 3], workers=2), timeout=120)
+
+    assert status["estado"] == "completado"
+    assert sorted(status["exportados"]) == [1, 3]
+    assert [item["id"] for item in status["fallidos"]] == [2]
+    assert "terminó de forma inesperada" in status["fallidos"][0]["error"]
+    with zipfile.ZipFile(PdfBatchService.get_zip_path(status["job_id"])) as archive:
+        assert sorted(archive.namelist()) == ["reporte_solucion_1.pdf", "reporte_solucion_3.pdf"]
+
+
+def test_flush_before_batch_is_bounded(mocker, batch_dirs):
+    flush = mocker.patch.object(SolutionWriter, 'flush', return_value=False)  # Venció el timeout
+
+    status = PdfBatchService.wait(PdfBatchService.start([1], workers=1), timeout=120)
+
+    flush.assert_called_once_with(timeout=config.PDF_BATCH_FLUSH_TIMEOUT)
+    assert status["exportados"] == [1]  # El lote sigue igual
+
+
+def test_finished_threads_and_expired_jobs_are_removed(mocker, batch_dirs):
+    mocker.patch.object(PdfBatchService, 'run')  # El hilo termina enseguida
+    mocker.patch.object(config, 'PDF_BATCH_TTL', 3600)
+    old_job = PdfBatchService.start([1])
+    pdf_batch_service._threads[old_job].join()
+    status = PdfBatchService.get_status(old_job)
+    status["creado"] = time.time() - 7200
+    PdfBatchService._write_status(old_job, status)
+
+    new_job = PdfBatchService.start([2])
+
+    assert old_job not in pdf_batch_service._threads
+    assert PdfBatchService.get_status(old_job) is None
+    assert not (batch_dirs / "lotes" / old_job).exists()
+    assert PdfBatchService.get_status(new_job)["ids"] == [2]
+
+
+@pytest.mark.parametrize("ids", [[], "1,2", [1, "2"], [0], [True], list(range(1, 300))])
+def test_invalid_ids_are_rejected(batch_dirs, ids):
+    with pytest.raises(ValueError):
+        PdfBatchService.start(ids)
+
+
+def test_batch_endpoints(mocker, batch_dirs):
+    app = init_app()
+    app.config.update({"TESTING": True, "SECRET_KEY": "test_secret_key"})
+    client = app.test_client()
+
+    response = client.post('/exportar-pdf/lote', json={"ids": [1, 3]})
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    assert response.get_json()["estado_url"] == f"/exportar-pdf/lote/{job_id}"
+
+    PdfBatchService.wait(job_id, timeout=120)
+    progress = client.get(f'/exportar-pdf/lote/{job_id}').get_json()
+    assert progress["estado"] == "completado" and progress["completados"] == 2
+
+    download = client.get(f'/exportar-pdf/lote/{job_id}/zip')
+    assert download.status_code == 200
+    assert download.mimetype == "application/zip"
+    assert len(zipfile.ZipFile(io.BytesIO(download.data)).namelist()) == 2
+
+    assert client.post('/exportar-pdf/lote', json={"ids": []}).status_code == 400
+    assert client.get('/exportar-pdf/lote/../../etc').status_code == 404
+    assert client.get(f'/exportar-pdf/lote/{"0" * 32}').status_code == 404
+
+
+def test_download_before_finishing_returns_conflict(mocker, batch_dirs):
+    mocker.patch('app.services.pdf_batch_service.threading.Thread.start')  # El lote queda en cola
+    app = init_app()
+    app.config.update({"TESTING": True, "SECRET_KEY": "test_secret_key"})
+    client = app.test_client()
+
+    job_id = client.post('/exportar-pdf/lote', data={"ids": ["1", "2"]}).get_json()["job_id"]
+    response = client.get(f'/exportar-pdf/lote/{job_id}/zip')
+
+    assert response.status_code == 409
+    assert response.get_json()["estado"] == "en_cola"
@@ -0,0 +1,155 @@
+"""
+Tests para el Servicio de Reportes PDF (app/services/pdf_report_service.py).
+Verifican la maquetación por tramos, el envío en bloques y los estilos
+compartidos (con un benchmark de un reporte de 100 tablas).
+"""
+import pytest
+from reportlab.lib import colors
+from reportlab.platypus import Table, TableStyle
+
+from app import config
+from app.services import PdfReportService, pdf_report_service
+from app.services.pdf_report_service import ChunkedStory
+
+
+def _report(num_tableaus: int, size: int = 6) -> dict:
+    """Reporte falso con 'num_tableaus' tablas de size x size."""
+    headers = ["Base"] + [f"C{j}" for j in range(size)]
+    tableaus = []
+    for k in range(num_tableaus):
+        table = [headers] + [[f"F{i}"] + [round((i + 1) * (j + 1) / (k + 1), 4) for j in range(size)]
+                             for i in range(size)]
+        tableaus.append({"iteration": k, "title": f"Iteración {k}", "table": table,
+                         "pivot": (k % size, (k + 1) % size) if k else None})
+    return {
+        "problema_definicion": {
+            "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 1, "x2": 2}},
+            "restricciones": [{"coefficients": {"x1": 1, "x2": 1}, "operator": "<=", "rhs": 10}]
+        },
+        "solucion_encontrada": {
+            "status": "Solucion Factible",
+            "valores_variables": {"x1": 0.0, "x2": 10.0},
+            "valor_optimo_z": 20.0
+        },
+        "tablas_intermedias": tableaus
+    }
+
+
+def test_chunked_story_refills_from_generator():
+    story = ChunkedStory(iter(range(7)), chunk_size=3)
+    consumed = []
+    while len(story):
+        assert list.__len__(story) <= 3
+        consumed.append(story[0])
+        del story[0]
+    assert consumed == list(range(7))
+
+
+def test_layout_keeps_a_bounded_number_of_pending_flowables(mocker):
+    mocker.patch.object(config, 'PDF_STORY_CHUNK_SIZE', 5)
+    pending = []
+    original_len = ChunkedStory.__len__
+
+    def spy_len(self):
+        size = original_len(self)
+        pending.append(size)
+        return size
+
+    mocker.patch.object(ChunkedStory, '__len__', spy_len)
+    PdfReportService(_report(40)).render()
+
+    assert max(pending) <= 5
+    assert len(pending) > 40 * 3  # Todas las tablas pasaron por la story
+
+
+def test_stream_yields_pdf_in_chunks():
+    chunks = list(PdfReportService(_report(30)).stream(chunk_size=4096))
+
+    assert len(chunks) > 1
+    assert all(len(c) == 4096 for c in chunks[:-1])
+    pdf = b"".join(chunks)
+    assert pdf.startswith(b"%PDF")
+    assert pdf.rstrip().endswith(b"%%EOF")
+
+
+def test_generate_still_writes_to_disk(tmp_path):
+    path = tmp_path / "reporte.pdf"
+    assert PdfReportService(_report(3), str(path)).generate() == str(path)
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+def test_stream_raises_before_first_chunk_on_layout_error(mocker):
+    mocker.patch.object(PdfReportService, '_build_solution_section', side_effect=ValueError("boom"))
+    with pytest.raises(ValueError, match="boom"):
+        PdfReportService(_report(1)).stream()
+
+
+def test_problem_without_constraints_still_lists_types_and_bounds():
+    report = _report(0)
+    report["problema_definicion"].update({
+        "restricciones": [],
+        "tipos_variables": {"x1": "integer", "x2": "continuous"},
+        "cotas_variables": {"x2": {"lower": None, "upper": 3}},
+    })
+    service = PdfReportService(report)
+
+    service._build_problem_section(report["problema_definicion"])
+
+    texts = [flowable.text for flowable in service.story if hasattr(flowable, "text")]
+    assert "No se ingresaron restricciones." in texts
+    assert "<b>Variables enteras:</b> x1 (entera)" in texts
+    assert "-inf &lt;= x2 &lt;= 3" in texts
+
+
+def test_styles_are_shared_and_read_only():
+    first = PdfReportService(_report(1))
+    second = PdfReportService(_report(1))
+
+    assert first.styles is second.styles is pdf_report_service.STYLES
+    with pytest.raises(TypeError):
+        first.styles['PDFTitle'] = None
+
+
+def test_tableau_table_adds_only_the_pivot_highlight():
+    table_list = _report(2)["tablas_intermedias"][1]["table"]
+
+    plain = PdfReportService._tableau_table(table_list, None)
+    pivoted = PdfReportService._tableau_table(table_list, (1, 2))
+
+    base = len(pdf_report_service.TABLEAU_TABLE_STYLE.getCommands())
+    assert len(plain._bkgrndcmds) + len(plain._linecmds) <= base
+    assert len(pivoted._bkgrndcmds) == len(plain._bkgrndcmds) + 1
+    assert pivoted._bkgrndcmds[-1][1:3] == ((3, 2), (3, 2))
+    # El estilo compartido no se modifica al resaltar un pivote
+    assert len(pdf_report_service.TABLEAU_TABLE_STYLE.getCommands()) == base
+
+
+class _PerInstanceStylesService(PdfReportService):
+    """Comportamiento anterior: hoja de estilos y TableStyle completos por reporte/tabla."""
+
+    def __init__(self, report_data):
+        super().__init__(report_data)
+        self.styles = pdf_report_service._build_styles()
+
+    @staticmethod
+    def _tableau_table(table_list, pivot):
+        t = Table(table_list, hAlign='LEFT', repeatRows=1)
+        commands = list(pdf_report_service.TABLEAU_TABLE_STYLE.getCommands())
+        if pivot:
+            cell = (pivot[1] + 1, pivot[0] + 1)
+            commands += [('BACKGROUND', cell, cell, pdf_report_service.PIVOT_BACKGROUND),
+                         ('TEXTCOLOR', cell, cell, colors.red),
+                         ('FONTNAME', cell, cell, 'Courier-Bold')]
+        t.setStyle(TableStyle(commands))
+        return t
+
+
+@pytest.mark.benchmark(group="pdf-100-tablas")
+@pytest.mark.parametrize("service_class", [PdfReportService, _PerInstanceStylesService],
+                         ids=["estilos-compartidos", "estilos-por-instancia"])
+def test_benchmark_pdf_100_tableaus(benchmark, service_class):
+    report = _report(100, size=12)
+
+    buffer = benchmark.pedantic(lambda: service_class(report).render(), rounds=3, iterations=1)
+
+    assert buffer.getvalue().startswith(b"%PDF")
@@ -0,0 +1,151 @@
+"""
+Tests para el Presolve (app/core/presolve.py).
+Verifican cada reducción y que el postsolve devuelva los valores
+en el espacio original de variables.
+"""
+import pytest
+import numpy as np
+from scipy.optimize import OptimizeResult
+from app.core import Presolver
+from app.controllers.solver_controller import SolverController
+
+VARIABLES = ["x1", "x2", "x3"]
+OBJECTIVE_MAX = {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0, "x3": 1.0}}
+
+
+def _row(coeffs, op, rhs):
+    return {"coefficients": coeffs, "operator": op, "rhs": rhs}
+
+
+def test_empty_row_is_removed():
+    constraints = [
+        _row({"x1": 0.0, "x2": 0.0, "x3": 0.0}, "<=", 5.0),
+        _row({"x1": 1.0, "x2": 1.0, "x3": 1.0}, "<=", 10.0),
+    ]
+    result = Presolver.run(OBJECTIVE_MAX, constraints, VARIABLES)
+
+    assert not result.infeasible
+    assert result.row_map == [1]
+    assert result.removed_rows[0] == {"indice": 0, "motivo": "fila vacía"}
+
+
+def test_empty_row_infeasible():
+    constraints = [_row({"x1": 0.0}, ">=", 5.0)]
+    result = Presolver.run({"type": "maximize", "coefficients": {"x1": 1.0}}, constraints, ["x1"])
+    assert result.infeasible
+
+
+def test_singleton_row_becomes_bound_and_dominated_bound_is_dropped():
+    constraints = [
+        _row({"x1": 2.0, "x2": 0.0, "x3": 0.0}, "<=", 8.0),   # x1 <= 4
+        _row({"x1": 1.0, "x2": 0.0, "x3": 0.0}, "<=", 6.0),   # x1 <= 6 (dominada)
+        _row({"x1": 0.0, "x2": -1.0, "x3": 0.0}, "<=", 3.0),  # x2 >= -3 (dominada por x2 >= 0)
+        _row({"x1": 1.0, "x2": 1.0, "x3": 1.0}, "<=", 10.0),
+    ]
+    result = Presolver.run(OBJECTIVE_MAX, constraints, VARIABLES)
+
+    assert result.bounds["x1"] == (0, 4.0)
+    assert result.bounds["x2"] == (0, None)
+    motivos = [r["motivo"] for r in result.removed_rows]
+    assert motivos == ["fila singleton convertida en cota", "cota dominada", "cota dominada"]
+    assert result.row_map == [3]
+
+
+def test_equality_singleton_fixes_variable_and_postsolve_restores_it():
+    constraints = [
+        _row({"x1": 2.0, "x2": 0.0, "x3": 0.0}, "=", 4.0),  # x1 = 2
+        _row({"x1": 1.0, "x2": 1.0, "x3": 1.0}, "<=", 10.0),
+    ]
+    result = Presolver.run(OBJECTIVE_MAX, constraints, VARIABLES)
+
+    assert result.variables == ["x2", "x3"]
+    assert result.fixed_values == {"x1": 2.0}
+    # El aporte de x1 pasó al RHS
+    assert result.constraints_data == [_row({"x2": 1.0, "x3": 1.0}, "<=", 8.0)]
+    assert result.objective_offset == pytest.approx(6.0)
+    assert result.postsolve([8.0, 0.0]) == {"x1": 2.0, "x2": 8.0, "x3": 0.0}
+
+
+def test_duplicate_and_parallel_rows():
+    constraints = [
+        _row({"x1": 1.0, "x2": 1.0, "x3": 0.0}, "<=", 10.0),
+        _row({"x1": 2.0, "x2": 2.0, "x3": 0.0}, "<=", 20.0),  # duplicada (escalada)
+        _row({"x1": 1.0, "x2": 1.0, "x3": 0.0}, "<=", 8.0),   # paralela más ajustada
+        _row({"x1": 1.0, "x2": 0.0, "x3": 1.0}, "<=", 5.0),
+    ]
+    result = Presolver.run(OBJECTIVE_MAX, constraints, VARIABLES)
+
+    # Se conserva la paralela más ajustada (la fila 2), no la primera que apareció
+    assert result.row_map == [2, 3]
+    assert result.constraints_data[0]["rhs"] == pytest.approx(8.0)
+    assert result.removed_rows == [{"indice": 1, "motivo": "restricción duplicada"},
+                                   {"indice": 0, "motivo": "fila dominada por una paralela"}]
+
+
+def test_dual_of_a_tighter_parallel_row_goes_to_that_row():
+    problema = {
+        "problema_definicion": {
+            "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 1.0, "x2": 1.0}},
+            "restricciones": [
+                _row({"x1": 1.0, "x2": 1.0}, "<=", 10.0),
+                _row({"x1": 1.0, "x2": 1.0}, "<=", 5.0),  # la que limita
+                _row({"x1": 1.0, "x2": 2.0}, "<=", 8.0),
+            ]
+        }
+    }
+    report = SolverController(problema, persist=False, include_visualization=False).run()
+
+    solution = report['solucion_encontrada']
+    assert solution['valor_optimo_z'] == pytest.approx(5.0)
+    assert solution['precios_sombra'] == pytest.approx([0.0, 1.0, 0.0])
+
+
+def test_incompatible_equalities_are_infeasible():
+    constraints = [
+        _row({"x1": 1.0, "x2": 1.0}, "=", 10.0),
+        _row({"x1": 1.0, "x2": 1.0}, "=", 12.0),
+    ]
+    result = Presolver.run({"type": "minimize", "coefficients": {"x1": 1.0, "x2": 1.0}},
+                           constraints, ["x1", "x2"])
+    assert result.infeasible
+
+
+def test_row_redundant_by_bounds():
+    constraints = [
+        _row({"x1": 1.0, "x2": 0.0}, "<=", 4.0),
+        _row({"x1": 0.0, "x2": 1.0}, "<=", 6.0),
+        _row({"x1": 1.0, "x2": 1.0}, "<=", 100.0),  # 4 + 6 <= 100 siempre
+    ]
+    result = Presolver.run({"type": "maximize", "coefficients": {"x1": 1.0, "x2": 1.0}},
+                           constraints, ["x1", "x2"])
+    assert "fila redundante por cotas" in [r["motivo"] for r in result.removed_rows]
+    # Sin filas, ambas columnas quedan vacías y se fijan en su mejor cota
+    assert result.is_empty
+    assert result.postsolve([]) == {"x1": 4.0, "x2": 6.0}
+
+
+def test_run_reports_original_variable_space(mocker):
+    """El solver recibe el modelo reducido, pero el reporte usa todas las variables."""
+    problema = {
+        "problema_definicion": {
+            "funcion_objetivo": OBJECTIVE_MAX,
+            "restricciones": [
+                _row({"x1": 0.0, "x2": 0.0, "x3": 1.0}, "=", 2.0),  # x3 = 2
+                _row({"x1": 1.0, "x2": 1.0, "x3": 1.0}, "<=", 10.0),
+                _row({"x1": 1.0, "x2": 2.0, "x3": 0.0}, "<=", 12.0),
+            ]
+        }
+    }
+    mock_linprog = mocker.patch('app.services.solver_backends.linprog', return_value=OptimizeResult({
+        'fun': -32.0, 'success': True, 'x': np.array([4.0, 4.0]), 'message': 'Optimization successful.'
+    }))
+    mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
+
+    report = SolverController(problema).run()
+
+    c = mock_linprog.call_args[0][0]
+    np.testing.assert_array_equal(c, np.array([-3.0, -5.0]))
+    solution = report['solucion_encontrada']
+    assert solution['valores_variables'] == {"x1": 4.0, "x2": 4.0, "x3": 2.0}
+    assert solution['valor_optimo_z'] == pytest.approx(34.0)
+    assert report['diagnostico']['presolve']['variables_resultantes'] == 2
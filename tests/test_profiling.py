@@ -0,0 +1,118 @@
+"""
+Tests para el perfilado de una resolución (app/services/profiling_service.py).
+Cubren el perfil junto al reporte, el token de administrador en la web y
+que solo haya un perfil a la vez.
+"""
+import json
+
+import pytest
+
+from app import config
+from app.controllers.routers import init_app
+from app.controllers.solver_controller import SolverController
+from app.services import SolveProfiler
+
+TOKEN = "token-de-prueba"
+PROBLEMA = {"problema_definicion": {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}},
+    "restricciones": [{"coefficients": {"x1": 1.0, "x2": 2.0}, "operator": "<=", "rhs": 8.0}],
+}}
+
+
+@pytest.fixture
+def output_dir(mocker, tmp_path):
+    mocker.patch('app.services.storage_service.OUTPUT_DIR', str(tmp_path))
+    mocker.patch.object(config, 'PROFILING_DIR', str(tmp_path / "perfiles"))
+    mocker.patch.object(config, 'PROFILING_TOKEN', TOKEN)
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "sync")
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    app = init_app()
+    app.config.update({"TESTING": True, "SECRET_KEY": "test_secret_key"})
+    return app.test_client()
+
+
+def test_profile_is_saved_next_to_the_report(output_dir):
+    solver = SolverController(PROBLEMA, profile=True)
+    report = solver.run()
+
+    profile = report["perfil"]
+    assert profile["archivo"] == str(output_dir / "perfil_solucion_1.prof")
+    assert (output_dir / "perfil_solucion_1.prof").stat().st_size > 0
+    assert "Ordered by: internal time" in (output_dir / "perfil_solucion_1.txt").read_text()
+    assert 0 < len(profile["top"]) <= config.PROFILING_TOP_N
+    own_times = [row["tiempo_propio"] for row in profile["top"]]
+    assert own_times == sorted(own_times, reverse=True)
+    # El perfil se devuelve, pero no forma parte de solucion_N.json
+    saved = json.loads((output_dir / "solucion_1.json").read_text(encoding="utf-8"))
+    assert "perfil" not in saved
+
+
+def test_without_profile_nothing_is_written(output_dir):
+    solver = SolverController(PROBLEMA)
+    report = solver.run()
+
+    assert "perfil" not in report and solver.profile_info is None
+    assert list(output_dir.glob("perfil_*")) == []
+
+
+def test_unsaved_solution_goes_to_profiling_dir(output_dir):
+    solver = SolverController(PROBLEMA, persist=False, profile=True)
+    solver.run()
+
+    assert solver.profile_info["archivo"].startswith(str(output_dir / "perfiles"))
+
+
+def test_only_one_profile_at_a_time(output_dir):
+    with SolveProfiler._lock:
+        result, profiler = SolveProfiler.profile(lambda: 42)
+    assert (result, profiler) == (42, None)
+
+
+@pytest.mark.parametrize("configured, sent, expected", [
+    (TOKEN, TOKEN, True),
+    (TOKEN, "otro", False),
+    (TOKEN, None, False),
+    ("", "", False),
+])
+def test_is_authorized(mocker, configured, sent, expected):
+    mocker.patch.object(config, 'PROFILING_TOKEN', configured)
+    assert SolveProfiler.is_authorized(sent) is expected
+
+
+def test_api_profiles_only_with_admin_token(output_dir, client):
+    body = {"problema_definicion": PROBLEMA["problema_definicion"]}
+
+    response = client.post('/api/v1/solve', json=body, headers={"X-Simplex-Perfil": TOKEN})
+    assert response.status_code == 200
+    assert response.get_json()["perfil"]["top"]
+
+    for headers in ({}, {"X-Simplex-Perfil": "otro"}):
+        response = client.post('/api/v1/solve', json=body, headers=headers)
+        assert "perfil" not in response.get_json()
+
+
+def test_ui_shows_hotspot_summary(output_dir, client):
+    with client.session_transaction() as session:
+        session['problem_data_wrapper'] = PROBLEMA
+
+    response = client.post('/solve', data={"backend": "auto"}, headers={"X-Simplex-Perfil": TOKEN})
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "Perfil de la resolución" in html
+    assert "perfil_solucion_1.prof" in html
+
+
+def test_token_outside_the_header_is_ignored(output_dir, client):
+    """El token en la URL o el formulario quedaría en logs e historial: no perfila."""
+    with client.session_transaction() as session:
+        session['problem_data_wrapper'] = PROBLEMA
+
+    response = client.post(f'/solve?perfil={TOKEN}', data={"backend": "auto", "perfil": TOKEN})
+
+    assert response.status_code == 200
+    assert "Perfil de la resolución" not in response.get_data(as_text=True)
@@ -0,0 +1,122 @@
+"""
+Tests para el Escalado de filas y columnas (app/core/scaling.py).
+Incluye un benchmark de iteraciones (simple_simplex y HiGHS) con y sin escalado
+sobre modelos con coeficientes de órdenes muy distintos.
+"""
+import io
+import contextlib
+import math
+
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from app.core import ModelScaler
+from app.controllers.solver_controller import SolverController
+
+
+def _wide_problem(seed: int, num_vars: int = 6, num_constraints: int = 5):
+    """Problema de maximización factible con coeficientes entre ~1e-6 y ~1e5."""
+    rng = np.random.default_rng(seed)
+    variables = [f"x{i+1}" for i in range(num_vars)]
+    A = (rng.uniform(1, 10, (num_constraints, num_vars))
+         * 10.0 ** rng.integers(-4, 5, (num_constraints, 1))
+         * 10.0 ** rng.integers(-3, 4, (1, num_vars)))
+    c = rng.uniform(1, 10, num_vars) * 10.0 ** rng.integers(-3, 4, num_vars)
+    objective = {"type": "maximize", "coefficients": {v: float(x) for v, x in zip(variables, c)}}
+    constraints = [
+        {"coefficients": {v: float(a) for v, a in zip(variables, row)}, "operator": "<=", "rhs": float(row.sum())}
+        for row in A
+    ]
+    return objective, constraints, variables
+
+
+def _default_bounds(variables):
+    return {var: (0, None) for var in variables}
+
+
+def test_auto_mode_skips_well_conditioned_models():
+    objective = {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}}
+    constraints = [{"coefficients": {"x1": 3.0, "x2": 2.0}, "operator": "<=", "rhs": 18.0}]
+    result = ModelScaler.run(objective, constraints, ["x1", "x2"], _default_bounds(["x1", "x2"]))
+
+    assert not result.applied
+    assert result.constraints_data is constraints
+    assert result.col_factors == [1.0, 1.0]
+
+
+def test_scaling_reduces_range_with_power_of_two_factors():
+    objective, constraints, variables = _wide_problem(seed=3)
+    result = ModelScaler.run(objective, constraints, variables, _default_bounds(variables), mode="on")
+
+    summary = result.summary()
+    assert result.applied
+    assert summary["rango_despues"]["ratio"] < summary["rango_antes"]["ratio"] / 1000
+    for factor in result.row_factors + result.col_factors:
+        assert math.log2(factor) == int(math.log2(factor))
+
+
+def test_unscale_primal_and_duals_match_unscaled_solve():
+    objective, constraints, variables = _wide_problem(seed=7)
+    scaled = ModelScaler.run(objective, constraints, variables, _default_bounds(variables), mode="on")
+
+    def solve(obj, cons):
+        c = [-obj["coefficients"][v] for v in variables]
+        A = [[row["coefficients"][v] for v in variables] for row in cons]
+        b = [row["rhs"] for row in cons]
+        return linprog(c, A_ub=A, b_ub=b, bounds=[(0, None)] * len(variables), method='highs-ds')
+
+    original = solve(objective, constraints)
+    result = solve(scaled.objective_data, scaled.constraints_data)
+
+    assert result.fun == pytest.approx(original.fun, rel=1e-7)
+    np.testing.assert_allclose(scaled.unscale_primal(result.x), original.x, rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(scaled.unscale_row_duals(result.ineqlin.marginals),
+                               original.ineqlin.marginals, rtol=1e-6, atol=1e-9)
+
+
+def test_run_reports_scaling_diagnostics(mocker):
+    objective, constraints, variables = _wide_problem(seed=11)
+    mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
+    mocker.patch('app.config.SCALING_MODE', "on")
+
+    report = SolverController({"problema_definicion": {
+        "funcion_objetivo": objective, "restricciones": constraints}}).run()
+
+    diagnostico = report['diagnostico']['escalado']
+    assert diagnostico['aplicado'] is True
+    assert diagnostico['rango_despues']['ratio'] < diagnostico['rango_antes']['ratio']
+    # Precios sombra reportados en las unidades del problema original
+    assert len(report['solucion_encontrada']['precios_sombra']) == len(constraints)
+
+
+def test_benchmark_iteraciones_con_y_sin_escalado():
+    """
+    Benchmark: cantidad de pivoteos de simple_simplex e iteraciones de HiGHS
+    con y sin escalado, sobre varias semillas de modelos "anchos".
+    """
+    controller = SolverController({})
+    rows = []
+    for seed in range(5):
+        objective, constraints, variables = _wide_problem(seed=seed, num_vars=8, num_constraints=6)
+        scaled = ModelScaler.run(objective, constraints, variables, _default_bounds(variables), mode="on")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            plain = controller._run_simple_simplex(objective, constraints, variables)
+            equilibrated = controller._run_simple_simplex(scaled.objective_data, scaled.constraints_data, variables)
+
+        def highs_nit(obj, cons):
+            c = [-obj["coefficients"][v] for v in variables]
+            A = [[row["coefficients"][v] for v in variables] for row in cons]
+            b = [row["rhs"] for row in cons]
+            return linprog(c, A_ub=A, b_ub=b, method='highs-ds', options={"presolve": False}).nit
+
+        rows.append((seed, plain["numSteps"], equilibrated["numSteps"],
+                     highs_nit(objective, constraints), highs_nit(scaled.objective_data, scaled.constraints_data)))
+
+        assert equilibrated["optimalValue"] == pytest.approx(plain["optimalValue"], rel=1e-6)
+
+    print("\nIteraciones con y sin escalado:")
+    print("   semilla | tablas sin | tablas con | highs sin | highs con")
+    for seed, t_plain, t_scaled, h_plain, h_scaled in rows:
+        print(f"   {seed:7d} | {t_plain:10d} | {t_scaled:10d} | {h_plain:9d} | {h_scaled:9d}")
@@ -0,0 +1,183 @@
+"""
+Tests para la persistencia de soluciones (app/services/solution_writer.py).
+Cubren los modos "off", "sync" y "write-behind", la cola acotada y las
+métricas de profundidad.
+"""
+import json
+import logging
+import os
+import threading
+
+import pytest
+
+from app import config
+from app.controllers.solver_controller import SolverController
+from app.services import SolutionWriter, StorageService
+
+PROBLEMA = {"problema_definicion": {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}},
+    "restricciones": [{"coefficients": {"x1": 1.0, "x2": 1.0}, "operator": "<=", "rhs": 4.0}],
+}}
+
+
+@pytest.fixture
+def output_dir(mocker, tmp_path):
+    mocker.patch('app.services.storage_service.OUTPUT_DIR', str(tmp_path))
+    yield tmp_path
+    SolutionWriter.shutdown()
+
+
+def test_sync_mode_writes_before_returning(mocker, output_dir):
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "sync")
+    save = mocker.spy(StorageService, 'save_solution')
+
+    solver = SolverController(PROBLEMA)
+    solver.run()
+
+    save.assert_called_once()
+    assert solver.solution_id == 1
+    assert (output_dir / "solucion_1.json").exists()
+
+
+def test_off_mode_skips_the_disk(mocker, output_dir, caplog):
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "off")
+    caplog.set_level(logging.INFO, logger="app")
+
+    solver = SolverController(PROBLEMA)
+    report = solver.run()
+
+    assert report['solucion_encontrada']['status'] == "Solucion Factible"
+    assert solver.solution_id is None
+    assert list(output_dir.iterdir()) == []
+    assert "Reporte de solución guardado en" not in caplog.text
+
+
+def test_write_behind_batches_writes_and_reads_pending_reports(mocker, output_dir):
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "write-behind")
+    mocker.patch.object(config, 'PERSISTENCE_BATCH_WAIT', 0.3)
+    before = SolutionWriter.metrics()
+
+    filenames = [SolutionWriter.save({"solucion_encontrada": {"n": n}, "tablas_intermedias": [n]})
+                 for n in range(3)]
+
+    assert [StorageService.solution_id_from_path(f) for f in filenames] == [1, 2, 3]
+    # Las lecturas de este proceso ven los reportes aunque no estén en disco todavía
+    assert StorageService.load_solution_by_id(2)["solucion_encontrada"] == {"n": 1}
+    assert StorageService.load_solution_tableaus(3) == (2,)
+    assert StorageService.get_latest_solution_id() == 3
+
+    assert SolutionWriter.flush(timeout=10)
+    after = SolutionWriter.metrics()
+    assert json.loads((output_dir / "solucion_3.json").read_text(encoding="utf-8"))["tablas_intermedias"] == [2]
+    assert after["escritos"] - before["escritos"] == 3
+    assert after["lotes"] - before["lotes"] == 1  # Un solo lote (y un solo fsync del directorio)
+    assert after["fsyncs"] - before["fsyncs"] == 4
+    assert after["profundidad_cola"] == 0
+    assert list(output_dir.glob("*.tmp")) == []
+
+
+def test_write_behind_reservations_are_unique_across_workers(mocker, output_dir):
+    """Dos workers no comparten '_pending': la reserva en disco evita que tomen el mismo número."""
+    first = StorageService.reserve_solution_filename({"worker": 1})
+    mocker.patch('app.services.storage_service._pending', {})  # Otro proceso
+    second = StorageService.reserve_solution_filename({"worker": 2})
+
+    assert first != second
+    # El otro worker ve la reserva vacía como una solución que todavía no existe
+    with pytest.raises(FileNotFoundError):
+        StorageService.load_solution_by_id(1)
+
+    SolutionWriter._write_batch([(second, {"worker": 2})])
+    SolutionWriter._write_batch([(first, {"worker": 1})])
+    assert StorageService.load_solution_by_id(1) == {"worker": 1}
+    assert StorageService.load_solution_by_id(2) == {"worker": 2}
+
+
+def test_failed_rename_is_counted_and_does_not_stop_the_batch(mocker, output_dir):
+    first = StorageService.reserve_solution_filename({"n": 1})
+    second = StorageService.reserve_solution_filename({"n": 2})
+    real_replace = os.replace
+
+    def replace(src, dst):
+        if dst == first:
+            raise OSError("disco lleno")
+        real_replace(src, dst)
+
+    mocker.patch('app.services.solution_writer.os.replace', side_effect=replace)
+    before = SolutionWriter.metrics()
+
+    SolutionWriter._write_batch([(first, {"n": 1}), (second, {"n": 2})])
+
+    after = SolutionWriter.metrics()
+    assert after["escritos"] - before["escritos"] == 1
+    assert after["errores"] - before["errores"] == 1
+    assert StorageService.load_solution_by_id(2) == {"n": 2}
+    with pytest.raises(FileNotFoundError):  # Ya no se lee de memoria: queda la reserva vacía
+        StorageService.load_solution_by_id(1)
+    assert list(output_dir.glob("*.tmp")) == []
+
+
+def test_shutdown_during_save_does_not_drop_the_report(mocker, output_dir):
+    """Un shutdown() entre la reserva y el encolado no deja el reporte en una cola sin hilo."""
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "write-behind")
+    SolutionWriter.save({"n": 0})  # El hilo ya existe
+    original_reserve = StorageService.reserve_solution_filename
+
+    def reserve_then_shutdown(report_data):
+        filename = original_reserve(report_data)
+        SolutionWriter.shutdown()
+        return filename
+
+    mocker.patch.object(StorageService, 'reserve_solution_filename', side_effect=reserve_then_shutdown)
+    filename = SolutionWriter.save({"n": 1})
+
+    assert SolutionWriter.flush(timeout=10)
+    assert json.loads(open(filename, encoding="utf-8").read()) == {"n": 1}
+
+
+def test_full_queue_falls_back_to_a_synchronous_write(mocker, output_dir):
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "write-behind")
+    mocker.patch.object(config, 'PERSISTENCE_QUEUE_SIZE', 1)
+    mocker.patch.object(config, 'PERSISTENCE_BATCH_WAIT', 0)
+    release = threading.Event()
+    picked_up = threading.Event()
+    original_write = SolutionWriter._write_batch
+
+    def slow_worker_write(batch):
+        if threading.current_thread().name == "solution-writer":
+            picked_up.set()
+            release.wait(10)
+        original_write(batch)
+
+    mocker.patch.object(SolutionWriter, '_write_batch', side_effect=slow_worker_write)
+    before = SolutionWriter.metrics()["sincronos_por_cola_llena"]
+
+    SolutionWriter.save({"n": 0})
+    assert picked_up.wait(10)          # El hilo tomó el primero y quedó ocupado
+    SolutionWriter.save({"n": 1})      # Ocupa el único lugar de la cola
+    SolutionWriter.save({"n": 2})      # Cola llena: se escribe en el momento
+
+    assert (output_dir / "solucion_3.json").exists()
+    metrics = SolutionWriter.metrics()
+    assert metrics["sincronos_por_cola_llena"] == before + 1
+    assert metrics["profundidad_cola"] == 1 and metrics["capacidad_cola"] == 1
+
+    release.set()
+    assert SolutionWriter.flush(timeout=10)
+    assert sorted(p.name for p in output_dir.iterdir()) == ["solucion_1.json", "solucion_2.json", "solucion_3.json"]
+
+
+def test_invalid_mode_is_rejected(mocker):
+    mocker.patch.object(config, 'PERSISTENCE_MODE', "async")
+    with pytest.raises(ValueError, match="PERSISTENCE_MODE"):
+        SolutionWriter.save({})
+
+
+def test_metrics_endpoint(mocker):
+    from app.controllers.routers import init_app
+    client = init_app().test_client()
+
+    data = client.get('/api/v1/metricas/persistencia').get_json()
+
+    assert data["modo"] == config.PERSISTENCE_MODE
+    assert {"profundidad_cola", "capacidad_cola", "max_profundidad", "escritos", "errores"} <= set(data)
@@ -0,0 +1,188 @@
+"""
+Tests para el presupuesto de tiempo e iteraciones de cada resolución
+(app/core/budget.py): el corte de simple_simplex, las opciones de HiGHS,
+la visualización parcial y la cancelación en el pool de procesos.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import config
+from app.core import BudgetExceeded, SolveBudget
+from app.controllers.solver_controller import SolverController
+from app.services import SolveExecutor, SolverBackendRegistry, SolverModel
+from app.services.solver_backends import run_simple_simplex
+
+# x1 + x2 >= 5 y x1 + x2 <= 3: simple_simplex pivotea para siempre
+OBJECTIVE = {"type": "maximize", "coefficients": {"x1": 1.0, "x2": 2.0}}
+INFEASIBLE = [
+    {"coefficients": {"x1": 1.0, "x2": 1.0}, "operator": ">=", "rhs": 5.0},
+    {"coefficients": {"x1": 1.0, "x2": 1.0}, "operator": "<=", "rhs": 3.0},
+    {"coefficients": {"x1": 1.0, "x2": 3.0}, "operator": "<=", "rhs": 9.0},
+]
+
+# max 3x1 + 5x2  s.a.  x1 <= 4,  2x2 <= 12,  3x1 + 2x2 <= 18  ->  Z = 36 (2 pivoteos)
+PROBLEMA = {"problema_definicion": {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}},
+    "restricciones": [
+        {"coefficients": {"x1": 1.0, "x2": 0.0}, "operator": "<=", "rhs": 4.0},
+        {"coefficients": {"x1": 0.0, "x2": 2.0}, "operator": "<=", "rhs": 12.0},
+        {"coefficients": {"x1": 3.0, "x2": 2.0}, "operator": "<=", "rhs": 18.0},
+    ],
+}}
+
+
+def test_budget_checks_time_and_iterations():
+    now = [0.0]
+    budget = SolveBudget(time_limit=2.0, iteration_limit=5, clock=lambda: now[0])
+
+    budget.check("solve", iterations=4)
+    with pytest.raises(BudgetExceeded) as exceeded:
+        budget.check("solve", iterations=5)
+    assert exceeded.value.reason == "iteraciones"
+
+    now[0] = 2.5
+    assert budget.remaining() == 0 and budget.expired()
+    with pytest.raises(BudgetExceeded) as exceeded:
+        budget.check("gilp")
+    assert (exceeded.value.stage, exceeded.value.reason) == ("gilp", "tiempo")
+
+    budget.record("simple_simplex", "tiempo")
+    budget.record("gilp", "tiempo")
+    assert budget.summary()["agotado"] == {"etapa": "simple_simplex", "motivo": "tiempo"}
+
+
+def test_cycling_simple_simplex_stops_with_its_pivot_steps():
+    variables = ["x1", "x2"]
+    with pytest.raises(BudgetExceeded) as exceeded:
+        run_simple_simplex(OBJECTIVE, INFEASIBLE, variables, budget=SolveBudget(iteration_limit=30))
+    assert exceeded.value.iterations == 30
+    assert len(exceeded.value.partial["pivotSteps"]) == 31  # Tabla inicial + 30 pivoteos
+
+    start = time.perf_counter()
+    with pytest.raises(BudgetExceeded) as exceeded:
+        run_simple_simplex(OBJECTIVE, INFEASIBLE, variables, budget=SolveBudget(time_limit=0.2))
+    assert exceeded.value.reason == "tiempo" and time.perf_counter() - start < 5
+
+
+def test_tableau_backend_reports_the_limit(mocker):
+    mocker.patch.object(config, 'SOLVE_ITERATION_LIMIT', 40)
+    problem = {"problema_definicion": {"funcion_objetivo": OBJECTIVE, "restricciones": INFEASIBLE}}
+
+    report = SolverController(problem, backend="tableau", persist=False).run()
+
+    assert report["solucion_encontrada"]["status"] == "Limite Alcanzado"
+    assert "40 pivoteos" in report["solucion_encontrada"]["mensaje_solver"]
+    budget = report["diagnostico"]["presupuesto"]
+    assert budget["agotado"] == {"etapa": "solve", "motivo": "iteraciones"}
+    assert budget["limite_iteraciones"] == 40 and budget["limite_tiempo_segundos"] == config.SOLVE_TIME_LIMIT
+
+
+def test_highs_gets_the_remaining_time_and_iteration_cap():
+    model = SolverModel(PROBLEMA["problema_definicion"]["funcion_objetivo"],
+                        PROBLEMA["problema_definicion"]["restricciones"], ["x1", "x2"])
+    budget = SolveBudget(time_limit=5.0, iteration_limit=100)
+
+    _, info = SolverBackendRegistry.solve(model, backend="highs-ds", options={"time_limit": 60}, budget=budget)
+    assert 0 < info["opciones"]["time_limit"] <= 5.0 and info["opciones"]["maxiter"] == 100
+
+    # Sin tiempo, el backend ni se ejecuta
+    result, _ = SolverBackendRegistry.solve(model, backend="highs-ds", budget=SolveBudget(time_limit=0.0))
+    assert not result.success and result.status == 1
+
+
+def test_visualization_keeps_the_tables_done_before_the_limit(mocker):
+    visual = mocker.patch('app.controllers.solver_controller.simplex_visual', side_effect=RuntimeError("sin gilp"))
+    solver = SolverController(PROBLEMA, persist=False)
+    definition = PROBLEMA["problema_definicion"]
+    budget = SolveBudget(iteration_limit=1)
+
+    html, tables = solver._generate_visualization_html_and_tables(
+        definition["funcion_objetivo"], definition["restricciones"], ["x1", "x2"], budget=budget)
+
+    assert "Visualización interrumpida" in html and len(tables) == 2
+    assert budget.exceeded == {"etapa": "simple_simplex", "motivo": "iteraciones"}
+    assert visual.call_args.kwargs["iteration_limit"] == 1
+
+    # Sin tiempo, gilp no se ejecuta
+    visual.reset_mock()
+    budget = SolveBudget(time_limit=0.0)
+    solver._generate_visualization_html_and_tables(
+        definition["funcion_objetivo"], definition["restricciones"], ["x1", "x2"], budget=budget)
+    visual.assert_not_called()
+    assert budget.exceeded["etapa"] == "simple_simplex"
+
+
+def test_solution_within_budget_reports_it_unexhausted(mocker):
+    mocker.patch.object(config, 'METRICS_ENABLED', False)
+    report = SolverController(PROBLEMA, persist=False, solver_options={"time_limit": 30}).run()
+
+    assert report["solucion_encontrada"]["valor_optimo_z"] == pytest.approx(36.0)
+    budget = report["diagnostico"]["presupuesto"]
+    assert budget["agotado"] is None and budget["limite_tiempo_segundos"] == 30.0
+    assert 0 < budget["tiempo_segundos"] < 30
+
+
+def _hang():
+    time.sleep(60)
+
+
+def _pid():
+    return os.getpid()
+
+
+def _slow_pid(started_file):
+    with open(started_file, "w"):
+        pass
+    time.sleep(3)
+    return os.getpid()
+
+
+@pytest.mark.timeout(120)
+def test_pool_solve_past_its_deadline_is_cancelled(mocker, tmp_path):
+    mocker.patch('app.services.storage_service.OUTPUT_DIR', str(tmp_path))
+    mocker.patch.object(config, 'SOLVE_EXECUTOR', "process")
+    mocker.patch.object(config, 'SOLVE_EXECUTOR_MAX_WORKERS', 1)
+    mocker.patch.object(config, 'METRICS_ENABLED', False)
+    try:
+        start = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            SolveExecutor.call(_hang, timeout=1.0)
+        assert time.perf_counter() - start < 30
+        # El proceso se reemplaza
+        assert SolveExecutor.call(_pid) is not None
+
+        # Para el controlador, un reporte sin solución que indica la cancelación
+        mocker.patch.object(SolveExecutor, "call", side_effect=TimeoutError())
+        solver = SolverController(PROBLEMA, solver_options={"time_limit": 2})
+        report = solver.run()
+        assert report["solucion_encontrada"]["status"] == "Limite Alcanzado"
+        assert report["diagnostico"]["presupuesto"]["agotado"] == {"etapa": "cancelada", "motivo": "tiempo"}
+        assert solver.outcome[0] == "Limite Alcanzado" and solver.solution_id == 1
+    finally:
+        SolveExecutor.shutdown()
+
+
+@pytest.mark.timeout(120)
+def test_cancelling_a_solve_does_not_affect_the_others_in_the_pool(mocker, tmp_path):
+    mocker.patch('app.services.storage_service.OUTPUT_DIR', str(tmp_path))
+    mocker.patch.object(config, 'SOLVE_EXECUTOR', "process")
+    mocker.patch.object(config, 'SOLVE_EXECUTOR_MAX_WORKERS', 2)
+    mocker.patch.object(config, 'METRICS_ENABLED', False)
+    started = tmp_path / "empezo"
+    try:
+        assert SolveExecutor.warm_up() == 2
+        with ThreadPoolExecutor(max_workers=1) as threads:
+            other = threads.submit(SolveExecutor.call, _slow_pid, str(started), timeout=60)
+            while not started.exists():
+                time.sleep(0.05)
+            # Se cancela mientras la otra tarea sigue en su proceso
+            with pytest.raises(TimeoutError):
+                SolveExecutor.call(_hang, timeout=0.5)
+            assert other.result() != os.getpid()
+        assert SolveExecutor.call(_pid) is not None
+    finally:
+        SolveExecutor.shutdown()
+
@@ -0,0 +1,117 @@
+"""
+Tests para la ejecución de las resoluciones en un pool de procesos
+(SolveExecutor, SOLVE_EXECUTOR = "process") y para el guardado
+concurrente desde varios hilos.
+"""
+import logging
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app import config
+from app.controllers.solver_controller import SolverController
+from app.services import SolveExecutor, StorageService
+
+# max 3x1 + 5x2  s.a.  x1 <= 4,  2x2 <= 12,  3x1 + 2x2 <= 18  ->  Z = 36
+PROBLEMA = {"problema_definicion": {
+    "funcion_objetivo": {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}},
+    "restricciones": [
+        {"coefficients": {"x1": 1.0, "x2": 0.0}, "operator": "<=", "rhs": 4.0},
+        {"coefficients": {"x1": 0.0, "x2": 2.0}, "operator": "<=", "rhs": 12.0},
+        {"coefficients": {"x1": 3.0, "x2": 2.0}, "operator": "<=", "rhs": 18.0},
+    ],
+}}
+
+
+@pytest.fixture
+def process_executor(mocker, tmp_path):
+    mocker.patch('app.services.storage_service.OUTPUT_DIR', str(tmp_path))
+    mocker.patch.object(config, 'SOLVE_EXECUTOR', "process")
+    mocker.patch.object(config, 'SOLVE_EXECUTOR_MAX_WORKERS', 1)
+    mocker.patch.object(config, 'METRICS_ENABLED', False)
+    yield tmp_path
+    SolveExecutor.shutdown()
+
+
+def _pid_of_solver():
+    return os.getpid()
+
+
+def _crash():
+    os._exit(1)
+
+
+@pytest.mark.timeout(120)
+def test_solve_runs_in_another_process_and_is_saved_here(process_executor, caplog):
+    assert SolveExecutor.call(_pid_of_solver) != os.getpid()
+
+    solver = SolverController(PROBLEMA)
+    with caplog.at_level(logging.INFO, logger="app"):
+        report = solver.run()
+
+    assert report["solucion_encontrada"]["valor_optimo_z"] == pytest.approx(36.0)
+    assert report["tablas_intermedias"]
+    # El reporte se guarda en el proceso web, con su número y el tiempo de guardado
+    assert solver.solution_id == 1 and os.path.exists(process_executor / "solucion_1.json")
+    record = next(r for r in caplog.records if r.getMessage().startswith("Resolución:"))
+    assert record.solve["estado"] == "Solucion Factible"
+    assert record.solve["tiempos_ms"]["solve"] > 0 and record.solve["tiempos_ms"]["persist"] > 0
+
+
+@pytest.mark.timeout(120)
+def test_broken_pool_is_replaced(process_executor, mocker):
+    with pytest.raises(BrokenProcessPool):
+        SolveExecutor.call(_crash)
+    # El siguiente pedido usa un proceso nuevo
+    assert SolveExecutor.call(_pid_of_solver) != os.getpid()
+
+    # Para el controlador, un pool roto es una resolución fallida (None, que la UI informa)
+    mocker.patch.object(SolveExecutor, "call", side_effect=BrokenProcessPool("murió"))
+    solver = SolverController(PROBLEMA)
+    assert solver.run() is None
+    assert solver.outcome[0] == "Error" and solver.solution_id is None
+
+
+def test_inline_mode_never_starts_a_pool(mocker):
+    mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
+    spy = mocker.spy(SolveExecutor, "call")
+
+    assert SolverController(PROBLEMA, persist=False).run()["solucion_encontrada"]["status"] == "Solucion Factible"
+    assert SolveExecutor.warm_up() == 0
+    spy.assert_not_called()
+
+
+def test_fork_start_method_only_without_threads(mocker):
+    mocker.patch.object(config, 'SOLVE_EXECUTOR_START_METHOD', "fork")
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        # Con otros hilos corriendo, un fork no es seguro: el pool usa spawn
+        assert SolveExecutor._context().get_start_method() == "spawn"
+    finally:
+        stop.set()
+        thread.join()
+
+    if threading.active_count() == 1:
+        assert SolveExecutor._context().get_start_method() == "fork"
+
+
+def test_concurrent_saves_get_distinct_files(mocker, tmp_path):
+    mocker.patch('app.services.storage_service.OUTPUT_DIR', str(tmp_path))
+    names, barrier = [], threading.Barrier(8)
+
+    def save(i):
+        barrier.wait()
+        names.append(StorageService.save_solution({"n": i}))
+
+    threads = [threading.Thread(target=save, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(names)) == 8
+    assert sorted(os.listdir(tmp_path)) == sorted(f"solucion_{i}.json" for i in range(1, 9))
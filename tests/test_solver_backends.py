@@ -0,0 +1,107 @@
+"""
+Tests para el registro de Backends de resolución (app/services/solver_backends.py).
+"""
+import pytest
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from app import config
+from app.services import SolverBackendRegistry, SolverModel
+from app.controllers.solver_controller import SolverController
+
+OBJECTIVE_MAX = {"type": "maximize", "coefficients": {"x1": 3.0, "x2": 5.0}}
+CONSTRAINTS_MAX = [
+    {"coefficients": {"x1": 3.0, "x2": 2.0}, "operator": "<=", "rhs": 18.0},
+    {"coefficients": {"x1": 1.0, "x2": 1.0}, "operator": ">=", "rhs": 1.0},
+]
+BOUNDS_MAX = [(0, 4.0), (0, 6.0)]
+
+
+def _model():
+    return SolverModel(OBJECTIVE_MAX, CONSTRAINTS_MAX, ["x1", "x2"], BOUNDS_MAX)
+
+
+def test_registry_lists_highs_and_tableau_backends():
+    names = SolverBackendRegistry.names()
+    for expected in ("highs-ds", "highs-ipm", "highs", "tableau"):
+        assert expected in names
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError, match="Backend de resolución desconocido"):
+        SolverBackendRegistry.get("simplex-magico")
+
+
+@pytest.mark.parametrize("nonzeros, density, expected", [
+    (10, 1.0, "highs-ds"),
+    (100_000, 0.01, "highs-ipm"),
+    (100_000, 0.5, "highs"),
+])
+def test_auto_selection_by_size_and_density(mocker, nonzeros, density, expected):
+    mocker.patch.object(SolverModel, 'nonzeros', new_callable=mocker.PropertyMock, return_value=nonzeros)
+    mocker.patch.object(SolverModel, 'density', new_callable=mocker.PropertyMock, return_value=density)
+    assert SolverBackendRegistry.select(_model()) == expected
+
+
+@pytest.mark.parametrize("backend", ["highs-ds", "highs-ipm", "highs", "tableau"])
+def test_every_backend_reaches_the_same_optimum(backend):
+    result, info = SolverBackendRegistry.solve(_model(), backend=backend)
+
+    assert result.success
+    np.testing.assert_allclose(result.x, [2.0, 6.0], atol=1e-6)
+    assert -result.fun == pytest.approx(36.0)
+    assert info["backend"] == backend
+    assert info["seleccion"] == "solicitada"
+    assert info["tiempo_segundos"] >= 0
+
+
+def test_options_are_filtered_per_backend(mocker):
+    mock_linprog = mocker.patch('app.services.solver_backends.linprog',
+                                return_value=OptimizeResult({'success': True}))
+    _, info = SolverBackendRegistry.solve(
+        _model(), backend="highs-ipm",
+        options={"time_limit": 3, "ipm_optimality_tolerance": 1e-9, "threads": 4}
+    )
+
+    options = mock_linprog.call_args.kwargs["options"]
+    assert options == {"presolve": True, "time_limit": 3, "ipm_optimality_tolerance": 1e-9}
+    assert mock_linprog.call_args.kwargs["method"] == "highs-ipm"
+    # linprog no expone la cantidad de hilos de HiGHS: queda informada como ignorada
+    assert info["opciones_ignoradas"] == ["threads"]
+
+
+def test_tableau_backend_handles_equalities():
+    constraints = [
+        {"coefficients": {"x1": 1.0, "x2": 1.0}, "operator": "=", "rhs": 10.0},
+        {"coefficients": {"x1": 2.0, "x2": 1.0}, "operator": "<=", "rhs": 15.0},
+    ]
+    model = SolverModel({"type": "maximize", "coefficients": {"x1": 1.0, "x2": 2.0}}, constraints, ["x1", "x2"])
+    result, _ = SolverBackendRegistry.solve(model, backend="tableau")
+
+    assert result.success
+    assert -result.fun == pytest.approx(20.0)
+    assert "pivotSteps" in result.simplex_json
+
+
+def test_controller_reuses_tableau_history_for_visualization(mocker):
+    mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
+    spy = mocker.spy(SolverController, '_run_simple_simplex')
+
+    controller = SolverController(
+        {"problema_definicion": {"funcion_objetivo": OBJECTIVE_MAX, "restricciones": CONSTRAINTS_MAX}},
+        backend="tableau"
+    )
+    report = controller.run()
+
+    assert report['solucion_encontrada']['valor_optimo_z'] == pytest.approx(
+        max(3 * x1 + 5 * x2 for x1, x2 in [(0, 9), (6, 0), (0, 0)]))
+    assert report['diagnostico']['backend']['backend'] == "tableau"
+    assert report['tablas_intermedias']
+    spy.assert_not_called()
+
+
+def test_default_backend_comes_from_config(mocker):
+    mocker.patch.object(config, 'SOLVER_DEFAULT_BACKEND', "highs")
+    _, info = SolverBackendRegistry.solve(_model())
+    assert info["backend"] == "highs"
+    assert info["seleccion"] == "solicitada"
@@ -5,6 +5,8 @@ Estos tests usan 'mocker' para simular:
 2. El guardado del reporte (StorageService.save_solution)
 """
 
+import logging
+
 import pytest
 import numpy as np
 from scipy.optimize import OptimizeResult
@@ -103,11 +105,11 @@ def test_prepare_model_for_scipy_minimize():
     np.testing.assert_array_equal(A_ub, expected_A_ub)
 
 
-def test_run_success_maximize(mocker, capsys):
+def test_run_success_maximize(mocker, caplog):
     """
     Testea el flujo 'run' completo para MAXIMIZAR.
     Verifica:
-    1. El 'print' en consola.
+    1. Los mensajes del log.
     2. Que se llame a 'save_solution' con el reporte correcto.
     3. Que 'run' devuelva el reporte correcto.
     """
@@ -120,18 +122,18 @@ def test_run_success_maximize(mocker, capsys):
     }
     
     # 2. Mockear Cálculo (Scipy.linprog)
-    mocker.patch('app.controllers.solver_controller.linprog', return_value=MOCK_SCIPY_RESULT_MAX)
+    mocker.patch('app.services.solver_backends.linprog', return_value=MOCK_SCIPY_RESULT_MAX)
     
     # 3. Mockear ESCRITURA (StorageService)
     mock_save = mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
     
     # 4. Ejecutar (pasando datos al constructor) y CAPTURAR RETURN
+    caplog.set_level(logging.DEBUG, logger="app")
     controller = SolverController(problema_completo)
     final_report = controller.run()
     
-    # 5. Verificar el print
-    captured = capsys.readouterr()
-    output = captured.out
+    # 5. Verificar el log
+    output = caplog.text
     
     assert "¡Se encontró una solución factible!" in output
     assert "x1 = 388.8889" in output 
@@ -151,7 +153,7 @@ def test_run_success_maximize(mocker, capsys):
         assert report['solucion_encontrada']['valor_optimo_z'] == pytest.approx(9833.333333)
         assert report['solucion_encontrada']['valores_variables']['x1'] == pytest.approx(388.888888)
 
-def test_run_success_minimize(mocker, capsys):
+def test_run_success_minimize(mocker, caplog):
     """Testea el flujo 'run' completo para MINIMIZAR y verifica el guardado."""
     # 1. Mocks de Lectura 
     problema_completo_min = {
@@ -162,18 +164,18 @@ def test_run_success_minimize(mocker, capsys):
     }
     
     # 2. Mock de Cálculo
-    mocker.patch('app.controllers.solver_controller.linprog', return_value=MOCK_SCIPY_RESULT_MIN)
+    mocker.patch('app.services.solver_backends.linprog', return_value=MOCK_SCIPY_RESULT_MIN)
     
     # 3. Mock de Escritura
     mock_save = mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
     
     # 4. Ejecutar y CAPTURAR RETURN
+    caplog.set_level(logging.INFO, logger="app")
     controller = SolverController(problema_completo_min)
     final_report = controller.run()
     
-    # 5. Verificar Print
-    captured = capsys.readouterr()
-    output = captured.out
+    # 5. Verificar el log
+    output = caplog.text
     assert "Z = 108.6957" in output
     
     # 6. Verificar Guardado y Return
@@ -186,8 +188,8 @@ def test_run_success_minimize(mocker, capsys):
         assert report['solucion_encontrada']['status'] == "Solucion Factible"
         assert report['solucion_encontrada']['valor_optimo_z'] == pytest.approx(108.695652)
 
-def test_run_infeasible(mocker, capsys):
-    """Testea el 'print' y el 'guardado' cuando no hay solución."""
+def test_run_infeasible(mocker, caplog):
+    """Testea el log y el 'guardado' cuando no hay solución."""
     # 1. Datos
     problema_completo = {
         "problema_definicion": {
@@ -198,19 +200,19 @@ def test_run_infeasible(mocker, capsys):
     
     # 2. Mock de Cálculo (para que falle)
     mock_fail_result = OptimizeResult({'success': False, 'status': 2, 'message': 'Infeasible.'})
-    mocker.patch('app.controllers.solver_controller.linprog', return_value=mock_fail_result)
+    mocker.patch('app.services.solver_backends.linprog', return_value=mock_fail_result)
 
     # 3. Mock de Escritura
     mock_save = mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
 
     # 4. Ejecutar y CAPTURAR RETURN
+    caplog.set_level(logging.INFO, logger="app")
     controller = SolverController(problema_completo)
     final_report = controller.run()
     
-    # 5. Verificar Print
-    captured = capsys.readouterr()
-    output = captured.out
-    assert "Sin Solucion Factible " in output
+    # 5. Verificar el log
+    output = caplog.text
+    assert "Sin Solucion Factible (Estado: Infeasible.)" in output
 
     # 6. Verificar Guardado y Return
     mock_save.assert_called_once()
@@ -222,7 +224,7 @@ def test_run_infeasible(mocker, capsys):
         assert report['solucion_encontrada']['status'] == "Sin Solucion Factible"
         assert report['solucion_encontrada']['valor_optimo_z'] is None
 
-def test_run_load_data_fails(mocker, capsys):
+def test_run_load_data_fails(mocker, caplog):
     """
     Testea que 'save_solution' NO se llame si la carga falla
     (datos vacíos pasados al constructor).
@@ -234,10 +236,9 @@ def test_run_load_data_fails(mocker, capsys):
     controller = SolverController(problem_data_wrapper={})
     final_report = controller.run()
     
-    # 3. Verificar Print
-    captured = capsys.readouterr()
-    output = captured.out
-    assert "Error: El solver no recibió datos válidos en la inicialización." in output
+    # 3. Verificar el log
+    assert ("app.controllers.solver_controller", logging.ERROR,
+            "El solver no recibió datos válidos en la inicialización.") in caplog.record_tuples
     
     # 4. Verificar que NO se guardó
     mock_save.assert_not_called()
@@ -38,4 +38,27 @@ def test_save_json_error(mocker, tmp_storage):
     """Test maneja IO error en save."""
     mocker.patch('builtins.open', side_effect=IOError("Mock error"))
     filename = StorageService.save_json({"test": 1}, "prefix")
-    assert filename is None  # Retorna None en error
\ No newline at end of file
+    assert filename is None  # Retorna None en error
+
+def test_save_cached_pdf_removes_tmp_when_replace_fails(mocker, tmp_path):
+    """Si el replace falla, el temporal no queda en la caché y el error se propaga."""
+    mocker.patch('app.services.storage_service.PDF_CACHE_DIR', str(tmp_path))
+    mocker.patch('app.services.storage_service.os.replace', side_effect=OSError("disco lleno"))
+    with pytest.raises(OSError):
+        StorageService.save_cached_pdf(3, "abc123", b"%PDF")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_save_cached_pdf_tolerates_stale_version_already_removed(mocker, tmp_path):
+    """Una versión vieja que otro worker borró entre listdir y remove no hace fallar al guardado."""
+    mocker.patch('app.services.storage_service.PDF_CACHE_DIR', str(tmp_path))
+    (tmp_path / "reporte_solucion_3_0dd.pdf").write_bytes(b"%PDF")
+    real_remove = os.remove
+
+    def remove_twice(path):
+        real_remove(path)
+        real_remove(path)  # Simula que otro worker la borró antes
+
+    mocker.patch('app.services.storage_service.os.remove', side_effect=remove_twice)
+    filename = StorageService.save_cached_pdf(3, "abc123", b"%PDF")
+    assert [p.name for p in tmp_path.iterdir()] == [os.path.basename(filename)]
@@ -0,0 +1,114 @@
+"""
+Tests para el historial de tablas paginado (/solucion/<id>/tablas).
+Verifican la paginación del endpoint JSON y que solution.html ya no
+incluya todas las tablas en la página.
+"""
+import json
+import os
+
+import pytest
+
+from app.controllers.routers import init_app
+
+TABLE = [["Base", "x1", "x2", "RHS"], ["s1", 1.0, 1.0, 4.0], ["s2", 1.0, 3.0, 6.0], ["Z", -3.0, -2.0, 0.0]]
+
+
+@pytest.fixture
+def client():
+    app = init_app()
+    app.config.update({"TESTING": True, "SECRET_KEY": "test_secret_key"})
+    return app.test_client()
+
+
+@pytest.fixture
+def output_dir(mocker, tmp_path):
+    mocker.patch('app.services.storage_service.OUTPUT_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _save_solution(output_dir, solution_id, num_tableaus):
+    tableaus = [{"iteration": k, "title": f"Iteración {k}", "table": TABLE, "pivot": [0, 1] if k else None}
+                for k in range(num_tableaus)]
+    path = output_dir / f"solucion_{solution_id}.json"
+    path.write_text(json.dumps({"tablas_intermedias": tableaus}), encoding="utf-8")
+    return path
+
+
+def test_tableaus_are_served_one_page_at_a_time(client, output_dir):
+    _save_solution(output_dir, 1, 5)
+
+    data = client.get('/solucion/1/tablas?pagina=2').get_json()
+
+    assert (data["pagina"], data["por_pagina"], data["total"], data["paginas"]) == (2, 1, 5, 5)
+    assert len(data["tablas"]) == 1
+    tableau = data["tablas"][0]
+    assert tableau["indice"] == 1 and tableau["titulo"] == "Iteración 1"
+    assert tableau["html"].startswith("<table")
+    assert "background-color:#fff0f0" in tableau["html"]  # Pivote resaltado
+
+
+def test_page_size_and_bounds(client, output_dir):
+    _save_solution(output_dir, 1, 5)
+
+    last = client.get('/solucion/1/tablas?pagina=3&por_pagina=2').get_json()
+    assert [t["indice"] for t in last["tablas"]] == [4]
+
+    assert client.get('/solucion/1/tablas?pagina=4&por_pagina=2').status_code == 404
+    assert client.get('/solucion/1/tablas?por_pagina=0').status_code == 400
+    assert client.get('/solucion/1/tablas?por_pagina=500').status_code == 400
+    assert client.get('/solucion/9/tablas').status_code == 404
+
+
+def test_rewritten_solution_is_not_served_stale(client, output_dir):
+    path = _save_solution(output_dir, 1, 2)
+    assert client.get('/solucion/1/tablas').get_json()["total"] == 2
+
+    _save_solution(output_dir, 1, 3)
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 5))
+
+    assert client.get('/solucion/1/tablas').get_json()["total"] == 3
+
+
+def test_solution_page_loads_tableaus_lazily(mocker, client, output_dir):
+    # Sin gilp (Plan B): antes el HTML traía todas las tablas concatenadas
+    mocker.patch('app.controllers.solver_controller.simplex_visual', side_effect=RuntimeError("sin gilp"))
+    client.post('/new', data={
+        'problem_type': 'maximize',
+        'objective[]': [3.0, 2.0],
+        'constraint_1[]': [1.0, 1.0],
+        'constraint_2[]': [1.0, 3.0],
+        'constraint_sign[]': ['<=', '<='],
+        'constraint_rhs[]': [4.0, 6.0],
+    })
+
+    html = client.post('/solve').data.decode('utf-8')
+
+    assert 'data-url="/solucion/1/tablas"' in html
+    assert '<table class="table' not in html
+    assert 'href="/exportar-pdf?id=1"' in html
+
+    data = client.get('/solucion/1/tablas').get_json()
+    assert data["total"] >= 2
+    assert data["tablas"][0]["html"].startswith("<table")
+
+
+def test_unsaved_solution_shows_the_first_page_inline(mocker, client, output_dir):
+    # Sin id no hay historial que pedir: la primera página va en la respuesta
+    mocker.patch('app.controllers.solver_controller.simplex_visual', side_effect=RuntimeError("sin gilp"))
+    mocker.patch('app.config.PERSISTENCE_MODE', "off")
+    client.post('/new', data={
+        'problem_type': 'maximize',
+        'objective[]': [3.0, 2.0],
+        'constraint_1[]': [1.0, 1.0],
+        'constraint_2[]': [1.0, 3.0],
+        'constraint_sign[]': ['<=', '<='],
+        'constraint_rhs[]': [4.0, 6.0],
+    })
+
+    html = client.post('/solve').data.decode('utf-8')
+
+    assert 'data-url="/solucion/' not in html
+    assert html.count('<table class="table') == 1  # TABLEAU_PAGE_SIZE = 1
+    assert "se muestra la primera página, 1 de" in html
+    assert "ver las tablas intermedias más abajo" in html
+    assert list(output_dir.iterdir()) == []
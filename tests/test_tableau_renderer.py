@@ -0,0 +1,91 @@
+"""
+Tests para el Renderizador de Tablas en HTML (app/services/tableau_renderer.py).
+Comparan la salida con la conversión celda por celda anterior, verifican
+la memorización por hash y miden una tabla de 100x100.
+"""
+import random
+
+import pytest
+
+from app import config
+from app.services import TableauHtmlRenderer
+
+
+def _table(size: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [["Base"] + [f"C{j}" for j in range(size)]] + [
+        [f"F{i}"] + [round(rng.uniform(-100, 100), 4) for _ in range(size)] for i in range(size)]
+
+
+def _legacy_tableau_to_html(tableau_list, pivot_r, pivot_c):
+    """Conversión anterior (SolverController._tableau_to_html), celda por celda."""
+    pivot_style = 'style="background-color:#fff0f0; color:#d00; font-weight:bold;"'
+    html = ['<table class="table table-bordered table-striped" style="border:1px solid #ccc; '
+            'justify-content:center; float:none; margin-left:auto; margin-right:auto;">']
+    for r_idx, row in enumerate(tableau_list):
+        html.append('<tr>')
+        for c_idx, cell in enumerate(row):
+            cell_tag = 'th' if c_idx == 0 or r_idx == 0 else 'td'
+            style = pivot_style if r_idx == pivot_r + 1 and c_idx == pivot_c + 1 else ""
+            cell_content = f"{cell:.4f}" if isinstance(cell, float) else cell
+            html.append(f'<{cell_tag} {style}>{cell_content}</{cell_tag}>')
+        html.append('</tr>')
+    html.append('</table>')
+    return "".join(html)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    TableauHtmlRenderer.clear_cache()
+    yield
+    TableauHtmlRenderer.clear_cache()
+
+
+@pytest.mark.parametrize("size, pivot", [(3, (1, 2)), (12, (0, 0)), (40, (39, 17))])
+def test_same_html_as_cell_by_cell_conversion(size, pivot):
+    table = _table(size, seed=size)
+    assert TableauHtmlRenderer.render(table, pivot) == _legacy_tableau_to_html(table, *pivot)
+
+
+def test_non_numeric_cells_fall_back_and_are_escaped():
+    table = [["Base", "C0", "C1"], ["F0", 1, 2.5], ["F1", "<b>", None]]
+    html = TableauHtmlRenderer.render(table, (0, 1))
+
+    assert "<td >1</td>" in html
+    assert 'font-weight:bold;">2.5000</td>' in html
+    assert "<td >&lt;b&gt;</td><td >None</td>" in html
+
+
+def test_no_pivot_highlights_nothing():
+    assert "background-color" not in TableauHtmlRenderer.render(_table(4))
+
+
+def test_rendered_html_is_memoized_per_tableau_hash():
+    table = _table(6)
+    first = TableauHtmlRenderer.render(table, (1, 1))
+    assert TableauHtmlRenderer.render([list(row) for row in table], (1, 1)) is first
+    assert TableauHtmlRenderer.cache_info()["hits"] == 1
+
+    TableauHtmlRenderer.render(table, (2, 2))
+    changed = [list(row) for row in table]
+    changed[3][3] += 1.0
+    assert TableauHtmlRenderer.render(changed, (1, 1)) != first
+    assert TableauHtmlRenderer.cache_info()["misses"] == 3
+
+
+def test_cache_is_bounded(mocker):
+    mocker.patch.object(config, 'TABLEAU_HTML_CACHE_SIZE', 2)
+    for seed in range(5):
+        TableauHtmlRenderer.render(_table(3, seed=seed))
+    assert TableauHtmlRenderer.cache_info()["size"] == 2
+
+
+@pytest.mark.benchmark(group="tablas-html-100x100")
+@pytest.mark.parametrize("mode", ["celda-por-celda", "vectorizado", "memorizado"])
+def test_benchmark_tableau_100x100(benchmark, mode):
+    table = _table(100)
+    if mode == "celda-por-celda":
+        html = benchmark(_legacy_tableau_to_html, table, 3, 4)
+    else:
+        html = benchmark(TableauHtmlRenderer.render, table, (3, 4), use_cache=(mode == "memorizado"))
+    assert html.count("<tr>") == 101
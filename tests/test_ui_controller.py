@@ -42,44 +42,99 @@ MOCK_SOLUTION_REPORT = {
 
 # --- Tests para /exportar-pdf ---
 
-def test_exportar_pdf_success(mocker, client):
+@pytest.fixture
+def pdf_cache_dir(mocker, tmp_path):
+    """Caché de PDFs en un directorio temporal."""
+    mocker.patch('app.services.storage_service.PDF_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+def test_exportar_pdf_success(mocker, client, pdf_cache_dir):
     """
-    Testea que la ruta /exportar-pdf llame a los servicios correctos
-    y envíe un archivo cuando la solución SÍ existe.
+    Testea que la ruta /exportar-pdf genere el PDF de la última solución
+    y lo envíe en bloques, sin pedir un nuevo reporte_solucion_N.pdf.
     """
     
     # 1. Simular (mock) los servicios que se usan
     
-    # Simular que SÍ encontramos un reporte JSON
-    mocker.patch.object(StorageService, 'load_solution', return_value=MOCK_SOLUTION_REPORT)
-    
-    # Simular que nos da un nombre de archivo PDF
-    mocker.patch.object(StorageService, 'get_new_pdf_path', return_value="outputs/mock_report.pdf")
+    # Simular que SÍ encontramos un reporte JSON (la solución número 3)
+    mocker.patch.object(StorageService, 'load_solution_by_id', return_value=MOCK_SOLUTION_REPORT)
+    mocker.patch.object(StorageService, 'get_latest_solution_id', return_value=3)
     
-    # Simular la *generación* del PDF (no queremos crear un archivo real)
-    mock_pdf_generate = mocker.patch.object(PdfReportService, 'generate', return_value=True)
-    
-    # Simular el *envío* del archivo (lo más importante)
-    mock_send_file = mocker.patch('app.controllers.ui_controller.send_file', return_value="PDF content as string")
+    # Ya no se numeran PDFs nuevos en cada exportación
+    mock_new_path = mocker.patch.object(StorageService, 'get_new_pdf_path')
+    mock_send_file = mocker.patch('app.controllers.ui_controller.send_file')
 
     # 2. Llamar a la ruta /exportar-pdf
     response = client.get('/exportar-pdf')
 
     # 3. Verificar (Asserts)
     
-    # Verificamos que la respuesta fue "OK" (200)
+    # Verificamos que la respuesta fue "OK" (200) y es un PDF completo
     assert response.status_code == 200 
-    assert response.data == b"PDF content as string" 
+    assert response.mimetype == "application/pdf"
+    assert response.data.startswith(b"%PDF")
+    assert response.data.rstrip().endswith(b"%%EOF")
+    assert response.headers["Content-Disposition"] == 'attachment; filename="reporte_solucion_3.pdf"'
     
-    # Verificamos que se llamó a `generate`
-    mock_pdf_generate.assert_called_once()
+    assert response.headers["ETag"] == f'"{PdfReportService.content_hash(MOCK_SOLUTION_REPORT)}"'
     
-    # Verificamos que `send_file` se llamó con los argumentos correctos
-    mock_send_file.assert_called_with(
-        "outputs/mock_report.pdf",
-        as_attachment=True,
-        download_name="mock_report.pdf"
-    )
+    mock_new_path.assert_not_called()
+    mock_send_file.assert_not_called()
+    # El PDF quedó en la caché
+    assert len(list(pdf_cache_dir.glob("reporte_solucion_3_*.pdf"))) == 1
+
+def test_exportar_pdf_uses_cache_and_conditional_get(mocker, client, pdf_cache_dir):
+    """La segunda descarga sale de la caché y un If-None-Match vigente devuelve 304."""
+    mocker.patch.object(StorageService, 'load_solution_by_id', return_value=MOCK_SOLUTION_REPORT)
+    mocker.patch.object(StorageService, 'get_latest_solution_id', return_value=3)
+    render_spy = mocker.spy(PdfReportService, 'render')
+
+    first = client.get('/exportar-pdf')
+    second = client.get('/exportar-pdf')
+    not_modified = client.get('/exportar-pdf', headers={"If-None-Match": first.headers["ETag"]})
+
+    assert render_spy.call_count == 1
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert not_modified.status_code == 304
+    assert not_modified.data == b""
+
+def test_exportar_pdf_regenerates_when_report_changes(mocker, client, pdf_cache_dir):
+    """Si el reporte cambia, cambia el ETag y la versión anterior se reemplaza en la caché."""
+    mocker.patch.object(StorageService, 'get_latest_solution_id', return_value=3)
+    load = mocker.patch.object(StorageService, 'load_solution_by_id', return_value=MOCK_SOLUTION_REPORT)
+    first = client.get('/exportar-pdf')
+
+    changed = dict(MOCK_SOLUTION_REPORT, tablas_intermedias=[])
+    load.return_value = changed
+    second = client.get('/exportar-pdf', headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert len(list(pdf_cache_dir.glob("reporte_solucion_3_*.pdf"))) == 1
+
+def test_exportar_pdf_resolves_the_latest_id_once(mocker, client, pdf_cache_dir):
+    """El reporte se carga por el mismo id con el que se nombra y se guarda en caché."""
+    mocker.patch.object(StorageService, 'get_latest_solution_id', side_effect=[3, 4])
+    load_by_id = mocker.patch.object(StorageService, 'load_solution_by_id', return_value=MOCK_SOLUTION_REPORT)
+    load_latest = mocker.spy(StorageService, 'load_solution')
+
+    response = client.get('/exportar-pdf')
+
+    load_by_id.assert_called_once_with(3)
+    load_latest.assert_not_called()
+    assert response.headers["Content-Disposition"] == 'attachment; filename="reporte_solucion_3.pdf"'
+    assert len(list(pdf_cache_dir.glob("reporte_solucion_3_*.pdf"))) == 1
+
+
+def test_exportar_pdf_by_solution_id(mocker, client, pdf_cache_dir):
+    """?id=N exporta esa solución en particular."""
+    load_by_id = mocker.patch.object(StorageService, 'load_solution_by_id', return_value=MOCK_SOLUTION_REPORT)
+    response = client.get('/exportar-pdf?id=7')
+
+    load_by_id.assert_called_once_with(7)
+    assert response.headers["Content-Disposition"] == 'attachment; filename="reporte_solucion_7.pdf"'
 
 def test_exportar_pdf_no_solution_found(mocker, client):
     """
@@ -87,7 +142,8 @@ def test_exportar_pdf_no_solution_found(mocker, client):
     si NO se encuentra el archivo solucion_X.json.
     """
     # 1. Simular el error (StorageService no encuentra el archivo)
-    mocker.patch.object(StorageService, 'load_solution', side_effect=FileNotFoundError("No solution file found"))
+    mocker.patch.object(StorageService, 'get_latest_solution_id', return_value=3)
+    mocker.patch.object(StorageService, 'load_solution_by_id', side_effect=FileNotFoundError("No solution file found"))
     
     # 2. Llamar a la ruta
     # 'follow_redirects=True' hace que el test siga la redirección
@@ -0,0 +1,158 @@
+"""
+Tests para las cotas generales de las variables ('cotas_variables').
+Verifican que las cotas lleguen como cotas nativas a cada backend (sin
+filas extra) y el cambio de variable que usan los métodos de tablas.
+"""
+import json
+
+import numpy as np
+import pytest
+from scipy.optimize import OptimizeResult
+
+from app.core import NonNegativeForm
+from app.services import SolverBackendRegistry, SolverModel
+from app.controllers.routers import init_app
+from app.controllers.solver_controller import SolverController
+from app.controllers.ui_controller import parse_variable_bounds, validate_problem_structure
+
+# max 2x1 - x2  s.a.  x1 + x2 <= 4,  x1 - x2 <= 5,  1 <= x1 <= 3,  x2 libre
+# Óptimo: x1 = 3, x2 = -2, Z = 8
+OBJECTIVE = {"type": "maximize", "coefficients": {"x1": 2.0, "x2": -1.0}}
+CONSTRAINTS = [
+    {"coefficients": {"x1": 1.0, "x2": 1.0}, "operator": "<=", "rhs": 4.0},
+    {"coefficients": {"x1": 1.0, "x2": -1.0}, "operator": "<=", "rhs": 5.0},
+]
+COTAS = {"x1": {"lower": 1.0, "upper": 3.0}, "x2": {"lower": None, "upper": None}}
+
+
+def test_non_negative_form_shifts_and_splits():
+    form = NonNegativeForm.build(OBJECTIVE, CONSTRAINTS, ["x1", "x2"],
+                                 {"x1": (1.0, 3.0), "x2": (None, None)})
+
+    assert form.variables == ["x1", "x2_pos", "x2_neg"]
+    # x1 = 1 + y1: el aporte de la cota inferior pasa al RHS y a Z
+    assert form.constraints_data[0] == {
+        "coefficients": {"x1": 1.0, "x2_pos": 1.0, "x2_neg": -1.0}, "operator": "<=", "rhs": 3.0}
+    assert form.objective_offset == pytest.approx(2.0)
+    # Solo la cota superior finita queda como fila
+    assert len(form.constraints_data) == len(CONSTRAINTS) + 1
+    assert form.constraints_data[-1]["rhs"] == pytest.approx(2.0)
+    np.testing.assert_allclose(form.recover({"x1": 2.0, "x2_pos": 0.0, "x2_neg": 2.0}), [3.0, -2.0])
+
+
+@pytest.mark.parametrize("backend", ["highs-ds", "highs-ipm", "highs-milp", "tableau"])
+def test_every_backend_honours_general_bounds(backend):
+    model = SolverModel(OBJECTIVE, CONSTRAINTS, ["x1", "x2"], bounds=[(1.0, 3.0), (None, None)])
+    result, _ = SolverBackendRegistry.solve(model, backend=backend)
+
+    assert result.success
+    np.testing.assert_allclose(result.x, [3.0, -2.0], atol=1e-6)
+    assert -result.fun == pytest.approx(8.0)
+
+
+def test_bounds_are_passed_natively_to_linprog(mocker):
+    mock_linprog = mocker.patch('app.services.solver_backends.linprog', return_value=OptimizeResult({
+        'fun': -8.0, 'success': True, 'x': np.array([3.0, -2.0]), 'message': 'Optimization successful.'
+    }))
+    mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
+
+    report = SolverController({"problema_definicion": {
+        "funcion_objetivo": OBJECTIVE, "restricciones": CONSTRAINTS, "cotas_variables": COTAS}}).run()
+
+    kwargs = mock_linprog.call_args.kwargs
+    assert kwargs["bounds"] == [(1.0, 3.0), (None, None)]
+    assert kwargs["A_ub"].shape == (2, 2)  # Sin filas extra por las cotas
+    assert report['solucion_encontrada']['valores_variables'] == {"x1": 3.0, "x2": -2.0}
+    assert report['problema_definicion']['cotas_variables'] == COTAS
+
+
+def test_crossed_bounds_are_infeasible(mocker):
+    mocker.patch('app.services.StorageService.save_solution', return_value="outputs/solucion_mock.json")
+    report = SolverController({"problema_definicion": {
+        "funcion_objetivo": OBJECTIVE, "restricciones": CONSTRAINTS,
+        "cotas_variables": {"x1": {"lower": 5.0, "upper": 2.0}}}}).run()
+
+    assert report['solucion_encontrada']['status'] == "Sin Solucion Factible"
+
+
+def test_parse_variable_bounds_from_form():
+    assert parse_variable_bounds(["", "-inf", "2"], ["10", "", ""], 3) == {
+        "x1": {"lower": 0.0, "upper": 10.0},
+        "x2": {"lower": None, "upper": None},
+        "x3": {"lower": 2.0, "upper": None},
+    }
+    assert parse_variable_bounds(["", ""], ["", ""], 2) == {}
+    with pytest.raises(ValueError):
+        parse_variable_bounds(["5"], ["1"], 1)
+    with pytest.raises(ValueError):
+        parse_variable_bounds(["abc"], [""], 1)
+
+
+@pytest.mark.parametrize("lower, upper", [("inf", ""), ("+inf", ""), ("", "-inf"), ("nan", "")])
+def test_parse_variable_bounds_rejects_impossible_infinite_bounds(lower, upper):
+    # Solo "-inf" libera la cota inferior y solo "inf" / "+inf" la superior
+    with pytest.raises(ValueError, match="x1"):
+        parse_variable_bounds([lower], [upper], 1)
+    assert parse_variable_bounds(["-inf"], ["+inf"], 1) == {"x1": {"lower": None, "upper": None}}
+
+
+@pytest.mark.parametrize("cotas, expected_ok", [
+    (COTAS, True),
+    ({"x1": {"lower": 4, "upper": 1}}, False),
+    ({"x1": {"lower": "0"}}, False),
+    ({"x1": {"min": 0}}, False),
+    ({"x7": {"upper": 1}}, False),
+    ({"x1": {"lower": True}}, False),
+    ({"x1": {"lower": float("inf")}}, False),
+    ({"x1": {"lower": float("-inf")}}, False),
+    ({"x1": {"upper": float("nan")}}, False),
+    ({"x1": {"upper": float("-inf")}}, False),
+    ({"x1": {"upper": float("inf")}}, True),
+])
+def test_validate_variable_bounds(cotas, expected_ok):
+    ok, _ = validate_problem_structure(
+        {"funcion_objetivo": OBJECTIVE, "restricciones": CONSTRAINTS, "cotas_variables": cotas})
+    assert ok is expected_ok
+
+
+def test_api_rejects_non_finite_json_bounds_and_accepts_infinite_upper():
+    app = init_app()
+    app.config.update({"TESTING": True})
+    client = app.test_client()
+    body = ('{"problema_definicion": {"funcion_objetivo": %s, "restricciones": %s, '
+            '"cotas_variables": {"x1": %s, "x2": {"lower": null}}}}')
+    objective, constraints = json.dumps(OBJECTIVE), json.dumps(CONSTRAINTS)
+
+    for bound in ('{"lower": Infinity}', '{"upper": NaN}', '{"lower": true}'):
+        response = client.post('/api/v1/solve', data=body % (objective, constraints, bound),
+                                content_type="application/json")
+        assert response.status_code == 400
+
+    # "upper": Infinity es lo mismo que sin cota superior
+    response = client.post('/api/v1/solve', data=body % (objective, constraints, '{"lower": 1, "upper": Infinity}'),
+                           content_type="application/json")
+    assert response.status_code == 200
+    assert response.get_json()['solucion_encontrada']['valores_variables'] == pytest.approx({"x1": 4.5, "x2": -0.5})
+
+
+def test_new_problem_form_stores_bounds():
+    app = init_app()
+    app.config.update({"TESTING": True, "SECRET_KEY": "test_secret_key"})
+    client = app.test_client()
+
+    response = client.post('/new', data={
+        "problem_type": "maximize",
+        "objective[]": ["2", "-1"],
+        "variable_type[]": ["continuous", "continuous"],
+        "variable_lower[]": ["1", "-inf"],
+        "variable_upper[]": ["3", ""],
+        "constraint_sign[]": ["<="],
+        "constraint_1[]": ["1"],
+        "constraint_2[]": ["1"],
+        "constraint_rhs[]": ["4"],
+    })
+
+    assert response.status_code == 200
+    with client.session_transaction() as session:
+        problem = session['problem_data_wrapper']['problema_definicion']
+    assert problem['cotas_variables'] == COTAS
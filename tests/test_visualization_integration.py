@@ -105,7 +105,7 @@ def test_flujo_completo_visualizacion_maximizacion(client, mocker, tmpdir):
     assert 'Maximize' in html or '3' in html  # Al menos debe tener los coeficientes
     
     # Paso 2: Mock del solver y resolver
-    mocker.patch('app.controllers.solver_controller.linprog', 
+    mocker.patch('app.services.solver_backends.linprog', 
                  return_value=RESULTADO_MAX_SIMPLE)
     
     response = client.post('/solve', follow_redirects=True)
@@ -141,7 +141,7 @@ def test_tablas_simplex_coinciden_con_calculos_internos(mocker, tmpdir):
     mocker.patch('app.config.OUTPUT_DIR', str(tmpdir))
 
     # Mock del linprog para tener control total
-    mocker.patch('app.controllers.solver_controller.linprog',
+    mocker.patch('app.services.solver_backends.linprog',
                  return_value=RESULTADO_MAX_SIMPLE)
     # Ejecutar solver (pasando datos al constructor)
     solver = SolverController({"problema_definicion": PROBLEMA_MAX_SIMPLE})
@@ -189,7 +189,7 @@ def test_visualizacion_problema_minimizacion(client, mocker, tmpdir):
     client.post('/new', data=form_data)
     
     # Mock solver
-    mocker.patch('app.controllers.solver_controller.linprog',
+    mocker.patch('app.services.solver_backends.linprog',
                  return_value=RESULTADO_MIN_SIMPLE)
     
     response = client.post('/solve', follow_redirects=True)
@@ -223,7 +223,7 @@ def test_visualizacion_con_restricciones_igualdad(mocker, tmpdir):
         'message': 'Optimization successful.'
     })
     
-    mocker.patch('app.controllers.solver_controller.linprog',
+    mocker.patch('app.services.solver_backends.linprog',
                  return_value=mock_result)
     
     solver = SolverController({"problema_definicion": problema_con_igualdad})
@@ -259,7 +259,7 @@ def test_visualizacion_problema_infactible(mocker, tmpdir):
         'message': 'Infeasible problem.'
     })
     
-    mocker.patch('app.controllers.solver_controller.linprog',
+    mocker.patch('app.services.solver_backends.linprog',
                  return_value=mock_result)
     
     solver = SolverController({"problema_definicion": problema_infactible})
@@ -283,7 +283,7 @@ def test_verificar_estructura_html_visualizacion(mocker, tmpdir):
     """
     mocker.patch('app.config.OUTPUT_DIR', str(tmpdir))
 
-    mocker.patch('app.controllers.solver_controller.linprog',
+    mocker.patch('app.services.solver_backends.linprog',
                  return_value=RESULTADO_MAX_SIMPLE)
     
     solver = SolverController({"problema_definicion": PROBLEMA_MAX_SIMPLE})
@@ -320,7 +320,7 @@ def test_integracion_css_con_visualizacion(client, mocker, tmpdir):
     
     client.post('/new', data=form_data)
     
-    mocker.patch('app.controllers.solver_controller.linprog',
+    mocker.patch('app.services.solver_backends.linprog',
                  return_value=RESULTADO_MAX_SIMPLE)
     
     response = client.post('/solve', follow_redirects=True)
@@ -361,7 +361,7 @@ def test_regresion_problema_sin_restricciones(mocker, tmpdir):
         'message': 'Unbounded problem.'
     })
     
-    mocker.patch('app.controllers.solver_controller.linprog',
+    mocker.patch('app.services.solver_backends.linprog',
                  return_value=mock_result)
     
     solver = SolverController({"problema_definicion": problema_sin_restricciones})
@@ -394,7 +394,7 @@ def test_regresion_coeficientes_cero(mocker, tmpdir):
         'message': 'Optimization successful.'
     })
     
-    mocker.patch('app.controllers.solver_controller.linprog',
+    mocker.patch('app.services.solver_backends.linprog',
                  return_value=mock_result)
     
     solver = SolverController({"problema_definicion": problema_con_ceros})
@@ -451,7 +451,7 @@ def test_performance_visualizacion_problema_grande(mocker, tmpdir):
         'message': 'Optimization successful.'
     })
     
-    mocker.patch('app.controllers.solver_controller.linprog',
+    mocker.patch('app.services.solver_backends.linprog',
                  return_value=mock_result)
     
     solver = SolverController({"problema_definicion": problema_grande})
@@ -468,7 +468,7 @@ def test_performance_visualizacion_problema_grande(mocker, tmpdir):
 def test_solucion_contiene_datos_problema_original(mocker, tmpdir):
     mocker.patch('app.config.OUTPUT_DIR', str(tmpdir))
     
-    mocker.patch('app.controllers.solver_controller.linprog',
+    mocker.patch('app.services.solver_backends.linprog',
                  return_value=RESULTADO_MAX_SIMPLE)
     
     solver = SolverController({"problema_definicion": PROBLEMA_MAX_SIMPLE})
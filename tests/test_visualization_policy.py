@@ -0,0 +1,75 @@
+"""
+Tests para la política de visualización según el tamaño del modelo
+(app/services/visualization_policy.py) y su uso en SolverController.
+"""
+from app import config
+from app.controllers.solver_controller import SolverController
+from app.services import VisualizationPolicy
+
+
+def _problem(num_variables: int, num_constraints: int) -> dict:
+    """max sum(x)  s.a.  x_i + x_(i+1) <= 10 (factible y acotado)."""
+    variables = [f"x{i + 1}" for i in range(num_variables)]
+    constraints = [
+        {"coefficients": {variables[i % num_variables]: 1.0, variables[(i + 1) % num_variables]: 1.0},
+         "operator": "<=", "rhs": 10.0 + i}
+        for i in range(num_constraints)
+    ]
+    return {"problema_definicion": {
+        "funcion_objetivo": {"type": "maximize", "coefficients": {var: 1.0 for var in variables}},
+        "restricciones": constraints,
+    }}
+
+
+def test_policy_picks_the_visualization_from_the_dimensions():
+    assert VisualizationPolicy.choose(2, 3).mode == "gilp"
+    assert VisualizationPolicy.choose(3, 20).mode == "gilp"
+    # gilp no dibuja más de 3 variables ni modelos con muchas restricciones
+    assert VisualizationPolicy.choose(5, 10).mode == "tablas"
+    assert VisualizationPolicy.choose(2, 21).mode == "tablas"
+
+    plan = VisualizationPolicy.choose(30, 30)
+    assert plan.mode == "resumen" and plan.columns == 62
+    assert len(plan.reasons) == 2 and "30 variables y 30 restricciones" in plan.summary_html()
+
+
+def test_equalities_count_twice_and_thresholds_are_configurable(mocker):
+    constraints = [{"coefficients": {"x1": 1.0}, "operator": "=", "rhs": 1.0}] * 11
+    assert VisualizationPolicy.for_model(constraints, ["x1", "x2"]).rows == 22
+    assert VisualizationPolicy.for_model(constraints, ["x1", "x2"]).mode == "tablas"
+
+    mocker.patch.object(config, 'VISUALIZATION_GILP_VARIABLES', (2, 3, 4))
+    mocker.patch.object(config, 'VISUALIZATION_TABLEAU_MAX_COLUMNS', 8)
+    assert VisualizationPolicy.choose(4, 3).mode == "gilp"
+    assert not VisualizationPolicy.choose(4, 3).tableaus
+
+
+def test_large_model_gets_only_a_summary(mocker):
+    visual = mocker.patch('app.controllers.solver_controller.simplex_visual')
+    tables = mocker.spy(SolverController, '_run_simple_simplex')
+
+    report = SolverController(_problem(30, 30), persist=False).run()
+
+    assert report["solucion_encontrada"]["status"] == "Solucion Factible"
+    assert report["tablas_intermedias"] == []
+    assert "Visualización omitida" in report["visualizacion_gilp_html"]
+    assert report["diagnostico"]["visualizacion"]["modo"] == "resumen"
+    visual.assert_not_called()
+    tables.assert_not_called()
+
+
+def test_gilp_is_skipped_beyond_three_variables(mocker):
+    visual = mocker.patch('app.controllers.solver_controller.simplex_visual')
+
+    report = SolverController(_problem(5, 5), persist=False).run()
+
+    visual.assert_not_called()
+    assert report["tablas_intermedias"]
+    assert report["diagnostico"]["visualizacion"] == {
+        "modo": "tablas", "variables": 5, "filas": 5, "columnas_tabla": 12,
+        "motivos": ["gilp solo dibuja modelos de 2 o 3 variables"],
+    }
+
+    # Sin visualización (ej: la API), el tamaño también decide si van las tablas
+    report = SolverController(_problem(30, 30), persist=False, include_visualization=False).run()
+    assert report["tablas_intermedias"] == []